@@ -0,0 +1,178 @@
+import numpy as np
+
+# Indices within an element of the midside node of each face, for faces 1 to 4
+_FACE_MIDSIDE_NODES = np.array([4, 5, 6, 7])
+
+
+class MeshAdjacency:
+    """Compressed sparse row adjacency of a mesh of eight node elements. Nodes and elements
+    are referred to by their index within the mesh's ordered node and element lists."""
+
+    def __init__(self, node_ids, element_ids, connectivity):
+        """Builds the adjacency of a mesh
+
+        Args:
+            node_ids (np.ndarray): (n,) sorted ids of the nodes
+            element_ids (np.ndarray): (m,) sorted ids of the elements
+            connectivity (np.ndarray): (m, 8) node ids of each element
+        """
+        self.node_ids = np.asarray(node_ids)
+        self.element_ids = np.asarray(element_ids)
+        self.element_nodes = np.searchsorted(self.node_ids, connectivity)
+
+        node_count = len(self.node_ids)
+        element_count = len(self.element_ids)
+
+        # Node to element
+        flat_nodes = self.element_nodes.ravel()
+        order = np.argsort(flat_nodes, kind="stable")
+        self.node_element_indices = np.repeat(np.arange(element_count), 8)[order]
+        self.node_element_indptr = np.zeros(node_count + 1, dtype=np.int64)
+        self.node_element_indptr[1:] = np.cumsum(
+            np.bincount(flat_nodes, minlength=node_count)
+        )
+
+        self.element_element_indptr, self.element_element_indices = (
+            self._build_element_neighbors(element_count)
+        )
+        self.face_neighbors = self._build_face_neighbors()
+
+    @classmethod
+    def from_elements(cls, nodes, elements):
+        """Builds the adjacency of node and element objects
+
+        Args:
+            nodes (list(Node)): Nodes of the mesh, ordered by id
+            elements (list(Element)): Elements of the mesh, ordered by id
+
+        Returns:
+            MeshAdjacency: Adjacency of the mesh
+        """
+        return cls(
+            np.array([node.id for node in nodes]),
+            np.array([element.id for element in elements]),
+            np.array([element.get_ids() for element in elements]).reshape(-1, 8),
+        )
+
+    def _build_element_neighbors(self, element_count):
+        """Finds elements that share at least one node with each element
+
+        Args:
+            element_count (int): Number of elements in the mesh
+
+        Returns:
+            (np.ndarray, np.ndarray): indptr and indices of the element to element adjacency
+        """
+        degrees = np.diff(self.node_element_indptr)
+        entry_degrees = np.repeat(degrees, degrees)
+        entry_starts = np.repeat(self.node_element_indptr[:-1], degrees)
+
+        # Pair every element of a node with every element of the same node
+        first = np.repeat(self.node_element_indices, entry_degrees)
+        pair_offsets = np.arange(len(first)) - np.repeat(
+            np.cumsum(entry_degrees) - entry_degrees, entry_degrees
+        )
+        second = self.node_element_indices[
+            np.repeat(entry_starts, entry_degrees) + pair_offsets
+        ]
+
+        pairs = np.unique(
+            first[first != second] * element_count + second[first != second]
+        )
+        first, second = np.divmod(pairs, element_count)
+
+        indptr = np.zeros(element_count + 1, dtype=np.int64)
+        indptr[1:] = np.cumsum(np.bincount(first, minlength=element_count))
+        return indptr, second
+
+    def _build_face_neighbors(self):
+        """Finds the element across each face of every element, using shared midside nodes
+
+        Returns:
+            np.ndarray: (m, 4) index of the neighboring element across faces 1 to 4, or -1 on a boundary
+        """
+        midside_nodes = self.element_nodes[:, _FACE_MIDSIDE_NODES]
+        starts = self.node_element_indptr[midside_nodes]
+        counts = self.node_element_indptr[midside_nodes + 1] - starts
+
+        # A midside node is shared by at most two elements
+        first = self.node_element_indices[starts]
+        second = np.where(
+            counts > 1,
+            self.node_element_indices[
+                np.minimum(starts + 1, len(self.node_element_indices) - 1)
+            ],
+            -1,
+        )
+        elements = np.arange(len(self.element_ids))[:, None]
+        return np.where(first == elements, second, first)
+
+    def element_index(self, element_ids):
+        """Gets the index of elements within the mesh from their ids
+
+        Args:
+            element_ids (int or np.ndarray): Element ids
+
+        Returns:
+            int or np.ndarray: Element indices
+        """
+        return np.searchsorted(self.element_ids, element_ids)
+
+    def get_node_elements(self, node_index):
+        """Gets the indices of the elements containing a node
+
+        Args:
+            node_index (int): Index of the node
+
+        Returns:
+            np.ndarray: Element indices
+        """
+        return self.node_element_indices[
+            self.node_element_indptr[node_index] : self.node_element_indptr[
+                node_index + 1
+            ]
+        ]
+
+    def get_element_neighbors(self, element_index):
+        """Gets the indices of the elements that share a node with an element
+
+        Args:
+            element_index (int): Index of the element
+
+        Returns:
+            np.ndarray: Element indices
+        """
+        return self.element_element_indices[
+            self.element_element_indptr[element_index] : self.element_element_indptr[
+                element_index + 1
+            ]
+        ]
+
+    def get_boundary_faces(self):
+        """Gets every element face that is not shared with another element
+
+        Returns:
+            np.ndarray: (k, 2) element index and face number (1 to 4) of each boundary face
+        """
+        elements, faces = np.nonzero(self.face_neighbors == -1)
+        return np.stack([elements, faces + 1], axis=-1)
+
+    def average_to_nodes(self, element_node_values):
+        """Averages values given at the nodes of each element across the elements sharing each node
+
+        Args:
+            element_node_values (np.ndarray): (m, 8, c) values at the nodes of each element
+
+        Returns:
+            np.ndarray: (n, c) averaged nodal values. NaN for nodes without values.
+        """
+        values = element_node_values.reshape(-1, element_node_values.shape[-1])
+        flat_nodes = self.element_nodes.ravel()
+        has_values = ~np.isnan(values).any(axis=1)
+
+        sums = np.zeros((len(self.node_ids), values.shape[1]))
+        np.add.at(sums, flat_nodes[has_values], values[has_values])
+        counts = np.bincount(flat_nodes[has_values], minlength=len(self.node_ids))
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(counts[:, None] > 0, sums / counts[:, None], np.nan)
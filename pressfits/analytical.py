@@ -0,0 +1,148 @@
+import numpy as np
+
+DEFAULT_FRICTION_COEFFICIENT = 0.2
+
+
+def get_contact_pressure(
+    id_0,
+    id_1,
+    od_0,
+    od_1,
+    inner_youngs_modulus,
+    inner_poissons_ratio,
+    outer_youngs_modulus,
+    outer_poissons_ratio,
+):
+    """Gets the contact pressure of a press fit from Lamé's equations for thick walled
+    cylinders, EQ 3-56 of Shigley's. Arguments may be floats or numpy arrays of equal shape.
+
+    Args:
+        id_0 (float): Internal diameter of inner part (m)
+        id_1 (float): Internal diameter of outer part (m)
+        od_0 (float): Outer diameter of inner part (m)
+        od_1 (float): Outer diameter of outer part (m)
+        inner_youngs_modulus (float): Young's modulus of the inner part (Pa)
+        inner_poissons_ratio (float): Poisson's ratio of the inner part
+        outer_youngs_modulus (float): Young's modulus of the outer part (Pa)
+        outer_poissons_ratio (float): Poisson's ratio of the outer part
+
+    Returns:
+        float: Contact pressure (Pa), 0 if the parts have clearance
+    """
+    radial_interference = (od_0 - id_1) / 2
+    radius = (od_0 + id_1) / 4  # Nominal radius
+    radius_2 = radius**2
+    inner_radius_2 = (id_0 / 2) ** 2
+    outer_radius_2 = (od_1 / 2) ** 2
+
+    compliance = (
+        (outer_radius_2 + radius_2) / (outer_radius_2 - radius_2) + outer_poissons_ratio
+    ) / outer_youngs_modulus + (
+        (radius_2 + inner_radius_2) / (radius_2 - inner_radius_2) - inner_poissons_ratio
+    ) / inner_youngs_modulus
+
+    return np.maximum(radial_interference / radius / compliance, 0.0)
+
+
+def get_von_mises_stress(principal_stress_1, principal_stress_2):
+    """Gets the Von Mises equivalent stress for plane stress, where all shear stresses are 0
+
+    Args:
+        principal_stress_1 (float): Principal stress
+        principal_stress_2 (float): Principal stress
+
+    Returns:
+        float: Von Mises stress, in the units of the principal stresses
+    """
+    return np.sqrt(
+        principal_stress_1**2
+        + principal_stress_2**2
+        - principal_stress_1 * principal_stress_2
+    )
+
+
+def get_summary(
+    id_0,
+    id_1,
+    od_0,
+    od_1,
+    length,
+    inner_youngs_modulus,
+    inner_poissons_ratio,
+    outer_youngs_modulus,
+    outer_poissons_ratio,
+    friction_coefficient=DEFAULT_FRICTION_COEFFICIENT,
+):
+    """Gets the analytical equivalent of PressFitModel.get_summary, with the holding capacity
+    of the fit. Peak stresses are those on the internal diameter of each part, and deflections
+    are those of the internal diameter of the inner part and outer diameter of the outer part,
+    as in the finite element summary. Arguments may be floats or numpy arrays of equal shape, so
+    that many designs are evaluated at once.
+
+    Args:
+        id_0 (float): Internal diameter of inner part (m), 0 for a solid shaft
+        id_1 (float): Internal diameter of outer part (m)
+        od_0 (float): Outer diameter of inner part (m)
+        od_1 (float): Outer diameter of outer part (m)
+        length (float): Contact length (m)
+        inner_youngs_modulus (float): Young's modulus of the inner part (Pa)
+        inner_poissons_ratio (float): Poisson's ratio of the inner part
+        outer_youngs_modulus (float): Young's modulus of the outer part (Pa)
+        outer_poissons_ratio (float): Poisson's ratio of the outer part
+        friction_coefficient (float, optional): Coefficient of friction between the parts. Defaults to DEFAULT_FRICTION_COEFFICIENT.
+
+    Returns:
+        dict: Contact pressure and maximum stresses (MPa), radial deflections (m), and the axial
+            force (N) and torque (N m) the fit holds
+    """
+    id_0 = np.asarray(id_0, dtype=float)
+    pressure = get_contact_pressure(
+        id_0,
+        id_1,
+        od_0,
+        od_1,
+        inner_youngs_modulus,
+        inner_poissons_ratio,
+        outer_youngs_modulus,
+        outer_poissons_ratio,
+    )
+    radius = (od_0 + id_1) / 4
+    radius_2 = radius**2
+    inner_radius = id_0 / 2
+    outer_radius = od_1 / 2
+
+    # EQ 3-49 of Shigley's on the free surfaces, where the radial stress is 0. A solid shaft
+    # is under uniform compression instead, EQ 3-58.
+    is_hollow = inner_radius > 0
+    inner_tangential_stress = np.where(
+        is_hollow, -2 * pressure * radius_2 / (radius_2 - inner_radius**2), -pressure
+    )
+    inner_radial_stress = np.where(is_hollow, 0.0, -pressure)
+    outer_free_tangential_stress = (
+        2 * pressure * radius_2 / (outer_radius**2 - radius_2)
+    )
+    # The outer part peaks on its internal diameter, under the contact pressure
+    outer_tangential_stress = (
+        pressure * (outer_radius**2 + radius_2) / (outer_radius**2 - radius_2)
+    )
+
+    holding_force = friction_coefficient * pressure * 2 * np.pi * radius * length
+
+    return {
+        "contact_pressure": pressure * 1e-6,
+        "max_inner_vm_stress": get_von_mises_stress(
+            inner_tangential_stress, inner_radial_stress
+        )
+        * 1e-6,
+        "max_outer_vm_stress": get_von_mises_stress(outer_tangential_stress, -pressure)
+        * 1e-6,
+        # Hooke's law in plane stress, u = r (σt - ν σr) / E, with σr = 0 on free surfaces
+        "inner_radial_deflection": np.abs(
+            inner_radius / inner_youngs_modulus * inner_tangential_stress
+        ),
+        "outer_radial_deflection": outer_radius
+        / outer_youngs_modulus
+        * outer_free_tangential_stress,
+        "holding_force": holding_force,
+        "holding_torque": holding_force * radius,
+    }
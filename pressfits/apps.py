@@ -1,6 +1,16 @@
 from django.apps import AppConfig
+from django.conf import settings
 
 
 class PressfitsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "pressfits"
+
+    def ready(self):
+        from pressfits import (  # noqa: F401 Records stage metrics
+            instrumentation, metrics)
+
+        instrumentation.configure(
+            trace_memory=settings.PRESSFITS_TRACE_MEMORY,
+            profile_directory=settings.PRESSFITS_PROFILE_DIRECTORY,
+        )
@@ -0,0 +1,172 @@
+import subprocess
+from collections import namedtuple
+
+from pressfits.concentric_axisymmetric_mesh import ConcentricAxisymmetricMesh
+from pressfits.concentric_mesh import get_step_inp_str
+from pressfits.instrumentation import RunRecorder, instrumented
+from pressfits.model import (MESH_LOCK, AxisymmetricPressFitModel,
+                             PressFitModel, reset_mesh_ids)
+
+# Dimensions (m), materials and mesh density of one press fit of a batch
+BatchCase = namedtuple(
+    "BatchCase",
+    "id_0 id_1 od_0 od_1 len_0 len_1 inner_material outer_material lines_per_part",
+    defaults=(None,),
+)
+
+_EDGE_COUNT = 8  # Node id lists l_0 to l_7 of each mesh
+
+
+def get_case_prefix(index):
+    """Gets the prefix of the set, surface, material and interaction names of a case of a batch
+
+    Args:
+        index (int): Index of the case in the batch
+
+    Returns:
+        String: Prefix
+    """
+    return f"C{index}_"
+
+
+class BatchMesh:
+    """Stands in for a ConcentricMesh made up of the meshes of every case of a batch, whose
+    node and element ids follow on from each other"""
+
+    def __init__(self, meshes):
+        self.meshes = meshes
+        self.element_inp_name = meshes[0].element_inp_name
+
+    def get_nodes(self):
+        return [node for mesh in self.meshes for node in mesh.get_nodes()]
+
+    def get_elements(self):
+        return [element for mesh in self.meshes for element in mesh.get_elements()]
+
+    @instrumented("inp_string")
+    def get_inp_str(self, materials, increments=1):
+        """Converts every mesh into a single .inp file for CCX as a string. Each mesh has its own
+        sets, surfaces, materials and contact pair, named with the prefix of its case, and all
+        are solved in one step.
+
+        Args:
+            materials (list((Material, Material))): Inner and outer material of each mesh
+            increments (int, optional): Number of fixed increments the interference is ramped
+                over. Defaults to 1.
+
+        Returns:
+            String: .inp representation of the meshes
+        """
+        string = ""
+        boundaries = ""
+        for i, (mesh, (material_inner, material_outer)) in enumerate(
+            zip(self.meshes, materials)
+        ):
+            prefix = get_case_prefix(i)
+            string += mesh.get_definition_inp_str(prefix)
+            string += mesh.get_interaction_inp_str(
+                material_inner, material_outer, prefix
+            )
+            boundaries += mesh.get_boundaries_inp(prefix)
+
+        return string + get_step_inp_str(boundaries, increments)
+
+
+class BatchPressFitModel(PressFitModel):
+    """Solves many independent axisymmetric press fits in one ccx run, as starting ccx and
+    setting up its files dominates the solve time of small meshes. Results are read as for a
+    single model, then split gives a model of each case."""
+
+    def __init__(self, cases, name):
+        """Meshes every case, one after another so that their ids are disjoint
+
+        Args:
+            cases (list(BatchCase)): Press fits to solve
+            name (String): Name of the batch, including the directory its files are written to
+        """
+        recorder = RunRecorder(name)
+        with MESH_LOCK:
+            reset_mesh_ids()
+            with recorder.stage("mesh", cases=len(cases)):
+                meshes = [
+                    ConcentricAxisymmetricMesh(
+                        case.id_0,
+                        case.id_1,
+                        case.od_0,
+                        case.od_1,
+                        case.len_0,
+                        case.len_1,
+                        lines_per_part=case.lines_per_part,
+                    )
+                    for case in cases
+                ]
+
+            mesh = BatchMesh(meshes)
+            mesh.recorder = recorder
+            super().__init__(mesh, name)
+
+        self.cases = list(cases)
+
+    @instrumented("run_model")
+    def run_model(self, increments=1):
+        """Creates an input file of every case and solves them together
+
+        Args:
+            increments (int, optional): Number of increments to ramp the interference over. Defaults to 1.
+
+        Raises:
+            subprocess.CalledProcessError: If ccx exits with a non-zero return code
+        """
+        self._create_input_file(increments)
+
+        with self.recorder.stage("ccx"):
+            subprocess.check_call(f"ccx {self.name}", shell=True)
+
+    @instrumented("deck")
+    def _create_input_file(self, increments=1):
+        """Creates a .inp file of every case"""
+        self.inp_str = self.mesh.get_inp_str(
+            [(case.inner_material, case.outer_material) for case in self.cases],
+            increments,
+        )
+        with open(f"{self.name}.inp", "w") as f:
+            self.recorder.add(bytes_written=f.write(self.inp_str))
+
+    def split(self):
+        """Splits the batch into a model of each case, with the results read for the batch. Ids
+        are renumbered from 1 as if each case had been solved alone, so the batch model should
+        not be used afterwards.
+
+        Returns:
+            list(AxisymmetricPressFitModel): Model of each case, in order
+        """
+        models = []
+        node_offset = 0
+        element_offset = 0
+
+        with MESH_LOCK:
+            for i, mesh in enumerate(self.mesh.meshes):
+                nodes = mesh.get_nodes()
+                elements = mesh.get_elements()
+
+                for node in nodes:
+                    node.id -= node_offset
+                for element in elements:
+                    element.id -= element_offset
+                for edge in range(_EDGE_COUNT):
+                    node_ids = getattr(mesh, f"l_{edge}")
+                    setattr(
+                        mesh,
+                        f"l_{edge}",
+                        [node_id - node_offset for node_id in node_ids],
+                    )
+
+                model = AxisymmetricPressFitModel.__new__(AxisymmetricPressFitModel)
+                PressFitModel.__init__(model, mesh, f"{self.name}_{i}")
+                model.step_times = dict(self.step_times)
+                models.append(model)
+
+                node_offset += len(nodes)
+                element_offset += len(elements)
+
+        return models
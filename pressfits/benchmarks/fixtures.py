@@ -0,0 +1,334 @@
+import argparse
+import os
+from time import perf_counter
+
+import numpy as np
+
+# Number of integration points of each ccx element type
+_INTEGRATION_POINTS = {"CAX8": 9, "CPE8": 9, "CAX8R": 4, "CPE8R": 4}
+_FRD_ELEMENT_TYPE = 10  # 8 node quadrilateral
+_CHUNK_ROWS = 16384  # Rows formatted at once, bounding memory use for very large meshes
+# Smaller magnitudes are written as zero, as %12.5E would overflow its field with a three digit exponent
+_SMALLEST_VALUE = 1e-99
+
+# Name, component names and frd component type of each nodal result block, in the order ccx writes them
+_FRD_BLOCKS = (
+    ("DISP", ("D1", "D2", "D3"), 2),
+    ("STRESS", ("SXX", "SYY", "SZZ", "SXY", "SYZ", "SZX"), 4),
+    ("TOSTRAIN", ("EXX", "EYY", "EZZ", "EXY", "EYZ", "EZX"), 4),
+    ("FORC", ("F1", "F2", "F3"), 2),
+    ("CONTACT", ("COPEN", "CSLIP1", "CSLIP2", "CPRESS", "CSHEAR1", "CSHEAR2"), 1),
+)
+# Row and column of each component of symmetric tensor blocks
+_TENSOR_INDICES = ((1, 1), (2, 2), (3, 3), (1, 2), (2, 3), (3, 1))
+
+
+def write_frd(mesh, path, steps=1):
+    """Writes plausible nodal results for every node of a mesh in the ccx .frd format, so that
+    results can be parsed without solving. Results of each step are those of a load ramped
+    linearly to full at the last step, with keys 101, 102 and so on as written by ccx. Lines
+    are formatted in chunks, so memory use does not grow with the size of the mesh beyond
+    that of the mesh itself.
+
+    Args:
+        mesh (ConcentricMesh): The mesh to write results for
+        path (String): Path of the .frd file
+        steps (int, optional): Number of increments of results. Defaults to 1.
+
+    Returns:
+        int: Number of bytes written
+    """
+    nodes = mesh.get_nodes()
+    elements = mesh.get_elements()
+    node_ids = np.fromiter((node.id for node in nodes), np.int64, len(nodes))
+    coordinates = np.array([(node.x, node.y) for node in nodes]).reshape(-1, 2)
+    parts = np.fromiter((node.part for node in nodes), np.int64, len(nodes))
+    radii = _get_radii(mesh, coordinates)
+    radii /= radii.max()
+
+    written = 0
+    with open(path, "w") as f:
+        written += f.write("    1C\n    1UPGM               CalculiX\n")
+
+        written += f.write(_frd_set_header(2, len(nodes)))
+        written += _write_rows(
+            f,
+            " -1%10d%12.5E%12.5E%12.5E\n",
+            node_ids,
+            np.column_stack([coordinates, np.zeros(len(nodes))]),
+        )
+        written += f.write(" -3\n")
+
+        written += f.write(_frd_set_header(3, len(elements)))
+        element_rows = np.array(
+            [
+                [element.id, _FRD_ELEMENT_TYPE, 0, element.get_part() + 1]
+                + element.get_ids()
+                for element in elements
+            ],
+            dtype=np.int64,
+        ).reshape(-1, 12)
+        written += _write_rows(
+            f,
+            " -1%10d%5d%5d%5d\n -2" + "%10d" * 8 + "\n",
+            element_rows[:, 0],
+            element_rows[:, 1:],
+        )
+        written += f.write(" -3\n")
+
+        block_number = 1
+        for step in range(1, steps + 1):
+            load = step / steps
+            for name, components, component_type in _FRD_BLOCKS:
+                written += f.write(
+                    _frd_block_header(
+                        block_number,
+                        100 + step,
+                        load,
+                        len(nodes),
+                        name,
+                        components,
+                        component_type,
+                    )
+                )
+                written += _write_rows(
+                    f,
+                    " -1%10d" + "%12.5E" * len(components) + "\n",
+                    node_ids,
+                    load * get_nodal_values(name, radii, parts),
+                )
+                written += f.write(" -3\n")
+                block_number += 1
+
+        written += f.write("9999\n")
+
+    return written
+
+
+def write_dat(mesh, path, steps=1):
+    """Writes plausible integration point stresses for every element of a mesh in the ccx .dat
+    format, so that results can be parsed without solving. Stresses of each step are those of a
+    load ramped linearly to full at the last step.
+
+    Args:
+        mesh (ConcentricMesh): The mesh to write results for
+        path (String): Path of the .dat file
+        steps (int, optional): Number of increments of results. Defaults to 1.
+
+    Returns:
+        int: Number of bytes written
+    """
+    elements = mesh.get_elements()
+    points = _INTEGRATION_POINTS.get(mesh.element_inp_name, 9)
+
+    element_ids = np.repeat(
+        np.fromiter((element.id for element in elements), np.int64, len(elements)),
+        points,
+    )
+    point_numbers = np.tile(np.arange(1, points + 1), len(elements))
+    radii = np.repeat(
+        np.fromiter(
+            (element.get_radius() for element in elements), float, len(elements)
+        ),
+        points,
+    )
+    stresses = np.column_stack(
+        [
+            -1e8 * radii,
+            2e7 - point_numbers * 1e5,
+            3e9 * radii + point_numbers,
+            -1e5 * point_numbers,
+            np.zeros(len(radii)),
+            np.zeros(len(radii)),
+        ]
+    )
+
+    written = 0
+    with open(path, "w") as f:
+        written += f.write("\n                        S T E P       1\n\n")
+        for step in range(1, steps + 1):
+            load = step / steps
+            written += f.write(
+                f"\n                                INCREMENT{step:6d}\n\n"
+                f" stresses (elem, integ.pnt.,sxx,syy,szz,sxy,sxz,syz) for set EALL and time {load:14.7E}\n\n"
+            )
+            written += _write_rows(
+                f,
+                "%10d%4d" + "%14.6E" * 6 + "\n",
+                element_ids,
+                np.column_stack([point_numbers, load * stresses]),
+            )
+
+    return written
+
+
+def get_nodal_values(name, radii, parts):
+    """Gets plausible values of a nodal result block at full load, varying smoothly with radius
+
+    Args:
+        name (String): Name of the result block
+        radii (np.ndarray): (n,) radius of each node relative to the largest radius of the mesh
+        parts (np.ndarray): (n,) part number of each node
+
+    Raises:
+        ValueError: If the name is not that of a result block
+
+    Returns:
+        np.ndarray: (n, c) values of each component
+    """
+    r = radii
+    zero = np.zeros(len(r))
+
+    if name == "DISP":
+        columns = (1e-5 * r, -2e-6 * r, zero)
+    elif name == "STRESS":
+        columns = (-1e8 * r, 2e7 * r, 3e8 * (1 - r), -1e6 * r, zero, zero)
+    elif name == "TOSTRAIN":
+        columns = (-5e-4 * r, 1e-4 * r, 1.5e-3 * (1 - r), -5e-6 * r, zero, zero)
+    elif name == "FORC":
+        columns = (-1e2 * r, 1e1 * r, zero)
+    elif name == "CONTACT":
+        columns = (
+            -1e-6 * r,
+            zero,
+            zero,
+            np.where(parts == 0, 5e7 * r, 0.0),
+            zero,
+            zero,
+        )
+    else:
+        raise ValueError(f"Unrecognized result block: {name}")
+
+    return np.column_stack(columns)
+
+
+def _get_radii(mesh, coordinates):
+    """Gets the radial coordinate of each node of a mesh
+
+    Args:
+        mesh (ConcentricMesh): The mesh
+        coordinates (np.ndarray): (n, 2) coordinates of its nodes
+
+    Returns:
+        np.ndarray: (n,) radius of each node
+    """
+    if mesh.element_inp_name.startswith("CAX"):
+        return coordinates[:, 0].copy()  # x is radial in axisymmetric meshes
+
+    return np.hypot(coordinates[:, 0], coordinates[:, 1])
+
+
+def _frd_set_header(set_type, count):
+    return f"{set_type:5d}C{'':18}{count:12d}{'':37}1\n"
+
+
+def _frd_block_header(block_number, key, load, count, name, components, component_type):
+    """Gets the lines starting a nodal result block, before the values of each node
+
+    Args:
+        block_number (int): Number of the block in the file, from 1
+        key (int): Step key of the results
+        load (float): Time of the step
+        count (int): Number of nodes with values
+        name (String): Name of the result block
+        components (tuple(String)): Names of the components
+        component_type (int): ccx type of the components
+
+    Returns:
+        String: Header lines
+    """
+    has_all = component_type == 2  # Vectors are followed by their magnitude
+    lines = [
+        f"    1PSTEP{block_number:26d}{1:12d}{1:12d}\n",
+        f"  100CL{key:5d}{load:12.9f}{count:12d}{0:22d}{1:5d}{1:12d}\n",
+        f" -4  {name:<8}{len(components) + has_all:5d}{1:5d}\n",
+    ]
+    for i, component in enumerate(components):
+        row, column = _TENSOR_INDICES[i] if component_type == 4 else (i + 1, 0)
+        lines.append(
+            f" -5  {component:<8}{1:5d}{component_type:5d}{row:5d}{column:5d}\n"
+        )
+    if has_all:
+        lines.append(f" -5  {'ALL':<8}{1:5d}{2:5d}{0:5d}{0:5d}{1:5d}ALL\n")
+
+    return "".join(lines)
+
+
+def _write_rows(f, row_format, ids, values):
+    """Writes fixed width rows of an id and values, formatting a chunk of rows at a time
+
+    Args:
+        f (file): File to write to
+        row_format (String): printf style format of a row, starting with the id
+        ids (np.ndarray): (n,) id of each row
+        values (np.ndarray): (n, c) values of each row
+
+    Returns:
+        int: Number of bytes written
+    """
+    written = 0
+    for start in range(0, len(ids), _CHUNK_ROWS):
+        chunk = np.column_stack(
+            [ids[start : start + _CHUNK_ROWS], values[start : start + _CHUNK_ROWS]]
+        )
+        chunk[np.abs(chunk) < _SMALLEST_VALUE] = 0.0
+        # Integer columns are formatted with %d, which accepts whole floats
+        written += f.write((row_format * len(chunk)) % tuple(chunk.ravel().tolist()))
+
+    return written
+
+
+def main():
+    from pressfits.concentric_axisymmetric_mesh import ConcentricAxisymmetricMesh
+    from pressfits.model import PressFitModel
+
+    parser = argparse.ArgumentParser(
+        description="Write synthetic .frd and .dat results of an axisymmetric mesh"
+    )
+    parser.add_argument("name", help="Path of the files to write, without extension")
+    parser.add_argument("--lines", type=int, default=100, help="Lines per part")
+    parser.add_argument("--length", type=float, default=0.05, help="Tube length (m)")
+    parser.add_argument("--steps", type=int, default=1)
+    parser.add_argument(
+        "--parse", action="store_true", help="Time parsing the written files"
+    )
+    args = parser.parse_args()
+
+    start = perf_counter()
+    # Untiled, so that the mesh spans the full length and grows with it
+    mesh = ConcentricAxisymmetricMesh(
+        0.02,
+        0.03,
+        0.0301,
+        0.05,
+        args.length,
+        args.length,
+        lines_per_part=args.lines,
+        should_tile=False,
+    )
+    print(
+        f"Meshed {len(mesh.get_nodes())} nodes and {len(mesh.get_elements())} elements "
+        f"in {perf_counter() - start:.2f}s"
+    )
+
+    directory = os.path.dirname(args.name)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    for extension, write in (("frd", write_frd), ("dat", write_dat)):
+        start = perf_counter()
+        written = write(mesh, f"{args.name}.{extension}", args.steps)
+        print(
+            f"Wrote {written / 2**20:.1f} MiB to {args.name}.{extension} "
+            f"in {perf_counter() - start:.2f}s"
+        )
+
+    if args.parse:
+        model = PressFitModel(mesh, args.name)
+        for stage in ("read_nodal_results", "read_element_results"):
+            start = perf_counter()
+            getattr(model, stage)()
+            print(f"{stage} took {perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
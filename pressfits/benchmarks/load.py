@@ -0,0 +1,392 @@
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from time import perf_counter, sleep
+
+import numpy as np
+
+from pressfits.benchmarks.fixtures import write_dat, write_frd
+from pressfits.benchmarks.stages import get_environment
+from pressfits.instrumentation import instrumented
+from pressfits.metrics import STAGE_DURATION
+from pressfits.model import PressFitModel
+
+REPORT_VERSION = 1
+
+# Kinds of request in a mix: one of a few popular designs, solved once then served from the
+# job store, a design not requested before, and malformed or physically impossible inputs
+REPEAT = "repeat"
+SWEEP = "sweep"
+INVALID = "invalid"
+KINDS = (REPEAT, SWEEP, INVALID)
+
+ENDPOINTS = ("/press", "/press/async")
+
+# Status codes each kind of request should be answered with. 429s are counted separately.
+_EXPECTED_STATUSES = {REPEAT: (200,), SWEEP: (200,), INVALID: (400,)}
+_POPULAR_INNER_DIAMETERS = (30.05, 30.1, 30.15, 30.2)  # mm
+
+
+def get_request_data(inner_od=30.1, contact_length=15):
+    """Gets the body of a /press request for a steel shaft pressed into an aluminium hub
+
+    Args:
+        inner_od (float, optional): Outer diameter of the inner part (mm). Defaults to 30.1.
+        contact_length (float, optional): Contact length (mm). Defaults to 15.
+
+    Returns:
+        dict: Request body
+    """
+    return {
+        "frictionCoefficient": 0.2,
+        "contactLength": contact_length,
+        "innerPart": {
+            "innerDiameter": 20,
+            "outerDiameter": inner_od,
+            "youngsModulus": 210,
+            "poissonsRatio": 0.3,
+        },
+        "outerPart": {
+            "innerDiameter": 30,
+            "outerDiameter": 50,
+            "youngsModulus": 68.9,
+            "poissonsRatio": 0.33,
+        },
+    }
+
+
+def generate_requests(count, mix, seed=0):
+    """Generates a reproducible sequence of requests
+
+    Args:
+        count (int): Number of requests
+        mix (dict(String, float)): Relative frequency of each kind of request, from KINDS
+        seed (int, optional): Seed of the random choices. Defaults to 0.
+
+    Returns:
+        list((String, dict)): Kind and body of each request
+    """
+    generator = random.Random(seed)
+    kinds = list(mix)
+    weights = [mix[kind] for kind in kinds]
+
+    requests = []
+    sweep_count = 0
+    for kind in generator.choices(kinds, weights, k=count):
+        if kind == REPEAT:
+            data = get_request_data(generator.choice(_POPULAR_INNER_DIAMETERS))
+        elif kind == SWEEP:
+            # Sweeps step the interference, and the contact length once per hundred designs
+            sweep_count += 1
+            data = get_request_data(
+                30.01 + 0.002 * (sweep_count % 100), 10 + sweep_count // 100
+            )
+        else:
+            data = get_request_data()
+            error = generator.randrange(4)
+            if error == 0:
+                data["innerPart"]["innerDiameter"] = -20
+            elif error == 1:
+                del data["outerPart"]["youngsModulus"]
+            elif error == 2:
+                data["contactLength"] = "fifteen"
+            else:
+                # Smaller than its inner diameter
+                data["outerPart"]["outerDiameter"] = 25
+        requests.append((kind, data))
+
+    return requests
+
+
+@contextmanager
+def stand_in_solver(solve_seconds=0.05, jitter=0.5, seed=0):
+    """Replaces ccx while in use. The deck is written as usual, then the solve sleeps, as a ccx
+    subprocess would without holding the GIL, and synthetic .frd and .dat results of the mesh are
+    written for the real parsers to read.
+
+    Args:
+        solve_seconds (float, optional): Mean duration of a solve. Defaults to 0.05.
+        jitter (float, optional): Largest relative deviation of a solve from the mean. Defaults to 0.5.
+        seed (int, optional): Seed of the solve durations. Defaults to 0.
+    """
+    generator = random.Random(seed)
+    lock = threading.Lock()
+
+    def get_solve_seconds():
+        with lock:
+            return solve_seconds * (1 + jitter * (2 * generator.random() - 1))
+
+    def write_results(model, increments):
+        write_frd(model.mesh, f"{model.name}.frd", increments)
+        write_dat(model.mesh, f"{model.name}.dat", increments)
+
+    @instrumented("run_model")
+    def run_model(model, inner_material, outer_material, increments=1):
+        model._create_input_file(inner_material, outer_material, increments)
+        with model.recorder.stage("ccx"):
+            sleep(get_solve_seconds())
+            write_results(model, increments)
+
+    @instrumented("run_model")
+    async def run_model_async(model, inner_material, outer_material, increments=1):
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(
+            None, model._create_input_file, inner_material, outer_material, increments
+        )
+        with model.recorder.stage("ccx"):
+            await asyncio.sleep(get_solve_seconds())
+            await loop.run_in_executor(None, write_results, model, increments)
+
+    original = PressFitModel.run_model, PressFitModel.run_model_async
+    PressFitModel.run_model = run_model
+    PressFitModel.run_model_async = run_model_async
+    try:
+        yield
+    finally:
+        PressFitModel.run_model, PressFitModel.run_model_async = original
+
+
+def get_stage_totals():
+    """Gets the number and total duration of every stage observed so far
+
+    Returns:
+        dict(String, (int, float)): Count and total seconds of each stage
+    """
+    totals = {}
+    for name, labels, value in STAGE_DURATION.get_samples():
+        count, seconds = totals.get(labels["stage"], (0, 0.0))
+        if name.endswith("_count"):
+            count = value
+        elif name.endswith("_sum"):
+            seconds = value
+        totals[labels["stage"]] = (count, seconds)
+
+    return totals
+
+
+def run_level(endpoint, requests, concurrency):
+    """Sends requests to the app in process, with a number of requests in flight at once
+
+    Args:
+        endpoint (String): Path to post to, from ENDPOINTS
+        requests (list((String, dict))): Kind and body of each request
+        concurrency (int): Number of requests in flight at once
+
+    Returns:
+        dict: Throughput, latency percentiles, statuses, error rate and stage breakdown
+    """
+    from django.test import Client
+
+    local = threading.local()
+
+    def send(request):
+        kind, data = request
+        if not hasattr(local, "client"):
+            local.client = Client(raise_request_exception=False)
+
+        start = perf_counter()
+        response = local.client.post(
+            endpoint, json.dumps(data), content_type="application/json"
+        )
+        return kind, response.status_code, perf_counter() - start
+
+    stages_before = get_stage_totals()
+    start = perf_counter()
+    with ThreadPoolExecutor(concurrency) as executor:
+        results = list(executor.map(send, requests))
+    seconds = perf_counter() - start
+
+    stages = {}
+    for stage, (count, total) in get_stage_totals().items():
+        count_before, total_before = stages_before.get(stage, (0, 0.0))
+        if count > count_before:
+            stages[stage] = {
+                "count": count - count_before,
+                "mean_seconds": (total - total_before) / (count - count_before),
+                "total_seconds": total - total_before,
+            }
+
+    statuses = {}
+    for _, status, _ in results:
+        statuses[str(status)] = statuses.get(str(status), 0) + 1
+    errors = sum(
+        status not in _EXPECTED_STATUSES[kind] and status != 429
+        for kind, status, _ in results
+    )
+
+    return {
+        "concurrency": concurrency,
+        "requests": len(results),
+        "seconds": seconds,
+        "throughput": len(results) / seconds,
+        "latency": get_latency_percentiles([latency for _, _, latency in results]),
+        "latency_by_kind": {
+            kind: get_latency_percentiles(
+                [latency for other, _, latency in results if other == kind]
+            )
+            for kind in KINDS
+            if any(other == kind for other, _, _ in results)
+        },
+        "statuses": statuses,
+        "errors": errors,
+        "error_rate": errors / len(results),
+        "rejected": statuses.get("429", 0),
+        "stages": stages,
+    }
+
+
+def get_latency_percentiles(latencies):
+    """Gets percentiles of request latencies
+
+    Args:
+        latencies (list(float)): Latency of each request (s)
+
+    Returns:
+        dict: Mean, 50th, 90th and 99th percentile and maximum latency (s)
+    """
+    p50, p90, p99 = np.percentile(latencies, (50, 90, 99))
+    return {
+        "mean": float(np.mean(latencies)),
+        "p50": float(p50),
+        "p90": float(p90),
+        "p99": float(p99),
+        "max": float(np.max(latencies)),
+    }
+
+
+def run_load_test(
+    endpoint="/press",
+    concurrency=(1, 4, 16),
+    requests=200,
+    mix=None,
+    solve_seconds=0.05,
+    workers=None,
+    seed=0,
+):
+    """Replays a request mix against the app with a stand-in solver at each concurrency level.
+    Each level starts with an empty job store, so repeated designs are solved once per level.
+
+    Args:
+        endpoint (String, optional): Path to post to, from ENDPOINTS. Defaults to "/press".
+        concurrency (tuple(int), optional): Numbers of requests in flight at once. Defaults to (1, 4, 16).
+        requests (int, optional): Number of requests sent at each level. Defaults to 200.
+        mix (dict(String, float), optional): Relative frequency of each kind of request. Defaults to
+            half repeats, 40% sweeps and 10% invalid requests.
+        solve_seconds (float, optional): Mean duration of a stand-in solve. Defaults to 0.05.
+        workers (int, optional): Solves run at once. Defaults to the PRESSFITS_MAX_CONCURRENT_SOLVES setting.
+        seed (int, optional): Seed of the request mix and solve durations. Defaults to 0.
+
+    Returns:
+        dict: Report of the settings and each level
+    """
+    from django.conf import settings
+    from django.test import override_settings
+
+    from pressfits import views
+
+    if mix is None:
+        mix = {REPEAT: 0.5, SWEEP: 0.4, INVALID: 0.1}
+    if workers is None:
+        workers = settings.PRESSFITS_MAX_CONCURRENT_SOLVES
+    request_list = generate_requests(requests, mix, seed)
+
+    levels = []
+    with stand_in_solver(solve_seconds, seed=seed):
+        for level_concurrency in concurrency:
+            with tempfile.TemporaryDirectory() as directory, override_settings(
+                ALLOWED_HOSTS=["testserver"],
+                PRESSFITS_JOB_DIRECTORY=os.path.join(directory, "jobs"),
+                PRESSFITS_WORK_DIRECTORY=directory,
+                PRESSFITS_EXPORT_DIRECTORY=None,
+                PRESSFITS_MAX_CONCURRENT_SOLVES=workers,
+            ):
+                views._job_store = None
+                views._scheduler = None
+                try:
+                    levels.append(run_level(endpoint, request_list, level_concurrency))
+                finally:
+                    views._job_store = None
+                    views._scheduler = None
+
+    return {
+        "version": REPORT_VERSION,
+        "created": datetime.now(timezone.utc).isoformat(),
+        "environment": get_environment(),
+        "endpoint": endpoint,
+        "mix": mix,
+        "solve_seconds": solve_seconds,
+        "workers": workers,
+        "levels": levels,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Load test the /press endpoints in process with a stand-in solver"
+    )
+    parser.add_argument("--endpoint", choices=ENDPOINTS, default="/press")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--repeat", type=float, default=0.5)
+    parser.add_argument("--sweep", type=float, default=0.4)
+    parser.add_argument("--invalid", type=float, default=0.1)
+    parser.add_argument("--solve-seconds", type=float, default=0.05)
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--output", default="load_test.json", help="Path of the JSON report"
+    )
+    args = parser.parse_args()
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "server.settings")
+    import django
+
+    django.setup()
+    # Invalid requests in the mix are expected, so only server errors are logged
+    logging.getLogger("django.request").setLevel(logging.ERROR)
+
+    report = run_load_test(
+        args.endpoint,
+        args.concurrency,
+        args.requests,
+        {REPEAT: args.repeat, SWEEP: args.sweep, INVALID: args.invalid},
+        args.solve_seconds,
+        args.workers,
+        args.seed,
+    )
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+
+    print(
+        f"{'concurrency':>12}{'req/s':>10}{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}"
+        f"{'errors':>8}{'429s':>6}{'solves':>8}"
+    )
+    for level in report["levels"]:
+        latency = level["latency"]
+        print(
+            f"{level['concurrency']:>12}{level['throughput']:>10.1f}"
+            f"{latency['p50'] * 1000:>10.1f}{latency['p90'] * 1000:>10.1f}"
+            f"{latency['p99'] * 1000:>10.1f}{level['errors']:>8}{level['rejected']:>6}"
+            f"{level['stages'].get('run_model', {}).get('count', 0):>8}"
+        )
+
+    for level in report["levels"]:
+        print(f"\nStages at concurrency {level['concurrency']}:")
+        for stage, values in sorted(
+            level["stages"].items(), key=lambda item: -item[1]["total_seconds"]
+        ):
+            print(
+                f"  {stage:<34}{values['count']:>6} x {values['mean_seconds'] * 1000:>8.2f} ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
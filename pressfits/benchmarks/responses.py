@@ -0,0 +1,151 @@
+import argparse
+import os
+from time import perf_counter
+
+from pressfits.model import AxisymmetricPressFitModel, Material
+from pressfits.results import Contact, Displacement, Result, Stress
+from pressfits.transport import (
+    compress,
+    encode_arrays,
+    encode_json,
+    get_model_array_lists,
+    get_model_arrays,
+)
+
+
+def populate_results(model, key=101):
+    """Assigns plausible results to every node and element of a model, without solving it
+
+    Args:
+        model (PressFitModel): The model to populate
+        key (int, optional): Step to add results for. Defaults to 101.
+    """
+    for node in model.nodes:
+        node.results[key] = Result()
+        node.results[key].add_displacement(Displacement(node.x * 1e-3, 0.0, 0.0))
+        node.results[key].add_contact_pressure(
+            Contact(0.0, 0.0, 0.0, 5e7 if node.part == 0 else 0.0, 0.0, 0.0)
+        )
+
+    for element in model.elements:
+        radius = element.get_radius()
+        element.results = [
+            Stress(-1e8 * radius, 2e7, 3e9 * radius + i, 1e5, 0.0, 0.0)
+            for i in range(9)
+        ]
+
+
+def time_call(function, repeats):
+    """Times a function
+
+    Args:
+        function (callable): Function taking no arguments
+        repeats (int): Number of times to call the function
+
+    Returns:
+        (float, object): Mean time per call in seconds and the result of the last call
+    """
+    start = perf_counter()
+    for _ in range(repeats):
+        result = function()
+    return (perf_counter() - start) / repeats, result
+
+
+def benchmark_responses(lines_per_part, repeats=5):
+    """Times serialization of each /press response format for a synthetic model
+
+    Args:
+        lines_per_part (int): Mesh density of the model
+        repeats (int, optional): Number of times to time each format. Defaults to 5.
+
+    Returns:
+        list(dict): Time, size and compressed sizes of each format
+    """
+    from rest_framework.renderers import JSONRenderer
+
+    from pressfits.serializers import PressSerializer
+
+    model = AxisymmetricPressFitModel(
+        0.02,
+        0.03,
+        0.0301,
+        0.05,
+        0.015,
+        0.015,
+        "Benchmark_Model",
+        lines_per_part=lines_per_part,
+    )
+    populate_results(model)
+    model.inp_str = model.mesh.get_inp_str(
+        Material("Steel", 2.1e11, 0.3), Material("Aluminium", 6.89e10, 0.33)
+    )
+
+    def summary_data():
+        return {
+            "mesh_string": model.inp_str,
+            "elemental_stresses": model.get_elemental_stresses_summary(),
+            "nodal_displacements": model.get_nodal_displacements_summary(),
+            "contact_pressure": model.max_contact_pressure(),
+        }
+
+    formats = {
+        "drf_serializer_json": lambda: JSONRenderer().render(
+            PressSerializer(summary_data()).data
+        ),
+        "fast_json": lambda: encode_json(summary_data()),
+        "fast_json_arrays": lambda: encode_json(get_model_array_lists(model)),
+        "binary_arrays": lambda: encode_arrays(get_model_arrays(model)),
+        "binary_arrays_quantized": lambda: encode_arrays(
+            get_model_arrays(model),
+            quantize=("elemental_stresses", "nodal_displacements"),
+        ),
+    }
+
+    report = []
+    for name, function in formats.items():
+        seconds, content = time_call(function, repeats)
+        gzip_seconds, gzip_content = time_call(
+            lambda: compress(content, "gzip", 5), repeats
+        )
+        report.append(
+            {
+                "format": name,
+                "lines_per_part": lines_per_part,
+                "nodes": len(model.nodes),
+                "seconds": seconds,
+                "bytes": len(content),
+                "gzip_seconds": gzip_seconds,
+                "gzip_bytes": len(gzip_content),
+            }
+        )
+
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark serialization of /press responses"
+    )
+    parser.add_argument("--lines", type=int, nargs="+", default=[13, 25, 49])
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "server.settings")
+    import django
+
+    django.setup()
+
+    print(
+        f"{'format':<26}{'lines':>6}{'nodes':>8}{'ms':>10}{'bytes':>12}{'gzip ms':>10}{'gzip bytes':>12}"
+    )
+    for lines_per_part in args.lines:
+        for row in benchmark_responses(lines_per_part, args.repeats):
+            print(
+                f"{row['format']:<26}{row['lines_per_part']:>6}{row['nodes']:>8}"
+                f"{row['seconds'] * 1000:>10.2f}{row['bytes']:>12}"
+                f"{row['gzip_seconds'] * 1000:>10.2f}{row['gzip_bytes']:>12}"
+            )
+
+
+if __name__ == "__main__":
+    main()
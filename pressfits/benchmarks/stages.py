@@ -0,0 +1,305 @@
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+from datetime import datetime, timezone
+
+import numpy as np
+
+from pressfits import instrumentation
+from pressfits.benchmarks.fixtures import write_dat, write_frd
+from pressfits.model import (
+    AxisymmetricPressFitModel,
+    Material,
+    PlaneStressPressFitModel,
+)
+
+REPORT_VERSION = 1
+
+AXISYMMETRIC = "axisymmetric"
+PLANE_STRESS = "plane_stress"
+MODELS = (AXISYMMETRIC, PLANE_STRESS)
+
+# Internal and outer diameters of the inner and outer tube of every benchmarked model
+_DIAMETERS = (0.02, 0.03, 0.0301, 0.05)
+_MATERIALS = (Material("Steel", 2.1e11, 0.3), Material("Aluminium", 6.89e10, 0.33))
+_SUMMARIES = (
+    "get_elemental_stresses_summary",
+    "get_nodal_displacements_summary",
+    "get_x_nodal_forces_summary",
+    "max_contact_pressure",
+    "max_element_vm_stress",
+    "get_radial_deflections",
+)
+
+
+def create_model(kind, name, lines_per_part=None, length=None):
+    """Creates a model to benchmark
+
+    Args:
+        kind (String): One of MODELS
+        name (String): Name of the model, including the directory its files are written to
+        lines_per_part (int, optional): Mesh density of axisymmetric models. Defaults to None.
+        length (float, optional): Length of both tubes of axisymmetric models. Defaults to None.
+
+    Returns:
+        PressFitModel: The model
+    """
+    if kind == PLANE_STRESS:
+        return PlaneStressPressFitModel(*_DIAMETERS, name)
+
+    return AxisymmetricPressFitModel(
+        *_DIAMETERS, length, length, name, lines_per_part=lines_per_part
+    )
+
+
+def run_stages(kind, name, lines_per_part=None, length=None):
+    """Meshes a model, writes its deck, parses the results in the .frd and .dat files of its name
+    and computes every summary, recording each as a stage
+
+    Args:
+        kind (String): One of MODELS
+        name (String): Name of the model, including the directory its files are written to
+        lines_per_part (int, optional): Mesh density of axisymmetric models. Defaults to None.
+        length (float, optional): Length of both tubes of axisymmetric models. Defaults to None.
+
+    Returns:
+        dict: Run record of the model
+    """
+    model = create_model(kind, name, lines_per_part, length)
+    model._create_input_file(*_MATERIALS)
+    model.read_nodal_results()
+    model.read_element_results()
+    for summary in _SUMMARIES:
+        getattr(model, summary)()
+
+    return model.emit_run_record()
+
+
+def benchmark_case(kind, directory, lines_per_part=None, length=None, repeats=3):
+    """Times every stage of a model over several runs, then records the peak memory of every
+    stage in a separate run, as tracing memory slows the stages down
+
+    Args:
+        kind (String): One of MODELS
+        directory (String): Directory to write the deck and result fixtures to
+        lines_per_part (int, optional): Mesh density of axisymmetric models. Defaults to None.
+        length (float, optional): Length of both tubes of axisymmetric models. Defaults to None.
+        repeats (int, optional): Number of timed runs. Defaults to 3.
+
+    Returns:
+        dict: Parameters and sizes of the model, and the timings and peak memory of each stage
+    """
+    name = os.path.join(directory, "Benchmark_Model")
+    mesh = create_model(kind, name, lines_per_part, length).mesh
+    frd_bytes = write_frd(mesh, f"{name}.frd")
+    dat_bytes = write_dat(mesh, f"{name}.dat")
+
+    timings = {}
+    for _ in range(repeats):
+        instrumentation.configure()
+        record = run_stages(kind, name, lines_per_part, length)
+        for stage in record["stages"]:
+            timings.setdefault(stage["stage"], []).append(stage["seconds"])
+
+    instrumentation.configure(trace_memory=True)
+    try:
+        memory_record = run_stages(kind, name, lines_per_part, length)
+    finally:
+        instrumentation.configure()
+
+    return {
+        "model": kind,
+        "lines_per_part": lines_per_part,
+        "length": length,
+        "node_count": memory_record["node_count"],
+        "element_count": memory_record["element_count"],
+        "inp_bytes": memory_record["bytes_written"],
+        "frd_bytes": frd_bytes,
+        "dat_bytes": dat_bytes,
+        "stages": {
+            stage["stage"]: {
+                "depth": stage["depth"],
+                "min": min(timings[stage["stage"]]),
+                "median": statistics.median(timings[stage["stage"]]),
+                "mean": statistics.fmean(timings[stage["stage"]]),
+                "peak_memory": stage["peak_memory"],
+            }
+            for stage in memory_record["stages"]
+        },
+    }
+
+
+def run_benchmarks(models=MODELS, lines=(13, 25, 49), lengths=(0.015, 0.05), repeats=3):
+    """Benchmarks every stage of a sweep of models. Plane stress meshes have a fixed density, so
+    are benchmarked once.
+
+    Args:
+        models (tuple(String), optional): Models to benchmark, from MODELS. Defaults to MODELS.
+        lines (tuple(int), optional): Mesh densities of axisymmetric models. Defaults to (13, 25, 49).
+        lengths (tuple(float), optional): Tube lengths of axisymmetric models. Defaults to (0.015, 0.05).
+        repeats (int, optional): Number of timed runs of each model. Defaults to 3.
+
+    Returns:
+        dict: Report of the environment and each benchmarked model
+    """
+    cases = []
+    with tempfile.TemporaryDirectory() as directory:
+        if AXISYMMETRIC in models:
+            for lines_per_part in lines:
+                for length in lengths:
+                    cases.append(
+                        benchmark_case(
+                            AXISYMMETRIC, directory, lines_per_part, length, repeats
+                        )
+                    )
+        if PLANE_STRESS in models:
+            cases.append(benchmark_case(PLANE_STRESS, directory, repeats=repeats))
+
+    return {
+        "version": REPORT_VERSION,
+        "created": datetime.now(timezone.utc).isoformat(),
+        "environment": get_environment(),
+        "repeats": repeats,
+        "cases": cases,
+    }
+
+
+def get_environment():
+    """Gets details of the machine and code being benchmarked
+
+    Returns:
+        dict: Python and numpy versions, platform, processor count and git commit
+    """
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=os.path.dirname(__file__),
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+        "commit": commit,
+    }
+
+
+def compare_reports(baseline, current, threshold=0.1, min_seconds=1e-3):
+    """Compares the median stage times and peak memory of two reports
+
+    Args:
+        baseline (dict): Earlier report
+        current (dict): Later report
+        threshold (float, optional): Relative increase counted as a regression. Defaults to 0.1.
+        min_seconds (float, optional): Smallest increase in time counted as a regression, as
+            very short stages are noisy. Defaults to 1e-3.
+
+    Returns:
+        list(dict): Change of each stage of each case in both reports, with whether it regressed
+    """
+
+    def case_key(case):
+        return case["model"], case["lines_per_part"], case["length"]
+
+    baseline_cases = {case_key(case): case for case in baseline["cases"]}
+
+    changes = []
+    for case in current["cases"]:
+        baseline_case = baseline_cases.get(case_key(case))
+        if baseline_case is None:
+            continue
+
+        for stage, values in case["stages"].items():
+            baseline_values = baseline_case["stages"].get(stage)
+            if baseline_values is None:
+                continue
+
+            time_ratio = values["median"] / max(baseline_values["median"], 1e-12)
+            memory_ratio = values["peak_memory"] / max(
+                baseline_values["peak_memory"], 1
+            )
+            changes.append(
+                {
+                    "model": case["model"],
+                    "lines_per_part": case["lines_per_part"],
+                    "length": case["length"],
+                    "stage": stage,
+                    "time_ratio": time_ratio,
+                    "memory_ratio": memory_ratio,
+                    "is_regression": (
+                        time_ratio > 1 + threshold
+                        and values["median"] - baseline_values["median"] > min_seconds
+                    )
+                    or memory_ratio > 1 + threshold,
+                }
+            )
+
+    return changes
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark meshing, deck writing, result parsing and summaries"
+    )
+    parser.add_argument("--models", nargs="+", choices=MODELS, default=list(MODELS))
+    parser.add_argument("--lines", type=int, nargs="+", default=[13, 25, 49])
+    parser.add_argument("--lengths", type=float, nargs="+", default=[0.015, 0.05])
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument(
+        "--output", default="benchmark_stages.json", help="Path of the JSON report"
+    )
+    parser.add_argument(
+        "--compare", help="Path of an earlier report to compare the results against"
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="Relative slowdown or memory growth reported as a regression",
+    )
+    args = parser.parse_args()
+
+    report = run_benchmarks(args.models, args.lines, args.lengths, args.repeats)
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+
+    print(
+        f"{'model':<14}{'lines':>6}{'length':>8}{'nodes':>8}  {'stage':<34}{'ms':>10}{'peak KiB':>10}"
+    )
+    for case in report["cases"]:
+        for stage, values in case["stages"].items():
+            print(
+                f"{case['model']:<14}{str(case['lines_per_part']):>6}{str(case['length']):>8}"
+                f"{case['node_count']:>8}  {'  ' * values['depth'] + stage:<34}"
+                f"{values['median'] * 1000:>10.2f}{values['peak_memory'] / 1024:>10.0f}"
+            )
+
+    if args.compare:
+        with open(args.compare) as f:
+            changes = compare_reports(json.load(f), report, args.threshold)
+
+        regressions = [change for change in changes if change["is_regression"]]
+        for change in regressions:
+            print(
+                f"Regression: {change['model']} lines={change['lines_per_part']} "
+                f"length={change['length']} {change['stage']}: "
+                f"time x{change['time_ratio']:.2f}, memory x{change['memory_ratio']:.2f}"
+            )
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,362 @@
+import argparse
+import csv
+import sqlite3
+import sys
+import time
+
+from pressfits.jobs import get_request_hash
+from pressfits.model import Material
+from pressfits.sweep import COLUMNS, ResultWriter, check_design, solve_designs
+
+_SQLITE_TYPES = {"int64": "INTEGER", "double": "REAL", "string": "TEXT"}
+# Columns of a design table, with the units of the sweep results so that results can be re-run
+_TABLE_COLUMNS = (
+    "id_0",
+    "id_1",
+    "od_0",
+    "od_1",
+    "length",
+    "inner_youngs_modulus",
+    "inner_poissons_ratio",
+    "outer_youngs_modulus",
+    "outer_poissons_ratio",
+)
+_PROGRESS_INTERVAL = 5  # Seconds between progress reports
+
+
+def read_design_table(path):
+    """Reads designs from a CSV table with a row per design. Dimensions are in m and Young's
+    moduli in Pa, as in the results of a sweep. Material names and lines_per_part are optional.
+
+    Args:
+        path (String): Path of the CSV file
+
+    Raises:
+        ValueError: If a column is missing, or any row has a value that is not a number or a
+            design that cannot be meshed, as for sweep.check_design. Every invalid row is listed
+            by its line number.
+
+    Returns:
+        list(dict(String, object)): Parameters of each design, as from sweep.get_designs
+    """
+    with open(path, newline="") as f:
+        reader = csv.DictReader(f)
+        missing = set(_TABLE_COLUMNS) - set(reader.fieldnames or ())
+        if missing:
+            raise ValueError(f"Missing columns: {', '.join(sorted(missing))}")
+
+        designs = []
+        invalid = []
+        for row in reader:
+            try:
+                design = _read_design(row)
+                check_design(design)
+            except (TypeError, ValueError) as e:
+                invalid.append(f"line {reader.line_num}: {e}")
+                continue
+
+            designs.append(design)
+
+    if invalid:
+        raise ValueError(f"Invalid designs in {path}:\n" + "\n".join(invalid))
+
+    return designs
+
+
+def _read_design(row):
+    """Reads the design of a row of a design table
+
+    Args:
+        row (dict(String, String)): Values of the row, keyed by column
+
+    Raises:
+        ValueError: If a value is not a number, or lines_per_part is not an integer
+
+    Returns:
+        dict(String, object): Parameters of the design
+    """
+    values = {name: float(row[name]) for name in _TABLE_COLUMNS}
+    lines_per_part = (row.get("lines_per_part") or "").strip()
+
+    return {
+        **{name: values[name] for name in ("id_0", "id_1", "od_0", "od_1", "length")},
+        "inner_material": Material(
+            row.get("inner_material") or "inner",
+            values["inner_youngs_modulus"],
+            values["inner_poissons_ratio"],
+        ),
+        "outer_material": Material(
+            row.get("outer_material") or "outer",
+            values["outer_youngs_modulus"],
+            values["outer_poissons_ratio"],
+        ),
+        "lines_per_part": int(lines_per_part) if lines_per_part else None,
+    }
+
+
+def get_design_key(design):
+    """Gets the key a design is checkpointed under, the job id of its inputs. Keys do not depend
+    on the position of the design in its table, so a table may be reordered or added to between runs.
+
+    Args:
+        design (dict(String, object)): Parameters of the design
+
+    Returns:
+        String: Hexadecimal key
+    """
+    return get_request_hash(
+        design["id_0"],
+        design["id_1"],
+        design["od_0"],
+        design["od_1"],
+        design["length"],
+        design["inner_material"],
+        design["outer_material"],
+        design["lines_per_part"],
+    )
+
+
+class Checkpoint:
+    """Records the result row of every finished design in a SQLite database, committing each
+    as it is recorded, so that a run stopped for any reason can be resumed without solving
+    finished designs again"""
+
+    def __init__(self, path):
+        """Opens a checkpoint, creating it if it doesn't exist
+
+        Args:
+            path (String): Path of the SQLite database
+        """
+        self.path = path
+        self._connection = sqlite3.connect(path)
+        columns = ", ".join(f"{name} {_SQLITE_TYPES[type_]}" for name, type_ in COLUMNS)
+        with self._connection:
+            self._connection.execute(
+                f"CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, {columns})"
+            )
+
+    def get_finished_keys(self, include_failed=True):
+        """Gets the keys of recorded designs
+
+        Args:
+            include_failed (bool, optional): Include designs that failed. Defaults to True.
+
+        Returns:
+            set(String): Keys of the designs
+        """
+        query = "SELECT key FROM results"
+        if not include_failed:
+            query += " WHERE error IS NULL"
+
+        return {key for (key,) in self._connection.execute(query)}
+
+    def record(self, key, row):
+        """Records the result row of a design, replacing any earlier row of the design
+
+        Args:
+            key (String): Key of the design, from get_design_key
+            row (dict(String, object)): Result row with a value for every column in sweep.COLUMNS
+        """
+        names = [name for name, _ in COLUMNS]
+        with self._connection:
+            self._connection.execute(
+                f"INSERT OR REPLACE INTO results (key, {', '.join(names)}) "
+                f"VALUES (?, {', '.join('?' * len(names))})",
+                [key] + [row[name] for name in names],
+            )
+
+    def get_rows(self, keys=None):
+        """Gets recorded result rows. The design index of a row is its position in the table of
+        the run that recorded it, so rows of tables reordered between runs are ordered by keys.
+
+        Args:
+            keys (list(String), optional): Keys of the designs of a table, from get_design_key.
+                Defaults to None, every recorded row in key order.
+
+        Yields:
+            dict(String, object): Values keyed by column name. Rows of keys given are in their
+                order, with the design index of their first position.
+        """
+        names = [name for name, _ in COLUMNS]
+        select = f"SELECT {', '.join(names)} FROM results"
+        if keys is None:
+            for values in self._connection.execute(f"{select} ORDER BY key"):
+                yield dict(zip(names, values))
+            return
+
+        seen = set()
+        for i, key in enumerate(keys):
+            if key in seen:
+                continue  # A repeat of a design of the table
+            seen.add(key)
+
+            values = self._connection.execute(
+                f"{select} WHERE key = ?", (key,)
+            ).fetchone()
+            if values is not None:
+                yield {**dict(zip(names, values)), "design": i}
+
+    def close(self):
+        self._connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def run_design_table(
+    designs,
+    checkpoint,
+    workers=None,
+    work_directory=None,
+    retry_failed=True,
+    progress=None,
+):
+    """Solves the designs not yet recorded in a checkpoint, recording each as it finishes
+
+    Args:
+        designs (list(dict(String, object))): Parameters of each design, as from read_design_table
+        checkpoint (Checkpoint): Checkpoint of finished designs
+        workers (int, optional): Number of processes. 0 solves in this process. Defaults to None, the processor count.
+        work_directory (String, optional): Directory to solve in. Defaults to None, the system temporary directory.
+        retry_failed (bool, optional): Solve designs that failed in an earlier run again. Defaults to True.
+        progress (callable, optional): Called with a dictionary of progress after each design. Defaults to None.
+
+    Returns:
+        dict: Number of designs, those skipped as already finished, those solved and failed, and
+            the duration of the run (s)
+    """
+    start = time.perf_counter()
+    finished = checkpoint.get_finished_keys(include_failed=not retry_failed)
+
+    keys = {}
+    pending_keys = set()
+    pending = []
+    for i, design in enumerate(designs):
+        key = get_design_key(design)
+        if key in finished or key in pending_keys:
+            continue  # Solved in an earlier run, or a repeat of a design in this run
+
+        keys[i] = key
+        pending_keys.add(key)
+        pending.append((i, design))
+
+    status = {
+        "designs": len(designs),
+        "skipped": len(designs) - len(pending),
+        "solved": 0,
+        "failed": 0,
+        "pending": len(pending),
+    }
+    for row in solve_designs(pending, workers, work_directory):
+        checkpoint.record(keys[row["design"]], row)
+        status["solved"] += 1
+        status["failed"] += row["error"] is not None
+
+        if progress is not None:
+            progress({**status, "seconds": time.perf_counter() - start})
+
+    return {**status, "seconds": time.perf_counter() - start}
+
+
+def print_progress(interval=_PROGRESS_INTERVAL, file=sys.stderr):
+    """Creates a progress callback for run_design_table that prints the progress, throughput
+    and estimated time remaining at most once per interval, and when the last design finishes
+
+    Args:
+        interval (float, optional): Seconds between reports. Defaults to _PROGRESS_INTERVAL.
+        file (file, optional): File to print to. Defaults to sys.stderr.
+
+    Returns:
+        callable: The callback
+    """
+    last_report = -interval
+
+    def progress(status):
+        nonlocal last_report
+
+        is_last = status["solved"] == status["pending"]
+        if status["seconds"] - last_report < interval and not is_last:
+            return
+        last_report = status["seconds"]
+
+        rate = status["solved"] / max(status["seconds"], 1e-9)
+        remaining = (status["pending"] - status["solved"]) / max(rate, 1e-9)
+        print(
+            f"{status['solved']}/{status['pending']} solved ({status['failed']} failed, "
+            f"{status['skipped']} already finished), {rate * 60:.1f} designs/min, "
+            f"{remaining:.0f}s remaining",
+            file=file,
+            flush=True,
+        )
+
+    return progress
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Solve the designs of a CSV table, recording each finished design in a "
+        "SQLite checkpoint. Running again with the same checkpoint resumes, skipping finished designs."
+    )
+    parser.add_argument(
+        "designs",
+        help="CSV with columns "
+        + ", ".join(_TABLE_COLUMNS)
+        + " and optionally inner_material, outer_material and lines_per_part. Dimensions in m, moduli in Pa.",
+    )
+    parser.add_argument(
+        "--checkpoint",
+        help="Path of the SQLite checkpoint. Defaults to the table path with a .sqlite3 extension.",
+    )
+    parser.add_argument(
+        "--output", help="Write every recorded result to a .parquet or .csv file"
+    )
+    parser.add_argument("--workers", type=int, help="Defaults to the processor count")
+    parser.add_argument("--work-directory")
+    parser.add_argument(
+        "--skip-failed",
+        action="store_true",
+        help="Don't retry designs that failed in an earlier run",
+    )
+    args = parser.parse_args()
+
+    checkpoint_path = args.checkpoint or f"{args.designs.rsplit('.', 1)[0]}.sqlite3"
+    try:
+        designs = read_design_table(args.designs)
+    except ValueError as e:
+        parser.error(str(e))
+
+    with Checkpoint(checkpoint_path) as checkpoint:
+        try:
+            status = run_design_table(
+                designs,
+                checkpoint,
+                args.workers,
+                args.work_directory,
+                not args.skip_failed,
+                print_progress(),
+            )
+        except KeyboardInterrupt:
+            print(
+                f"Interrupted. Finished designs are recorded in {checkpoint_path}",
+                file=sys.stderr,
+            )
+            sys.exit(130)
+
+        print(
+            f"Solved {status['solved']} designs ({status['failed']} failed) in "
+            f"{status['seconds']:.1f}s, skipping {status['skipped']} already finished"
+        )
+
+        if args.output:
+            with ResultWriter(args.output) as writer:
+                keys = [get_design_key(design) for design in designs]
+                for row in checkpoint.get_rows(keys):
+                    writer.write(row)
+            print(f"Wrote {writer.count} results to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
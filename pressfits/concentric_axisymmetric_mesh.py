@@ -5,6 +5,7 @@ import numpy as np
 from pressfits.concentric_mesh import ConcentricMesh
 from pressfits.curves import VerticalLine
 from pressfits.element import Element
+from pressfits.instrumentation import instrumented
 
 _INFLATION_LAYERS = 5
 _LINES_PER_PART = 13
@@ -12,6 +13,7 @@ FP_ALLOWANCE = 0.0001
 
 
 class ConcentricAxisymmetricMesh(ConcentricMesh):
+    @instrumented("mesh")
     def __init__(
         self,
         id_0,
@@ -212,20 +214,23 @@ class ConcentricAxisymmetricMesh(ConcentricMesh):
                 )
 
     @staticmethod
-    def get_boundaries_inp():
+    def get_boundaries_inp(prefix=""):
         """Gets the boundary conditions block of a calculix .inp file
 
+        Args:
+            prefix (String, optional): Prefix of the names of the node sets. Defaults to "".
+
         Returns:
             string: String representation of the boundary conditions block
         """
         string = "*BOUNDARY\n"
-        string += "L1_nodes,2\n"
+        string += f"{prefix}L1_nodes,2\n"
         string += "*BOUNDARY\n"
-        string += "L3_nodes,2\n"
+        string += f"{prefix}L3_nodes,2\n"
         string += "*BOUNDARY\n"
-        string += "L5_nodes,2\n"
+        string += f"{prefix}L5_nodes,2\n"
         string += "*BOUNDARY\n"
-        string += "L7_nodes,2\n"
+        string += f"{prefix}L7_nodes,2\n"
         return string
 
     @staticmethod
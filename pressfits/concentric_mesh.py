@@ -3,7 +3,9 @@ from abc import ABC, abstractmethod
 import matplotlib.pyplot as plt
 
 import pressfits.curves as curves
+from pressfits.adjacency import MeshAdjacency
 from pressfits.curves import VerticalLine
+from pressfits.instrumentation import instrumented
 
 YOUNGS_MODULUS = 210000000000
 POISSONS_RATIO = 0.3
@@ -26,6 +28,7 @@ class ConcentricMesh(ABC):
         self.p_1_elements = []
 
         self.element_inp_name = None
+        self._adjacency = None
 
     def _build_edges(self):
         # Edge IDs
@@ -71,6 +74,9 @@ class ConcentricMesh(ABC):
         lines = surface_string.split("\n")
         color = None
 
+        # Don't assume that the elements are ordered/and sequential by ID
+        elements_by_id = {element.id: element for element in elements}
+
         for line in lines:
             if "*" in line or line == "":
                 continue  # It is a header or blank line
@@ -79,18 +85,17 @@ class ConcentricMesh(ABC):
             face = int(str_face[1:])  # Remove the S character
             element_id = int(str_id)
 
-            # Don't assume that the elements are ordered/and sequential by ID
-            for element in elements:
-                if element.id == element_id:
-                    nodes = element.get_face_nodes(face)
-                    x = [nodes[0].x, nodes[1].x]
-                    y = [nodes[0].y, nodes[1].y]
+            if element_id not in elements_by_id:
+                continue
+
+            nodes = elements_by_id[element_id].get_face_nodes(face)
+            x = [nodes[0].x, nodes[1].x]
+            y = [nodes[0].y, nodes[1].y]
 
-                    if color is None:
-                        color = plt.plot(x, y, linestyle="--")[0].get_color()
+            if color is None:
+                color = plt.plot(x, y, linestyle="--")[0].get_color()
 
-                    plt.plot(x, y, color=color, linestyle="--")
-                    break
+            plt.plot(x, y, color=color, linestyle="--")
 
     def plot_curve_nodes(self, curves):
         """Plots nodes of a collection of curves
@@ -134,6 +139,19 @@ class ConcentricMesh(ABC):
 
         return elements
 
+    def get_adjacency(self):
+        """Gets the node and element adjacency of the mesh, building it on first use
+
+        Returns:
+            MeshAdjacency: Adjacency of the mesh
+        """
+        if self._adjacency is None:
+            self._adjacency = MeshAdjacency.from_elements(
+                self.get_nodes(), self.get_elements()
+            )
+
+        return self._adjacency
+
     def get_inner_nodes(self):
         return self.p_0_curves[0].nodes
 
@@ -153,12 +171,35 @@ class ConcentricMesh(ABC):
 
         plt.show()
 
-    def get_inp_str(self, material_inner, material_outer):
+    @instrumented("inp_string")
+    def get_inp_str(self, material_inner, material_outer, increments=1):
         """Converts the mesh into a .inp file format for CCX as a string
 
+        Args:
+            material_inner (Material): Material of inner part
+            material_outer (Material): Material of outer part
+            increments (int, optional): Number of fixed increments the interference is ramped
+                over, see _get_inp_str_footer. Defaults to 1.
+
         Returns:
             String: .inp representation of the mesh
         """
+        string = self.get_definition_inp_str()
+        string += self._get_inp_str_footer(material_inner, material_outer, increments)
+
+        return string
+
+    def get_definition_inp_str(self, prefix=""):
+        """Creates a string for a .inp file of the nodes, elements, sets and surfaces of the mesh.
+        Every element is also added to the EAll set, and every node to the nodes set.
+
+        Args:
+            prefix (String, optional): Prefix of the names of the sets and surfaces, so that
+                several meshes can be defined in one file. Defaults to "".
+
+        Returns:
+            String: .inp representation of the mesh up to the material information block
+        """
         arcs = self.p_0_curves.copy()
         arcs.extend(self.p_1_curves)
 
@@ -178,92 +219,92 @@ class ConcentricMesh(ABC):
             string += str(element) + "\n"
 
         # Add node sets
-        string += self._nodeset_string(self.l_1, "L1_nodes")
-        string += self._nodeset_string(self.l_2, "L2_nodes")
-        string += self._nodeset_string(self.l_3, "L3_nodes")
-        string += self._nodeset_string(self.l_4, "L4_nodes")
-        string += self._nodeset_string(self.l_5, "L5_nodes")
-        string += self._nodeset_string(self.l_7, "L7_nodes")
+        string += self._nodeset_string(self.l_1, f"{prefix}L1_nodes")
+        string += self._nodeset_string(self.l_2, f"{prefix}L2_nodes")
+        string += self._nodeset_string(self.l_3, f"{prefix}L3_nodes")
+        string += self._nodeset_string(self.l_4, f"{prefix}L4_nodes")
+        string += self._nodeset_string(self.l_5, f"{prefix}L5_nodes")
+        string += self._nodeset_string(self.l_7, f"{prefix}L7_nodes")
 
         # Add element sets
-        string += self._elset_string(self.p_0_elements, "PART0_elements")
-        string += self._elset_string(self.p_1_elements, "PART1_elements")
+        string += self._elset_string(self.p_0_elements, f"{prefix}PART0_elements")
+        string += self._elset_string(self.p_1_elements, f"{prefix}PART1_elements")
 
         # Add surfaces. Must be defined as element face surfaces, not nodes.
-        string += self._surface_string(True)
-        string += self._surface_string(False)
+        string += self._surface_string(True, prefix)
+        string += self._surface_string(False, prefix)
 
         # Add parts
         string += self._nodeset_string(
-            curves.node_ids_from_arcs(self.p_0_curves), "PART0_nodes"
+            curves.node_ids_from_arcs(self.p_0_curves), f"{prefix}PART0_nodes"
         )
         string += self._nodeset_string(
-            curves.node_ids_from_arcs(self.p_1_curves), "PART1_nodes"
+            curves.node_ids_from_arcs(self.p_1_curves), f"{prefix}PART1_nodes"
         )
         string += "\n"
 
-        string += self._get_inp_str_footer(material_inner, material_outer)
-
         return string
 
-    def _get_inp_str_footer(self, material_inner, material_outer):
+    def _get_inp_str_footer(self, material_inner, material_outer, increments=1):
         """Creates a string for a .inp file from the material information block onwards
 
         Args:
             material_inner (Material): Material of inner part
             material_outer (Material): Material of outer part
+            increments (int, optional): Number of fixed increments the interference is ramped
+                over, see get_step_inp_str. Defaults to 1.
 
         Returns:
             String: .inp representation of the mesh from the material information block onwards
         """
+        string = self.get_interaction_inp_str(material_inner, material_outer)
+        string += get_step_inp_str(self.get_boundaries_inp(), increments)
+        return string
+
+    def get_interaction_inp_str(self, material_inner, material_outer, prefix=""):
+        """Creates a string for a .inp file of the materials, sections and contact pair of the mesh
+
+        Args:
+            material_inner (Material): Material of inner part
+            material_outer (Material): Material of outer part
+            prefix (String, optional): Prefix of the names of the sets, surfaces, materials and
+                interaction, as given to get_definition_inp_str. Defaults to "".
+
+        Returns:
+            String: .inp representation of the materials and contact of the mesh
+        """
         # TODO: Allow multiple materials
         # Add material properties
-        string = f"*MATERIAL,NAME={material_inner.name}\n"
+        string = f"*MATERIAL,NAME={prefix}{material_inner.name}\n"
         string += "*ELASTIC\n"
         string += f"{material_inner.youngs_modulus},{material_inner.poissons_ratio}\n"
 
         if material_outer != material_inner:
-            string += f"*MATERIAL,NAME={material_outer.name}\n"
+            string += f"*MATERIAL,NAME={prefix}{material_outer.name}\n"
             string += "*ELASTIC\n"
             string += (
                 f"{material_outer.youngs_modulus},{material_outer.poissons_ratio}\n"
             )
 
-        string += (
-            f"*SOLID SECTION,ELSET=PART0_elements,MATERIAL={material_inner.name}\n"
-        )
-        string += (
-            f"*SOLID SECTION,ELSET=PART1_elements,MATERIAL={material_outer.name}\n"
-        )
+        for part, material in ((0, material_inner), (1, material_outer)):
+            string += f"*SOLID SECTION,ELSET={prefix}PART{part}_elements,"
+            string += f"MATERIAL={prefix}{material.name}\n"
 
         string += "*NODAL THICKNESS\n"
-        string += "PART0_nodes, 1.000000\n"
+        string += f"{prefix}PART0_nodes, 1.000000\n"
         string += "*NODAL THICKNESS\n"
-        string += "PART1_nodes, 1.000000\n"
+        string += f"{prefix}PART1_nodes, 1.000000\n"
 
         # Boundary conditions
-        string += "*SURFACE INTERACTION,NAME=SI0\n"
+        string += f"*SURFACE INTERACTION,NAME={prefix}SI0\n"
         string += "*SURFACE BEHAVIOR,PRESSURE-OVERCLOSURE=LINEAR\n"
         string += "1.050000e+16\n"
-        string += "*CONTACT PAIR,INTERACTION=SI0,TYPE=SURFACE TO SURFACE\n"
-        string += "L2_faces,L4_faces\n"
-        string += "*STEP\n"
-        string += "*STATIC\n"
-
-        string += self.get_boundaries_inp()
-        string += "*CONTACT FILE\n"
-        string += "CSTR\n"
-        string += "*EL FILE\n"
-        string += "E,S\n"
-        string += "*NODE FILE\n"
-        string += "RF,U\n"
-        string += "*EL PRINT,ELSET=EALL\n"
-        string += "S\n"
-        string += "*END STEP\n"
+        string += f"*CONTACT PAIR,INTERACTION={prefix}SI0,TYPE=SURFACE TO SURFACE\n"
+        string += f"{prefix}L2_faces,{prefix}L4_faces\n"
         return string
 
     @abstractmethod
-    def get_boundaries_inp():
+    def get_boundaries_inp(prefix=""):
         pass
 
     @staticmethod
@@ -341,17 +382,18 @@ class ConcentricMesh(ABC):
         string += "\n"
         return string
 
-    def _surface_string(self, is_inner):
+    def _surface_string(self, is_inner, prefix=""):
         """Creates a string for a .inp file denoting the surface block in the form of *SURFACE,NAME=L2_faces,TYPE=ELEMENT...
            Surfaces are defined as element face surfaces, not nodal surfaces.
 
         Args:
             is_inner (bool): If true, the surface string for the inner part is generated. If false, the outer part is generated.
+            prefix (String, optional): Prefix of the name of the surface. Defaults to "".
 
         Returns:
             String: Surface block representation as a string
         """
-        name = "L2_faces" if is_inner else "L4_faces"
+        name = f"{prefix}L2_faces" if is_inner else f"{prefix}L4_faces"
         elements = self.p_0_elements if is_inner else self.p_1_elements
         if is_inner:
             diameter = self.od_0
@@ -393,3 +435,37 @@ class ConcentricMesh(ABC):
                 id_list.append(curve.get_positive_id())
 
         return id_list
+
+
+def get_step_inp_str(boundaries, increments=1):
+    """Creates a string for a .inp file of the step solving the press fit. ccx removes the initial
+    overclosure of each contact pair linearly over the step, so with more than one increment the
+    results of each increment are those of the interference ramped up to the fraction of the step
+    completed.
+
+    Args:
+        boundaries (String): Boundary conditions block of every mesh in the file
+        increments (int, optional): Number of fixed, equal increments of the step, each written
+            to the results. Defaults to 1, letting ccx choose the increments.
+
+    Returns:
+        String: .inp representation of the step
+    """
+    string = "*STEP\n"
+    if increments > 1:
+        string += "*STATIC,DIRECT\n"
+        string += f"{1 / increments},1.0\n"
+    else:
+        string += "*STATIC\n"
+
+    string += boundaries
+    string += "*CONTACT FILE\n"
+    string += "CSTR\n"
+    string += "*EL FILE\n"
+    string += "E,S\n"
+    string += "*NODE FILE\n"
+    string += "RF,U\n"
+    string += "*EL PRINT,ELSET=EALL\n"
+    string += "S\n"
+    string += "*END STEP\n"
+    return string
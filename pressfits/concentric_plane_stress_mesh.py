@@ -7,6 +7,7 @@ import pressfits.curves as curves
 from pressfits.concentric_mesh import ConcentricMesh
 from pressfits.curves import Arc
 from pressfits.element import PSElement
+from pressfits.instrumentation import instrumented
 
 _ARCS_PER_PART = 47
 _ANGULAR_SPACING = math.pi / 16
@@ -14,6 +15,7 @@ _INFLATION_LAYERS = 3
 
 
 class ConcentricPlaneStressMesh(ConcentricMesh):
+    @instrumented("mesh")
     def __init__(self, id_0, id_1, od_0, od_1):
         """Create a mesh for two quarter tubes pressed over each other using a plane stress assumption
 
@@ -185,18 +187,21 @@ class ConcentricPlaneStressMesh(ConcentricMesh):
         return elements
 
     @staticmethod
-    def get_boundaries_inp():
+    def get_boundaries_inp(prefix=""):
         """Gets the boundary conditions block of a calculix .inp file
 
+        Args:
+            prefix (String, optional): Prefix of the names of the node sets. Defaults to "".
+
         Returns:
             string: String representation of the boundary conditions block
         """
         string = "*BOUNDARY\n"
-        string += "L1_nodes,1\n"
+        string += f"{prefix}L1_nodes,1\n"
         string += "*BOUNDARY\n"
-        string += "L3_nodes,2\n"
+        string += f"{prefix}L3_nodes,2\n"
         string += "*BOUNDARY\n"
-        string += "L5_nodes,1\n"
+        string += f"{prefix}L5_nodes,1\n"
         string += "*BOUNDARY\n"
-        string += "L7_nodes,2\n"
+        string += f"{prefix}L7_nodes,2\n"
         return string
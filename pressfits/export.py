@@ -0,0 +1,238 @@
+import uuid
+
+import numpy as np
+
+from pressfits.result_set import NODAL_QUANTITIES, ResultSet
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+_COMPRESSION = "zstd"
+# Node rows of the runs written to each file by a DatasetWriter
+_ROWS_PER_FILE = 250000
+# Column datasets are partitioned by. Each mesh density shares files, whatever the run.
+_PARTITION_COLUMN = "lines_per_part"
+
+
+def get_run_parameters(
+    id_0, id_1, od_0, od_1, length, inner_material, outer_material, lines_per_part
+):
+    """Gets the inputs of a run as a flat dictionary of columns values
+
+    Args:
+        id_0 (float): Internal diameter of inner part (m)
+        id_1 (float): Internal diameter of outer part (m)
+        od_0 (float): Outer diameter of inner part (m)
+        od_1 (float): Outer diameter of outer part (m)
+        length (float): Contact length (m)
+        inner_material (Material): Material of the inner part
+        outer_material (Material): Material of the outer part
+        lines_per_part (int): Number of lines per part used by the mesh
+
+    Returns:
+        dict(String, object): Parameters keyed by column name
+    """
+    return {
+        "id_0": float(id_0),
+        "id_1": float(id_1),
+        "od_0": float(od_0),
+        "od_1": float(od_1),
+        "length": float(length),
+        "inner_youngs_modulus": float(inner_material.youngs_modulus),
+        "inner_poissons_ratio": float(inner_material.poissons_ratio),
+        "outer_youngs_modulus": float(outer_material.youngs_modulus),
+        "outer_poissons_ratio": float(outer_material.poissons_ratio),
+        "lines_per_part": int(lines_per_part),
+    }
+
+
+def node_columns(result_set, run_id, parameters=None):
+    """Creates columns with one row per node per step
+
+    Args:
+        result_set (ResultSet): Results to create columns for
+        run_id (String): Identifier of the run, repeated in every row
+        parameters (dict, optional): Run inputs, each repeated as a column. Defaults to None.
+
+    Returns:
+        dict(String, np.ndarray): Columns keyed by name
+    """
+    node_count = len(result_set.node_ids)
+    steps = result_set.get_step_keys()
+    row_count = node_count * len(steps)
+
+    columns = _constant_columns(run_id, parameters, row_count)
+    columns["step"] = np.repeat(np.array(steps, dtype=np.int32), node_count)
+    columns["node_id"] = np.tile(result_set.node_ids, len(steps))
+    columns["part"] = np.tile(result_set.node_parts, len(steps))
+    columns["x"] = np.tile(result_set.coordinates[:, 0], len(steps))
+    columns["y"] = np.tile(result_set.coordinates[:, 1], len(steps))
+
+    for quantity, result_type in NODAL_QUANTITIES.items():
+        for i, field in enumerate(result_type.__dataclass_fields__):
+            values = [
+                (
+                    result_set.nodal_results[key][quantity][:, i]
+                    if quantity in result_set.nodal_results[key]
+                    else np.full(node_count, np.nan, dtype=np.float32)
+                )
+                for key in steps
+            ]
+            columns[f"{quantity}_{field}"] = (
+                np.concatenate(values) if values else np.empty(0, dtype=np.float32)
+            )
+
+    return columns
+
+
+def element_columns(result_set, run_id, parameters=None):
+    """Creates columns with one row per element, holding integration point averaged stresses
+
+    Args:
+        result_set (ResultSet): Results to create columns for
+        run_id (String): Identifier of the run, repeated in every row
+        parameters (dict, optional): Run inputs, each repeated as a column. Defaults to None.
+
+    Returns:
+        dict(String, np.ndarray): Columns keyed by name
+    """
+    element_count = len(result_set.element_ids)
+    node_rows = np.searchsorted(result_set.node_ids, result_set.connectivity[:, :4])
+    corners = result_set.coordinates[node_rows]
+
+    columns = _constant_columns(run_id, parameters, element_count)
+    columns["element_id"] = result_set.element_ids
+    columns["part"] = result_set.node_parts[node_rows[:, 0]]
+    columns["x"] = corners[:, :, 0].mean(axis=1)
+    columns["y"] = corners[:, :, 1].mean(axis=1)
+
+    counts = np.diff(result_set.integration_point_offsets)
+    has_results = counts > 0
+    stresses = result_set.integration_point_stresses.astype(float)
+    for i, component in enumerate(("xx", "yy", "zz", "xy", "yz", "zx")):
+        sums = np.zeros(element_count)
+        sums[has_results] = np.add.reduceat(
+            stresses[:, i], result_set.integration_point_offsets[:-1][has_results]
+        )
+        with np.errstate(invalid="ignore", divide="ignore"):
+            columns[f"stress_{component}"] = np.where(
+                has_results, sums / counts, np.nan
+            ).astype(np.float32)
+
+    columns["stress_von_mises"] = result_set.get_element_mean_von_mises().astype(
+        np.float32
+    )
+    return columns
+
+
+class DatasetWriter:
+    """Appends the results of runs to Parquet datasets of nodes and elements, at
+    {directory}/nodes and {directory}/elements. Runs are buffered and written together, so that
+    a file holds many runs rather than one. Datasets are partitioned by _PARTITION_COLUMN, a
+    column with few values, when runs have it, and run_id is an ordinary column."""
+
+    def __init__(self, directory, rows_per_file=_ROWS_PER_FILE):
+        """Creates a writer
+
+        Args:
+            directory (String): Root directory of the datasets
+            rows_per_file (int, optional): Node rows buffered before they are written. Defaults to _ROWS_PER_FILE.
+
+        Raises:
+            ImportError: If pyarrow is not installed
+        """
+        if pq is None:
+            raise ImportError("pyarrow is required to export results to Parquet")
+
+        self.directory = directory
+        self.rows_per_file = rows_per_file
+        self._tables = {"nodes": [], "elements": []}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def write(self, results, run_id, parameters=None):
+        """Adds the results of a run, writing the buffered runs once enough rows have arrived
+
+        Args:
+            results (PressFitModel or ResultSet): The solved model, or its result set
+            run_id (String): Identifier of the run
+            parameters (dict, optional): Run inputs to store with every row, as from get_run_parameters. Defaults to None.
+        """
+        result_set = (
+            results if isinstance(results, ResultSet) else ResultSet.from_model(results)
+        )
+        self._tables["nodes"].append(
+            pa.table(node_columns(result_set, run_id, parameters))
+        )
+        self._tables["elements"].append(
+            pa.table(element_columns(result_set, run_id, parameters))
+        )
+
+        if sum(table.num_rows for table in self._tables["nodes"]) >= self.rows_per_file:
+            self.flush()
+
+    def flush(self):
+        """Writes the buffered runs, as a new file in each partition they fill"""
+        for name, tables in self._tables.items():
+            if not tables:
+                continue
+
+            # Runs with and without parameters are written together, with nulls for the missing
+            table = pa.concat_tables(tables, promote_options="default")
+            partition_cols = (
+                [_PARTITION_COLUMN] if _PARTITION_COLUMN in table.column_names else None
+            )
+            pq.write_to_dataset(
+                table,
+                root_path=f"{self.directory}/{name}",
+                partition_cols=partition_cols,
+                compression=_COMPRESSION,
+                basename_template=f"part-{uuid.uuid4().hex}-{{i}}.parquet",
+                existing_data_behavior="overwrite_or_ignore",
+            )
+            tables.clear()
+
+    def close(self):
+        """Writes any buffered runs"""
+        self.flush()
+
+
+def export_run(results, directory, run_id, parameters=None):
+    """Appends the results of a single run to the Parquet datasets of a DatasetWriter, as a file
+    of its own. Use a DatasetWriter to write many runs to shared files.
+
+    Args:
+        results (PressFitModel or ResultSet): The solved model, or its result set
+        directory (String): Root directory of the datasets
+        run_id (String): Identifier of the run
+        parameters (dict, optional): Run inputs to store with every row, as from get_run_parameters. Defaults to None.
+    """
+    with DatasetWriter(directory) as writer:
+        writer.write(results, run_id, parameters)
+
+
+def _constant_columns(run_id, parameters, row_count):
+    """Creates columns for values that are the same in every row of a run
+
+    Args:
+        run_id (String): Identifier of the run
+        parameters (dict): Run inputs
+        row_count (int): Number of rows
+
+    Returns:
+        dict(String, np.ndarray): Columns keyed by name
+    """
+    columns = {"run_id": np.full(row_count, str(run_id), dtype=object)}
+
+    for name, value in (parameters or {}).items():
+        columns[name] = np.full(row_count, value)
+
+    return columns
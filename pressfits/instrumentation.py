@@ -0,0 +1,276 @@
+import cProfile
+import functools
+import inspect
+import json
+import logging
+import os
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+# Called with the stage name, duration in seconds and details of every finished stage
+_stage_callbacks = []
+# Called with the record of every finished run
+_record_callbacks = []
+
+# Defaults of new recorders, set with configure
+_trace_memory = False
+_profile_directory = None
+
+_tracing_lock = threading.Lock()
+_tracing_count = 0  # Number of recorders tracing memory
+
+
+def configure(trace_memory=False, profile_directory=None):
+    """Sets the defaults of recorders created from now on
+
+    Args:
+        trace_memory (bool, optional): Record the peak memory of each stage with tracemalloc. Defaults to False.
+        profile_directory (String, optional): Directory to write a cProfile capture of each run to. Defaults to None, not profiling.
+    """
+    global _trace_memory, _profile_directory
+
+    _trace_memory = trace_memory
+    _profile_directory = profile_directory
+
+
+def add_stage_callback(callback):
+    """Registers a function to call when any stage finishes
+
+    Args:
+        callback (callable): Function of the stage name, duration in seconds and a dictionary of details
+    """
+    _stage_callbacks.append(callback)
+
+
+def remove_stage_callback(callback):
+    """Unregisters a function added with add_stage_callback
+
+    Args:
+        callback (callable): The function
+    """
+    _stage_callbacks.remove(callback)
+
+
+def add_record_callback(callback):
+    """Registers a function to call with the record of every finished run
+
+    Args:
+        callback (callable): Function of the record dictionary
+    """
+    _record_callbacks.append(callback)
+
+
+def remove_record_callback(callback):
+    """Unregisters a function added with add_record_callback
+
+    Args:
+        callback (callable): The function
+    """
+    _record_callbacks.remove(callback)
+
+
+class RunRecorder:
+    """Records the stages of a single model run, such as meshing, solving and parsing, and emits
+    them as one structured record. Memory tracing is process wide, so peaks include any other
+    work running at the same time."""
+
+    def __init__(self, name=None, trace_memory=None, profile_directory=None):
+        """Creates a recorder with no stages
+
+        Args:
+            name (String, optional): Name of the run. Defaults to None.
+            trace_memory (bool, optional): Record peak memory of each stage. Defaults to the configured default.
+            profile_directory (String, optional): Directory to write a cProfile capture to. Defaults to the configured default.
+        """
+        self.name = name
+        self.trace_memory = _trace_memory if trace_memory is None else trace_memory
+        self.profile_directory = (
+            _profile_directory if profile_directory is None else profile_directory
+        )
+        self.values = {}
+        self.stages = []
+        self._active = []  # Peak memory of each stage in progress, outermost first
+        self._profiler = cProfile.Profile() if self.profile_directory else None
+        self._is_tracing = False
+
+    def add(self, **values):
+        """Adds to counted values of the run, such as bytes written
+
+        Args:
+            **values: Amounts to add, by name
+        """
+        for name, value in values.items():
+            self.values[name] = self.values.get(name, 0) + value
+
+    def set(self, **values):
+        """Sets values of the run, such as node counts
+
+        Args:
+            **values: Values, by name
+        """
+        self.values.update(values)
+
+    @contextmanager
+    def stage(self, name, **details):
+        """Records the duration of a stage. Details yielded may be added to by the stage.
+
+        Args:
+            name (String): Name of the stage
+            **details: Details to record with the stage
+        """
+        if self.trace_memory and not self._is_tracing:
+            _start_tracing()
+            self._is_tracing = True
+        if self.trace_memory:
+            if self._active:
+                self._active[-1] = max(
+                    self._active[-1], tracemalloc.get_traced_memory()[1]
+                )
+            tracemalloc.reset_peak()
+        if self._profiler is not None and not self._active:
+            self._profiler.enable()
+
+        self._active.append(0)
+        start = time.perf_counter()
+        try:
+            yield details
+        except BaseException as e:
+            details["error"] = type(e).__name__
+            raise
+        finally:
+            seconds = time.perf_counter() - start
+            peak = self._active.pop()
+            if self.trace_memory:
+                peak = max(peak, tracemalloc.get_traced_memory()[1])
+                details["peak_memory"] = peak
+                if self._active:
+                    self._active[-1] = max(self._active[-1], peak)
+            if self._profiler is not None and not self._active:
+                self._profiler.disable()
+
+            self.stages.append(
+                {
+                    "stage": name,
+                    "seconds": seconds,
+                    "depth": len(self._active),
+                    **details,
+                }
+            )
+            for callback in list(_stage_callbacks):
+                callback(name, seconds, details)
+
+    def get_record(self):
+        """Gets the record of the run
+
+        Returns:
+            dict: Name, values and stages of the run, with the total duration of its outermost stages
+        """
+        record = {
+            "run": self.name,
+            **self.values,
+            "seconds": sum(
+                stage["seconds"] for stage in self.stages if stage["depth"] == 0
+            ),
+            "stages": list(self.stages),
+        }
+        if self.trace_memory:
+            record["peak_memory"] = max(
+                (stage["peak_memory"] for stage in self.stages), default=0
+            )
+
+        return record
+
+    def emit(self, **values):
+        """Finishes the run, logging its record and passing it to the record callbacks. Writes the
+        cProfile capture of the run if profiling.
+
+        Args:
+            **values: Values to include in the record
+
+        Returns:
+            dict: The record
+        """
+        record = {**self.get_record(), **values}
+
+        if self._profiler is not None:
+            os.makedirs(self.profile_directory, exist_ok=True)
+            path = os.path.join(
+                self.profile_directory,
+                f"{os.path.basename(str(self.name))}_{time.time_ns()}.prof",
+            )
+            self._profiler.dump_stats(path)
+            record["profile"] = path
+
+        if self._is_tracing:
+            _stop_tracing()
+            self._is_tracing = False
+
+        logger.info(json.dumps(record, default=str))
+        for callback in list(_record_callbacks):
+            callback(record)
+
+        return record
+
+
+def get_recorder(instance):
+    """Gets the recorder of an object, creating it on first use
+
+    Args:
+        instance (object): Object with a recorder attribute, such as a mesh or model
+
+    Returns:
+        RunRecorder: The recorder
+    """
+    if getattr(instance, "recorder", None) is None:
+        instance.recorder = RunRecorder()
+
+    return instance.recorder
+
+
+def instrumented(stage):
+    """Decorates a method to be recorded as a stage by the recorder of its instance
+
+    Args:
+        stage (String): Name of the stage
+    """
+
+    def decorator(method):
+        if inspect.iscoroutinefunction(method):
+
+            @functools.wraps(method)
+            async def async_wrapper(self, *args, **kwargs):
+                with get_recorder(self).stage(stage):
+                    return await method(self, *args, **kwargs)
+
+            return async_wrapper
+
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            with get_recorder(self).stage(stage):
+                return method(self, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def _start_tracing():
+    global _tracing_count
+
+    with _tracing_lock:
+        if _tracing_count == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        _tracing_count += 1
+
+
+def _stop_tracing():
+    global _tracing_count
+
+    with _tracing_lock:
+        _tracing_count -= 1
+        if _tracing_count == 0:
+            tracemalloc.stop()
@@ -0,0 +1,337 @@
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from pressfits.metrics import record_cache_lookup
+from pressfits.result_set import ResultSet
+
+JOB_ID_PATTERN = r"[0-9a-f]{16,64}"
+
+_MEMORY_CACHE_SIZE = 16  # Number of recently used result sets kept in memory
+_STORE_SIZE = 1000  # Number of jobs kept on disk
+_EXTENSIONS = ("json", "npz", "inp")
+# Incremented when meshing or solving changes, so that results of earlier versions are not reused
+_HASH_VERSION = 1
+_HASH_LENGTH = 32
+_SIGNIFICANT_DIGITS = 12
+
+
+def get_request_hash(
+    id_0,
+    id_1,
+    od_0,
+    od_1,
+    length,
+    inner_material,
+    outer_material,
+    lines_per_part=None,
+    increments=1,
+):
+    """Creates a canonical hash of the inputs of a solve, for use as its job id and ETag. Values
+    are normalized so that requests differing only in number formatting share a hash.
+
+    Args:
+        id_0 (float): Internal diameter of inner part (m)
+        id_1 (float): Internal diameter of outer part (m)
+        od_0 (float): Outer diameter of inner part (m)
+        od_1 (float): Outer diameter of outer part (m)
+        length (float): Contact length (m)
+        inner_material (Material): Material of the inner part
+        outer_material (Material): Material of the outer part
+        lines_per_part (int, optional): Number of lines per part used by the mesh. Defaults to None, the mesh default.
+        increments (int, optional): Number of increments the interference is ramped over. Defaults to 1.
+
+    Returns:
+        String: Hexadecimal hash
+    """
+
+    def normalize(value):
+        return float(f"{float(value):.{_SIGNIFICANT_DIGITS}g}")
+
+    inputs = {
+        "version": _HASH_VERSION,
+        "id_0": normalize(id_0),
+        "id_1": normalize(id_1),
+        "od_0": normalize(od_0),
+        "od_1": normalize(od_1),
+        "length": normalize(length),
+        "inner_youngs_modulus": normalize(inner_material.youngs_modulus),
+        "inner_poissons_ratio": normalize(inner_material.poissons_ratio),
+        "outer_youngs_modulus": normalize(outer_material.youngs_modulus),
+        "outer_poissons_ratio": normalize(outer_material.poissons_ratio),
+        "lines_per_part": None if lines_per_part is None else int(lines_per_part),
+    }
+    if increments != 1:
+        # Only hashed when ramped, so that the ids of earlier single increment jobs are unchanged
+        inputs["increments"] = int(increments)
+    canonical = json.dumps(inputs, sort_keys=True, separators=(",", ":"))
+
+    return hashlib.sha256(canonical.encode()).hexdigest()[:_HASH_LENGTH]
+
+
+class JobStore:
+    """Stores the results of finished solves on disk, as result archives and JSON summaries,
+    so that their fields can be retrieved later without solving again. Jobs are identified by
+    the hash of their inputs, from get_request_hash. Once more than size jobs are stored, the
+    least recently used are removed."""
+
+    def __init__(self, directory, size=_STORE_SIZE):
+        """Creates a store within a directory, creating the directory if it doesn't exist
+
+        Args:
+            directory (String): Directory to store jobs in
+            size (int, optional): Number of jobs kept on disk. Defaults to _STORE_SIZE. None
+                keeps every job.
+        """
+        self.directory = directory
+        self.size = size
+        os.makedirs(directory, exist_ok=True)
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _path(self, job_id, extension):
+        if re.fullmatch(JOB_ID_PATTERN, job_id) is None:
+            raise KeyError(f"Invalid job id: {job_id}")
+
+        return os.path.join(self.directory, f"{job_id}.{extension}")
+
+    def save(self, job_id, result_set, summary, mesh_string=None):
+        """Stores the results of a job
+
+        Args:
+            job_id (String): Id of the job
+            result_set (ResultSet): Results of the job
+            summary (dict): JSON serializable summary of the job
+            mesh_string (String, optional): ccx input of the job. Defaults to None.
+        """
+        self._write(self._path(job_id, "npz"), result_set.save)
+        if mesh_string is not None:
+
+            def write_mesh_string(path):
+                with open(path, "w") as f:
+                    f.write(mesh_string)
+
+            self._write(self._path(job_id, "inp"), write_mesh_string)
+
+        def write_summary(path):
+            with open(path, "w") as f:
+                json.dump(summary, f)
+
+        # Written last, as its presence marks the job as complete
+        self._write(self._path(job_id, "json"), write_summary)
+
+        with self._lock:
+            self._remember(job_id, result_set)
+        self._evict()
+
+    def _write(self, path, write):
+        """Writes a file of a job to a temporary file of the directory, then moves it into
+        place, so that other requests never read a partly written file
+
+        Args:
+            path (String): Path of the file
+            write (callable): Writes the file, taking the path to write to
+        """
+        descriptor, temporary = tempfile.mkstemp(
+            suffix=os.path.splitext(path)[1], dir=self.directory
+        )
+        os.close(descriptor)
+        try:
+            write(temporary)
+            os.replace(temporary, path)
+        except BaseException:
+            os.remove(temporary)
+            raise
+
+    def _touch(self, job_id):
+        """Marks a job as recently used, so that it is removed after those used before it
+
+        Args:
+            job_id (String): Id of the job
+        """
+        try:
+            os.utime(self._path(job_id, "json"))
+        except FileNotFoundError:
+            pass  # Removed by another request
+
+    def _evict(self):
+        """Removes the least recently used jobs beyond the size of the store"""
+        if self.size is None:
+            return
+
+        jobs = []
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                job_id, extension = os.path.splitext(entry.name)
+                if extension == ".json" and re.fullmatch(JOB_ID_PATTERN, job_id):
+                    try:
+                        jobs.append((entry.stat().st_mtime, job_id))
+                    except FileNotFoundError:
+                        pass  # Removed by another request
+
+        for _, job_id in sorted(jobs)[: max(len(jobs) - self.size, 0)]:
+            with self._lock:
+                self._cache.pop(job_id, None)
+            # The summary is removed first, so that the job is no longer marked as complete
+            for extension in _EXTENSIONS:
+                try:
+                    os.remove(self._path(job_id, extension))
+                except FileNotFoundError:
+                    pass
+
+    def exists(self, job_id):
+        """Checks if a job has been stored
+
+        Args:
+            job_id (String): Id of the job
+
+        Returns:
+            bool: True if the job is complete and stored
+        """
+        try:
+            return os.path.exists(self._path(job_id, "json"))
+        except KeyError:
+            return False
+
+    def load_summary(self, job_id):
+        """Loads the summary of a stored job
+
+        Args:
+            job_id (String): Id of the job
+
+        Raises:
+            KeyError: If the job does not exist
+
+        Returns:
+            dict: Summary of the job
+        """
+        try:
+            with open(self._path(job_id, "json"), "r") as f:
+                summary = json.load(f)
+        except FileNotFoundError:
+            raise KeyError(f"Job not found: {job_id}")
+
+        self._touch(job_id)
+        return summary
+
+    def load_mesh_string(self, job_id):
+        """Loads the ccx input of a stored job
+
+        Args:
+            job_id (String): Id of the job
+
+        Raises:
+            KeyError: If the job does not exist or was stored without its input
+
+        Returns:
+            String: ccx input of the job
+        """
+        if not self.exists(job_id):
+            raise KeyError(f"Job input not found: {job_id}")
+
+        try:
+            with open(self._path(job_id, "inp"), "r") as f:
+                return f.read()
+        except FileNotFoundError:
+            raise KeyError(f"Job input not found: {job_id}")
+
+    def load(self, job_id):
+        """Loads the results of a stored job
+
+        Args:
+            job_id (String): Id of the job
+
+        Raises:
+            KeyError: If the job does not exist
+
+        Returns:
+            ResultSet: Results of the job
+        """
+        with self._lock:
+            is_cached = job_id in self._cache
+            if is_cached:
+                self._cache.move_to_end(job_id)
+                result_set = self._cache[job_id]
+        record_cache_lookup("result_sets", is_cached)
+        if is_cached:
+            self._touch(job_id)
+            return result_set
+
+        if not self.exists(job_id):
+            raise KeyError(f"Job not found: {job_id}")
+
+        try:
+            result_set = ResultSet.load(self._path(job_id, "npz"))
+        except FileNotFoundError:
+            raise KeyError(f"Job not found: {job_id}")
+        self._touch(job_id)
+
+        with self._lock:
+            self._remember(job_id, result_set)
+
+        return result_set
+
+    def _remember(self, job_id, result_set):
+        """Keeps a result set in the memory cache. The lock must be held.
+
+        Args:
+            job_id (String): Id of the job
+            result_set (ResultSet): Results of the job
+        """
+        self._cache[job_id] = result_set
+        self._cache.move_to_end(job_id)
+
+        while len(self._cache) > _MEMORY_CACHE_SIZE:
+            self._cache.popitem(last=False)
+
+
+def get_field(result_set, name, key=None):
+    """Gets a field of a result set as an array with one row per node or element
+
+    Args:
+        result_set (ResultSet): The results to get the field of
+        name (String): Name of the field, from FIELDS
+        key (int, optional): Step of simulation. Defaults to None, the last step, at the full
+            interference of a ramped solve.
+
+    Raises:
+        KeyError: If the field is not recognized
+
+    Returns:
+        np.ndarray: Field values
+    """
+    if name not in FIELDS:
+        raise KeyError(f"Unrecognized field: {name}")
+    if key is None:
+        key = max(result_set.get_step_keys())
+
+    return FIELDS[name](result_set, key)
+
+
+def _nodal_displacements(result_set, key):
+    displacement = result_set.nodal_results[key]["displacement"].astype(float)
+    magnitude = np.linalg.norm(displacement, axis=1)
+    return np.where(displacement[:, 0] < 0, -magnitude, magnitude)
+
+
+# Fields that can be retrieved from a stored job, each with one row per node or element
+FIELDS = {
+    "node_ids": lambda result_set, key: result_set.node_ids,
+    "coordinates": lambda result_set, key: result_set.coordinates[:, :2],
+    "node_parts": lambda result_set, key: result_set.node_parts,
+    "nodal_displacements": _nodal_displacements,
+    "displacement": lambda result_set, key: result_set.nodal_results[key][
+        "displacement"
+    ],
+    "contact": lambda result_set, key: result_set.nodal_results[key]["contact"],
+    "element_ids": lambda result_set, key: result_set.element_ids,
+    "connectivity": lambda result_set, key: result_set.connectivity,
+    "elemental_stresses": lambda result_set, key: result_set.get_element_mean_von_mises()
+    / 1000**2,
+}
@@ -0,0 +1,411 @@
+import math
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+
+from pressfits.instrumentation import add_stage_callback
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Upper bounds of latency histogram buckets, in seconds
+DEFAULT_BUCKETS = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+    120.0,
+)
+
+
+class Metric(ABC):
+    """A named metric with values for each combination of its label values"""
+
+    type = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        """Creates a metric with no values
+
+        Args:
+            name (String): Name of the metric
+            documentation (String): Description of the metric
+            labelnames (tuple(String), optional): Names of the labels of the metric. Defaults to ().
+        """
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels):
+        """Gets the label values of a sample in label order
+
+        Args:
+            labels (dict(String, object)): Label values by name
+
+        Raises:
+            ValueError: If the labels do not match the label names of the metric
+
+        Returns:
+            tuple(String): Label values
+        """
+        if set(labels) != set(self.labelnames):
+            raise ValueError(
+                f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}"
+            )
+
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    @abstractmethod
+    def get_samples(self):
+        """Gets the samples of the metric
+
+        Returns:
+            list((String, dict(String, String), float)): Suffixed name, labels and value of each sample
+        """
+        pass
+
+    def render(self):
+        """Renders the metric in the Prometheus text exposition format
+
+        Returns:
+            String: Lines of the metric
+        """
+        lines = [
+            f"# HELP {self.name} {_escape(self.documentation, False)}",
+            f"# TYPE {self.name} {self.type}",
+        ]
+        for name, labels, value in self.get_samples():
+            lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+
+        return "\n".join(lines)
+
+
+class Counter(Metric):
+    """A value that only increases, such as a number of requests"""
+
+    type = "counter"
+
+    def inc(self, amount=1, **labels):
+        """Increases the counter
+
+        Args:
+            amount (float, optional): Amount to increase by. Defaults to 1.
+            **labels: Label values
+        """
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def get(self, **labels):
+        """Gets the value of the counter
+
+        Args:
+            **labels: Label values
+
+        Returns:
+            float: Value of the counter
+        """
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+    def get_samples(self):
+        with self._lock:
+            return [
+                (f"{self.name}_total", dict(zip(self.labelnames, key)), value)
+                for key, value in self._values.items()
+            ]
+
+
+class Gauge(Metric):
+    """A value that can go up and down, set directly or read from a function when collected"""
+
+    type = "gauge"
+
+    def __init__(self, name, documentation, labelnames=(), function=None):
+        """Creates a gauge
+
+        Args:
+            name (String): Name of the metric
+            documentation (String): Description of the metric
+            labelnames (tuple(String), optional): Names of the labels of the metric. Defaults to ().
+            function (callable, optional): Function returning a dictionary of values keyed by tuples
+                of label values, called when the gauge is collected. Defaults to None.
+        """
+        super().__init__(name, documentation, labelnames)
+        self.function = function
+
+    def set(self, value, **labels):
+        """Sets the value of the gauge
+
+        Args:
+            value (float): Value
+            **labels: Label values
+        """
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def get_samples(self):
+        if self.function is not None:
+            values = self.function()
+        else:
+            with self._lock:
+                values = dict(self._values)
+
+        return [
+            (self.name, dict(zip(self.labelnames, map(str, key))), value)
+            for key, value in values.items()
+        ]
+
+
+class Histogram(Metric):
+    """Counts observations, such as durations, in cumulative buckets"""
+
+    type = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        """Creates a histogram
+
+        Args:
+            name (String): Name of the metric
+            documentation (String): Description of the metric
+            labelnames (tuple(String), optional): Names of the labels of the metric. Defaults to ().
+            buckets (tuple(float), optional): Upper bounds of the buckets. Defaults to DEFAULT_BUCKETS.
+        """
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+
+    def observe(self, value, **labels):
+        """Records an observation
+
+        Args:
+            value (float): Observed value
+            **labels: Label values
+        """
+        key = self._key(labels)
+        with self._lock:
+            counts, total = self._values.get(key, ([0] * len(self.buckets), 0.0))
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+                    break
+            self._values[key] = (counts, total + value)
+
+    @contextmanager
+    def time(self, **labels):
+        """Observes the duration of a block of code, in seconds
+
+        Args:
+            **labels: Label values
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def get_count(self, **labels):
+        """Gets the number of observations
+
+        Args:
+            **labels: Label values
+
+        Returns:
+            int: Number of observations
+        """
+        with self._lock:
+            counts, _ = self._values.get(self._key(labels), ((), 0.0))
+            return sum(counts)
+
+    def get_samples(self):
+        samples = []
+        with self._lock:
+            for key, (counts, total) in self._values.items():
+                labels = dict(zip(self.labelnames, key))
+                cumulative = 0
+                for bound, count in zip(self.buckets, counts):
+                    cumulative += count
+                    samples.append(
+                        (
+                            f"{self.name}_bucket",
+                            {**labels, "le": _format_value(bound)},
+                            cumulative,
+                        )
+                    )
+                samples.append((f"{self.name}_sum", labels, total))
+                samples.append((f"{self.name}_count", labels, cumulative))
+
+        return samples
+
+
+class MetricsRegistry:
+    """A collection of metrics rendered together"""
+
+    def __init__(self):
+        """Creates an empty registry"""
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric):
+        """Adds a metric to the registry, or gets the metric already registered with its name
+
+        Args:
+            metric (Metric): Metric to add
+
+        Returns:
+            Metric: The registered metric
+        """
+        with self._lock:
+            return self._metrics.setdefault(metric.name, metric)
+
+    def get(self, name):
+        """Gets a registered metric
+
+        Args:
+            name (String): Name of the metric
+
+        Returns:
+            Metric: The metric, or None if it is not registered
+        """
+        return self._metrics.get(name)
+
+    def render(self):
+        """Renders every metric in the Prometheus text exposition format
+
+        Returns:
+            String: Exposition text
+        """
+        with self._lock:
+            metrics = list(self._metrics.values())
+
+        return "\n".join(metric.render() for metric in metrics) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+STAGE_DURATION = REGISTRY.register(
+    Histogram(
+        "pressfits_stage_duration_seconds",
+        "Duration of each stage of solving and responding to a request",
+        ("stage",),
+    )
+)
+STAGE_FAILURES = REGISTRY.register(
+    Counter(
+        "pressfits_stage_failures",
+        "Number of stages that raised an exception",
+        ("stage",),
+    )
+)
+CACHE_LOOKUPS = REGISTRY.register(
+    Counter(
+        "pressfits_cache_lookups",
+        "Number of cache lookups, by cache and whether they hit",
+        ("cache", "result"),
+    )
+)
+CACHE_HIT_RATIO = REGISTRY.register(
+    Gauge(
+        "pressfits_cache_hit_ratio",
+        "Fraction of lookups of each cache that hit",
+        ("cache",),
+        lambda: _get_hit_ratios(),
+    )
+)
+
+
+def _observe_stage(stage, seconds, details):
+    """Records a stage finished by a RunRecorder
+
+    Args:
+        stage (String): Name of the stage
+        seconds (float): Duration of the stage
+        details (dict): Details of the stage, including error if it raised an exception
+    """
+    STAGE_DURATION.observe(seconds, stage=stage)
+    if "error" in details:
+        STAGE_FAILURES.inc(stage=stage)
+
+
+add_stage_callback(_observe_stage)
+
+
+@contextmanager
+def time_stage(stage):
+    """Records the duration of a stage, and counts it as failed if it raises an exception
+
+    Args:
+        stage (String): Name of the stage
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    except BaseException:
+        STAGE_FAILURES.inc(stage=stage)
+        raise
+    finally:
+        STAGE_DURATION.observe(time.perf_counter() - start, stage=stage)
+
+
+def record_cache_lookup(cache, is_hit):
+    """Counts a lookup of a cache
+
+    Args:
+        cache (String): Name of the cache
+        is_hit (bool): True if the lookup found a value
+    """
+    CACHE_LOOKUPS.inc(cache=cache, result="hit" if is_hit else "miss")
+
+
+def _get_hit_ratios():
+    """Gets the fraction of lookups that hit for each cache
+
+    Returns:
+        dict(tuple(String), float): Hit ratio keyed by cache name
+    """
+    lookups = {}
+    for _, labels, value in CACHE_LOOKUPS.get_samples():
+        hits, total = lookups.get(labels["cache"], (0, 0))
+        lookups[labels["cache"]] = (
+            hits + (value if labels["result"] == "hit" else 0),
+            total + value,
+        )
+
+    return {(cache,): hits / total for cache, (hits, total) in lookups.items() if total}
+
+
+def _escape(value, is_label=True):
+    value = value.replace("\\", "\\\\").replace("\n", "\\n")
+    return value.replace('"', '\\"') if is_label else value
+
+
+def _format_labels(labels):
+    if not labels:
+        return ""
+
+    return (
+        "{"
+        + ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items())
+        + "}"
+    )
+
+
+def _format_value(value):
+    if value == math.inf:
+        return "+Inf"
+    if value == -math.inf:
+        return "-Inf"
+
+    return repr(value) if isinstance(value, float) else str(value)
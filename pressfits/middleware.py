@@ -0,0 +1,39 @@
+import time
+
+from django.utils.deprecation import MiddlewareMixin
+
+from pressfits.metrics import REGISTRY, Counter, Histogram
+
+REQUESTS = REGISTRY.register(
+    Counter(
+        "pressfits_requests",
+        "Number of requests handled, by route, method and status code",
+        ("route", "method", "status"),
+    )
+)
+REQUEST_DURATION = REGISTRY.register(
+    Histogram(
+        "pressfits_request_duration_seconds",
+        "Time taken to handle requests, by route",
+        ("route",),
+    )
+)
+
+
+class RequestMetricsMiddleware(MiddlewareMixin):
+    """Counts and times every request. Requests are labelled by their URL pattern rather than
+    their path, so that job ids don't create a label value for every job."""
+
+    def process_request(self, request):
+        request.metrics_start = time.perf_counter()
+
+    def process_response(self, request, response):
+        start = getattr(request, "metrics_start", None)
+        match = getattr(request, "resolver_match", None)
+        route = match.route if match is not None else "unmatched"
+
+        REQUESTS.inc(route=route, method=request.method, status=response.status_code)
+        if start is not None:
+            REQUEST_DURATION.observe(time.perf_counter() - start, route=route)
+
+        return response
@@ -1,48 +1,182 @@
+import asyncio
+import logging
 import math
+import os
 import subprocess
+import threading
+import time
 from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
 
 import matplotlib.pyplot as plt
 import matplotlib.tri as tri
+import numpy as np
 
 from pressfits.concentric_axisymmetric_mesh import ConcentricAxisymmetricMesh
 from pressfits.concentric_plane_stress_mesh import ConcentricPlaneStressMesh
 from pressfits.element import Element
+from pressfits.instrumentation import get_recorder, instrumented
 from pressfits.node import Node
+from pressfits.probe import FieldProbe
+from pressfits.result_set import ResultSet
 from pressfits.results import (Contact, Displacement, Force, Result, Strain,
                                Stress)
+from pressfits.shape_functions import extrapolate_integration_points
+
+logger = logging.getLogger(__name__)
 
 _ENTRY_LENGTH = 12
+_POLL_INTERVAL = 0.05  # Seconds between checks for new solver output when streaming
 _CMAP = "jet"
 
 Material = namedtuple("Material", "name youngs_modulus poissons_ratio")
 
+# Node and element ids are assigned from global counters, so meshes must be built one at a time
+MESH_LOCK = threading.RLock()
+
+
+def reset_mesh_ids():
+    """Restarts node and element ids from 1, so that the ids of the next mesh index its nodes
+    and elements whatever was meshed before, including builds that failed. MESH_LOCK must be held.
+    """
+    Node.reset_node_count()
+    Element.reset_element_count()
+
 
 class PressFitModel:
     def __init__(self, mesh, name):
-        Node.reset_node_count()
-        Element.reset_element_count()
         self.mesh = mesh
         self.elements = mesh.get_elements()
         self.nodes = mesh.get_nodes()
         self.name = name
+
+        # Stages of the mesh and model are recorded together
+        self.recorder = get_recorder(mesh)
+        self.recorder.name = name
+        self.recorder.set(node_count=len(self.nodes), element_count=len(self.elements))
         self.inp_str = ""
+        self.step_times = {}  # Time of each step key, as a fraction of the step
         self.nodal_results = ""
         self.elemental_results = ""
 
-    def run_model(self, inner_material, outer_material):
-        """Creates an input file and solves the model"""
-        self._create_input_file(inner_material, outer_material)
+    @classmethod
+    def load_results(cls, path, name=None):
+        """Reopens a model from a result archive created by save_results, without parsing any ccx output
+
+        Args:
+            path (String): Path of the .npz archive
+            name (String, optional): Name to give the model. Defaults to the name of the stored model.
+
+        Returns:
+            PressFitModel: Model with the stored mesh and results
+        """
+        return cls.from_result_set(ResultSet.load(path), name)
+
+    @classmethod
+    def from_result_set(cls, result_set, name=None):
+        """Creates a model from the mesh and results of a result set, without parsing any ccx output
+
+        Args:
+            result_set (ResultSet): Stored mesh and results
+            name (String, optional): Name to give the model. Defaults to the name of the stored model.
+
+        Returns:
+            PressFitModel: Model with the stored mesh and results
+        """
+        model = cls.__new__(cls)
+        with MESH_LOCK:
+            PressFitModel.__init__(
+                model,
+                result_set.to_mesh(),
+                name if name is not None else result_set.name,
+            )
+        result_set.apply_results(model)
+        return model
+
+    def save_results(self, path):
+        """Saves the mesh and parsed results of the model to a compressed binary archive
+
+        Args:
+            path (String): Path of the .npz archive
+        """
+        ResultSet.from_model(self).save(path)
+
+    def emit_run_record(self, **values):
+        """Finishes recording the run of the model, logging one structured record of its stages
+
+        Args:
+            **values: Values to include in the record, such as a job id
+
+        Returns:
+            dict: The record
+        """
+        return self.recorder.emit(**values)
+
+    @instrumented("run_model")
+    def run_model(self, inner_material, outer_material, increments=1):
+        """Creates an input file and solves the model
+
+        Args:
+            inner_material (Material): Material of the inner part
+            outer_material (Material): Material of the outer part
+            increments (int, optional): Number of increments to ramp the interference over, each
+                with its own step key of results. Defaults to 1.
+        """
+        self._create_input_file(inner_material, outer_material, increments)
 
         runstr = f"ccx {self.name}"
-        subprocess.check_call(runstr, shell=True)
-        print("Solving done!")
+        with self.recorder.stage("ccx"):
+            subprocess.check_call(runstr, shell=True)
+        logger.debug("Solving done!")
+
+    @instrumented("run_model")
+    async def run_model_async(self, inner_material, outer_material, increments=1):
+        """Creates an input file and solves the model in an asyncio subprocess, so that the event
+        loop is free while ccx runs. The name of the model may include a directory, which ccx is
+        run in. ccx is killed if the solve is cancelled.
 
-    def _create_input_file(self, inner_material, outer_material):
+        Args:
+            inner_material (Material): Material of the inner part
+            outer_material (Material): Material of the outer part
+            increments (int, optional): Number of increments to ramp the interference over. Defaults to 1.
+
+        Raises:
+            subprocess.CalledProcessError: If ccx exits with a non-zero return code
+        """
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(
+            None, self._create_input_file, inner_material, outer_material, increments
+        )
+
+        directory, name = os.path.split(self.name)
+        with self.recorder.stage("ccx"):
+            process = await asyncio.create_subprocess_exec(
+                "ccx",
+                name,
+                cwd=directory or None,
+                stdout=asyncio.subprocess.DEVNULL,
+                stderr=asyncio.subprocess.PIPE,
+            )
+
+            try:
+                _, stderr = await process.communicate()
+            except asyncio.CancelledError:
+                process.kill()
+                await process.wait()
+                raise
+
+        if process.returncode:
+            raise subprocess.CalledProcessError(
+                process.returncode, f"ccx {name}", stderr=stderr
+            )
+        logger.debug("Solving done!")
+
+    @instrumented("deck")
+    def _create_input_file(self, inner_material, outer_material, increments=1):
         """Creates a .inp file representing the model"""
-        self.inp_str = self.mesh.get_inp_str(inner_material, outer_material)
+        self.inp_str = self.mesh.get_inp_str(inner_material, outer_material, increments)
         with open(f"{self.name}.inp", "w") as f:
-            f.write(self.inp_str)
+            self.recorder.add(bytes_written=f.write(self.inp_str))
 
     def get_nodal_results_str(self):
         with open(f"{self.name}.frd", "r") as file:
@@ -54,46 +188,127 @@ class PressFitModel:
             data = file.read()
         return data
 
+    @instrumented("run_model")
+    def run_model_streaming(self, inner_material, outer_material, increments=1):
+        """Creates an input file and solves the model, parsing the .frd and .dat results
+        concurrently while ccx is still writing them. Results are fully read once this returns,
+        so read_nodal_results and read_element_results should not be called afterwards.
+
+        Args:
+            inner_material (Material): Material of the inner part
+            outer_material (Material): Material of the outer part
+            increments (int, optional): Number of increments to ramp the interference over. Defaults to 1.
+
+        Raises:
+            subprocess.CalledProcessError: If ccx exits with a non-zero return code, caused by
+                any error parsing its partial results
+        """
+        self._create_input_file(inner_material, outer_material, increments)
+
+        # Stale results from a previous run of the same name would otherwise be parsed
+        for extension in ("frd", "dat"):
+            if os.path.exists(f"{self.name}.{extension}"):
+                os.remove(f"{self.name}.{extension}")
+
+        runstr = f"ccx {self.name}"
+        process = subprocess.Popen(runstr, shell=True)
+
+        # Parsing overlaps the solve, so both are timed as one stage
+        with self.recorder.stage("ccx_streaming"), ThreadPoolExecutor(
+            max_workers=2
+        ) as executor:
+            nodal_future = executor.submit(
+                self._parse_nodal_lines, tail_lines(f"{self.name}.frd", process)
+            )
+            element_future = executor.submit(
+                self._parse_element_lines, tail_lines(f"{self.name}.dat", process)
+            )
+            return_code = process.wait()
+            errors = [future.exception() for future in (nodal_future, element_future)]
+            parse_error = next((e for e in errors if e is not None), None)
+
+        # A failed solve leaves partial results, so its error comes before any from parsing them
+        if return_code:
+            raise subprocess.CalledProcessError(return_code, runstr) from parse_error
+        if parse_error is not None:
+            raise parse_error
+        self.recorder.add(
+            bytes_read=os.path.getsize(f"{self.name}.frd")
+            + os.path.getsize(f"{self.name}.dat")
+        )
+        logger.debug("Solving done!")
+
+    @instrumented("frd_parse")
     def read_nodal_results(self):
         """Read nodal results from a .frd file"""
-        print("Reading Nodal Results")
+        logger.debug("Reading Nodal Results")
+
+        with open(f"{self.name}.frd", "r") as f:
+            self._parse_nodal_lines(f)
+        self.recorder.add(bytes_read=os.path.getsize(f"{self.name}.frd"))
+
+    def _parse_nodal_lines(self, lines):
+        """Parses nodal results from lines in the .frd format, acting on each results block once complete
+
+        Args:
+            lines (iterable(String)): Lines of a .frd file
+        """
         # Tracks whether the current lines being read are part of a set of nodal results
         is_results_block = False
         results_block = []
 
-        with open(f"{self.name}.frd", "r") as f:
-            for line in f:
-                if is_results_block:
-                    if line[:3] == " -3":  # End of results block
-                        is_results_block = False
-                        self._read_nodal_results_block(results_block)
-                        continue
+        for line in lines:
+            if is_results_block:
+                if line[:3] == " -3":  # End of results block
+                    is_results_block = False
+                    self._read_nodal_results_block(results_block)
+                    continue
 
-                    results_block.append(line)
+                results_block.append(line)
 
-                elif "1PSTEP" in line:  # Start of results block
-                    is_results_block = True
-                    results_block = []
+            elif "1PSTEP" in line:  # Start of results block
+                is_results_block = True
+                results_block = []
 
+    @instrumented("dat_parse")
     def read_element_results(self):
         """Reads results for elements from a .dat file"""
-        print("Reading Element Results")
+        logger.debug("Reading Element Results")
 
         with open(f"{self.name}.dat", "r") as f:
-            for _ in range(3):
-                next(f)  # Skip the header text
+            self._parse_element_lines(f)
+        self.recorder.add(bytes_read=os.path.getsize(f"{self.name}.dat"))
+
+    def _parse_element_lines(self, lines):
+        """Parses elemental stresses from lines in the .dat format. Only the stresses of the last
+        increment are kept when the file has several.
+
+        Args:
+            lines (iterable(String)): Lines of a .dat file
+        """
+        has_results = False
 
-            for line in f:
+        for line in lines:
+            try:
                 element_num = int(line[:10])
-                line = line[10:]
-                line = line.lstrip()
+            except ValueError:
+                if line.lstrip().startswith("stresses") and has_results:
+                    # Start of a later increment, replacing the stresses of the earlier one
+                    for element in self.elements:
+                        element.results = []
+                    has_results = False
+                continue  # Header text or a blank line
+
+            line = line[10:]
+            line = line.lstrip()
 
-                # Space delimited, first entry is integration point number
-                data = line.split(" ")
-                data = list(filter(lambda item: item != "", data))
-                data = list(map(float, data))
+            # Space delimited, first entry is integration point number
+            data = line.split(" ")
+            data = list(filter(lambda item: item != "", data))
+            data = list(map(float, data))
 
-                self.elements[element_num - 1].results.append(Stress(*data[1:]))
+            self.elements[element_num - 1].results.append(Stress(*data[1:]))
+            has_results = True
 
     def _read_nodal_results_block(self, block):
         """Read a block of nodal results in a .inp file, as started with the header    1PSTEP                         1           1           1          ...
@@ -106,6 +321,7 @@ class PressFitModel:
         """
 
         key = int(block[0][7:_ENTRY_LENGTH])
+        self.step_times[key] = float(block[0][_ENTRY_LENGTH : 2 * _ENTRY_LENGTH])
 
         # Skip the first line
         block = block[1:]
@@ -185,9 +401,9 @@ class PressFitModel:
                     * 1000
                 )
             except KeyError:
-                print(f"Error Key: {key}, Node: {node.id}")
+                logger.warning(f"Error Key: {key}, Node: {node.id}")
             except AttributeError:
-                print(f"Attribute Error: {key}, Node: {node.id}")
+                logger.warning(f"Attribute Error: {key}, Node: {node.id}")
 
         self.nodal_plot(x, y, values, "Radial Displacement (μm)")
 
@@ -206,21 +422,56 @@ class PressFitModel:
             try:
                 values.append(node.results[key].stress.get_von_mises() / 1000**2)
             except KeyError:
-                print(f"Error Key: {key}, Node: {node.id}")
+                logger.warning(f"Error Key: {key}, Node: {node.id}")
         self.nodal_plot(x, y, values, "Von Mises Stress (MPA)")
 
+    @instrumented("get_elemental_stresses_summary")
     def get_elemental_stresses_summary(self):
         return {element.id: self.mean_stress(element) for element in self.elements}
 
+    @instrumented("get_nodal_displacements_summary")
     def get_nodal_displacements_summary(self, key=101):
         return {
             node.id: node.results[key].displacement.get_total_displacement()
             for node in self.nodes
         }
 
+    @instrumented("get_x_nodal_forces_summary")
     def get_x_nodal_forces_summary(self, key=101):
         return {node.id: node.results[key].force.x for node in self.nodes}
 
+    def get_nodal_stresses(self):
+        """Extrapolates the integration point stresses of every element to its nodes and averages
+        them across the elements sharing each node
+
+        Returns:
+            np.ndarray: (n, 6) stresses of each node in the order of self.nodes (Pa)
+        """
+        offsets = np.zeros(len(self.elements) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum([len(element.results) for element in self.elements])
+        stresses = np.array(
+            [
+                [stress.xx, stress.yy, stress.zz, stress.xy, stress.yz, stress.zx]
+                for element in self.elements
+                for stress in element.results
+            ]
+        ).reshape(-1, 6)
+
+        return self.mesh.get_adjacency().average_to_nodes(
+            extrapolate_integration_points(offsets, stresses)
+        )
+
+    def get_field_probe(self, key=101):
+        """Creates a probe that interpolates results at arbitrary points of the model
+
+        Args:
+            key (int, optional): Step of simulation to probe. Defaults to 101.
+
+        Returns:
+            FieldProbe: Probe of the model's results
+        """
+        return FieldProbe(self, key)
+
     @staticmethod
     def mean_stress(element):
         vm_stresses = [stress.get_von_mises() for stress in element.results]
@@ -233,7 +484,7 @@ class PressFitModel:
 
     def plot_element_mean_vm_stress(self):
         """Create a matplotlib plot of the mean Von Mises stress across elements"""
-        print("Showing elements")
+        logger.debug("Showing elements")
 
         x = []
         y = []
@@ -294,6 +545,7 @@ class PressFitModel:
         plt.title("Von Mises Stress (MPA)")
         plt.show()
 
+    @instrumented("max_contact_pressure")
     def max_contact_pressure(self, key=101):
         """Gets the maximum normal contact pressure of the contacts within the model
 
@@ -308,6 +560,7 @@ class PressFitModel:
 
         return contact_pressure * 1e-6
 
+    @instrumented("max_element_vm_stress")
     def max_element_vm_stress(self, part_number=0):
         """Gets the maximum averaged elemental Von Mises stress within a part
 
@@ -336,15 +589,117 @@ class PressFitModel:
 
         return max_ * 1e-6
 
-    def get_radial_deflections(self):
+    @instrumented("get_radial_deflections")
+    def get_radial_deflections(self, key=101):
         """Gets radial deflections of the outer and inner nodes
 
+        Args:
+            key (int, optional): Step of simulation. Defaults to 101.
+
         Returns:
             (float, float): Inner deflection (m) and outer deflection (m)
         """
         return self._get_avg_radial_deflection(
-            self.mesh.get_inner_nodes()
-        ), self._get_avg_radial_deflection(self.mesh.get_outer_nodes())
+            self.mesh.get_inner_nodes(), key
+        ), self._get_avg_radial_deflection(self.mesh.get_outer_nodes(), key)
+
+    def get_summary(self):
+        """Gets the summary values of the solved model, at the full interference. Solves that
+        ramped the interference over several increments also include the interference_curve.
+
+        Returns:
+            dict: Contact pressure and maximum stresses (MPa), and radial deflections (m)
+        """
+        key = self.get_final_key()
+        inner_deflection, outer_deflection = self.get_radial_deflections(key)
+
+        summary = {
+            "contact_pressure": self.max_contact_pressure(key),
+            "max_inner_vm_stress": self.max_element_vm_stress(0),
+            "max_outer_vm_stress": self.max_element_vm_stress(1),
+            "inner_radial_deflection": inner_deflection,
+            "outer_radial_deflection": outer_deflection,
+        }
+        if len(self.get_step_keys()) > 1:
+            summary["interference_curve"] = self.get_interference_curve()
+
+        return summary
+
+    def get_step_keys(self):
+        """Gets the keys of every step with nodal results, one for each increment written by ccx
+
+        Returns:
+            list(int): Sorted step keys
+        """
+        return sorted({key for node in self.nodes for key in node.results})
+
+    def get_final_key(self):
+        """Gets the key of the last step with nodal results, that of the full interference
+
+        Returns:
+            int: Step key, 101 if no results have been read
+        """
+        return max(self.get_step_keys(), default=101)
+
+    def max_nodal_vm_stress(self, part_number=0, key=101):
+        """Gets the maximum nodal Von Mises stress within a part
+
+        Args:
+            part_number (int, optional): Part number of nodes. Defaults to 0.
+            key (int, optional): Step of simulation. Defaults to 101.
+
+        Returns:
+            float: Maximum Von Mises stress (MPa)
+        """
+        max_ = 0.0
+        for node in self.nodes:
+            if node.part != part_number:
+                continue
+
+            result = node.results.get(key)
+            if result is not None and result.stress is not None:
+                max_ = max(max_, result.stress.get_von_mises())
+
+        return max_ * 1e-6
+
+    @instrumented("get_interference_curve")
+    def get_interference_curve(self, interference=None):
+        """Gets the response of every increment of a solve that ramped the interference. The
+        interference of each increment is its fraction of the step times the full interference.
+        Stresses are those of the nodes, as only the elemental stresses of the last increment
+        are kept.
+
+        Args:
+            interference (float, optional): Full diametral interference (m). Defaults to the
+                difference between the outer diameter of the inner part and the internal diameter
+                of the outer part of the mesh.
+
+        Returns:
+            list(dict): Interference (m), contact pressure and maximum nodal stresses (MPa), and
+                radial deflections (m) of each increment, in order
+        """
+        if interference is None:
+            interference = self.mesh.od_0 - self.mesh.id_1
+
+        keys = self.get_step_keys()
+        curve = []
+        for i, key in enumerate(keys):
+            # Increments are equal, if the time of the step was not read from the .frd file
+            time = self.step_times.get(key, (i + 1) / len(keys))
+            inner_deflection, outer_deflection = self.get_radial_deflections(key)
+            curve.append(
+                {
+                    "time": time,
+                    "interference": time * interference,
+                    "contact_pressure": self.max_contact_pressure(key),
+                    "max_inner_vm_stress": self.max_nodal_vm_stress(0, key),
+                    "max_outer_vm_stress": self.max_nodal_vm_stress(1, key),
+                    "inner_radial_deflection": inner_deflection,
+                    "outer_radial_deflection": outer_deflection,
+                }
+            )
+
+        return curve
 
     @staticmethod
     def _get_avg_radial_deflection(nodes, key=101):
@@ -362,9 +717,9 @@ class PressFitModel:
             try:
                 values.append(node.results[key].displacement.get_total_displacement())
             except KeyError:
-                print(f"Error Key: {key}, Node: {node.id}")
+                logger.warning(f"Error Key: {key}, Node: {node.id}")
             except AttributeError:
-                print(f"Attribute Error: {key}, Node: {node.id}")
+                logger.warning(f"Attribute Error: {key}, Node: {node.id}")
 
         return sum(values) / len(values)
 
@@ -387,17 +742,61 @@ def get_nodal_values(text):
     return node_id, return_vals
 
 
+def tail_lines(path, process, poll_interval=_POLL_INTERVAL):
+    """Yields complete lines of a file as they are written by another process. Waits for the file
+    to be created and stops once the process has exited and the remainder of the file has been read.
+
+    Args:
+        path (String): Path of the file being written
+        process (subprocess.Popen): The process writing the file
+        poll_interval (float, optional): Seconds to wait between checks for new content. Defaults to _POLL_INTERVAL.
+
+    Yields:
+        String: A line of the file, including its newline character
+    """
+    while not os.path.exists(path):
+        if process.poll() is not None and not os.path.exists(path):
+            return  # The process exited without writing the file
+        time.sleep(poll_interval)
+
+    with open(path, "r") as f:
+        partial = ""
+
+        while True:
+            # Checked before reading so that everything written before exiting is read
+            is_finished = process.poll() is not None
+
+            line = f.readline()
+            while line:
+                partial += line
+                if partial.endswith("\n"):
+                    yield partial
+                    partial = ""
+                line = f.readline()
+
+            if is_finished:
+                break
+            time.sleep(poll_interval)
+
+        if partial:
+            yield partial
+
+
 class PlaneStressPressFitModel(PressFitModel):
     def __init__(self, id_0, id_1, od_0, od_1, name):
-        mesh = ConcentricPlaneStressMesh(id_0, id_1, od_0, od_1)
-        super().__init__(mesh, name)
+        with MESH_LOCK:
+            reset_mesh_ids()
+            mesh = ConcentricPlaneStressMesh(id_0, id_1, od_0, od_1)
+            super().__init__(mesh, name)
 
 
 class AxisymmetricPressFitModel(PressFitModel):
     def __init__(self, id_0, id_1, od_0, od_1, len_0, len_1, name, **kwargs):
         lines_per_part = kwargs.get("lines_per_part")
 
-        mesh = ConcentricAxisymmetricMesh(
-            id_0, id_1, od_0, od_1, len_0, len_1, lines_per_part=lines_per_part
-        )
-        super().__init__(mesh, name)
+        with MESH_LOCK:
+            reset_mesh_ids()
+            mesh = ConcentricAxisymmetricMesh(
+                id_0, id_1, od_0, od_1, len_0, len_1, lines_per_part=lines_per_part
+            )
+            super().__init__(mesh, name)
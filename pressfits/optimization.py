@@ -0,0 +1,317 @@
+import math
+from functools import partial
+
+import numpy as np
+
+from pressfits import analytical
+from pressfits.result_set import INTERFACE_NODE_SET
+from pressfits.scaling import LinearScalingCache
+
+_MAX_BRACKET_EXPANSIONS = 20
+
+
+def get_mean_contact_pressure(result_set):
+    """Gets the mean contact pressure along the interface of a result set, weighting the
+    pressure of each node of the interface by its spacing. The axisymmetric mesh is a repeating
+    slice of the contact length, so the mean holds along the whole contact.
+
+    Args:
+        result_set (ResultSet): Results of a solve
+
+    Returns:
+        float: Mean contact pressure (Pa)
+    """
+    key = max(result_set.get_step_keys())
+    rows = result_set.get_node_rows(result_set.node_sets[INTERFACE_NODE_SET])
+    y = result_set.coordinates[rows, 1]
+    order = np.argsort(y)
+    y = y[order]
+    # Open nodes carry no pressure
+    pressures = np.nan_to_num(
+        result_set.nodal_results[key]["contact"][rows, 3].astype(float)
+    )[order]
+
+    # Trapezoidal integral of the pressure along the interface
+    force = np.sum((pressures[1:] + pressures[:-1]) / 2 * np.diff(y))
+    return float(force / (y[-1] - y[0]))
+
+
+def get_holding_force(
+    mean_contact_pressure, contact_diameter, length, friction_coefficient
+):
+    """Gets the axial force a press fit holds before slipping
+
+    Args:
+        mean_contact_pressure (float): Mean contact pressure (Pa)
+        contact_diameter (float): Diameter of the contact (m)
+        length (float): Contact length (m)
+        friction_coefficient (float): Coefficient of friction between the parts
+
+    Returns:
+        float: Holding force (N). The holding torque is this times half the contact diameter.
+    """
+    return (
+        friction_coefficient
+        * mean_contact_pressure
+        * math.pi
+        * contact_diameter
+        * length
+    )
+
+
+def find_root(function, low, high, rtol, max_evaluations):
+    """Finds the root of an increasing function by false position, halving the value kept at
+    an end that stays fixed (the Illinois method). The bracket is moved down or up until the
+    function changes sign within it.
+
+    Args:
+        function (callable): The function, taking and returning a float
+        low (float): Lower end of the first bracket, greater than 0
+        high (float): Upper end of the first bracket
+        rtol (float): Largest absolute function value, or width of the bracket relative to the
+            root, of a converged root
+        max_evaluations (int): Evaluations of the function before stopping
+
+    Raises:
+        ValueError: If the function does not change sign within _MAX_BRACKET_EXPANSIONS moves
+
+    Returns:
+        (float, bool): The root, and whether it converged
+    """
+    f_low = function(low)
+    f_high = function(high)
+    evaluations = 2
+    for _ in range(_MAX_BRACKET_EXPANSIONS):
+        if f_low < 0 <= f_high:
+            break
+
+        if f_low >= 0:
+            high, f_high = low, f_low
+            low /= 2
+            f_low = function(low)
+        else:
+            low, f_low = high, f_high
+            high *= 2
+            f_high = function(high)
+        evaluations += 1
+    else:
+        raise ValueError("The function does not change sign")
+
+    side = 0
+    root = high
+    while evaluations < max_evaluations:
+        root = high - f_high * (high - low) / (f_high - f_low)
+        f_root = function(root)
+        evaluations += 1
+
+        if abs(f_root) <= rtol or high - low <= rtol * root:
+            return root, True
+
+        if f_root < 0:
+            low, f_low = root, f_root
+            if side == -1:
+                f_high /= 2
+            side = -1
+        else:
+            high, f_high = root, f_root
+            if side == 1:
+                f_low /= 2
+            side = 1
+
+    return root, False
+
+
+def find_minimum_interference(
+    id_0,
+    id_1,
+    od_1,
+    length,
+    inner_material,
+    outer_material,
+    holding_force=None,
+    holding_torque=None,
+    friction_coefficient=analytical.DEFAULT_FRICTION_COEFFICIENT,
+    inner_yield_strength=None,
+    outer_yield_strength=None,
+    lines_per_part=None,
+    cache=None,
+    work_directory=None,
+    rtol=1e-4,
+    max_evaluations=12,
+    max_solves=4,
+):
+    """Finds the smallest diametral interference of an axisymmetric press fit that holds a
+    required axial force and torque, by sizing the outer diameter of the inner part. A first
+    solve is made at the interference Lamé's equations give, then the root is bracketed and
+    found from its results scaled to each interference. Solves are kept in a LinearScalingCache,
+    and the root is found again from a new solve only if it moves too far from the reference
+    to share its mesh.
+
+    Args:
+        id_0 (float): Internal diameter of inner part (m)
+        id_1 (float): Internal diameter of outer part (m)
+        od_1 (float): Outer diameter of outer part (m)
+        length (float): Contact length (m)
+        inner_material (Material): Material of the inner part
+        outer_material (Material): Material of the outer part
+        holding_force (float, optional): Axial force the fit must hold (N). Defaults to None.
+        holding_torque (float, optional): Torque the fit must hold (N m). Defaults to None.
+        friction_coefficient (float, optional): Coefficient of friction between the parts. Defaults to analytical.DEFAULT_FRICTION_COEFFICIENT.
+        inner_yield_strength (float, optional): Yield strength of the inner part (MPa). Defaults to None, not checked.
+        outer_yield_strength (float, optional): Yield strength of the outer part (MPa). Defaults to None, not checked.
+        lines_per_part (int, optional): Number of lines per part used by the mesh. Defaults to None, the mesh default.
+        cache (LinearScalingCache, optional): Cache of reference solves, shared with other
+            optimizations. Defaults to None, a cache of this optimization only.
+        work_directory (String, optional): Directory to solve in. Defaults to None, the system temporary directory.
+        rtol (float, optional): Relative error of the capacity at the interference found. Defaults to 1e-4.
+        max_evaluations (int, optional): Capacity evaluations of each root finding. Defaults to 12.
+        max_solves (int, optional): Reference solves before stopping. Defaults to 4.
+
+    Raises:
+        ValueError: If neither a holding force nor torque is required, or one is not positive
+        subprocess.CalledProcessError: If ccx exits with a non-zero return code
+
+    Returns:
+        dict: Interference and outer diameter of the inner part (m), the capacity and summary
+            values of the fit with it, the largest interference before either part yields (m)
+            and whether the fit is feasible, the analytical interference (m), every evaluation,
+            and the number of ccx solves
+    """
+    if holding_force is None and holding_torque is None:
+        raise ValueError("A holding force or torque is required")
+    for value in (holding_force, holding_torque):
+        if value is not None and not value > 0:
+            raise ValueError("Required holding force and torque must be positive")
+
+    if cache is None:
+        cache = LinearScalingCache()
+
+    def get_required_force(interference):
+        # Torque is held at the contact radius, which grows with the interference
+        contact_diameter = id_1 + interference / 2
+        return max(
+            holding_force or 0.0,
+            (holding_torque or 0.0) / (contact_diameter / 2),
+        )
+
+    def get_analytical_capacity(interference):
+        summary = analytical.get_summary(
+            id_0,
+            id_1,
+            id_1 + interference,
+            od_1,
+            length,
+            inner_material.youngs_modulus,
+            inner_material.poissons_ratio,
+            outer_material.youngs_modulus,
+            outer_material.poissons_ratio,
+            friction_coefficient,
+        )
+        return float(summary["holding_force"]) / get_required_force(interference) - 1
+
+    references = {}
+    evaluations = []
+
+    def get_results(interference):
+        results = cache.get_results(
+            id_0,
+            id_1,
+            id_1 + interference,
+            od_1,
+            length,
+            inner_material,
+            outer_material,
+            lines_per_part,
+            work_directory,
+        )
+        if results not in references:
+            references[results] = get_mean_contact_pressure(results.result_set)
+
+        return results
+
+    def get_holding(results, interference):
+        mean_contact_pressure = references[results] * results.get_scale(interference)
+        return get_holding_force(
+            mean_contact_pressure,
+            id_1 + interference / 2,
+            length,
+            friction_coefficient,
+        )
+
+    def get_capacity(results, interference):
+        force = get_holding(results, interference)
+        evaluations.append(
+            {
+                "interference": interference,
+                "holding_force": force,
+                "holding_torque": force * (id_1 + interference / 2) / 2,
+            }
+        )
+        # Relative to the requirement, so that rtol is the relative error of the capacity
+        return force / get_required_force(interference) - 1
+
+    # Lamé's equations are close to the finite element results, so bracket their root
+    initial = id_1 * 1e-4
+    analytical_interference, _ = find_root(
+        get_analytical_capacity, initial * 1e-3, initial, rtol, 100
+    )
+
+    interference = analytical_interference
+    results = get_results(interference)
+    for _ in range(max_solves):
+        # Evaluations scale the results of the reference, so finding the root needs no solves
+        interference, converged = find_root(
+            partial(get_capacity, results),
+            interference / 2,
+            interference * 2,
+            rtol,
+            max_evaluations,
+        )
+
+        root_results = get_results(interference)
+        if root_results is results:
+            break
+        # The root is too far from the reference to share its mesh, so is found again from a
+        # solve close to it
+        results = root_results
+    else:
+        converged = False
+
+    summary = results.get_summary(interference)
+    force = get_holding(results, interference)
+
+    # Stresses are proportional to the interference, so yield limits the interference
+    maximum_interference = math.inf
+    for name, yield_strength in (
+        ("max_inner_vm_stress", inner_yield_strength),
+        ("max_outer_vm_stress", outer_yield_strength),
+    ):
+        if yield_strength is not None and summary[name] > 0:
+            maximum_interference = min(
+                maximum_interference, interference * yield_strength / summary[name]
+            )
+
+    return {
+        "interference": interference,
+        "od_0": id_1 + interference,
+        "converged": converged,
+        "holding_force": force,
+        "holding_torque": force * (id_1 + interference / 2) / 2,
+        **{
+            name: summary[name]
+            for name in (
+                "contact_pressure",
+                "max_inner_vm_stress",
+                "max_outer_vm_stress",
+                "inner_radial_deflection",
+                "outer_radial_deflection",
+            )
+        },
+        "maximum_interference": (
+            None if math.isinf(maximum_interference) else maximum_interference
+        ),
+        "feasible": interference <= maximum_interference,
+        "analytical_interference": analytical_interference,
+        "evaluations": evaluations,
+        "solves": len(references),
+    }
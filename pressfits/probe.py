@@ -0,0 +1,295 @@
+import math
+
+import numpy as np
+
+from pressfits.shape_functions import shape_function_derivatives, shape_functions
+
+_NEWTON_ITERATIONS = 12
+# Allowance outside of [-1, 1] for a point to be within an element
+_NATURAL_TOLERANCE = 1e-6
+_POSITION_TOLERANCE = 1e-9  # Relative to the element size
+
+
+class FieldProbe:
+    """Evaluates nodal fields of a solved model at arbitrary points. Points are located within
+    elements through a uniform grid of element bounding boxes, then fields are interpolated
+    with the element's quadratic shape functions. For axisymmetric models, x is the radial
+    and y the axial coordinate, and stress components are ordered radial, axial, hoop, shear.
+    """
+
+    def __init__(self, model, key=101):
+        """Builds the spatial index of a model
+
+        Args:
+            model (PressFitModel): The model to probe, with results read
+            key (int, optional): Step of simulation to probe. Defaults to 101.
+        """
+        self.model = model
+        self.key = key
+        self.coordinates = np.array([[node.x, node.y] for node in model.nodes])
+        self.node_parts = np.array([node.part for node in model.nodes])
+        self.element_nodes = model.mesh.get_adjacency().element_nodes
+        self.element_parts = self.node_parts[self.element_nodes[:, 0]]
+        self._fields = {}
+
+        element_coordinates = self.coordinates[self.element_nodes]
+        self.element_min = element_coordinates.min(axis=1)
+        self.element_max = element_coordinates.max(axis=1)
+        self.element_size = (self.element_max - self.element_min).max(axis=1)
+        self._build_grid()
+
+    def _build_grid(self):
+        """Buckets element bounding boxes into a uniform grid with roughly one element per cell"""
+        self.origin = self.element_min.min(axis=0)
+        extent = self.element_max.max(axis=0) - self.origin
+        element_count = len(self.element_nodes)
+
+        self.cell_size = max(
+            math.sqrt(max(extent[0] * extent[1], 1e-30) / max(element_count, 1)),
+            extent.max() / 4096,  # Limit memory use for very thin domains
+        )
+        self.shape = np.maximum(np.ceil(extent / self.cell_size).astype(int), 1)
+
+        low = self._cell_of(self.element_min - _POSITION_TOLERANCE * self.cell_size)
+        high = self._cell_of(self.element_max + _POSITION_TOLERANCE * self.cell_size)
+        spans = high - low + 1
+        counts = spans[:, 0] * spans[:, 1]
+
+        # Expand every element into each of the cells its bounding box covers
+        elements = np.repeat(np.arange(element_count), counts)
+        local = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        cell_x = low[elements, 0] + local % spans[elements, 0]
+        cell_y = low[elements, 1] + local // spans[elements, 0]
+        cells = cell_y * self.shape[0] + cell_x
+
+        order = np.argsort(cells, kind="stable")
+        self.cell_elements = elements[order]
+        self.cell_indptr = np.zeros(self.shape[0] * self.shape[1] + 1, dtype=np.int64)
+        self.cell_indptr[1:] = np.cumsum(
+            np.bincount(cells, minlength=self.shape[0] * self.shape[1])
+        )
+
+    def _cell_of(self, points):
+        """Gets the grid cell containing each point, clamped to the grid
+
+        Args:
+            points (np.ndarray): (k, 2) points
+
+        Returns:
+            np.ndarray: (k, 2) cell x and y indices
+        """
+        cells = np.floor((points - self.origin) / self.cell_size).astype(int)
+        return np.clip(cells, 0, self.shape - 1)
+
+    def locate(self, points, part=None):
+        """Finds the element containing each point and the point's natural coordinates within it
+
+        Args:
+            points (np.ndarray): (k, 2) points
+            part (int, optional): Only locate points within elements of this part. Defaults to None.
+
+        Returns:
+            (np.ndarray, np.ndarray): (k,) element indices, -1 for points outside of the mesh, and (k, 2) natural coordinates
+        """
+        points = np.asarray(points, dtype=float).reshape(-1, 2)
+        cells = self._cell_of(points)
+        cell_ids = cells[:, 1] * self.shape[0] + cells[:, 0]
+
+        # Pair every point with every candidate element of its cell
+        starts = self.cell_indptr[cell_ids]
+        counts = self.cell_indptr[cell_ids + 1] - starts
+        pair_points = np.repeat(np.arange(len(points)), counts)
+        pair_elements = self.cell_elements[
+            np.repeat(starts, counts)
+            + np.arange(counts.sum())
+            - np.repeat(np.cumsum(counts) - counts, counts)
+        ]
+
+        in_box = np.all(
+            (
+                points[pair_points]
+                >= self.element_min[pair_elements]
+                - _POSITION_TOLERANCE * self.element_size[pair_elements, None]
+            )
+            & (
+                points[pair_points]
+                <= self.element_max[pair_elements]
+                + _POSITION_TOLERANCE * self.element_size[pair_elements, None]
+            ),
+            axis=1,
+        )
+        if part is not None:
+            in_box &= self.element_parts[pair_elements] == part
+        pair_points = pair_points[in_box]
+        pair_elements = pair_elements[in_box]
+
+        natural, is_inside = self._inverse_map(
+            points[pair_points], self.coordinates[self.element_nodes[pair_elements]]
+        )
+
+        elements = np.full(len(points), -1)
+        natural_coordinates = np.full((len(points), 2), np.nan)
+
+        # Take the first element found for points on shared edges
+        pair_points = pair_points[is_inside][::-1]
+        elements[pair_points] = pair_elements[is_inside][::-1]
+        natural_coordinates[pair_points] = natural[is_inside][::-1]
+
+        return elements, natural_coordinates
+
+    @staticmethod
+    def _inverse_map(points, element_coordinates):
+        """Finds natural coordinates of points within elements with Newton iterations
+
+        Args:
+            points (np.ndarray): (k, 2) points
+            element_coordinates (np.ndarray): (k, 8, 2) node coordinates of the element paired with each point
+
+        Returns:
+            (np.ndarray, np.ndarray): (k, 2) natural coordinates and (k,) whether each point is within its element
+        """
+        natural = np.zeros((len(points), 2))
+
+        for _ in range(_NEWTON_ITERATIONS):
+            residual = (
+                np.einsum(
+                    "kn,knc->kc",
+                    shape_functions(natural[:, 0], natural[:, 1]),
+                    element_coordinates,
+                )
+                - points
+            )
+            jacobian = np.einsum(
+                "knd,knc->kcd",
+                shape_function_derivatives(natural[:, 0], natural[:, 1]),
+                element_coordinates,
+            )
+            determinant = (
+                jacobian[:, 0, 0] * jacobian[:, 1, 1]
+                - jacobian[:, 0, 1] * jacobian[:, 1, 0]
+            )
+            step_xi = (
+                jacobian[:, 1, 1] * residual[:, 0] - jacobian[:, 0, 1] * residual[:, 1]
+            ) / determinant
+            step_eta = (
+                jacobian[:, 0, 0] * residual[:, 1] - jacobian[:, 1, 0] * residual[:, 0]
+            ) / determinant
+            natural = np.clip(
+                natural - np.stack([step_xi, step_eta], axis=-1), -2.0, 2.0
+            )
+
+        positions = np.einsum(
+            "kn,knc->kc",
+            shape_functions(natural[:, 0], natural[:, 1]),
+            element_coordinates,
+        )
+        size = np.ptp(element_coordinates, axis=1).max(axis=1)
+        is_inside = (np.abs(natural).max(axis=1) <= 1 + _NATURAL_TOLERANCE) & (
+            np.linalg.norm(positions - points, axis=1) <= 1e-6 * size
+        )
+
+        return natural, is_inside
+
+    def get_nodal_field(self, quantity):
+        """Gets the values of a quantity at every node
+
+        Args:
+            quantity (String): One of displacement, stress, strain, force or contact. Stresses are
+                extrapolated from integration points, other quantities are read from nodal results.
+
+        Returns:
+            np.ndarray: (n, c) nodal values
+        """
+        if quantity not in self._fields:
+            if quantity == "stress":
+                self._fields[quantity] = self.model.get_nodal_stresses()
+            else:
+                self._fields[quantity] = np.array(
+                    [
+                        list(
+                            getattr(node.results[self.key], quantity).__dict__.values()
+                        )
+                        for node in self.model.nodes
+                    ]
+                )
+
+        return self._fields[quantity]
+
+    def probe(self, points, quantity, part=None):
+        """Interpolates a quantity at points
+
+        Args:
+            points (np.ndarray): (k, 2) points
+            quantity (String): One of displacement, stress, strain, force or contact
+            part (int, optional): Only probe elements of this part. Defaults to None.
+
+        Returns:
+            np.ndarray: (k, c) interpolated values. NaN for points outside of the mesh.
+        """
+        elements, natural = self.locate(points, part)
+        field = self.get_nodal_field(quantity)
+
+        values = np.full((len(elements), field.shape[1]), np.nan)
+        found = elements != -1
+        weights = shape_functions(natural[found, 0], natural[found, 1])
+        values[found] = np.einsum(
+            "kn,knc->kc", weights, field[self.element_nodes[elements[found]]]
+        )
+
+        return values
+
+    def probe_line(self, start, end, count, quantity, part=None):
+        """Interpolates a quantity at evenly spaced points along a straight line
+
+        Args:
+            start ((float, float)): Start of the line
+            end ((float, float)): End of the line
+            count (int): Number of points, including the start and end
+            quantity (String): One of displacement, stress, strain, force or contact
+            part (int, optional): Only probe elements of this part. Defaults to None.
+
+        Returns:
+            (np.ndarray, np.ndarray): (count, 2) points and (count, c) interpolated values
+        """
+        points = np.linspace(start, end, count)
+        return points, self.probe(points, quantity, part)
+
+    def probe_radial_line(self, y, part, count, quantity):
+        """Interpolates a quantity along a radial line through the full thickness of a part
+
+        Args:
+            y (float): Axial position of the line
+            part (int): Part to probe
+            count (int): Number of points
+            quantity (String): One of displacement, stress, strain, force or contact
+
+        Returns:
+            (np.ndarray, np.ndarray): (count, 2) points and (count, c) interpolated values
+        """
+        is_part = self.node_parts == part
+        x_min = self.coordinates[is_part, 0].min()
+        x_max = self.coordinates[is_part, 0].max()
+
+        return self.probe_line((x_min, y), (x_max, y), count, quantity, part)
+
+    def probe_interface(self, part, count, quantity):
+        """Interpolates a quantity along the contact surface of a part of an axisymmetric model
+
+        Args:
+            part (int): 0 for the outer surface of the inner part, 1 for the inner surface of the outer part
+            count (int): Number of points
+            quantity (String): One of displacement, stress, strain, force or contact
+
+        Returns:
+            (np.ndarray, np.ndarray): (count, 2) points and (count, c) interpolated values
+        """
+        is_part = self.node_parts == part
+        x = (
+            self.coordinates[is_part, 0].max()
+            if part == 0
+            else self.coordinates[is_part, 0].min()
+        )
+        y_min = self.coordinates[is_part, 1].min()
+        y_max = self.coordinates[is_part, 1].max()
+
+        return self.probe_line((x, y_min), (x, y_max), count, quantity, part)
@@ -0,0 +1,41 @@
+from rest_framework import renderers
+
+from pressfits.metrics import time_stage
+from pressfits.transport import BINARY_CONTENT_TYPE, encode_arrays, encode_json
+
+
+class FastJSONRenderer(renderers.BaseRenderer):
+    """Renders compact JSON without the overhead of the generic JSONRenderer, and supports numpy arrays"""
+
+    media_type = "application/json"
+    format = "json"
+    charset = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+
+        with time_stage("serialize"):
+            return encode_json(data)
+
+
+class ArrayRenderer(renderers.BaseRenderer):
+    """Renders a dictionary of {"arrays", "metadata", "quantize"} as a typed array buffer.
+    Other data, such as error details, is rendered as metadata without arrays."""
+
+    media_type = BINARY_CONTENT_TYPE
+    format = "arrays"
+    charset = None
+    render_style = "binary"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+
+        if "arrays" not in data:
+            return encode_arrays({}, metadata=data)
+
+        with time_stage("serialize"):
+            return encode_arrays(
+                data["arrays"], data.get("metadata"), data.get("quantize", ())
+            )
@@ -0,0 +1,416 @@
+import json
+
+import numpy as np
+
+from pressfits.adjacency import MeshAdjacency
+from pressfits.element import Element, PSElement
+from pressfits.node import Node
+from pressfits.results import (Contact, Displacement, Force, Result, Strain,
+                               Stress)
+
+# Nodal result quantities, mapped to their dataclass and the Result attribute they are stored in
+NODAL_QUANTITIES = {
+    "displacement": Displacement,
+    "stress": Stress,
+    "strain": Strain,
+    "force": Force,
+    "contact": Contact,
+}
+
+# Node set of the slave surface of the contact pair, the outer surface of the inner part, whose
+# nodes ccx reports the contact results of
+INTERFACE_NODE_SET = "L2"
+_ARCHIVE_VERSION = 1
+_RESULT_DTYPE = np.float32  # Results are written to six significant figures by ccx
+
+
+class ResultSet:
+    """Array representation of a solved model's mesh and results. Nodes and elements are stored
+    in id order, so row i of every nodal array corresponds to node_ids[i]."""
+
+    def __init__(
+        self,
+        node_ids,
+        coordinates,
+        node_parts,
+        element_ids,
+        connectivity,
+        node_sets,
+        element_sets,
+        surfaces,
+        nodal_results,
+        integration_point_offsets,
+        integration_point_stresses,
+        element_inp_name=None,
+        name=None,
+    ):
+        """Creates a result set from arrays
+
+        Args:
+            node_ids (np.ndarray): (n,) node ids
+            coordinates (np.ndarray): (n, 3) node coordinates
+            node_parts (np.ndarray): (n,) part number of each node
+            element_ids (np.ndarray): (m,) element ids
+            connectivity (np.ndarray): (m, 8) node ids of each element, in ccx order
+            node_sets (dict(String, np.ndarray)): Named node id sets
+            element_sets (dict(String, np.ndarray)): Named element id sets
+            surfaces (dict(String, np.ndarray)): Named (k, 2) arrays of element id and face number
+            nodal_results (dict(int, dict(String, np.ndarray))): Arrays of nodal results for each
+                quantity in NODAL_QUANTITIES, keyed by step. Nodes without a result are NaN.
+            integration_point_offsets (np.ndarray): (m + 1,) offsets of each element's rows within integration_point_stresses
+            integration_point_stresses (np.ndarray): (k, 6) integration point stresses of every element
+            element_inp_name (String, optional): The ccx element type. Defaults to None.
+            name (String, optional): Name of the model the results were produced by. Defaults to None.
+        """
+        self.node_ids = node_ids
+        self.coordinates = coordinates
+        self.node_parts = node_parts
+        self.element_ids = element_ids
+        self.connectivity = connectivity
+        self.node_sets = node_sets
+        self.element_sets = element_sets
+        self.surfaces = surfaces
+        self.nodal_results = nodal_results
+        self.integration_point_offsets = integration_point_offsets
+        self.integration_point_stresses = integration_point_stresses
+        self.element_inp_name = element_inp_name
+        self.name = name
+
+    @classmethod
+    def from_model(cls, model):
+        """Creates a result set from a model that has had its results read
+
+        Args:
+            model (PressFitModel): The model to store
+
+        Returns:
+            ResultSet: Array representation of the model
+        """
+        mesh = model.mesh
+        nodes = model.nodes
+        elements = model.elements
+
+        nodal_results = {}
+        for i, node in enumerate(nodes):
+            for key, result in node.results.items():
+                step = nodal_results.setdefault(key, {})
+
+                for quantity, result_type in NODAL_QUANTITIES.items():
+                    value = getattr(result, quantity)
+                    if value is None:
+                        continue
+
+                    if quantity not in step:
+                        step[quantity] = np.full(
+                            (len(nodes), len(result_type.__dataclass_fields__)),
+                            np.nan,
+                            dtype=_RESULT_DTYPE,
+                        )
+                    step[quantity][i] = list(value.__dict__.values())
+
+        offsets = np.zeros(len(elements) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum([len(element.results) for element in elements])
+        stresses = np.array(
+            [
+                list(stress.__dict__.values())
+                for element in elements
+                for stress in element.results
+            ],
+            dtype=_RESULT_DTYPE,
+        ).reshape(-1, 6)
+
+        node_sets = {
+            "inner": [node.id for node in mesh.get_inner_nodes()],
+            "outer": [node.id for node in mesh.get_outer_nodes()],
+        }
+        for i in range(8):
+            edge = getattr(mesh, f"l_{i}", None)
+            if edge is not None:
+                node_sets[f"L{i}"] = edge
+
+        element_sets = {
+            f"PART{part}": [
+                element.id for element in elements if element.get_part() == part
+            ]
+            for part in {element.get_part() for element in elements}
+        }
+
+        return cls(
+            node_ids=np.array([node.id for node in nodes], dtype=np.int32),
+            coordinates=np.array([[node.x, node.y, node.z] for node in nodes]),
+            node_parts=np.array([node.part for node in nodes], dtype=np.int8),
+            element_ids=np.array([element.id for element in elements], dtype=np.int32),
+            connectivity=np.array(
+                [element.get_ids() for element in elements], dtype=np.int32
+            ).reshape(-1, 8),
+            node_sets={
+                name: np.array(ids, dtype=np.int32) for name, ids in node_sets.items()
+            },
+            element_sets={
+                name: np.array(ids, dtype=np.int32)
+                for name, ids in element_sets.items()
+            },
+            surfaces=_get_surfaces(mesh),
+            nodal_results=nodal_results,
+            integration_point_offsets=offsets,
+            integration_point_stresses=stresses,
+            element_inp_name=getattr(mesh, "element_inp_name", None),
+            name=model.name,
+        )
+
+    def get_step_keys(self):
+        """Gets the keys of every step with nodal results
+
+        Returns:
+            list(int): Sorted step keys
+        """
+        return sorted(self.nodal_results)
+
+    def get_node_rows(self, node_ids):
+        """Gets the rows of nodes within the nodal arrays
+
+        Args:
+            node_ids (np.ndarray): Ids of nodes of the result set
+
+        Returns:
+            np.ndarray: Row of each node
+        """
+        return np.searchsorted(self.node_ids, node_ids)
+
+    def get_element_mean_von_mises(self):
+        """Gets the mean Von Mises stress of the integration points of each element
+
+        Returns:
+            np.ndarray: (m,) mean Von Mises stress of each element (Pa). NaN for elements without results.
+        """
+        vm_stresses = von_mises(self.integration_point_stresses.astype(float))
+        counts = np.diff(self.integration_point_offsets)
+
+        sums = np.zeros(len(counts))
+        has_results = counts > 0
+        sums[has_results] = np.add.reduceat(
+            vm_stresses, self.integration_point_offsets[:-1][has_results]
+        )
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(has_results, sums / counts, np.nan)
+
+    def save(self, path):
+        """Saves the result set as a compressed .npz archive
+
+        Args:
+            path (String): Path of the archive
+        """
+        arrays = {
+            "node_ids": self.node_ids,
+            "coordinates": self.coordinates,
+            "node_parts": self.node_parts,
+            "element_ids": self.element_ids,
+            "connectivity": self.connectivity,
+            "integration_point_offsets": self.integration_point_offsets,
+            "integration_point_stresses": self.integration_point_stresses,
+        }
+        for name, ids in self.node_sets.items():
+            arrays[f"nset__{name}"] = ids
+        for name, ids in self.element_sets.items():
+            arrays[f"elset__{name}"] = ids
+        for name, faces in self.surfaces.items():
+            arrays[f"surface__{name}"] = faces
+        for key, step in self.nodal_results.items():
+            for quantity, values in step.items():
+                arrays[f"step__{key}__{quantity}"] = values
+
+        metadata = {
+            "version": _ARCHIVE_VERSION,
+            "element_inp_name": self.element_inp_name,
+            "name": self.name,
+        }
+        arrays["metadata"] = np.array(json.dumps(metadata))
+
+        np.savez_compressed(path, **arrays)
+
+    @classmethod
+    def load(cls, path):
+        """Loads a result set from an archive created by save
+
+        Args:
+            path (String): Path of the archive
+
+        Raises:
+            ValueError: If the archive was written by an unsupported version
+
+        Returns:
+            ResultSet: The stored result set
+        """
+        node_sets = {}
+        element_sets = {}
+        surfaces = {}
+        nodal_results = {}
+
+        with np.load(path) as archive:
+            metadata = json.loads(str(archive["metadata"]))
+            if metadata["version"] != _ARCHIVE_VERSION:
+                raise ValueError(
+                    f"Unsupported result archive version: {metadata['version']}"
+                )
+
+            for name in archive.files:
+                if name.startswith("nset__"):
+                    node_sets[name[len("nset__") :]] = archive[name]
+                elif name.startswith("elset__"):
+                    element_sets[name[len("elset__") :]] = archive[name]
+                elif name.startswith("surface__"):
+                    surfaces[name[len("surface__") :]] = archive[name]
+                elif name.startswith("step__"):
+                    _, key, quantity = name.split("__")
+                    nodal_results.setdefault(int(key), {})[quantity] = archive[name]
+
+            return cls(
+                node_ids=archive["node_ids"],
+                coordinates=archive["coordinates"],
+                node_parts=archive["node_parts"],
+                element_ids=archive["element_ids"],
+                connectivity=archive["connectivity"],
+                node_sets=node_sets,
+                element_sets=element_sets,
+                surfaces=surfaces,
+                nodal_results=nodal_results,
+                integration_point_offsets=archive["integration_point_offsets"],
+                integration_point_stresses=archive["integration_point_stresses"],
+                element_inp_name=metadata["element_inp_name"],
+                name=metadata["name"],
+            )
+
+    def to_mesh(self):
+        """Rebuilds node and element objects, without results, from the stored arrays
+
+        Returns:
+            ArchivedMesh: Mesh of the stored nodes and elements
+        """
+        nodes = []
+        for node_id, (x, y, z), part in zip(
+            self.node_ids, self.coordinates, self.node_parts
+        ):
+            node = Node(float(x), float(y), float(z), part=int(part))
+            node.id = int(node_id)
+            nodes.append(node)
+
+        node_by_id = {node.id: node for node in nodes}
+        element_type = PSElement if self.element_inp_name == "CPE8" else Element
+
+        elements = []
+        for element_id, node_ids in zip(self.element_ids, self.connectivity):
+            element = element_type([node_by_id[int(i)] for i in node_ids])
+            element.id = int(element_id)
+            elements.append(element)
+
+        return ArchivedMesh(self, nodes, elements)
+
+    def apply_results(self, model):
+        """Populates the results of a model's nodes and elements from the stored arrays
+
+        Args:
+            model (PressFitModel): Model with nodes and elements in the same order as this result set
+        """
+        for key, step in self.nodal_results.items():
+            rows = {
+                quantity: values.astype(float).tolist()
+                for quantity, values in step.items()
+            }
+
+            for i, node in enumerate(model.nodes):
+                result = Result()
+                for quantity, values in rows.items():
+                    if not np.isnan(values[i][0]):
+                        setattr(
+                            result, quantity, NODAL_QUANTITIES[quantity](*values[i])
+                        )
+                node.results[key] = result
+
+        stresses = self.integration_point_stresses.astype(float).tolist()
+        for i, element in enumerate(model.elements):
+            start, end = self.integration_point_offsets[i : i + 2]
+            element.results = [Stress(*values) for values in stresses[start:end]]
+
+
+def von_mises(stresses):
+    """Get Von Mises equivalent stresses of an array of stress tensors
+
+    Args:
+        stresses (np.ndarray): (k, 6) stresses in the order xx, yy, zz, xy, yz, zx
+
+    Returns:
+        np.ndarray: (k,) Von Mises equivalent stresses
+    """
+    xx, yy, zz, xy, yz, zx = stresses.T
+    return (
+        ((xx - yy) ** 2 + (yy - zz) ** 2 + (zz - xx) ** 2) / 2
+        + 3 * (xy**2 + yz**2 + zx**2)
+    ) ** 0.5
+
+
+class ArchivedMesh:
+    """Stands in for a ConcentricMesh that has been rebuilt from a ResultSet"""
+
+    def __init__(self, result_set, nodes, elements):
+        self.result_set = result_set
+        self.nodes = nodes
+        self.elements = elements
+        self.element_inp_name = result_set.element_inp_name
+        self.surfaces = result_set.surfaces
+        self._adjacency = None
+
+        node_by_id = {node.id: node for node in nodes}
+        self.inner_nodes = [node_by_id[int(i)] for i in result_set.node_sets["inner"]]
+        self.outer_nodes = [node_by_id[int(i)] for i in result_set.node_sets["outer"]]
+
+        for i in range(8):
+            if f"L{i}" in result_set.node_sets:
+                setattr(self, f"l_{i}", result_set.node_sets[f"L{i}"].tolist())
+
+    def get_nodes(self):
+        return self.nodes
+
+    def get_elements(self):
+        return self.elements
+
+    def get_adjacency(self):
+        if self._adjacency is None:
+            self._adjacency = MeshAdjacency(
+                self.result_set.node_ids,
+                self.result_set.element_ids,
+                self.result_set.connectivity,
+            )
+
+        return self._adjacency
+
+    def get_inner_nodes(self):
+        return self.inner_nodes
+
+    def get_outer_nodes(self):
+        return self.outer_nodes
+
+
+def _get_surfaces(mesh):
+    """Gets the contact surfaces of a mesh as arrays of element id and face number
+
+    Args:
+        mesh (ConcentricMesh): The mesh to get surfaces of
+
+    Returns:
+        dict(String, np.ndarray): (k, 2) arrays keyed by surface name
+    """
+    if not hasattr(mesh, "_surface_string"):
+        return dict(getattr(mesh, "surfaces", {}))
+
+    surfaces = {}
+    for is_inner in (True, False):
+        lines = mesh._surface_string(is_inner).splitlines()
+        name = lines[0].split("NAME=")[1].split(",")[0]
+        faces = [
+            (int(element_id), int(face[1:]))
+            for element_id, face in (line.split(",") for line in lines[1:] if line)
+        ]
+        surfaces[name] = np.array(faces, dtype=np.int32).reshape(-1, 2)
+
+    return surfaces
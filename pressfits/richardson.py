@@ -0,0 +1,280 @@
+import argparse
+import json
+import math
+
+import numpy as np
+
+from pressfits.sweep import parse_material, solve_designs
+
+# Summary values that are extrapolated, each from get_summary
+QUANTITIES = (
+    "contact_pressure",
+    "max_inner_vm_stress",
+    "max_outer_vm_stress",
+    "inner_radial_deflection",
+    "outer_radial_deflection",
+)
+# Lines per part of the coarse solves. Quadratic elements span three lines, so lines are odd.
+DEFAULT_LEVELS = (5, 7, 9)
+# Order of convergence assumed with only two meshes, that of the displacements of the quadratic
+# CAX8 elements
+DEFAULT_ORDER = 2.0
+# Range of observed orders of convergence used, from half to one more than the order of the
+# quadratic elements. Orders outside it come from meshes not yet in the asymptotic range, and
+# would make the extrapolation blow up as the order approaches 0.
+_ORDER_LIMITS = (0.5, DEFAULT_ORDER + 1)
+# Safety factors of the grid convergence index with three meshes, or two and an assumed order
+_SAFETY_FACTORS = {2: 3.0, 3: 1.25}
+_ORDER_ITERATIONS = 50
+
+
+def get_observed_order(values, ratios, limits=_ORDER_LIMITS):
+    """Gets the observed order of convergence of values on three meshes, by the fixed point
+    iteration of Celik et al. (2008) that allows refinement ratios to differ. The order is kept
+    within limits throughout, as the iteration diverges for orders approaching 0.
+
+    Args:
+        values ((float, float, float)): Values on the fine, medium and coarse meshes
+        ratios ((float, float)): Refinement ratios of the medium to fine and coarse to medium meshes
+        limits ((float, float), optional): Lowest and highest order. Defaults to _ORDER_LIMITS.
+
+    Returns:
+        (float, bool, bool): Observed order, whether convergence is oscillatory, and whether
+            the order was clamped to limits
+    """
+    fine, medium, coarse = values
+    ratio_21, ratio_32 = ratios
+    difference_21 = medium - fine
+    difference_32 = coarse - medium
+    sign = math.copysign(1, difference_32 / difference_21)
+    low, high = limits
+
+    order = abs(math.log(abs(difference_32 / difference_21))) / math.log(ratio_21)
+    for _ in range(_ORDER_ITERATIONS):
+        order = min(max(order, low), high)
+        q = math.log((ratio_21**order - sign) / (ratio_32**order - sign))
+        order = abs(math.log(abs(difference_32 / difference_21)) + q) / math.log(
+            ratio_21
+        )
+        is_clamped = not low <= order <= high
+
+    return min(max(order, low), high), sign < 0, is_clamped
+
+
+def get_mesh_size(result_set):
+    """Gets the representative size of a mesh, the square root of the mean area of its elements
+    (Celik et al., 2008). Unlike the number of lines of a part, it accounts for the finer
+    inflation layers at the surfaces of the parts and the tiled length of the mesh.
+
+    Args:
+        result_set (ResultSet): Results of a solve of the mesh
+
+    Returns:
+        float: Mesh size (m)
+    """
+    corners = result_set.coordinates[
+        result_set.get_node_rows(result_set.connectivity[:, :4])
+    ]
+    x = corners[:, :, 0]
+    y = corners[:, :, 1]
+    # Shoelace formula over the corners of each element
+    areas = 0.5 * np.abs(
+        np.sum(x * np.roll(y, -1, axis=1) - np.roll(x, -1, axis=1) * y, axis=1)
+    )
+    return float(np.sqrt(areas.mean()))
+
+
+def extrapolate(values, lines_per_part, order=None, sizes=None):
+    """Extrapolates values on meshes of increasing density to the mesh independent limit, with
+    Richardson extrapolation. The error estimate is the grid convergence index of the finest
+    mesh, a band the limit is expected to lie within. An observed order outside of
+    _ORDER_LIMITS is clamped to it, as the meshes are not yet in the asymptotic range.
+
+    Args:
+        values (list(float)): Value on each mesh
+        lines_per_part (list(int)): Lines per part of each mesh, 2 or 3 distinct values above 1
+        order (float, optional): Order of convergence. Defaults to None, that observed on three
+            meshes or DEFAULT_ORDER on two.
+        sizes (list(float), optional): Size of each mesh, as from get_mesh_size. Defaults to
+            None, inversely proportional to the spacings between the lines of a part, one fewer
+            than the lines, which assumes the lines are evenly spaced.
+
+    Raises:
+        ValueError: If there are not 2 or 3 meshes of distinct densities, or finer meshes are not
+            smaller
+
+    Returns:
+        dict: The extrapolated value, the value on the finest mesh, the order used, whether
+            convergence is oscillatory, whether the observed order was clamped, and the grid
+            convergence index as an absolute and relative error of the finest value
+    """
+    if (
+        len(values) != len(lines_per_part)
+        or len(lines_per_part) not in (2, 3)
+        or len(set(lines_per_part)) != len(lines_per_part)
+        or min(lines_per_part) < 2
+    ):
+        raise ValueError("Values of 2 or 3 meshes of distinct densities are required")
+    if sizes is None:
+        sizes = [1 / (density - 1) for density in lines_per_part]
+    elif len(sizes) != len(lines_per_part):
+        raise ValueError("A size is required for each mesh")
+
+    # Finest first
+    meshes = sorted(zip(lines_per_part, sizes, values), reverse=True)
+    sizes = [size for _, size, _ in meshes]
+    values = [value for _, _, value in meshes]
+    ratios = [sizes[i + 1] / sizes[i] for i in range(len(sizes) - 1)]
+    if min(ratios) <= 1:
+        raise ValueError("Meshes with more lines per part must be smaller")
+
+    fine = values[0]
+    difference = values[1] - fine
+    result = {
+        "value": fine,
+        "fine_value": fine,
+        "order": order,
+        "oscillatory": False,
+        "clamped": False,
+    }
+    if difference == 0:
+        # The two finest meshes agree, so the value is converged
+        return {**result, "error": 0.0, "relative_error": 0.0}
+
+    if order is None:
+        if len(values) == 3 and values[2] != values[1]:
+            order, oscillatory, is_clamped = get_observed_order(values, ratios)
+            result["oscillatory"] = oscillatory
+            result["clamped"] = is_clamped
+        else:
+            order = DEFAULT_ORDER
+    result["order"] = order
+
+    denominator = ratios[0] ** order - 1
+    error = _SAFETY_FACTORS[len(values)] * abs(difference) / denominator
+
+    return {
+        **result,
+        "value": fine - difference / denominator,
+        "error": error,
+        "relative_error": error / abs(fine) if fine != 0 else math.inf,
+    }
+
+
+def get_extrapolated_summary(
+    design, levels=DEFAULT_LEVELS, workers=None, work_directory=None, order=None
+):
+    """Solves an axisymmetric design on coarse meshes in parallel and extrapolates each of
+    QUANTITIES to the mesh independent limit, with the size of each mesh from get_mesh_size
+
+    Args:
+        design (dict(String, object)): Parameters of the design, as from sweep.get_designs.
+            Its lines_per_part is ignored.
+        levels (tuple(int), optional): Lines per part of each mesh, 2 or 3 distinct odd values
+            of at least 3. Defaults to DEFAULT_LEVELS.
+        workers (int, optional): Number of processes. 0 solves in this process. Defaults to
+            None, the processor count.
+        work_directory (String, optional): Directory to solve in. Defaults to None, the system temporary directory.
+        order (float, optional): Order of convergence. Defaults to None, that observed.
+
+    Raises:
+        ValueError: If the levels cannot be meshed or extrapolated
+        RuntimeError: If a mesh fails to solve
+
+    Returns:
+        dict: Extrapolation of each of QUANTITIES, from extrapolate, with the summary of each
+            mesh, its size (m) and the duration of its solve (s)
+    """
+    if (
+        len(levels) not in (2, 3)
+        or len(set(levels)) != len(levels)
+        or any(level < 3 or level % 2 == 0 for level in levels)
+    ):
+        raise ValueError(
+            "2 or 3 distinct odd numbers of lines of at least 3 are required"
+        )
+
+    rows = sorted(
+        solve_designs(
+            enumerate({**design, "lines_per_part": level} for level in levels),
+            workers,
+            work_directory,
+            keep_results=True,
+        ),
+        key=lambda row: row["design"],
+    )
+    for row in rows:
+        if row["error"] is not None:
+            raise RuntimeError(
+                f"Solving with {row['lines_per_part']} lines per part failed: {row['error']}"
+            )
+
+    sizes = [get_mesh_size(row["result_set"]) for row in rows]
+    levels = [row["lines_per_part"] for row in rows]
+
+    return {
+        **{
+            name: extrapolate([row[name] for row in rows], levels, order, sizes)
+            for name in QUANTITIES
+        },
+        "meshes": [
+            {
+                "lines_per_part": row["lines_per_part"],
+                "size": size,
+                "seconds": row["seconds"],
+                **{name: row[name] for name in QUANTITIES},
+            }
+            for row, size in zip(rows, sizes)
+        ],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Solve an axisymmetric press fit on two or three coarse meshes in parallel and "
+        "extrapolate its summary to the mesh independent limit, with a grid convergence index "
+        "error estimate. Dimensions are in m."
+    )
+    for name in ("id_0", "id_1", "od_0", "od_1", "length"):
+        parser.add_argument(f"--{name.replace('_', '-')}", type=float, required=True)
+    for name in ("inner_material", "outer_material"):
+        parser.add_argument(
+            f"--{name.replace('_', '-')}",
+            required=True,
+            type=parse_material,
+            help="name:youngs_modulus_gpa:poissons_ratio",
+        )
+    parser.add_argument(
+        "--levels",
+        nargs="+",
+        type=int,
+        default=DEFAULT_LEVELS,
+        help="Odd lines per part of each mesh",
+    )
+    parser.add_argument(
+        "--order", type=float, help="Order of convergence. Defaults to that observed."
+    )
+    parser.add_argument("--workers", type=int, help="Defaults to the processor count")
+    parser.add_argument("--work-directory")
+    args = parser.parse_args()
+
+    design = {
+        name: getattr(args, name)
+        for name in (
+            "id_0",
+            "id_1",
+            "od_0",
+            "od_1",
+            "length",
+            "inner_material",
+            "outer_material",
+        )
+    }
+    result = get_extrapolated_summary(
+        design, tuple(args.levels), args.workers, args.work_directory, args.order
+    )
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
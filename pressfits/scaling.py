@@ -0,0 +1,361 @@
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from pressfits.metrics import record_cache_lookup
+from pressfits.model import AxisymmetricPressFitModel
+from pressfits.result_set import INTERFACE_NODE_SET, ResultSet
+
+# Summary values proportional to the interference. Others, such as job ids, are kept as they are.
+_SCALED_SUMMARY_KEYS = (
+    "contact_pressure",
+    "max_inner_vm_stress",
+    "max_outer_vm_stress",
+    "inner_radial_deflection",
+    "outer_radial_deflection",
+)
+_CACHE_SIZE = 64  # Number of reference solves kept
+# Largest relative difference of contact diameters of a reference and the design it answers
+_DIAMETER_RTOL = 1e-3
+_SIGNIFICANT_DIGITS = 12
+
+
+class ScaledResults:
+    """Answers solves of a geometry at any interference from one reference solve. With linear
+    elastic parts and the linear pressure-overclosure law of the deck, the parts overlap by the
+    interference along the whole contact, so every displacement, stress, strain, force and
+    contact value is proportional to the interference. Scaling by a positive factor cannot open
+    closed contact or close open contact, so the contact state of the reference holds at every
+    interference and is not checked again; only a reference with closed contact is accepted.
+    Coordinates remain those of the reference mesh."""
+
+    def __init__(self, result_set, interference, summary):
+        """Creates scaled results from a reference solve
+
+        Args:
+            result_set (ResultSet): Results of the reference solve
+            interference (float): Diametral interference of the reference solve (m)
+            summary (dict): Summary values of the reference solve, as from PressFitModel.get_summary
+
+        Raises:
+            ValueError: If the reference has no interference, or none of its contact is closed
+        """
+        if not interference > 0:
+            raise ValueError("The reference solve must have a positive interference")
+
+        self.result_set = result_set
+        self.interference = interference
+        self.summary = summary
+
+        key = max(result_set.get_step_keys())
+        contact = result_set.nodal_results[key].get("contact")
+        # Nodes of the contact interface, and those carrying pressure at the reference
+        self.contact_nodes = np.zeros(len(result_set.node_ids), dtype=bool)
+        self.contact_nodes[
+            result_set.get_node_rows(result_set.node_sets[INTERFACE_NODE_SET])
+        ] = True
+        pressures = (
+            np.zeros(len(result_set.node_ids))
+            if contact is None
+            else np.nan_to_num(contact[:, 3])
+        )
+        self.closed_nodes = self.contact_nodes & (pressures > 0)
+        if not self.closed_nodes.any():
+            raise ValueError("The contact of the reference solve is not closed")
+
+    @classmethod
+    def from_model(cls, model, interference=None):
+        """Creates scaled results from a solved model whose results have been read
+
+        Args:
+            model (PressFitModel): The solved model
+            interference (float, optional): Diametral interference of the model (m). Defaults to
+                the overlap of the diameters of its mesh.
+
+        Returns:
+            ScaledResults: Results of the model at any interference
+        """
+        if interference is None:
+            interference = model.mesh.od_0 - model.mesh.id_1
+
+        return cls(ResultSet.from_model(model), interference, model.get_summary())
+
+    def get_scale(self, interference):
+        """Gets the factor results are scaled by to reach an interference. Clearance fits have
+        no contact to scale.
+
+        Args:
+            interference (float): Diametral interference (m)
+
+        Raises:
+            ValueError: If the interference is not positive
+
+        Returns:
+            float: Ratio of the interference to that of the reference
+        """
+        if not interference > 0:
+            raise ValueError(
+                f"Results can only be scaled to a positive interference, not {interference}"
+            )
+
+        return interference / self.interference
+
+    def get_summary(self, interference):
+        """Gets the summary values at an interference
+
+        Args:
+            interference (float): Diametral interference (m)
+
+        Returns:
+            dict: Summary of the reference with every value proportional to the interference scaled
+        """
+        scale = self.get_scale(interference)
+        summary = {
+            **self.summary,
+            **{
+                name: self.summary[name] * scale
+                for name in _SCALED_SUMMARY_KEYS
+                if name in self.summary
+            },
+        }
+        if "interference_curve" in self.summary:
+            summary["interference_curve"] = [
+                {
+                    name: value if name == "time" else value * scale
+                    for name, value in point.items()
+                }
+                for point in self.summary["interference_curve"]
+            ]
+
+        return summary
+
+    def get_result_set(self, interference):
+        """Gets the fields at an interference. Mesh arrays are shared with the reference.
+
+        Args:
+            interference (float): Diametral interference (m)
+
+        Returns:
+            ResultSet: Results with every nodal and integration point value scaled
+        """
+        scale = self.get_scale(interference)
+        reference = self.result_set
+        dtype = reference.integration_point_stresses.dtype
+
+        return ResultSet(
+            node_ids=reference.node_ids,
+            coordinates=reference.coordinates,
+            node_parts=reference.node_parts,
+            element_ids=reference.element_ids,
+            connectivity=reference.connectivity,
+            node_sets=reference.node_sets,
+            element_sets=reference.element_sets,
+            surfaces=reference.surfaces,
+            nodal_results={
+                key: {
+                    quantity: values * values.dtype.type(scale)
+                    for quantity, values in step.items()
+                }
+                for key, step in reference.nodal_results.items()
+            },
+            integration_point_offsets=reference.integration_point_offsets,
+            integration_point_stresses=reference.integration_point_stresses
+            * dtype.type(scale),
+            element_inp_name=reference.element_inp_name,
+            name=reference.name,
+        )
+
+
+def get_geometry_key(
+    id_0, od_1, length, inner_material, outer_material, lines_per_part
+):
+    """Gets the key of the inputs of an axisymmetric solve that scaled results must share
+
+    Args:
+        id_0 (float): Internal diameter of inner part (m)
+        od_1 (float): Outer diameter of outer part (m)
+        length (float): Contact length (m)
+        inner_material (Material): Material of the inner part
+        outer_material (Material): Material of the outer part
+        lines_per_part (int): Number of lines per part used by the mesh, or None for the mesh default
+
+    Returns:
+        tuple: Normalized inputs
+    """
+
+    def normalize(value):
+        return float(f"{float(value):.{_SIGNIFICANT_DIGITS}g}")
+
+    return (
+        normalize(id_0),
+        normalize(od_1),
+        normalize(length),
+        normalize(inner_material.youngs_modulus),
+        normalize(inner_material.poissons_ratio),
+        normalize(outer_material.youngs_modulus),
+        normalize(outer_material.poissons_ratio),
+        None if lines_per_part is None else int(lines_per_part),
+    )
+
+
+class LinearScalingCache:
+    """Keeps reference solves of recently used geometries, so that designs differing from one
+    only in interference are answered by scaling its results instead of running ccx. A design
+    matches a reference of the same geometry key whose contact diameter, the mean of the outer
+    diameter of the inner part and internal diameter of the outer part, is within rtol of its own.
+    The least recently used reference solves are removed once more than size are kept.
+    """
+
+    def __init__(self, size=_CACHE_SIZE, rtol=_DIAMETER_RTOL):
+        """Creates an empty cache
+
+        Args:
+            size (int, optional): Number of reference solves kept. Defaults to _CACHE_SIZE.
+            rtol (float, optional): Largest relative difference of contact diameters. Defaults to _DIAMETER_RTOL.
+        """
+        self.size = size
+        self.rtol = rtol
+        self._references = OrderedDict()
+        self._lock = threading.Lock()
+
+    def add(self, key, contact_diameter, results):
+        """Adds the results of a reference solve
+
+        Args:
+            key (tuple): Geometry key of the reference, from get_geometry_key
+            contact_diameter (float): Mean of the overlapping diameters of the reference (m)
+            results (ScaledResults): Results of the reference
+        """
+        with self._lock:
+            self._references[(key, contact_diameter)] = results
+            self._references.move_to_end((key, contact_diameter))
+
+            while len(self._references) > self.size:
+                self._references.popitem(last=False)
+
+    def find(self, key, contact_diameter):
+        """Finds a reference that can be scaled to a design
+
+        Args:
+            key (tuple): Geometry key of the design, from get_geometry_key
+            contact_diameter (float): Mean of the overlapping diameters of the design (m)
+
+        Returns:
+            ScaledResults: Results of the closest matching reference, or None if there is none
+        """
+        with self._lock:
+            difference, reference = min(
+                (
+                    (abs(diameter - contact_diameter), (key, diameter))
+                    for reference_key, diameter in self._references
+                    if reference_key == key
+                ),
+                default=(None, None),
+                key=lambda match: match[0],
+            )
+
+            is_match = (
+                reference is not None and difference <= self.rtol * contact_diameter
+            )
+            results = self._references[reference] if is_match else None
+            if is_match:
+                self._references.move_to_end(reference)
+
+        record_cache_lookup("linear_scaling", is_match)
+        return results
+
+    def get_summary(
+        self,
+        id_0,
+        id_1,
+        od_0,
+        od_1,
+        length,
+        inner_material,
+        outer_material,
+        lines_per_part=None,
+        work_directory=None,
+    ):
+        """Gets the summary of an axisymmetric design, scaling the results of a matching
+        reference, or solving the design as a new reference if there is none
+
+        Args:
+            id_0 (float): Internal diameter of inner part (m)
+            id_1 (float): Internal diameter of outer part (m)
+            od_0 (float): Outer diameter of inner part (m)
+            od_1 (float): Outer diameter of outer part (m)
+            length (float): Contact length (m)
+            inner_material (Material): Material of the inner part
+            outer_material (Material): Material of the outer part
+            lines_per_part (int, optional): Number of lines per part used by the mesh. Defaults to None, the mesh default.
+            work_directory (String, optional): Directory to solve in. Defaults to None, the system temporary directory.
+
+        Raises:
+            ValueError: If the parts do not interfere
+            subprocess.CalledProcessError: If ccx exits with a non-zero return code
+
+        Returns:
+            dict: Summary values of the design, as from PressFitModel.get_summary
+        """
+        return self.get_results(
+            id_0,
+            id_1,
+            od_0,
+            od_1,
+            length,
+            inner_material,
+            outer_material,
+            lines_per_part,
+            work_directory,
+        ).get_summary(od_0 - id_1)
+
+    def get_results(
+        self,
+        id_0,
+        id_1,
+        od_0,
+        od_1,
+        length,
+        inner_material,
+        outer_material,
+        lines_per_part=None,
+        work_directory=None,
+    ):
+        """Gets scaled results that can answer an axisymmetric design, solving the design as a
+        new reference if no reference matches. Arguments are as for get_summary.
+
+        Returns:
+            ScaledResults: Results of the reference
+        """
+        key = get_geometry_key(
+            id_0, od_1, length, inner_material, outer_material, lines_per_part
+        )
+        contact_diameter = (od_0 + id_1) / 2
+        results = self.find(key, contact_diameter)
+        if results is not None:
+            return results
+
+        if not od_0 > id_1:
+            raise ValueError("Linear scaling needs parts that interfere")
+
+        with tempfile.TemporaryDirectory(dir=work_directory) as directory:
+            model = AxisymmetricPressFitModel(
+                id_0,
+                id_1,
+                od_0,
+                od_1,
+                length,
+                length,
+                os.path.join(directory, "Reference_Model"),
+                lines_per_part=lines_per_part,
+            )
+            model.run_model(inner_material, outer_material)
+            model.read_element_results()
+            model.read_nodal_results()
+
+        results = ScaledResults.from_model(model, od_0 - id_1)
+        self.add(key, contact_diameter, results)
+        return results
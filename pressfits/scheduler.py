@@ -0,0 +1,278 @@
+import asyncio
+import logging
+import math
+import threading
+import time
+from collections import OrderedDict, deque
+
+from pressfits.metrics import STAGE_DURATION
+
+logger = logging.getLogger(__name__)
+
+# Priority classes, from most to least urgent
+INTERACTIVE = "interactive"
+BATCH = "batch"
+PRIORITIES = (INTERACTIVE, BATCH)
+
+_DURATION_SMOOTHING = 0.2  # Weight of the latest solve in the mean solve duration
+_INITIAL_DURATION = 1.0  # Seconds, assumed before any solve has finished
+
+
+class SchedulerSaturated(Exception):
+    """Raised when a solve cannot be queued because the queue of its priority or client is full"""
+
+    def __init__(self, priority, retry_after):
+        """Creates the exception
+
+        Args:
+            priority (String): Priority class of the rejected solve
+            retry_after (int): Estimated number of seconds until the solve could be queued
+        """
+        super().__init__(f"Too many {priority} solves queued")
+        self.priority = priority
+        self.retry_after = retry_after
+
+
+class SolveScheduler:
+    """Limits the number of solves run at once, granting free workers to queued solves by priority.
+    Interactive solves are always granted before batch solves, and some workers are reserved
+    for them so that they never wait for a batch solve to finish. Batch solves are always left
+    at least one worker so that they are never starved, so with no more workers than are
+    reserved, fewer are reserved: with a single worker, none, and an interactive solve may wait
+    for the batch solve running to finish. Within a priority, workers are shared fairly by
+    granting the solves of each client in turn.
+
+    Solves are queued with submit, and the returned ticket is used as a context manager, or an
+    async context manager, that waits for a worker and releases it on exit.
+    """
+
+    def __init__(
+        self,
+        workers,
+        reserved_interactive_workers=1,
+        max_queued=None,
+        max_queued_per_client=None,
+    ):
+        """Creates a scheduler with no queued solves
+
+        Args:
+            workers (int): Number of solves run at once
+            reserved_interactive_workers (int, optional): Workers batch solves can't use, at
+                most one fewer than the workers. Defaults to 1.
+            max_queued (dict(String, int), optional): Maximum number of queued solves of each priority. Defaults to None, unlimited.
+            max_queued_per_client (dict(String, int), optional): Maximum number of queued solves of each priority per client. Defaults to None, unlimited.
+        """
+        self.workers = max(workers, 1)
+        self.batch_workers = max(self.workers - reserved_interactive_workers, 1)
+        self.reserved_interactive_workers = self.workers - self.batch_workers
+        if self.reserved_interactive_workers < reserved_interactive_workers:
+            logger.warning(
+                "Only %d of %d workers reserved for interactive solves, leaving one for batch solves",
+                self.reserved_interactive_workers,
+                reserved_interactive_workers,
+            )
+        self.max_queued = max_queued or {}
+        self.max_queued_per_client = max_queued_per_client or {}
+
+        self._lock = threading.Lock()
+        # Queued tickets of each priority, by client in the order clients are served
+        self._queues = {priority: OrderedDict() for priority in PRIORITIES}
+        self._queued = {priority: 0 for priority in PRIORITIES}
+        self._running = {priority: 0 for priority in PRIORITIES}
+        self._mean_duration = _INITIAL_DURATION
+
+    def submit(self, priority, client):
+        """Queues a solve
+
+        Args:
+            priority (String): Priority class of the solve, from PRIORITIES
+            client (String): Identifier of the client requesting the solve
+
+        Raises:
+            ValueError: If the priority is not recognized
+            SchedulerSaturated: If the queue of the priority or client is full
+
+        Returns:
+            SolveTicket: Ticket to wait for a worker with
+        """
+        if priority not in PRIORITIES:
+            raise ValueError(f"Unrecognized priority: {priority}")
+
+        ticket = SolveTicket(self, priority, client)
+
+        with self._lock:
+            client_queue = self._queues[priority].get(client, ())
+            if self._queued[priority] >= self.max_queued.get(priority, math.inf) or len(
+                client_queue
+            ) >= self.max_queued_per_client.get(priority, math.inf):
+                raise SchedulerSaturated(priority, self._retry_after(priority))
+
+            self._queues[priority].setdefault(client, deque()).append(ticket)
+            self._queued[priority] += 1
+            self._dispatch()
+
+        return ticket
+
+    def get_stats(self):
+        """Gets the current load of the scheduler
+
+        Returns:
+            dict: workers, those reserved for interactive solves, and the number of queued and
+                running solves of each priority
+        """
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "reserved_interactive_workers": self.reserved_interactive_workers,
+                "queued": dict(self._queued),
+                "running": dict(self._running),
+                "mean_duration": self._mean_duration,
+            }
+
+    def _retry_after(self, priority):
+        """Estimates the number of seconds until the queue of a priority has room. The lock must be held.
+
+        Args:
+            priority (String): Priority class
+
+        Returns:
+            int: Seconds, at least 1
+        """
+        workers = self.workers if priority == INTERACTIVE else self.batch_workers
+        queued = sum(
+            self._queued[other]
+            for other in PRIORITIES[: PRIORITIES.index(priority) + 1]
+        )
+
+        return max(math.ceil(queued * self._mean_duration / workers), 1)
+
+    def _dispatch(self):
+        """Grants free workers to queued tickets. The lock must be held."""
+        for priority in PRIORITIES:
+            limit = self.workers if priority == INTERACTIVE else self.batch_workers
+            queue = self._queues[priority]
+
+            while queue and sum(self._running.values()) < self.workers:
+                if priority != INTERACTIVE and self._running[priority] >= limit:
+                    break
+
+                # Serve the client at the front, then move it to the back
+                client, tickets = next(iter(queue.items()))
+                ticket = tickets.popleft()
+                if tickets:
+                    queue.move_to_end(client)
+                else:
+                    del queue[client]
+
+                self._queued[priority] -= 1
+                self._running[priority] += 1
+                ticket._grant()
+
+    def _cancel(self, ticket):
+        """Removes a ticket that has not been granted from the queue. The lock must be held.
+
+        Args:
+            ticket (SolveTicket): Ticket to remove
+        """
+        tickets = self._queues[ticket.priority].get(ticket.client)
+        if tickets is not None and ticket in tickets:
+            tickets.remove(ticket)
+            self._queued[ticket.priority] -= 1
+            if not tickets:
+                del self._queues[ticket.priority][ticket.client]
+
+    def _release(self, ticket, duration):
+        """Frees the worker of a granted ticket
+
+        Args:
+            ticket (SolveTicket): Ticket to release
+            duration (float): Seconds the worker was used for
+        """
+        with self._lock:
+            self._running[ticket.priority] -= 1
+            self._mean_duration += _DURATION_SMOOTHING * (
+                duration - self._mean_duration
+            )
+            self._dispatch()
+
+
+class SolveTicket:
+    """A queued solve, granted a worker by a SolveScheduler"""
+
+    def __init__(self, scheduler, priority, client):
+        """Creates a ticket that has not been granted a worker
+
+        Args:
+            scheduler (SolveScheduler): Scheduler the solve is queued in
+            priority (String): Priority class of the solve
+            client (String): Identifier of the client requesting the solve
+        """
+        self.scheduler = scheduler
+        self.priority = priority
+        self.client = client
+        self.submitted = time.perf_counter()
+        self.granted = None  # Time the ticket was granted a worker
+        self._event = threading.Event()
+        self._future = None
+        self._is_released = False
+
+    def _grant(self):
+        """Marks the ticket as granted and wakes its waiter. The scheduler lock must be held."""
+        self.granted = time.perf_counter()
+        STAGE_DURATION.observe(self.granted - self.submitted, stage="queue")
+        self._event.set()
+        if self._future is not None:
+            self._future.get_loop().call_soon_threadsafe(self._resolve_future)
+
+    def _resolve_future(self):
+        if not self._future.done():
+            self._future.set_result(None)
+
+    def get_wait_time(self):
+        """Gets the time the solve waited for a worker
+
+        Returns:
+            float: Seconds, or None if not yet granted
+        """
+        return None if self.granted is None else self.granted - self.submitted
+
+    def cancel(self):
+        """Removes the ticket from the queue, or frees its worker if it was granted one"""
+        with self.scheduler._lock:
+            if self.granted is None:
+                self.scheduler._cancel(self)
+                return
+
+        self.release()
+
+    def release(self):
+        """Frees the worker granted to the ticket. Does nothing if already released."""
+        if self._is_released or self.granted is None:
+            return
+
+        self._is_released = True
+        self.scheduler._release(self, time.perf_counter() - self.granted)
+
+    def __enter__(self):
+        self._event.wait()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.release()
+
+    async def __aenter__(self):
+        with self.scheduler._lock:
+            if self.granted is None:
+                self._future = asyncio.get_running_loop().create_future()
+
+        if self._future is not None:
+            try:
+                await self._future
+            except asyncio.CancelledError:
+                self.cancel()
+                raise
+
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.release()
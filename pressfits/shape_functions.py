@@ -0,0 +1,172 @@
+import numpy as np
+
+# Natural coordinates of the nodes of an eight node element, in the order nodes are added to an Element
+# https://web.mit.edu/calculix_v2.7/CalculiX/ccx_2.7/doc/ccx/node43.html#planestresssection
+NODE_NATURAL_COORDINATES = np.array(
+    [
+        [-1.0, -1.0],
+        [1.0, -1.0],
+        [1.0, 1.0],
+        [-1.0, 1.0],
+        [0.0, -1.0],
+        [1.0, 0.0],
+        [0.0, 1.0],
+        [-1.0, 0.0],
+    ]
+)
+
+_GAUSS_2 = 1 / 3**0.5
+_GAUSS_3 = 0.6**0.5
+
+# Integration points in the order ccx writes them. xi varies fastest.
+INTEGRATION_POINTS = {
+    4: np.array(
+        [
+            [-_GAUSS_2, -_GAUSS_2],
+            [_GAUSS_2, -_GAUSS_2],
+            [-_GAUSS_2, _GAUSS_2],
+            [_GAUSS_2, _GAUSS_2],
+        ]
+    ),
+    9: np.array(
+        [
+            [xi, eta]
+            for eta in (-_GAUSS_3, 0, _GAUSS_3)
+            for xi in (-_GAUSS_3, 0, _GAUSS_3)
+        ]
+    ),
+}
+
+
+def shape_functions(xi, eta):
+    """Evaluates the quadratic serendipity shape functions of an eight node element
+
+    Args:
+        xi (np.ndarray): Natural coordinates in the direction from node 0 to node 1
+        eta (np.ndarray): Natural coordinates in the direction from node 0 to node 3
+
+    Returns:
+        np.ndarray: (..., 8) shape function values, in node order
+    """
+    xi = np.asarray(xi, dtype=float)
+    eta = np.asarray(eta, dtype=float)
+    xi_n = NODE_NATURAL_COORDINATES[:4, 0]
+    eta_n = NODE_NATURAL_COORDINATES[:4, 1]
+
+    x = xi[..., None]
+    e = eta[..., None]
+    corners = (1 + x * xi_n) * (1 + e * eta_n) * (x * xi_n + e * eta_n - 1) / 4
+
+    return np.concatenate(
+        [
+            corners,
+            np.stack(
+                [
+                    (1 - xi**2) * (1 - eta) / 2,
+                    (1 + xi) * (1 - eta**2) / 2,
+                    (1 - xi**2) * (1 + eta) / 2,
+                    (1 - xi) * (1 - eta**2) / 2,
+                ],
+                axis=-1,
+            ),
+        ],
+        axis=-1,
+    )
+
+
+def shape_function_derivatives(xi, eta):
+    """Evaluates derivatives of the quadratic serendipity shape functions of an eight node element
+
+    Args:
+        xi (np.ndarray): Natural coordinates in the direction from node 0 to node 1
+        eta (np.ndarray): Natural coordinates in the direction from node 0 to node 3
+
+    Returns:
+        np.ndarray: (..., 8, 2) derivatives with respect to xi and eta, in node order
+    """
+    xi = np.asarray(xi, dtype=float)
+    eta = np.asarray(eta, dtype=float)
+    xi_n = NODE_NATURAL_COORDINATES[:4, 0]
+    eta_n = NODE_NATURAL_COORDINATES[:4, 1]
+
+    x = xi[..., None]
+    e = eta[..., None]
+    d_xi = np.concatenate(
+        [
+            xi_n * (1 + e * eta_n) * (2 * x * xi_n + e * eta_n) / 4,
+            np.stack(
+                [-xi * (1 - eta), (1 - eta**2) / 2, -xi * (1 + eta), -(1 - eta**2) / 2],
+                axis=-1,
+            ),
+        ],
+        axis=-1,
+    )
+    d_eta = np.concatenate(
+        [
+            eta_n * (1 + x * xi_n) * (x * xi_n + 2 * e * eta_n) / 4,
+            np.stack(
+                [-(1 - xi**2) / 2, -(1 + xi) * eta, (1 - xi**2) / 2, -(1 - xi) * eta],
+                axis=-1,
+            ),
+        ],
+        axis=-1,
+    )
+
+    return np.stack([d_xi, d_eta], axis=-1)
+
+
+def extrapolation_matrix(integration_point_count):
+    """Creates a matrix that extrapolates values at integration points to the nodes of an element.
+    Values are fitted with a bilinear (4 point) or biquadratic Lagrange (9 point) field, which is
+    then evaluated at the nodes. Other integration schemes are extrapolated as a constant mean.
+
+    Args:
+        integration_point_count (int): Number of integration points of the element
+
+    Returns:
+        np.ndarray: (8, integration_point_count) matrix
+    """
+    if integration_point_count not in INTEGRATION_POINTS:
+        return np.full((8, integration_point_count), 1 / integration_point_count)
+
+    points = INTEGRATION_POINTS[integration_point_count]
+    order = 1 if integration_point_count == 4 else 2
+
+    def lagrange_basis(coordinates):
+        return np.stack(
+            [
+                coordinates[:, 0] ** i * coordinates[:, 1] ** j
+                for i in range(order + 1)
+                for j in range(order + 1)
+            ],
+            axis=-1,
+        )
+
+    return lagrange_basis(NODE_NATURAL_COORDINATES) @ np.linalg.inv(
+        lagrange_basis(points)
+    )
+
+
+def extrapolate_integration_points(offsets, values):
+    """Extrapolates integration point values of many elements to their nodes
+
+    Args:
+        offsets (np.ndarray): (m + 1,) offsets of each element's rows within values
+        values (np.ndarray): (k, c) values at the integration points of every element
+
+    Returns:
+        np.ndarray: (m, 8, c) values at the nodes of each element. NaN for elements without values.
+    """
+    counts = np.diff(offsets)
+    nodal = np.full((len(counts), 8, values.shape[1]), np.nan)
+
+    for count in np.unique(counts):
+        if count == 0:
+            continue
+        elements = np.flatnonzero(counts == count)
+        rows = offsets[elements][:, None] + np.arange(count)
+        nodal[elements] = np.einsum(
+            "np,epc->enc", extrapolation_matrix(count), values[rows]
+        )
+
+    return nodal
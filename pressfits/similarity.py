@@ -0,0 +1,363 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from pressfits.metrics import record_cache_lookup
+from pressfits.model import AxisymmetricPressFitModel
+from pressfits.result_set import ResultSet
+
+_MEMORY_CACHE_SIZE = 64  # Number of normalized results kept in memory
+# Ratios are rounded so that designs scaled by any factor share a key despite rounding errors
+_SIGNIFICANT_DIGITS = 9
+_HASH_VERSION = 1
+
+# Scale of the columns of each nodal quantity of a result set
+_QUANTITY_SCALES = {
+    "displacement": ("displacement",) * 3,
+    "stress": ("stress",) * 6,
+    "strain": ("strain",) * 6,
+    "force": ("force",) * 3,
+    # Clearance and slips are lengths, and pressure and shears are stresses
+    "contact": ("displacement",) * 3 + ("stress",) * 3,
+}
+# Scale of each summary value. Summary stresses stay in MPa, as they are normalized and rescaled
+# by the same scale.
+_SUMMARY_SCALES = {
+    "contact_pressure": "stress",
+    "max_inner_vm_stress": "stress",
+    "max_outer_vm_stress": "stress",
+    "inner_radial_deflection": "displacement",
+    "outer_radial_deflection": "displacement",
+    "interference": "displacement",
+}
+
+
+def get_similarity_key(design):
+    """Gets the nondimensional groups that results of an axisymmetric design depend on: the
+    ratios of its diameters and length to the internal diameter of the outer part, the ratio of
+    its Young's moduli, its Poisson's ratios and mesh density. Meshes are built from these
+    ratios, so similar designs have similar meshes. The interference strain, and so the outer
+    diameter of the inner part, is left out, as results are proportional to it while the contact
+    is closed.
+
+    Args:
+        design (dict(String, object)): Parameters of the design, as from sweep.get_designs
+
+    Returns:
+        tuple: The nondimensional groups
+    """
+
+    def normalize(value):
+        return float(f"{float(value):.{_SIGNIFICANT_DIGITS}g}")
+
+    diameter = design["id_1"]
+    inner_material = design["inner_material"]
+    outer_material = design["outer_material"]
+    lines_per_part = design.get("lines_per_part")
+
+    return (
+        normalize(design["id_0"] / diameter),
+        normalize(design["od_1"] / diameter),
+        normalize(design["length"] / diameter),
+        normalize(inner_material.youngs_modulus / outer_material.youngs_modulus),
+        normalize(inner_material.poissons_ratio),
+        normalize(outer_material.poissons_ratio),
+        None if lines_per_part is None else int(lines_per_part),
+    )
+
+
+def get_scales(design):
+    """Gets the physical scale of each kind of result of a design. Lengths scale with the
+    internal diameter of the outer part, displacements with the interference, strains with the interference
+    strain, stresses with the interference strain times the Young's modulus of the outer part,
+    and forces with the stress times the diameter squared.
+
+    Args:
+        design (dict(String, object)): Parameters of the design
+
+    Raises:
+        ValueError: If the parts do not interfere
+
+    Returns:
+        dict(String, float): Scale keyed by kind of result, in SI units
+    """
+    interference = design["od_0"] - design["id_1"]
+    if not interference > 0:
+        raise ValueError("Similarity scaling needs parts that interfere")
+
+    diameter = design["id_1"]
+    strain = interference / diameter
+    stress = design["outer_material"].youngs_modulus * strain
+
+    return {
+        "length": diameter,
+        "displacement": interference,
+        "strain": strain,
+        "stress": stress,
+        "force": stress * diameter**2,
+    }
+
+
+def scale_result_set(result_set, scales):
+    """Multiplies every coordinate and result of a result set by its scale
+
+    Args:
+        result_set (ResultSet): The results to scale
+        scales (dict(String, float)): Scale of each kind of result, as from get_scales, or their
+            reciprocals to normalize
+
+    Returns:
+        ResultSet: The scaled results. Connectivity, ids and sets are shared.
+    """
+    nodal_results = {}
+    for key, step in result_set.nodal_results.items():
+        nodal_results[key] = {}
+        for quantity, values in step.items():
+            factors = np.array(
+                [scales[kind] for kind in _QUANTITY_SCALES[quantity]],
+                dtype=values.dtype,
+            )
+            nodal_results[key][quantity] = values * factors
+
+    stresses = result_set.integration_point_stresses
+
+    return ResultSet(
+        node_ids=result_set.node_ids,
+        coordinates=result_set.coordinates * scales["length"],
+        node_parts=result_set.node_parts,
+        element_ids=result_set.element_ids,
+        connectivity=result_set.connectivity,
+        node_sets=result_set.node_sets,
+        element_sets=result_set.element_sets,
+        surfaces=result_set.surfaces,
+        nodal_results=nodal_results,
+        integration_point_offsets=result_set.integration_point_offsets,
+        integration_point_stresses=stresses * stresses.dtype.type(scales["stress"]),
+        element_inp_name=result_set.element_inp_name,
+        name=result_set.name,
+    )
+
+
+def scale_summary(summary, scales):
+    """Multiplies every value of a summary by its scale
+
+    Args:
+        summary (dict): Summary values, as from PressFitModel.get_summary
+        scales (dict(String, float)): Scale of each kind of result, or their reciprocals
+
+    Returns:
+        dict: The scaled summary. Values without a scale are kept as they are.
+    """
+
+    def scale(values):
+        scaled = dict(values)
+        for name, kind in _SUMMARY_SCALES.items():
+            if name in values:
+                scaled[name] = values[name] * scales[kind]
+
+        return scaled
+
+    scaled = scale(summary)
+    if "interference_curve" in summary:
+        scaled["interference_curve"] = [
+            scale(point) for point in summary["interference_curve"]
+        ]
+
+    return scaled
+
+
+def _reciprocals(scales):
+    return {kind: 1 / value for kind, value in scales.items()}
+
+
+class SimilarityCache:
+    """Stores results of axisymmetric designs normalized by their scales, keyed by their
+    nondimensional groups, so that a design geometrically similar to a solved one, of any size,
+    stiffness or interference, is answered by rescaling instead of solving. Normalized results
+    are kept in memory and, if given a directory, on disk so that they are shared by processes.
+
+    The contact penalty stiffness of the deck is not scaled, but is stiff enough for its effect
+    on the results to be negligible."""
+
+    def __init__(self, directory=None, size=_MEMORY_CACHE_SIZE):
+        """Creates a cache, creating its directory if it doesn't exist
+
+        Args:
+            directory (String, optional): Directory to store normalized results in. Defaults to
+                None, keeping them only in memory.
+            size (int, optional): Number of normalized results kept in memory. Defaults to _MEMORY_CACHE_SIZE.
+        """
+        self.directory = directory
+        self.size = size
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def get_entry_id(key):
+        """Gets the file name of the normalized results of a key
+
+        Args:
+            key (tuple): Nondimensional groups, from get_similarity_key
+
+        Returns:
+            String: Hexadecimal id
+        """
+        canonical = json.dumps({"version": _HASH_VERSION, "key": key})
+        return hashlib.sha256(canonical.encode()).hexdigest()[:32]
+
+    def _path(self, key, extension):
+        return os.path.join(self.directory, f"{self.get_entry_id(key)}.{extension}")
+
+    def put(self, design, result_set, summary):
+        """Stores the results of a solved design
+
+        Args:
+            design (dict(String, object)): Parameters of the design
+            result_set (ResultSet): Results of the design
+            summary (dict): Summary values of the design, as from PressFitModel.get_summary
+        """
+        key = get_similarity_key(design)
+        reciprocals = _reciprocals(get_scales(design))
+        entry = (
+            scale_result_set(result_set, reciprocals),
+            scale_summary(summary, reciprocals),
+        )
+
+        if self.directory is not None:
+            self._write(self._path(key, "npz"), entry[0].save)
+
+            def write_summary(path):
+                with open(path, "w") as f:
+                    json.dump(entry[1], f)
+
+            # Written last, as its presence marks the entry as complete
+            self._write(self._path(key, "json"), write_summary)
+
+        with self._lock:
+            self._remember(key, entry)
+
+    def _write(self, path, write):
+        """Writes a file of an entry to a temporary file of the directory, then moves it into
+        place, so that other processes never read a partly written file
+
+        Args:
+            path (String): Path of the file
+            write (callable): Writes the file, taking the path to write to
+        """
+        descriptor, temporary = tempfile.mkstemp(
+            suffix=os.path.splitext(path)[1], dir=self.directory
+        )
+        os.close(descriptor)
+        try:
+            write(temporary)
+            os.replace(temporary, path)
+        except BaseException:
+            os.remove(temporary)
+            raise
+
+    def get(self, design):
+        """Gets the results of a design from those of a similar design
+
+        Args:
+            design (dict(String, object)): Parameters of the design
+
+        Returns:
+            (ResultSet, dict): Results and summary of the design, or None if no similar design
+                has been stored
+        """
+        key = get_similarity_key(design)
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is not None:
+                self._cache.move_to_end(key)
+
+        if entry is None and self.directory is not None:
+            entry = self._load(key)
+
+        record_cache_lookup("similarity", entry is not None)
+        if entry is None:
+            return None
+
+        scales = get_scales(design)
+        return scale_result_set(entry[0], scales), scale_summary(entry[1], scales)
+
+    def _load(self, key):
+        """Loads normalized results from the directory
+
+        Args:
+            key (tuple): Nondimensional groups
+
+        Returns:
+            (ResultSet, dict): Normalized results and summary, or None if they are not stored
+        """
+        if not os.path.exists(self._path(key, "json")):
+            return None
+
+        with open(self._path(key, "json"), "r") as f:
+            summary = json.load(f)
+        entry = (ResultSet.load(self._path(key, "npz")), summary)
+
+        with self._lock:
+            self._remember(key, entry)
+
+        return entry
+
+    def _remember(self, key, entry):
+        """Keeps normalized results in memory. The lock must be held.
+
+        Args:
+            key (tuple): Nondimensional groups
+            entry ((ResultSet, dict)): Normalized results and summary
+        """
+        self._cache[key] = entry
+        self._cache.move_to_end(key)
+
+        while len(self._cache) > self.size:
+            self._cache.popitem(last=False)
+
+    def get_or_solve(self, design, work_directory=None):
+        """Gets the results of a design from those of a similar design, or solves it and stores
+        its results if there is none
+
+        Args:
+            design (dict(String, object)): Parameters of the design
+            work_directory (String, optional): Directory to solve in. Defaults to None, the system temporary directory.
+
+        Raises:
+            ValueError: If the parts do not interfere
+            subprocess.CalledProcessError: If ccx exits with a non-zero return code
+
+        Returns:
+            (ResultSet, dict): Results and summary of the design
+        """
+        get_scales(design)  # Checked before solving, as results could not be stored
+        entry = self.get(design)
+        if entry is not None:
+            return entry
+
+        with tempfile.TemporaryDirectory(dir=work_directory) as directory:
+            model = AxisymmetricPressFitModel(
+                design["id_0"],
+                design["id_1"],
+                design["od_0"],
+                design["od_1"],
+                design["length"],
+                design["length"],
+                os.path.join(directory, "Similar_Model"),
+                lines_per_part=design.get("lines_per_part"),
+            )
+            model.run_model(design["inner_material"], design["outer_material"])
+            model.read_element_results()
+            model.read_nodal_results()
+
+        result_set = ResultSet.from_model(model)
+        summary = model.get_summary()
+        self.put(design, result_set, summary)
+        return result_set, summary
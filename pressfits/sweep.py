@@ -0,0 +1,568 @@
+import argparse
+import csv
+import itertools
+import math
+import os
+import shutil
+import tempfile
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import nullcontext
+
+import numpy as np
+
+from pressfits.export import DatasetWriter, get_run_parameters
+from pressfits.model import AxisymmetricPressFitModel, Material
+from pressfits.result_set import ResultSet
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+FULL_FACTORIAL = "full_factorial"
+LATIN_HYPERCUBE = "latin_hypercube"
+RANDOM = "random"
+METHODS = (FULL_FACTORIAL, LATIN_HYPERCUBE, RANDOM)
+
+# Continuous range of a parameter. Full factorial designs take count evenly spaced levels of it.
+Range = namedtuple("Range", "low high count", defaults=(3,))
+
+REQUIRED_PARAMETERS = (
+    "id_0",
+    "id_1",
+    "od_0",
+    "od_1",
+    "length",
+    "inner_material",
+    "outer_material",
+)
+PARAMETERS = REQUIRED_PARAMETERS + ("lines_per_part",)
+# Parameters that can only take listed values, as materials and mesh densities are not continuous
+_DISCRETE_PARAMETERS = ("inner_material", "outer_material", "lines_per_part")
+
+# Name and Arrow type of each column of the results, in order
+COLUMNS = (
+    ("design", "int64"),
+    ("id_0", "double"),
+    ("id_1", "double"),
+    ("od_0", "double"),
+    ("od_1", "double"),
+    ("length", "double"),
+    ("inner_material", "string"),
+    ("inner_youngs_modulus", "double"),
+    ("inner_poissons_ratio", "double"),
+    ("outer_material", "string"),
+    ("outer_youngs_modulus", "double"),
+    ("outer_poissons_ratio", "double"),
+    ("lines_per_part", "int64"),
+    ("contact_pressure", "double"),
+    ("max_inner_vm_stress", "double"),
+    ("max_outer_vm_stress", "double"),
+    ("inner_radial_deflection", "double"),
+    ("outer_radial_deflection", "double"),
+    ("seconds", "double"),
+    ("error", "string"),
+)
+_SUMMARY_COLUMNS = (
+    "contact_pressure",
+    "max_inner_vm_stress",
+    "max_outer_vm_stress",
+    "inner_radial_deflection",
+    "outer_radial_deflection",
+)
+
+
+def get_designs(parameters, method=FULL_FACTORIAL, samples=10, seed=0):
+    """Generates designs from the values each parameter may take. Values are given as a single
+    value, a list of values, or a Range of a continuous parameter.
+
+    Full factorial designs are every combination of the values, taking count levels of each
+    Range. Latin hypercube designs split each parameter into samples equal strata and take one
+    value from each, pairing strata of different parameters at random. Random designs take every
+    value uniformly at random.
+
+    Args:
+        parameters (dict(String, object)): Values of each parameter, keyed by names in PARAMETERS
+        method (String, optional): One of METHODS. Defaults to FULL_FACTORIAL.
+        samples (int, optional): Number of designs of latin hypercube and random methods. Defaults to 10.
+        seed (int, optional): Seed of latin hypercube and random designs. Defaults to 0.
+
+    Raises:
+        ValueError: If a parameter is missing or not recognized, a discrete parameter is given a
+            Range, the method is not recognized, or a design is invalid, as for check_design
+
+    Returns:
+        list(dict(String, object)): Value of every parameter of each design
+    """
+    unknown = set(parameters) - set(PARAMETERS)
+    if unknown:
+        raise ValueError(f"Unrecognized parameters: {', '.join(sorted(unknown))}")
+    missing = set(REQUIRED_PARAMETERS) - set(parameters)
+    if missing:
+        raise ValueError(f"Missing parameters: {', '.join(sorted(missing))}")
+    for name in _DISCRETE_PARAMETERS:
+        if isinstance(parameters.get(name), Range):
+            raise ValueError(f"{name} must be a value or list of values")
+
+    parameters = {"lines_per_part": None, **parameters}
+    names = list(parameters)
+
+    if method == FULL_FACTORIAL:
+        return _check_designs(
+            [
+                dict(zip(names, values))
+                for values in itertools.product(
+                    *(get_levels(parameters[name]) for name in names)
+                )
+            ]
+        )
+
+    generator = np.random.default_rng(seed)
+    if method == LATIN_HYPERCUBE:
+        strata = generator.permuted(
+            np.tile(np.arange(samples), (len(names), 1)), axis=1
+        )
+        fractions = (strata + generator.random((len(names), samples))) / samples
+    elif method == RANDOM:
+        fractions = generator.random((len(names), samples))
+    else:
+        raise ValueError(f"Unrecognized method: {method}")
+
+    designs = [{} for _ in range(samples)]
+    for name, row in zip(names, fractions):
+        for design, fraction in zip(designs, row.tolist()):
+            design[name] = _sample(parameters[name], fraction)
+
+    return _check_designs(designs)
+
+
+def check_design(design):
+    """Checks that a design can be meshed. A mesh that fails part way is costly to find out
+    about, so designs are checked before they are solved.
+
+    Args:
+        design (dict(String, object)): Value of every parameter of the design
+
+    Raises:
+        ValueError: If its number of lines per part is not an odd integer of at least 3, as each
+            quadratic element spans three lines, or its parts are not concentric tubes, or a
+            solid shaft in a tube, that interfere
+    """
+    lines_per_part = design.get("lines_per_part")
+    if lines_per_part is not None and (
+        isinstance(lines_per_part, bool)
+        or not float(lines_per_part).is_integer()
+        or lines_per_part < 3
+        or lines_per_part % 2 == 0
+    ):
+        raise ValueError(
+            f"lines_per_part must be an odd integer of at least 3, not {lines_per_part}"
+        )
+
+    # An internal diameter of 0 is a solid shaft
+    if not design["id_0"] >= 0:
+        raise ValueError(f"id_0 must be positive or 0, not {design['id_0']}")
+    for name in ("id_1", "od_0", "od_1", "length"):
+        if not design[name] > 0:
+            raise ValueError(f"{name} must be positive, not {design[name]}")
+    if not design["id_0"] < design["id_1"] < design["od_0"] < design["od_1"]:
+        raise ValueError(
+            "Diameters must increase from id_0 to id_1, od_0 and od_1, so that the parts interfere"
+        )
+
+
+def _check_designs(designs):
+    """Checks every design of a sweep, so that none are solved if any cannot be
+
+    Args:
+        designs (list(dict(String, object))): The designs
+
+    Raises:
+        ValueError: If any design is invalid, naming the first
+
+    Returns:
+        list(dict(String, object)): The designs
+    """
+    invalid = []
+    for i, design in enumerate(designs):
+        try:
+            check_design(design)
+        except ValueError as e:
+            invalid.append((i, e))
+
+    if invalid:
+        i, error = invalid[0]
+        raise ValueError(
+            f"{len(invalid)} of {len(designs)} designs are invalid, such as design {i}: {error}"
+        )
+
+    return designs
+
+
+def get_levels(values):
+    """Gets the values a parameter takes in a full factorial design
+
+    Args:
+        values (object): A single value, a list of values or a Range
+
+    Returns:
+        list: Values of the parameter
+    """
+    if isinstance(values, Range):
+        return np.linspace(values.low, values.high, values.count).tolist()
+    if isinstance(values, (list, tuple)) and not isinstance(values, Material):
+        return list(values)
+
+    return [values]
+
+
+def _sample(values, fraction):
+    """Gets the value of a parameter at a fraction of its values
+
+    Args:
+        values (object): A single value, a list of values or a Range
+        fraction (float): Fraction from 0 to 1
+
+    Returns:
+        object: Value of the parameter
+    """
+    if isinstance(values, Range):
+        return values.low + fraction * (values.high - values.low)
+
+    levels = get_levels(values)
+    return levels[min(int(fraction * len(levels)), len(levels) - 1)]
+
+
+def get_design_columns(index, design):
+    """Gets the input columns of the result row of a design
+
+    Args:
+        index (int): Index of the design
+        design (dict(String, object)): Value of every parameter of the design
+
+    Returns:
+        dict(String, object): Values keyed by column name
+    """
+    inner_material = design["inner_material"]
+    outer_material = design["outer_material"]
+
+    return {
+        "design": index,
+        "id_0": float(design["id_0"]),
+        "id_1": float(design["id_1"]),
+        "od_0": float(design["od_0"]),
+        "od_1": float(design["od_1"]),
+        "length": float(design["length"]),
+        "inner_material": inner_material.name,
+        "inner_youngs_modulus": float(inner_material.youngs_modulus),
+        "inner_poissons_ratio": float(inner_material.poissons_ratio),
+        "outer_material": outer_material.name,
+        "outer_youngs_modulus": float(outer_material.youngs_modulus),
+        "outer_poissons_ratio": float(outer_material.poissons_ratio),
+        "lines_per_part": design["lines_per_part"],
+    }
+
+
+def solve_design(index, design, work_directory=None, keep_results=False):
+    """Meshes, solves and summarizes a design in a directory of its own, so that designs can be
+    solved in parallel processes. A design that fails is recorded with its error rather than
+    stopping the sweep.
+
+    Args:
+        index (int): Index of the design
+        design (dict(String, object)): Value of every parameter of the design
+        work_directory (String, optional): Directory to solve in. Defaults to None, the system temporary directory.
+        keep_results (bool, optional): Also return the fields of the solved model, as the
+            result_set of the row, so that they can be exported. Defaults to False.
+
+    Returns:
+        dict(String, object): Result row of the design, with a value for every column in COLUMNS
+    """
+    start = time.perf_counter()
+    row = {
+        **get_design_columns(index, design),
+        **{name: math.nan for name in _SUMMARY_COLUMNS},
+        "error": None,
+    }
+
+    directory = tempfile.mkdtemp(dir=work_directory)
+    try:
+        check_design(design)
+        model = AxisymmetricPressFitModel(
+            design["id_0"],
+            design["id_1"],
+            design["od_0"],
+            design["od_1"],
+            design["length"],
+            design["length"],
+            os.path.join(directory, "Sweep_Model"),
+            lines_per_part=design["lines_per_part"],
+        )
+        row["lines_per_part"] = model.mesh.curve_num
+        model.run_model(design["inner_material"], design["outer_material"])
+        model.read_element_results()
+        model.read_nodal_results()
+
+        summary = model.get_summary()
+        row.update({name: summary[name] for name in _SUMMARY_COLUMNS})
+
+        if keep_results:
+            row["result_set"] = ResultSet.from_model(model)
+    except Exception as e:  # Any failure of one design is recorded in its row
+        row["error"] = f"{type(e).__name__}: {e}"
+    finally:
+        shutil.rmtree(directory, True)
+
+    row["seconds"] = time.perf_counter() - start
+    return row
+
+
+class ResultWriter:
+    """Writes result rows to a Parquet or CSV file as they arrive, so that results of a long
+    sweep are kept if it is stopped and memory use does not grow with the number of designs.
+    Parquet rows are buffered and written as a row group once enough have arrived."""
+
+    def __init__(self, path, rows_per_group=256):
+        """Opens a file for writing, replacing any existing file
+
+        Args:
+            path (String): Path of the file. Written as Parquet if it ends with .parquet, otherwise CSV.
+            rows_per_group (int, optional): Rows of each Parquet row group. Defaults to 256.
+
+        Raises:
+            ImportError: If writing Parquet without pyarrow installed
+        """
+        self.path = path
+        self.rows_per_group = rows_per_group
+        self.count = 0
+        self._rows = []
+
+        if path.endswith(".parquet"):
+            if pq is None:
+                raise ImportError("pyarrow is required to write results to Parquet")
+
+            self._schema = pa.schema(
+                [(name, pa.type_for_alias(type_)) for name, type_ in COLUMNS]
+            )
+            self._writer = pq.ParquetWriter(path, self._schema, compression="zstd")
+            self._file = None
+        else:
+            self._writer = None
+            self._file = open(path, "w", newline="")
+            self._csv = csv.DictWriter(self._file, [name for name, _ in COLUMNS])
+            self._csv.writeheader()
+
+    def write(self, row):
+        """Writes a result row
+
+        Args:
+            row (dict(String, object)): Values keyed by column name
+        """
+        self.count += 1
+        if self._writer is None:
+            self._csv.writerow(row)
+            self._file.flush()
+            return
+
+        self._rows.append(row)
+        if len(self._rows) >= self.rows_per_group:
+            self._write_group()
+
+    def _write_group(self):
+        if self._rows:
+            self._writer.write_table(pa.Table.from_pylist(self._rows, self._schema))
+            self._rows = []
+
+    def close(self):
+        """Writes any buffered rows and closes the file"""
+        if self._writer is not None:
+            self._write_group()
+            self._writer.close()
+        else:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def solve_designs(
+    indexed_designs, workers=None, work_directory=None, keep_results=False
+):
+    """Solves designs across a pool of processes, each solving one design at a time
+
+    Args:
+        indexed_designs (iterable((int, dict(String, object)))): Index and parameters of each design
+        workers (int, optional): Number of processes. 0 solves in this process. Defaults to None, the processor count.
+        work_directory (String, optional): Directory to solve in. Defaults to None, the system temporary directory.
+        keep_results (bool, optional): Also return the fields of each solved design, as from
+            solve_design. Defaults to False.
+
+    Yields:
+        dict(String, object): Result row of each design, from solve_design, in the order they finish
+    """
+    if workers == 0:
+        for i, design in indexed_designs:
+            yield solve_design(i, design, work_directory, keep_results)
+        return
+
+    executor = ProcessPoolExecutor(max_workers=workers)
+    try:
+        futures = [
+            executor.submit(solve_design, i, design, work_directory, keep_results)
+            for i, design in indexed_designs
+        ]
+        for future in as_completed(futures):
+            yield future.result()
+    finally:
+        # Designs not yet started are dropped if iteration stops early, such as on an interrupt
+        executor.shutdown(cancel_futures=True)
+
+
+def run_sweep(
+    designs,
+    output,
+    workers=None,
+    work_directory=None,
+    export_directory=None,
+    rows_per_group=256,
+):
+    """Solves every design across a pool of processes, each solving one design at a time, and
+    writes the result row of each as it finishes
+
+    Args:
+        designs (list(dict(String, object))): Designs, as from get_designs
+        output (String): Path of the Parquet or CSV results file
+        workers (int, optional): Number of processes. 0 solves in this process. Defaults to None, the processor count.
+        work_directory (String, optional): Directory to solve in. Defaults to None, the system temporary directory.
+        export_directory (String, optional): Directory of Parquet datasets to export the fields of
+            each solved design to, with run id design_{index}. Fields are written by this process
+            so that designs share files. Defaults to None, not exporting.
+        rows_per_group (int, optional): Rows of each Parquet row group. Defaults to 256.
+
+    Returns:
+        dict: Number of designs and failures, and the duration of the sweep (s)
+    """
+    start = time.perf_counter()
+    failed = 0
+
+    exporter = DatasetWriter(export_directory) if export_directory else None
+    with ResultWriter(output, rows_per_group) as writer, exporter or nullcontext():
+        for row in solve_designs(
+            enumerate(designs), workers, work_directory, exporter is not None
+        ):
+            result_set = row.pop("result_set", None)
+            if result_set is not None:
+                design = designs[row["design"]]
+                parameters = get_run_parameters(
+                    *(design[name] for name in REQUIRED_PARAMETERS),
+                    row["lines_per_part"],
+                )
+                exporter.write(result_set, f"design_{row['design']}", parameters)
+
+            writer.write(row)
+            failed += row["error"] is not None
+
+    return {
+        "designs": len(designs),
+        "failed": failed,
+        "seconds": time.perf_counter() - start,
+    }
+
+
+def parse_values(text, count=3):
+    """Parses the values of a numeric parameter given on the command line
+
+    Args:
+        text (list(String)): Values, or a single low:high range
+        count (int, optional): Levels of a range in full factorial designs. Defaults to 3.
+
+    Returns:
+        object: A list of values or a Range
+    """
+    if len(text) == 1 and ":" in text[0]:
+        low, high = text[0].split(":")
+        return Range(float(low), float(high), count)
+
+    return [float(value) for value in text]
+
+
+def parse_material(text):
+    """Parses a material given on the command line as name:youngs_modulus:poissons_ratio, with
+    the Young's modulus in GPa
+
+    Args:
+        text (String): The material
+
+    Returns:
+        Material: The material
+    """
+    name, youngs_modulus, poissons_ratio = text.split(":")
+    return Material(name, float(youngs_modulus) * 1e9, float(poissons_ratio))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Solve a sweep of axisymmetric press fits, writing a row of results for each design. "
+        "Dimensions are in m. Numeric parameters take one or more values, or a low:high range."
+    )
+    parser.add_argument("output", help="Path of the results, .parquet or .csv")
+    for name in ("id_0", "id_1", "od_0", "od_1", "length"):
+        parser.add_argument(f"--{name.replace('_', '-')}", nargs="+", required=True)
+    for name in ("inner_material", "outer_material"):
+        parser.add_argument(
+            f"--{name.replace('_', '-')}",
+            nargs="+",
+            required=True,
+            type=parse_material,
+            help="name:youngs_modulus_gpa:poissons_ratio",
+        )
+    parser.add_argument("--lines-per-part", nargs="+", type=int)
+    parser.add_argument("--method", choices=METHODS, default=FULL_FACTORIAL)
+    parser.add_argument(
+        "--levels",
+        type=int,
+        default=3,
+        help="Levels of each range of full factorial designs",
+    )
+    parser.add_argument(
+        "--samples", type=int, default=10, help="Latin hypercube or random designs"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, help="Defaults to the processor count")
+    parser.add_argument("--work-directory")
+    parser.add_argument(
+        "--export-directory", help="Also export the fields of each design to Parquet"
+    )
+    args = parser.parse_args()
+
+    parameters = {
+        name: parse_values(getattr(args, name), args.levels)
+        for name in ("id_0", "id_1", "od_0", "od_1", "length")
+    }
+    parameters["inner_material"] = args.inner_material
+    parameters["outer_material"] = args.outer_material
+    if args.lines_per_part:
+        parameters["lines_per_part"] = args.lines_per_part
+
+    try:
+        designs = get_designs(parameters, args.method, args.samples, args.seed)
+    except ValueError as e:
+        parser.error(str(e))
+    summary = run_sweep(
+        designs, args.output, args.workers, args.work_directory, args.export_directory
+    )
+    print(
+        f"Solved {summary['designs']} designs ({summary['failed']} failed) "
+        f"in {summary['seconds']:.1f}s, writing {args.output}"
+    )
+
+
+if __name__ == "__main__":
+    main()
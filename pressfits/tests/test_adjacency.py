@@ -0,0 +1,79 @@
+import unittest
+
+import numpy as np
+
+from pressfits.model import AxisymmetricPressFitModel
+from pressfits.results import Stress
+from pressfits.shape_functions import (
+    INTEGRATION_POINTS,
+    NODE_NATURAL_COORDINATES,
+    shape_functions,
+)
+
+
+class TestAdjacency(unittest.TestCase):
+    def setUp(self):
+        self.model = AxisymmetricPressFitModel(
+            0.02, 0.03, 0.0301, 0.05, 0.015, 0.015, "Adjacency_Model", lines_per_part=5
+        )
+        self.adjacency = self.model.mesh.get_adjacency()
+
+    def test_node_elements(self):
+        for node_index in (0, len(self.model.nodes) // 2, len(self.model.nodes) - 1):
+            node_id = self.model.nodes[node_index].id
+            expected = [
+                i
+                for i, element in enumerate(self.model.elements)
+                if node_id in element.get_ids()
+            ]
+            self.assertEqual(
+                sorted(self.adjacency.get_node_elements(node_index)), expected
+            )
+
+    def test_face_neighbors(self):
+        for element_index, neighbors in enumerate(self.adjacency.face_neighbors):
+            element = self.model.elements[element_index]
+            for face, neighbor in enumerate(neighbors, start=1):
+                if neighbor == -1:
+                    continue
+                # Neighbors share the face's corner nodes and refer back to this element
+                face_ids = {node.id for node in element.get_face_nodes(face)}
+                self.assertTrue(
+                    face_ids <= set(self.model.elements[neighbor].get_ids())
+                )
+                self.assertIn(element_index, self.adjacency.face_neighbors[neighbor])
+                self.assertIn(
+                    neighbor, self.adjacency.get_element_neighbors(element_index)
+                )
+
+        # Parts do not share nodes, so each has its own closed boundary of faces
+        self.assertTrue(len(self.adjacency.get_boundary_faces()) > 0)
+
+    def test_shape_functions(self):
+        values = shape_functions(
+            NODE_NATURAL_COORDINATES[:, 0], NODE_NATURAL_COORDINATES[:, 1]
+        )
+        np.testing.assert_allclose(values, np.eye(8), atol=1e-12)
+        np.testing.assert_allclose(
+            shape_functions(np.array([0.3, -0.7]), np.array([0.1, 0.5])).sum(axis=-1),
+            1,
+        )
+
+    def test_nodal_stresses_reproduce_linear_field(self):
+        def field(x, y):
+            return 1e6 + 3e8 * x - 2e8 * y
+
+        points = INTEGRATION_POINTS[9]
+        weights = shape_functions(points[:, 0], points[:, 1])
+        for element in self.model.elements:
+            x = weights @ [node.x for node in element.nodes]
+            y = weights @ [node.y for node in element.nodes]
+            element.results = [
+                Stress(value, -value, 0.0, 0.0, 0.0, 0.0) for value in field(x, y)
+            ]
+
+        stresses = self.model.get_nodal_stresses()
+        expected = [field(node.x, node.y) for node in self.model.nodes]
+
+        np.testing.assert_allclose(stresses[:, 0], expected, rtol=1e-6)
+        np.testing.assert_allclose(stresses[:, 1], np.negative(expected), rtol=1e-6)
@@ -0,0 +1,67 @@
+import os
+import tempfile
+import unittest
+
+from pressfits.batch import BatchCase, BatchPressFitModel
+from pressfits.benchmarks.fixtures import write_dat, write_frd
+from pressfits.model import AxisymmetricPressFitModel, Material
+
+_STEEL = Material("Steel", 2.1e11, 0.3)
+_ALUMINIUM = Material("Aluminium", 6.89e10, 0.33)
+
+
+class TestBatchPressFitModel(unittest.TestCase):
+    def setUp(self):
+        self.cases = [
+            BatchCase(0.02, 0.03, 0.0301, 0.05, 0.015, 0.015, _STEEL, _ALUMINIUM, 5),
+            BatchCase(0.01, 0.02, 0.0201, 0.04, 0.01, 0.01, _ALUMINIUM, _STEEL, 5),
+            BatchCase(0.02, 0.03, 0.0302, 0.06, 0.015, 0.015, _STEEL, _STEEL, 7),
+        ]
+
+    def test_deck(self):
+        batch = BatchPressFitModel(self.cases, "Batch_Model")
+        node_ids = [node.id for node in batch.nodes]
+        self.assertEqual(node_ids, list(range(1, len(node_ids) + 1)))
+
+        with tempfile.TemporaryDirectory() as directory:
+            batch.name = os.path.join(directory, "Batch_Model")
+            batch._create_input_file(increments=2)
+
+        self.assertEqual(batch.inp_str.count("*STEP\n"), 1)
+        self.assertIn("*STATIC,DIRECT\n0.5,1.0\n", batch.inp_str)
+        for i in range(len(self.cases)):
+            self.assertIn(f"C{i}_L2_faces,C{i}_L4_faces\n", batch.inp_str)
+            self.assertIn(f"*BOUNDARY\nC{i}_L7_nodes,2\n", batch.inp_str)
+        self.assertIn("*MATERIAL,NAME=C1_Aluminium\n", batch.inp_str)
+
+    def test_split(self):
+        batch = BatchPressFitModel(self.cases, "Batch_Model")
+        with tempfile.TemporaryDirectory() as directory:
+            batch.name = os.path.join(directory, "Batch_Model")
+            write_frd(batch.mesh, f"{batch.name}.frd", 2)
+            write_dat(batch.mesh, f"{batch.name}.dat", 2)
+            batch.read_nodal_results()
+            batch.read_element_results()
+
+        models = batch.split()
+        self.assertEqual(len(models), len(self.cases))
+
+        for case, model in zip(self.cases, models):
+            alone = AxisymmetricPressFitModel(
+                *case[:6], "Alone_Model", lines_per_part=case.lines_per_part
+            )
+            self.assertIsInstance(model, AxisymmetricPressFitModel)
+            self.assertEqual(
+                [node.id for node in model.nodes], [node.id for node in alone.nodes]
+            )
+            self.assertEqual(
+                [element.get_ids() for element in model.elements],
+                [element.get_ids() for element in alone.elements],
+            )
+            self.assertEqual(model.mesh.l_2, alone.mesh.l_2)
+
+            self.assertEqual(model.get_step_keys(), [101, 102])
+            self.assertEqual(model.step_times[101], 0.5)
+            self.assertEqual(len(model.elements[-1].results), 9)
+            self.assertGreater(model.max_contact_pressure(102), 0)
+            self.assertEqual(len(model.get_interference_curve()), 2)
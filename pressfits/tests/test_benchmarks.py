@@ -0,0 +1,142 @@
+import copy
+import os
+import tempfile
+import unittest
+
+from pressfits.benchmarks.fixtures import write_dat, write_frd
+from pressfits.benchmarks.load import INVALID, REPEAT, SWEEP, run_load_test
+from pressfits.benchmarks.stages import (AXISYMMETRIC, benchmark_case,
+                                         compare_reports)
+from pressfits.model import AxisymmetricPressFitModel
+
+
+class TestFixtures(unittest.TestCase):
+    def create_model(self, directory):
+        return AxisymmetricPressFitModel(
+            0.02,
+            0.03,
+            0.0301,
+            0.05,
+            0.015,
+            0.015,
+            os.path.join(directory, "Fixture_Model"),
+            lines_per_part=5,
+        )
+
+    def test_round_trip(self):
+        with tempfile.TemporaryDirectory() as directory:
+            model = self.create_model(directory)
+            frd_bytes = write_frd(model.mesh, f"{model.name}.frd")
+            dat_bytes = write_dat(model.mesh, f"{model.name}.dat")
+            model.read_nodal_results()
+            model.read_element_results()
+
+            self.assertEqual(os.path.getsize(f"{model.name}.frd"), frd_bytes)
+            self.assertEqual(os.path.getsize(f"{model.name}.dat"), dat_bytes)
+
+        for node in model.nodes:
+            result = node.results[101]
+            for quantity in ("displacement", "stress", "strain", "force", "contact"):
+                self.assertIsNotNone(getattr(result, quantity))
+        self.assertTrue(all(len(element.results) == 9 for element in model.elements))
+
+        self.assertGreater(model.max_contact_pressure(), 0)
+        self.assertLess(model.nodes[0].results[101].stress.xx, 0)
+        self.assertLess(model.elements[0].results[0].xx, 0)
+
+    def test_steps(self):
+        with tempfile.TemporaryDirectory() as directory:
+            model = self.create_model(directory)
+            write_frd(model.mesh, f"{model.name}.frd", steps=2)
+            write_dat(model.mesh, f"{model.name}.dat", steps=2)
+            model.read_nodal_results()
+            model.read_element_results()
+
+            with open(f"{model.name}.frd") as f:
+                frd_lines = f.read().splitlines()
+            with open(f"{model.name}.dat") as f:
+                dat_lines = f.read().splitlines()
+
+        node = model.nodes[-1]
+        self.assertEqual(set(node.results), {101, 102})
+        self.assertAlmostEqual(
+            node.results[102].stress.xx, 2 * node.results[101].stress.xx, delta=1e3
+        )
+        # Only the stresses of the last increment are kept
+        self.assertEqual(len(model.elements[0].results), 9)
+
+        # Values are fixed width, running on into each other when negative
+        value_lines = [
+            line for line in frd_lines if line.startswith(" -1") and "E" in line
+        ]
+        self.assertTrue(all((len(line) - 13) % 12 == 0 for line in value_lines))
+        self.assertTrue(any("E-06-" in line for line in value_lines))
+        self.assertEqual(
+            {len(line) for line in dat_lines if line[:10].strip().isdigit()}, {98}
+        )
+
+    def test_after_failed_mesh(self):
+        with tempfile.TemporaryDirectory() as directory:
+            self.create_model(directory)
+            # An even number of lines cannot be meshed, leaving nodes of a partial mesh
+            with self.assertRaises(ValueError):
+                AxisymmetricPressFitModel(
+                    0.02, 0.03, 0.0301, 0.05, 0.015, 0.015, "Failed", lines_per_part=4
+                )
+
+            model = self.create_model(directory)
+            write_frd(model.mesh, f"{model.name}.frd")
+            model.read_nodal_results()
+
+        self.assertEqual([node.id for node in model.nodes][:3], [1, 2, 3])
+        self.assertEqual(model.elements[0].id, 1)
+        self.assertTrue(all(101 in node.results for node in model.nodes))
+
+
+class TestStageBenchmarks(unittest.TestCase):
+    def test_benchmark_case(self):
+        with tempfile.TemporaryDirectory() as directory:
+            case = benchmark_case(AXISYMMETRIC, directory, 5, 0.015, repeats=1)
+
+        self.assertEqual(case["lines_per_part"], 5)
+        self.assertGreater(case["frd_bytes"], 0)
+        self.assertEqual(
+            list(case["stages"])[:5],
+            ["mesh", "inp_string", "deck", "frd_parse", "dat_parse"],
+        )
+        self.assertEqual(case["stages"]["inp_string"]["depth"], 1)
+        self.assertGreater(case["stages"]["frd_parse"]["peak_memory"], 0)
+
+        report = {"cases": [case]}
+        slower = copy.deepcopy(report)
+        slower["cases"][0]["stages"]["frd_parse"]["median"] += 1.0
+
+        changes = compare_reports(report, slower)
+        self.assertEqual(
+            [change["stage"] for change in changes if change["is_regression"]],
+            ["frd_parse"],
+        )
+        self.assertFalse(
+            any(change["is_regression"] for change in compare_reports(report, report))
+        )
+
+
+class TestLoadTest(unittest.TestCase):
+    def test_load_test(self):
+        report = run_load_test(
+            concurrency=(1, 4),
+            requests=24,
+            mix={REPEAT: 0.4, SWEEP: 0.4, INVALID: 0.2},
+            solve_seconds=0.001,
+            workers=2,
+        )
+
+        for level in report["levels"]:
+            self.assertEqual(level["requests"], 24)
+            self.assertEqual(level["errors"], 0)
+            self.assertEqual(set(level["statuses"]), {"200", "400"})
+            self.assertGreater(level["throughput"], 0)
+            self.assertLessEqual(level["latency"]["p50"], level["latency"]["max"])
+            self.assertEqual(set(level["latency_by_kind"]), {REPEAT, SWEEP, INVALID})
+            for stage in ("queue", "run_model", "ccx", "frd_parse", "store"):
+                self.assertIn(stage, level["stages"])
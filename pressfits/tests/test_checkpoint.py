@@ -0,0 +1,147 @@
+import csv
+import os
+import tempfile
+import unittest
+
+from pressfits import sweep
+from pressfits.benchmarks.load import stand_in_solver
+from pressfits.checkpoint import (
+    Checkpoint,
+    get_design_key,
+    read_design_table,
+    run_design_table,
+)
+from pressfits.model import Material
+
+_STEEL = Material("Steel", 2.1e11, 0.3)
+_ALUMINIUM = Material("Aluminium", 6.89e10, 0.33)
+
+
+class TestCheckpoint(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.designs = sweep.get_designs(
+            {
+                "id_0": 0.02,
+                "id_1": 0.03,
+                "od_0": sweep.Range(0.0301, 0.0303),
+                "od_1": 0.05,
+                "length": 0.015,
+                "inner_material": [_STEEL, _ALUMINIUM],
+                "outer_material": _ALUMINIUM,
+                "lines_per_part": 5,
+            }
+        )
+        self.path = os.path.join(self.directory.name, "designs.sqlite3")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_read_design_table(self):
+        path = os.path.join(self.directory.name, "designs.csv")
+        with open(path, "w", newline="") as f:
+            writer = csv.DictWriter(
+                f, [name for name, _ in sweep.COLUMNS][:13], extrasaction="ignore"
+            )
+            writer.writeheader()
+            for i, design in enumerate(self.designs):
+                writer.writerow(sweep.get_design_columns(i, design))
+
+        self.assertEqual(read_design_table(path), self.designs)
+
+        with open(path, "w") as f:
+            f.write("id_0,id_1\n0.02,0.03\n")
+        with self.assertRaises(ValueError):
+            read_design_table(path)
+
+    def test_invalid_design_table(self):
+        path = os.path.join(self.directory.name, "designs.csv")
+        columns = [name for name, _ in sweep.COLUMNS][:13]
+        with open(path, "w", newline="") as f:
+            writer = csv.DictWriter(f, columns, extrasaction="ignore")
+            writer.writeheader()
+            for i, design in enumerate(self.designs[:3]):
+                writer.writerow(sweep.get_design_columns(i, design))
+            # A solid shaft is valid
+            writer.writerow({**sweep.get_design_columns(3, self.designs[3]), "id_0": 0})
+            writer.writerow(
+                {**sweep.get_design_columns(4, self.designs[0]), "lines_per_part": 4}
+            )
+            writer.writerow(
+                {**sweep.get_design_columns(5, self.designs[0]), "od_0": 0.029}
+            )
+            writer.writerow(
+                {**sweep.get_design_columns(6, self.designs[0]), "id_0": "x"}
+            )
+
+        with self.assertRaises(ValueError) as context:
+            read_design_table(path)
+
+        # Rows are numbered by their line, after the header
+        message = str(context.exception)
+        for line in (6, 7, 8):
+            self.assertIn(f"line {line}:", message)
+        self.assertNotIn("line 5:", message)
+        self.assertIn("odd integer", message)
+
+    def test_resume(self):
+        with Checkpoint(self.path) as checkpoint, stand_in_solver(solve_seconds=0):
+            status = run_design_table(self.designs[:4], checkpoint, workers=0)
+            self.assertEqual(status["solved"], 4)
+            self.assertEqual(status["skipped"], 0)
+
+        # A second run, as after an interruption, solves only the designs not yet recorded
+        reports = []
+        with Checkpoint(self.path) as checkpoint, stand_in_solver(solve_seconds=0):
+            status = run_design_table(
+                self.designs, checkpoint, workers=0, progress=reports.append
+            )
+            rows = list(
+                checkpoint.get_rows([get_design_key(design) for design in self.designs])
+            )
+
+        self.assertEqual(status["skipped"], 4)
+        self.assertEqual(status["solved"], len(self.designs) - 4)
+        self.assertEqual(len(reports), len(self.designs) - 4)
+        self.assertEqual([row["design"] for row in rows], list(range(6)))
+        self.assertTrue(all(row["contact_pressure"] > 0 for row in rows))
+        self.assertTrue(all(row["error"] is None for row in rows))
+
+    def test_reordered_table(self):
+        with Checkpoint(self.path) as checkpoint, stand_in_solver(solve_seconds=0):
+            run_design_table(self.designs[:4], checkpoint, workers=0)
+            # The table is reordered and added to before the second run
+            designs = self.designs[::-1]
+            run_design_table(designs, checkpoint, workers=0)
+
+            keys = [get_design_key(design) for design in designs]
+            rows = list(checkpoint.get_rows(keys + keys[:1]))
+            self.assertEqual(len(list(checkpoint.get_rows())), len(designs))
+
+        # Rows follow the reordered table, whichever run recorded them
+        self.assertEqual([row["design"] for row in rows], list(range(len(designs))))
+        for row, design in zip(rows, designs):
+            self.assertEqual(row["od_0"], design["od_0"])
+            self.assertEqual(row["inner_material"], design["inner_material"].name)
+
+    def test_retry_failed(self):
+        design = self.designs[0]
+        key = get_design_key(design)
+        with Checkpoint(self.path) as checkpoint, stand_in_solver(solve_seconds=0):
+            checkpoint.record(
+                key,
+                {
+                    **sweep.get_design_columns(0, design),
+                    **{name: None for name in sweep._SUMMARY_COLUMNS},
+                    "seconds": 0.0,
+                    "error": "CalledProcessError: ccx failed",
+                },
+            )
+            self.assertEqual(checkpoint.get_finished_keys(include_failed=False), set())
+
+            status = run_design_table([design], checkpoint, 0, retry_failed=False)
+            self.assertEqual(status["skipped"], 1)
+
+            status = run_design_table([design, design], checkpoint, 0)
+            self.assertEqual((status["solved"], status["skipped"]), (1, 1))
+            self.assertEqual(checkpoint.get_finished_keys(include_failed=False), {key})
@@ -0,0 +1,87 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from pressfits import export
+from pressfits.model import AxisymmetricPressFitModel, Material
+from pressfits.result_set import ResultSet
+from pressfits.tests.test_result_set import populate_results
+
+
+class TestExport(unittest.TestCase):
+    def setUp(self):
+        self.model = AxisymmetricPressFitModel(
+            0.02, 0.03, 0.0301, 0.05, 0.015, 0.015, "Export_Model", lines_per_part=5
+        )
+        populate_results(self.model)
+        self.result_set = ResultSet.from_model(self.model)
+
+        steel = Material(name="Steel", youngs_modulus=2.1e11, poissons_ratio=0.3)
+        self.parameters = export.get_run_parameters(
+            0.02, 0.03, 0.0301, 0.05, 0.015, steel, steel, 5
+        )
+
+    def test_node_columns(self):
+        columns = export.node_columns(self.result_set, "run", self.parameters)
+
+        self.assertEqual(len(columns["node_id"]), len(self.model.nodes))
+        self.assertTrue((columns["od_0"] == 0.0301).all())
+        self.assertAlmostEqual(
+            float(columns["displacement_x"][5]),
+            self.model.nodes[5].results[101].displacement.x,
+            delta=1e-9,
+        )
+        self.assertTrue(np.isnan(columns["stress_xx"]).all())
+
+    def test_element_columns(self):
+        columns = export.element_columns(self.result_set, "run")
+
+        self.assertEqual(len(columns["element_id"]), len(self.model.elements))
+        self.assertAlmostEqual(
+            float(columns["stress_von_mises"].max()) * 1e-6,
+            max(
+                self.model.max_element_vm_stress(0),
+                self.model.max_element_vm_stress(1),
+            ),
+            delta=1e-3,
+        )
+
+    @unittest.skipIf(export.pq is None, "pyarrow is not installed")
+    def test_export_run(self):
+        with tempfile.TemporaryDirectory() as directory:
+            export.export_run(self.model, directory, "run_0", self.parameters)
+            export.export_run(self.result_set, directory, "run_1", self.parameters)
+
+            nodes = export.pq.read_table(f"{directory}/nodes")
+            elements = export.pq.read_table(f"{directory}/elements")
+            partitions = os.listdir(f"{directory}/nodes")
+
+        self.assertEqual(nodes.num_rows, 2 * len(self.model.nodes))
+        self.assertEqual(elements.num_rows, 2 * len(self.model.elements))
+        self.assertEqual(
+            sorted(set(nodes.column("run_id").to_pylist())), ["run_0", "run_1"]
+        )
+        # Runs are partitioned by mesh density, not by run
+        self.assertEqual(partitions, ["lines_per_part=5"])
+
+    @unittest.skipIf(export.pq is None, "pyarrow is not installed")
+    def test_dataset_writer(self):
+        with tempfile.TemporaryDirectory() as directory:
+            node_rows = len(self.model.nodes)
+            with export.DatasetWriter(directory, rows_per_file=3 * node_rows) as writer:
+                for i in range(7):
+                    writer.write(self.result_set, f"run_{i}", self.parameters)
+                writer.write(self.result_set, "unparameterized")
+
+            files = [
+                name for _, _, names in os.walk(f"{directory}/nodes") for name in names
+            ]
+            nodes = export.pq.read_table(f"{directory}/nodes")
+
+        # Two full files of three runs, and on closing one of the last run with parameters and
+        # one in the partition of runs without
+        self.assertEqual(len(files), 4)
+        self.assertEqual(nodes.num_rows, 8 * node_rows)
+        self.assertEqual(len(set(nodes.column("run_id").to_pylist())), 8)
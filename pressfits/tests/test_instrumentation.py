@@ -0,0 +1,107 @@
+import asyncio
+import os
+import tempfile
+import unittest
+
+from pressfits import instrumentation
+from pressfits.instrumentation import RunRecorder, instrumented
+from pressfits.model import Material, PlaneStressPressFitModel
+
+
+class _Instrumented:
+    def __init__(self):
+        self.recorder = RunRecorder("test")
+
+    @instrumented("outer")
+    def outer(self):
+        return self.inner()
+
+    @instrumented("inner")
+    def inner(self):
+        return list(range(10000))
+
+    @instrumented("async")
+    async def run(self):
+        await asyncio.sleep(0)
+        return self.inner()
+
+
+class TestRunRecorder(unittest.TestCase):
+    def setUp(self):
+        self.stages = []
+        self.records = []
+        instrumentation.add_stage_callback(self.record_stage)
+        instrumentation.add_record_callback(self.records.append)
+
+    def tearDown(self):
+        instrumentation.remove_stage_callback(self.record_stage)
+        instrumentation.remove_record_callback(self.records.append)
+
+    def record_stage(self, stage, seconds, details):
+        self.stages.append((stage, details.get("error")))
+
+    def test_stages(self):
+        instance = _Instrumented()
+        self.assertEqual(len(instance.outer()), 10000)
+        self.assertEqual(len(asyncio.run(instance.run())), 10000)
+
+        with self.assertRaises(ValueError), instance.recorder.stage("failing"):
+            raise ValueError()
+
+        self.assertEqual(
+            self.stages,
+            [
+                ("inner", None),
+                ("outer", None),
+                ("inner", None),
+                ("async", None),
+                ("failing", "ValueError"),
+            ],
+        )
+
+        instance.recorder.add(bytes_read=10)
+        instance.recorder.add(bytes_read=5)
+        record = instance.recorder.emit(job_id="abc")
+        self.assertEqual(self.records, [record])
+        self.assertEqual(record["bytes_read"], 15)
+        self.assertEqual(record["job_id"], "abc")
+        self.assertEqual(
+            [stage["depth"] for stage in record["stages"]], [1, 0, 1, 0, 0]
+        )
+        self.assertAlmostEqual(
+            record["seconds"],
+            sum(stage["seconds"] for stage in record["stages"] if stage["depth"] == 0),
+        )
+
+    def test_memory_and_profile(self):
+        with tempfile.TemporaryDirectory() as directory:
+            instance = _Instrumented()
+            instance.recorder = RunRecorder(
+                "profiled", trace_memory=True, profile_directory=directory
+            )
+            instance.outer()
+            record = instance.recorder.emit()
+
+            inner, outer = record["stages"]
+            self.assertGreater(inner["peak_memory"], 0)
+            self.assertGreaterEqual(outer["peak_memory"], inner["peak_memory"])
+            self.assertEqual(record["peak_memory"], outer["peak_memory"])
+            self.assertTrue(os.path.exists(record["profile"]))
+
+    def test_model(self):
+        with tempfile.TemporaryDirectory() as directory:
+            model = PlaneStressPressFitModel(
+                0.02, 0.03, 0.0301, 0.05, os.path.join(directory, "Test_Model")
+            )
+            model._create_input_file(
+                Material("inner", 210e9, 0.3), Material("outer", 68.9e9, 0.33)
+            )
+            record = model.emit_run_record()
+
+        self.assertEqual(record["node_count"], len(model.nodes))
+        self.assertEqual(record["element_count"], len(model.elements))
+        self.assertEqual(record["bytes_written"], len(model.inp_str))
+        self.assertEqual(
+            [stage["stage"] for stage in record["stages"]],
+            ["mesh", "inp_string", "deck"],
+        )
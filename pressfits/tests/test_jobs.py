@@ -0,0 +1,68 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from pressfits.jobs import JobStore
+from pressfits.model import AxisymmetricPressFitModel
+from pressfits.result_set import ResultSet
+from pressfits.tests.test_result_set import populate_results
+
+_JOB_IDS = ["a" * 32, "b" * 32, "c" * 32]
+
+
+class TestJobStore(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        model = AxisymmetricPressFitModel(
+            0.02, 0.03, 0.0301, 0.05, 0.015, 0.015, "Job_Model", lines_per_part=5
+        )
+        populate_results(model)
+        self.result_set = ResultSet.from_model(model)
+        self.summary = {"contact_pressure": 30.0}
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_atomic_writes(self):
+        store = JobStore(self.directory.name)
+        store.save(_JOB_IDS[0], self.result_set, self.summary, "*NODE\n")
+        self.assertEqual(
+            sorted(os.listdir(self.directory.name)),
+            [f"{_JOB_IDS[0]}.{extension}" for extension in ("inp", "json", "npz")],
+        )
+
+        # A write that fails leaves no file, partial or temporary, for other requests
+        with mock.patch.object(ResultSet, "save", side_effect=OSError):
+            with self.assertRaises(OSError):
+                store.save(_JOB_IDS[1], self.result_set, self.summary)
+
+        self.assertEqual(len(os.listdir(self.directory.name)), 3)
+        self.assertFalse(store.exists(_JOB_IDS[1]))
+        self.assertEqual(
+            JobStore(self.directory.name).load_summary(_JOB_IDS[0]), self.summary
+        )
+
+    def test_eviction(self):
+        store = JobStore(self.directory.name, size=2)
+        for i, job_id in enumerate(_JOB_IDS[:2]):
+            store.save(job_id, self.result_set, self.summary)
+            path = os.path.join(self.directory.name, f"{job_id}.json")
+            os.utime(path, (i, i))
+
+        # Loading the older job makes the other the least recently used
+        store.load(_JOB_IDS[0])
+        store.save(_JOB_IDS[2], self.result_set, self.summary)
+
+        self.assertEqual(
+            [store.exists(job_id) for job_id in _JOB_IDS], [True, False, True]
+        )
+        self.assertEqual(len(os.listdir(self.directory.name)), 4)
+        with self.assertRaises(KeyError):
+            store.load(_JOB_IDS[1])
+        with self.assertRaises(KeyError):
+            store.load_summary(_JOB_IDS[1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,6 +3,7 @@ import unittest
 
 from pressfits.concentric_plane_stress_mesh import ConcentricPlaneStressMesh, PSElement
 from pressfits.curves import Arc
+from pressfits.model import Material
 from pressfits.node import Node
 
 
@@ -111,3 +112,10 @@ class TestMesh(unittest.TestCase):
     def compare_nodes(self, a, b, delta=0.001):
         self.assertAlmostEqual(a.x, b.x, delta=delta)
         self.assertAlmostEqual(a.y, b.y, delta=delta)
+
+    def test_increments(self):
+        mesh = ConcentricPlaneStressMesh(0.02, 0.03, 0.0301, 0.05)
+        steel = Material("Steel", 2.1e11, 0.3)
+
+        self.assertIn("*STATIC\n", mesh.get_inp_str(steel, steel))
+        self.assertIn("*STATIC,DIRECT\n0.25,1.0\n", mesh.get_inp_str(steel, steel, 4))
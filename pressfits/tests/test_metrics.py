@@ -0,0 +1,65 @@
+import unittest
+
+from pressfits.metrics import (REGISTRY, STAGE_DURATION, STAGE_FAILURES,
+                               Counter, Gauge, Histogram, Metric,
+                               MetricsRegistry, record_cache_lookup,
+                               time_stage)
+
+
+class TestMetrics(unittest.TestCase):
+    def test_render(self):
+        registry = MetricsRegistry()
+        counter = registry.register(Counter("test_requests", "Requests", ("route",)))
+        histogram = registry.register(
+            Histogram("test_seconds", "Durations", buckets=(0.1, 1.0))
+        )
+        registry.register(Gauge("test_depth", "Depth", ("queue",), lambda: {("a",): 3}))
+
+        counter.inc(route='press"')
+        counter.inc(2, route='press"')
+        for value in (0.05, 0.5, 5.0):
+            histogram.observe(value)
+
+        lines = registry.render().splitlines()
+        self.assertIn("# TYPE test_requests counter", lines)
+        self.assertIn('test_requests_total{route="press\\""} 3', lines)
+        self.assertIn('test_seconds_bucket{le="0.1"} 1', lines)
+        self.assertIn('test_seconds_bucket{le="1.0"} 2', lines)
+        self.assertIn('test_seconds_bucket{le="+Inf"} 3', lines)
+        self.assertIn("test_seconds_sum 5.55", lines)
+        self.assertIn("test_seconds_count 3", lines)
+        self.assertIn('test_depth{queue="a"} 3', lines)
+
+        with self.assertRaises(ValueError):
+            counter.inc(stage="press")
+
+        self.assertIs(
+            registry.register(Counter("test_requests", "Requests", ("route",))),
+            counter,
+        )
+
+    def test_time_stage(self):
+        count = STAGE_DURATION.get_count(stage="test_stage")
+        failures = STAGE_FAILURES.get(stage="test_stage")
+
+        with time_stage("test_stage"):
+            pass
+        with self.assertRaises(RuntimeError), time_stage("test_stage"):
+            raise RuntimeError()
+
+        self.assertEqual(STAGE_DURATION.get_count(stage="test_stage"), count + 2)
+        self.assertEqual(STAGE_FAILURES.get(stage="test_stage"), failures + 1)
+
+    def test_cache_hit_ratio(self):
+        for is_hit in (True, True, True, False):
+            record_cache_lookup("test_cache", is_hit)
+
+        self.assertIn(
+            'pressfits_cache_hit_ratio{cache="test_cache"} 0.75',
+            REGISTRY.render().splitlines(),
+        )
+
+    def test_abstract_metric(self):
+        # Each type of metric defines its samples
+        with self.assertRaises(TypeError):
+            Metric("test_metric", "Metric")
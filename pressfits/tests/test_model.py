@@ -1,6 +1,14 @@
+import asyncio
+import os
+import subprocess
+import tempfile
+import threading
+import time
 import unittest
+from unittest import mock
 
 import pressfits.model as model
+from pressfits.benchmarks.fixtures import write_dat, write_frd
 from pressfits.element import PSElement
 from pressfits.model import Material, PlaneStressPressFitModel
 from pressfits.node import Node
@@ -51,3 +59,170 @@ class TestModel(unittest.TestCase):
             model.get_nodal_values(" -1         3-3.93642E-04 9.50334E-04 0.00000E+00"),
             (3, [-3.93642e-04, 9.50334e-04, float(0.0)]),
         )
+
+    def test_parse_nodal_lines(self):
+        test_model = PlaneStressPressFitModel(0.02, 0.03, 0.0301, 0.05, "Test_Model")
+        test_model._parse_nodal_lines(_FRD_DISP_BLOCK.splitlines(keepends=True))
+
+        self.assertEqual(test_model.nodes[0].results[101].displacement.x, 1e-05)
+        self.assertEqual(test_model.nodes[1].results[101].displacement.y, -2e-06)
+
+    def test_parse_element_lines(self):
+        test_model = PlaneStressPressFitModel(0.02, 0.03, 0.0301, 0.05, "Test_Model")
+        test_model._parse_element_lines(_DAT_BLOCK.splitlines(keepends=True))
+
+        self.assertEqual(len(test_model.elements[0].results), 2)
+        self.assertEqual(test_model.elements[0].results[1].yy, -2.0e06)
+        self.assertEqual(len(test_model.elements[1].results), 1)
+
+    def test_parse_increments(self):
+        test_model = PlaneStressPressFitModel(0.02, 0.03, 0.0301, 0.05, "Test_Model")
+        with tempfile.TemporaryDirectory() as directory:
+            test_model.name = os.path.join(directory, "Ramp_Model")
+            write_frd(test_model.mesh, f"{test_model.name}.frd", 4)
+            write_dat(test_model.mesh, f"{test_model.name}.dat", 4)
+            test_model.read_nodal_results()
+            test_model.read_element_results()
+
+        self.assertEqual(test_model.get_step_keys(), [101, 102, 103, 104])
+        self.assertEqual(test_model.get_final_key(), 104)
+        self.assertEqual(test_model.step_times[102], 0.5)
+
+        # Only the stresses of the last increment are kept
+        self.assertEqual(len(test_model.elements[0].results), 9)
+        final_stress = test_model.max_element_vm_stress(0)
+
+        curve = test_model.get_interference_curve()
+        self.assertEqual([point["time"] for point in curve], [0.25, 0.5, 0.75, 1.0])
+        self.assertAlmostEqual(curve[-1]["interference"], 0.0001)
+        self.assertAlmostEqual(
+            curve[1]["contact_pressure"], curve[-1]["contact_pressure"] / 2, 4
+        )
+        self.assertAlmostEqual(
+            curve[-1]["contact_pressure"], test_model.max_contact_pressure(104)
+        )
+        self.assertGreater(curve[-1]["max_inner_vm_stress"], 0)
+        self.assertGreater(final_stress, 0)
+
+    def test_tail_lines(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "Tail.frd")
+            process = _FakeProcess()
+            lines = _FRD_DISP_BLOCK.splitlines(keepends=True)
+
+            def write():
+                with open(path, "w") as f:
+                    for line in lines:
+                        # Write lines in two halves to exercise partial line handling
+                        f.write(line[:5])
+                        f.flush()
+                        time.sleep(0.001)
+                        f.write(line[5:])
+                        f.flush()
+                process.return_code = 0
+
+            writer = threading.Thread(target=write)
+            writer.start()
+            tailed = list(model.tail_lines(path, process, poll_interval=0.001))
+            writer.join()
+
+            self.assertEqual(tailed, lines)
+
+    def test_tail_lines_missing_file(self):
+        process = _FakeProcess()
+        process.return_code = 1
+        self.assertEqual(list(model.tail_lines("Does_Not_Exist.frd", process)), [])
+
+    def test_run_model_async(self):
+        with tempfile.TemporaryDirectory() as directory:
+            # Stand in for ccx that writes a results file for the job it is given, or fails
+            ccx = os.path.join(directory, "ccx")
+            with open(ccx, "w") as f:
+                f.write(
+                    '#!/bin/sh\n[ "$1" = "Fail" ] && exit 2\necho done > "$1.frd"\n'
+                )
+            os.chmod(ccx, 0o755)
+            path = f"{directory}{os.pathsep}{os.environ.get('PATH', '')}"
+            materials = (
+                Material("inner", 210e9, 0.3),
+                Material("outer", 68.9e9, 0.33),
+            )
+
+            with mock.patch.dict(os.environ, {"PATH": path}):
+                test_model = PlaneStressPressFitModel(
+                    0.02, 0.03, 0.0301, 0.05, os.path.join(directory, "Test_Model")
+                )
+                asyncio.run(test_model.run_model_async(*materials))
+                self.assertTrue(os.path.exists(f"{test_model.name}.inp"))
+                self.assertTrue(os.path.exists(f"{test_model.name}.frd"))
+
+                failing_model = PlaneStressPressFitModel(
+                    0.02, 0.03, 0.0301, 0.05, os.path.join(directory, "Fail")
+                )
+                with self.assertRaises(subprocess.CalledProcessError):
+                    asyncio.run(failing_model.run_model_async(*materials))
+
+    def test_run_model_streaming_errors(self):
+        with tempfile.TemporaryDirectory() as directory:
+            # Stand in for ccx that writes results, then fails for the Fail job
+            ccx = os.path.join(directory, "ccx")
+            with open(ccx, "w") as f:
+                f.write(
+                    '#!/bin/sh\necho done > "$1.frd"\necho done > "$1.dat"\n'
+                    'case "$1" in *Fail) exit 2 ;; esac\n'
+                )
+            os.chmod(ccx, 0o755)
+            path = f"{directory}{os.pathsep}{os.environ.get('PATH', '')}"
+            materials = (
+                Material("inner", 210e9, 0.3),
+                Material("outer", 68.9e9, 0.33),
+            )
+            parse_error = ValueError("Truncated results")
+
+            with mock.patch.dict(os.environ, {"PATH": path}), mock.patch.object(
+                PlaneStressPressFitModel, "_parse_nodal_lines", side_effect=parse_error
+            ):
+                # The error of a failed solve is raised, caused by that of parsing its results
+                failing_model = PlaneStressPressFitModel(
+                    0.02, 0.03, 0.0301, 0.05, os.path.join(directory, "Fail")
+                )
+                with self.assertRaises(subprocess.CalledProcessError) as context:
+                    failing_model.run_model_streaming(*materials)
+                self.assertIs(context.exception.__cause__, parse_error)
+
+                test_model = PlaneStressPressFitModel(
+                    0.02, 0.03, 0.0301, 0.05, os.path.join(directory, "Test_Model")
+                )
+                with self.assertRaises(ValueError):
+                    test_model.run_model_streaming(*materials)
+
+
+class _FakeProcess:
+    """Stand in for a subprocess.Popen that exits once return_code is set"""
+
+    def __init__(self):
+        self.return_code = None
+
+    def poll(self):
+        return self.return_code
+
+
+_FRD_DISP_BLOCK = """    1PSTEP                         1           1           1
+  100CL  101 1.000000000           2                     0    1           1
+ -4  DISP        4    1
+ -5  D1          1    2    1    0
+ -5  D2          1    2    2    0
+ -5  D3          1    2    3    0
+ -5  ALL         1    2    0    0    1ALL
+ -1         1 1.00000E-05 0.00000E+00 0.00000E+00
+ -1         2 3.00000E-06-2.00000E-06 0.00000E+00
+ -3
+"""
+
+_DAT_BLOCK = """
+ stresses (elem, integ.pnt.,sxx,syy,szz,sxy,sxz,syz) for set EALL and time  0.1000000E+01
+
+         1   1  1.000000E+06 -1.000000E+06  0.000000E+00  0.000000E+00  0.000000E+00  0.000000E+00
+         1   2  2.000000E+06 -2.000000E+06  0.000000E+00  0.000000E+00  0.000000E+00  0.000000E+00
+         2   1  3.000000E+06 -3.000000E+06  0.000000E+00  0.000000E+00  0.000000E+00  0.000000E+00
+"""
@@ -0,0 +1,115 @@
+import math
+import unittest
+
+from pressfits.benchmarks.load import stand_in_solver
+from pressfits.model import Material
+from pressfits.optimization import (find_minimum_interference, find_root,
+                                    get_mean_contact_pressure)
+from pressfits.scaling import LinearScalingCache, ScaledResults
+from pressfits.tests.test_scaling import get_solved_model
+
+_STEEL = Material("Steel", 2.1e11, 0.3)
+_ALUMINIUM = Material("Aluminium", 6.89e10, 0.33)
+
+
+class TestFindRoot(unittest.TestCase):
+    def test_root(self):
+        root, converged = find_root(lambda x: x**3 - 2, 0.1, 0.2, 1e-10, 100)
+
+        self.assertTrue(converged)
+        self.assertAlmostEqual(root, 2 ** (1 / 3))
+
+    def test_bracket(self):
+        # The bracket moves down to a root below it
+        root, _ = find_root(lambda x: math.log(x / 1e-3), 1, 2, 1e-10, 100)
+        self.assertAlmostEqual(root, 1e-3)
+
+        with self.assertRaises(ValueError):
+            find_root(lambda x: -1, 1, 2, 1e-10, 100)
+
+
+def get_interface_pressure(od_0, od_1=0.05):
+    # The stand in solver's contact pressure is 5e7 Pa times the radius relative to the
+    # largest, on every node of the inner part, so is uniform along the interface
+    return 5e7 * od_0 / od_1
+
+
+class TestMeanContactPressure(unittest.TestCase):
+    def test_interface(self):
+        results = ScaledResults.from_model(get_solved_model())
+        self.assertAlmostEqual(
+            get_mean_contact_pressure(results.result_set)
+            / get_interface_pressure(0.0301),
+            1,
+            5,
+        )
+
+
+class TestFindMinimumInterference(unittest.TestCase):
+    def find(self, **kwargs):
+        arguments = {
+            "id_0": 0.02,
+            "id_1": 0.03,
+            "od_1": 0.05,
+            "length": 0.015,
+            "inner_material": _STEEL,
+            "outer_material": _ALUMINIUM,
+            "lines_per_part": 5,
+            # The stand in solver's results do not depend on the interference, so every
+            # interference shares one solve
+            "cache": LinearScalingCache(rtol=0.1),
+            **kwargs,
+        }
+        with stand_in_solver(solve_seconds=0):
+            return find_minimum_interference(**arguments)
+
+    def test_holding_force(self):
+        result = self.find(holding_force=20000, outer_yield_strength=250)
+
+        self.assertTrue(result["converged"])
+        self.assertAlmostEqual(result["holding_force"] / 20000, 1, 3)
+        self.assertAlmostEqual(result["od_0"], 0.03 + result["interference"])
+        self.assertGreater(result["analytical_interference"], 0)
+        # Every evaluation after the first scales the results of one solve
+        self.assertEqual(result["solves"], 1)
+        self.assertGreater(len(result["evaluations"]), 2)
+
+        self.assertAlmostEqual(
+            result["maximum_interference"],
+            result["interference"] * 250 / result["max_outer_vm_stress"],
+        )
+        self.assertEqual(
+            result["feasible"],
+            result["interference"] <= result["maximum_interference"],
+        )
+
+    def test_hand_calculation(self):
+        result = self.find(holding_force=20000, friction_coefficient=0.3)
+
+        # The reference is solved at the analytical interference, and its pressure scaled
+        reference = result["analytical_interference"]
+        interference = result["interference"]
+        pressure = get_interface_pressure(0.03 + reference) * interference / reference
+        area = math.pi * (0.03 + interference / 2) * 0.015
+        self.assertAlmostEqual(result["holding_force"] / (0.3 * pressure * area), 1, 5)
+
+    def test_holding_torque(self):
+        cache = LinearScalingCache(rtol=0.1)
+        force = self.find(holding_force=20000, cache=cache)
+        torque = self.find(holding_torque=400, cache=cache)
+
+        radius = 0.03 / 2 + torque["interference"] / 4
+        self.assertAlmostEqual(torque["holding_torque"] / 400, 1, 3)
+        self.assertAlmostEqual(
+            torque["holding_force"] * radius, torque["holding_torque"]
+        )
+        self.assertIsNone(torque["maximum_interference"])
+        self.assertTrue(torque["feasible"])
+        # The second optimization reuses the solve of the first
+        self.assertEqual(torque["solves"], 1)
+        self.assertGreater(force["interference"], 0)
+
+        with self.assertRaises(ValueError):
+            self.find()
+        with self.assertRaises(ValueError):
+            self.find(holding_force=-1)
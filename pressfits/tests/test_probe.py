@@ -0,0 +1,49 @@
+import unittest
+
+import numpy as np
+
+from pressfits.model import AxisymmetricPressFitModel
+from pressfits.tests.test_result_set import populate_results
+
+
+class TestFieldProbe(unittest.TestCase):
+    def setUp(self):
+        self.model = AxisymmetricPressFitModel(
+            0.02, 0.03, 0.0301, 0.05, 0.015, 0.015, "Probe_Model", lines_per_part=5
+        )
+        populate_results(self.model)
+        self.probe = self.model.get_field_probe()
+
+    def test_locate(self):
+        for element_index in (0, len(self.model.elements) // 2):
+            element = self.model.elements[element_index]
+            centre = np.mean([[node.x, node.y] for node in element.nodes], axis=0)
+
+            elements, natural = self.probe.locate([centre])
+            self.assertEqual(elements[0], element_index)
+            np.testing.assert_allclose(natural[0], [0, 0], atol=1e-6)
+
+        elements, _ = self.probe.locate([[0.0, 0.0], [0.1, 0.004], [0.012, 0.006]])
+        self.assertTrue((elements == -1).all())
+
+    def test_probe_reproduces_linear_field(self):
+        rng = np.random.default_rng(0)
+        points = np.column_stack(
+            [rng.uniform(0.0101, 0.0149, 2000), rng.uniform(0.0, 0.005, 2000)]
+        )
+
+        values = self.probe.probe(points, "displacement")
+
+        self.assertFalse(np.isnan(values).any())
+        np.testing.assert_allclose(values[:, 0], points[:, 0] * 1e-3, rtol=1e-9)
+        np.testing.assert_allclose(values[:, 1], points[:, 1] * -1e-4, rtol=1e-9)
+
+    def test_path_probes(self):
+        points, values = self.probe.probe_interface(0, 11, "displacement")
+        np.testing.assert_allclose(points[:, 0], 0.0301 / 2)
+        np.testing.assert_allclose(values[:, 0], 0.0301 / 2 * 1e-3, rtol=1e-9)
+
+        points, values = self.probe.probe_radial_line(0.0, 1, 7, "displacement")
+        self.assertAlmostEqual(points[0, 0], 0.015)
+        self.assertAlmostEqual(points[-1, 0], 0.025)
+        np.testing.assert_allclose(values[:, 0], points[:, 0] * 1e-3, rtol=1e-9)
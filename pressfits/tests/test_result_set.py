@@ -0,0 +1,78 @@
+import os
+import tempfile
+import unittest
+
+from pressfits.model import AxisymmetricPressFitModel, PressFitModel
+from pressfits.result_set import ResultSet
+from pressfits.results import Contact, Displacement, Result, Stress
+
+
+def populate_results(model, key=101):
+    """Assigns deterministic results to every node and element of a model
+
+    Args:
+        model (PressFitModel): The model to populate
+        key (int, optional): Step to add results for. Defaults to 101.
+    """
+    for node in model.nodes:
+        node.results[key] = Result()
+        node.results[key].add_displacement(
+            Displacement(node.x * 1e-3, node.y * -1e-4, 0.0)
+        )
+        node.results[key].add_contact_pressure(
+            Contact(0.0, 0.0, 0.0, node.x * 1e9 if node.part == 0 else 0.0, 0.0, 0.0)
+        )
+
+    for element in model.elements:
+        x = element.get_radius()
+        element.results = [
+            Stress(x * 1e10 + i, -x * 1e9, 0.0, 1.0e5, 0.0, 0.0) for i in range(9)
+        ]
+
+
+class TestResultSet(unittest.TestCase):
+    def setUp(self):
+        self.model = AxisymmetricPressFitModel(
+            0.02, 0.03, 0.0301, 0.05, 0.015, 0.015, "Archive_Model", lines_per_part=5
+        )
+        populate_results(self.model)
+
+    def test_round_trip(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "results.npz")
+            self.model.save_results(path)
+            loaded = PressFitModel.load_results(path)
+
+        self.assertEqual(loaded.name, "Archive_Model")
+        self.assertEqual(len(loaded.nodes), len(self.model.nodes))
+        self.assertEqual(
+            [element.get_ids() for element in loaded.elements],
+            [element.get_ids() for element in self.model.elements],
+        )
+        self.assertAlmostEqual(
+            loaded.max_contact_pressure(), self.model.max_contact_pressure(), places=3
+        )
+        for part in (0, 1):
+            self.assertAlmostEqual(
+                loaded.max_element_vm_stress(part),
+                self.model.max_element_vm_stress(part),
+                delta=self.model.max_element_vm_stress(part) * 1e-6,
+            )
+        for loaded_deflection, deflection in zip(
+            loaded.get_radial_deflections(), self.model.get_radial_deflections()
+        ):
+            self.assertAlmostEqual(loaded_deflection, deflection, delta=1e-9)
+
+    def test_sets_and_surfaces(self):
+        result_set = ResultSet.from_model(self.model)
+
+        self.assertEqual(list(result_set.node_sets["L2"]), self.model.mesh.l_2)
+        self.assertEqual(result_set.get_step_keys(), [101])
+        self.assertEqual(set(result_set.surfaces), {"L2_faces", "L4_faces"})
+        self.assertTrue(len(result_set.surfaces["L2_faces"]) > 0)
+        self.assertTrue((result_set.surfaces["L2_faces"][:, 1] == 2).all())
+        self.assertEqual(
+            len(result_set.element_sets["PART0"])
+            + len(result_set.element_sets["PART1"]),
+            len(self.model.elements),
+        )
@@ -0,0 +1,162 @@
+import math
+import subprocess
+import unittest
+from unittest.mock import patch
+
+from pressfits.benchmarks.load import stand_in_solver
+from pressfits.model import Material, PressFitModel
+from pressfits.result_set import ResultSet
+from pressfits.richardson import (QUANTITIES, extrapolate,
+                                  get_extrapolated_summary, get_mesh_size,
+                                  get_observed_order)
+from pressfits.tests.test_scaling import get_solved_model
+
+_STEEL = Material("Steel", 2.1e11, 0.3)
+_ALUMINIUM = Material("Aluminium", 6.89e10, 0.33)
+
+
+def get_values(lines_per_part, limit=100.0, coefficient=50.0, order=2.0, sizes=None):
+    # A value converging to its limit with the mesh size, by default the reciprocal of the line
+    # spacings
+    if sizes is None:
+        sizes = [1 / (density - 1) for density in lines_per_part]
+    return [limit + coefficient * size**order for size in sizes]
+
+
+class TestExtrapolate(unittest.TestCase):
+    def test_observed_order(self):
+        for lines_per_part in ((5, 7, 9), (5, 7, 11)):
+            values = get_values(lines_per_part, order=1.5)
+            result = extrapolate(values, lines_per_part)
+
+            self.assertAlmostEqual(result["order"], 1.5, places=6)
+            self.assertAlmostEqual(result["value"], 100.0, places=6)
+            self.assertEqual(result["fine_value"], values[-1])
+            self.assertFalse(result["oscillatory"])
+            self.assertFalse(result["clamped"])
+            # The limit lies within the error band of the finest value
+            self.assertLessEqual(
+                abs(result["fine_value"] - result["value"]), result["error"]
+            )
+
+    def test_meshes_in_any_order(self):
+        values = get_values((5, 7, 9))
+        result = extrapolate(values[::-1], (9, 7, 5))
+        self.assertAlmostEqual(result["value"], 100.0, places=6)
+
+    def test_two_meshes(self):
+        result = extrapolate(get_values((7, 9)), (7, 9))
+        self.assertEqual(result["order"], 2.0)
+        self.assertAlmostEqual(result["value"], 100.0, places=6)
+
+        # An order given is used with any number of meshes
+        result = extrapolate(get_values((7, 9), order=1.0), (7, 9), order=1.0)
+        self.assertEqual(result["order"], 1.0)
+        self.assertAlmostEqual(result["value"], 100.0, places=6)
+
+    def test_sizes(self):
+        # Sizes of meshes whose lines are not evenly spaced
+        sizes = (0.4, 0.3, 0.15)
+        values = get_values((5, 7, 9), order=1.5, sizes=sizes)
+        result = extrapolate(values, (5, 7, 9), sizes=sizes)
+        self.assertAlmostEqual(result["order"], 1.5, places=6)
+        self.assertAlmostEqual(result["value"], 100.0, places=6)
+
+        with self.assertRaises(ValueError):
+            extrapolate(values, (5, 7, 9), sizes=(0.4, 0.3))
+        with self.assertRaises(ValueError):
+            extrapolate(values, (5, 7, 9), sizes=(0.15, 0.3, 0.4))
+
+    def test_clamped_order(self):
+        for order, clamped in ((0.05, 0.5), (6.0, 3.0)):
+            values = get_values((5, 7, 9), order=order)
+            result = extrapolate(values, (5, 7, 9))
+            self.assertTrue(result["clamped"])
+            self.assertAlmostEqual(result["order"], clamped)
+            self.assertTrue(math.isfinite(result["value"]))
+
+    def test_oscillatory(self):
+        result = extrapolate([100.0, 90.0, 95.0], (5, 7, 9))
+        self.assertTrue(result["oscillatory"])
+
+    def test_converged(self):
+        result = extrapolate([101.0, 100.0, 100.0], (5, 7, 9))
+        self.assertEqual(result["value"], 100.0)
+        self.assertEqual(result["error"], 0.0)
+
+    def test_invalid_meshes(self):
+        with self.assertRaises(ValueError):
+            extrapolate([1.0], (4,))
+        with self.assertRaises(ValueError):
+            extrapolate([1.0, 2.0], (4, 4))
+        with self.assertRaises(ValueError):
+            extrapolate([1.0, 2.0, 3.0], (4, 6))
+        # A repeated mesh would give a three mesh error estimate from two meshes
+        with self.assertRaises(ValueError):
+            extrapolate([1.0, 1.0, 2.0], (5, 5, 7))
+
+    def test_get_observed_order(self):
+        values = get_values((9, 7, 5), order=3.0)
+        order, oscillatory, is_clamped = get_observed_order(values, (8 / 6, 6 / 4))
+        self.assertAlmostEqual(order, 3.0, places=6)
+        self.assertFalse(oscillatory)
+
+        values = get_values((9, 7, 5), order=2.5)
+        order, _, is_clamped = get_observed_order(values, (8 / 6, 6 / 4))
+        self.assertAlmostEqual(order, 2.5, places=6)
+        self.assertFalse(is_clamped)
+
+    def test_mesh_size(self):
+        result_set = ResultSet.from_model(get_solved_model())
+        # The parts are rectangles of the tiled length of the mesh
+        area = 0
+        for part, (inner, outer) in enumerate(((0.02, 0.0301), (0.03, 0.05))):
+            y = result_set.coordinates[result_set.node_parts == part, 1]
+            area += (outer - inner) / 2 * (y.max() - y.min())
+
+        self.assertAlmostEqual(
+            get_mesh_size(result_set) / math.sqrt(area / len(result_set.element_ids)),
+            1,
+            6,
+        )
+
+
+class TestGetExtrapolatedSummary(unittest.TestCase):
+    design = {
+        "id_0": 0.02,
+        "id_1": 0.03,
+        "od_0": 0.0301,
+        "od_1": 0.05,
+        "length": 0.015,
+        "inner_material": _STEEL,
+        "outer_material": _ALUMINIUM,
+    }
+
+    def test_extrapolated_summary(self):
+        with stand_in_solver(solve_seconds=0):
+            result = get_extrapolated_summary(self.design, (5, 7, 9), workers=0)
+
+        self.assertEqual(
+            [mesh["lines_per_part"] for mesh in result["meshes"]], [5, 7, 9]
+        )
+        sizes = [mesh["size"] for mesh in result["meshes"]]
+        self.assertEqual(sizes, sorted(sizes, reverse=True))
+        for name in QUANTITIES:
+            self.assertTrue(math.isfinite(result[name]["value"]))
+            self.assertEqual(result[name]["fine_value"], result["meshes"][-1][name])
+            self.assertGreaterEqual(result[name]["error"], 0)
+
+    def test_invalid_levels(self):
+        for levels in ((5,), (5, 6), (1, 3), (5, 5), (5, 5, 7), (3, 5, 7, 9)):
+            with self.assertRaises(ValueError):
+                get_extrapolated_summary(self.design, levels, workers=0)
+
+    def test_failed_mesh(self):
+        error = subprocess.CalledProcessError(1, "ccx")
+        with patch.object(PressFitModel, "run_model", side_effect=error):
+            with self.assertRaises(RuntimeError):
+                get_extrapolated_summary(self.design, (5, 7), workers=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
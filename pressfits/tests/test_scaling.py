@@ -0,0 +1,110 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from pressfits.benchmarks.fixtures import write_dat, write_frd
+from pressfits.benchmarks.load import stand_in_solver
+from pressfits.model import AxisymmetricPressFitModel, Material, PressFitModel
+from pressfits.scaling import (LinearScalingCache, ScaledResults,
+                               get_geometry_key)
+
+_STEEL = Material("Steel", 2.1e11, 0.3)
+_ALUMINIUM = Material("Aluminium", 6.89e10, 0.33)
+
+
+def get_solved_model(od_0=0.0301):
+    model = AxisymmetricPressFitModel(
+        0.02, 0.03, od_0, 0.05, 0.015, 0.015, "Scaled_Model", lines_per_part=5
+    )
+    with tempfile.TemporaryDirectory() as directory:
+        model.name = os.path.join(directory, "Scaled_Model")
+        write_frd(model.mesh, f"{model.name}.frd")
+        write_dat(model.mesh, f"{model.name}.dat")
+        model.read_nodal_results()
+        model.read_element_results()
+
+    return model
+
+
+class TestScaledResults(unittest.TestCase):
+    def setUp(self):
+        self.model = get_solved_model()
+        self.results = ScaledResults.from_model(self.model)
+
+    def test_summary(self):
+        reference = self.model.get_summary()
+        self.assertAlmostEqual(self.results.interference, 1e-4)
+        self.assertEqual(self.results.get_summary(self.results.interference), reference)
+
+        summary = self.results.get_summary(2.5 * self.results.interference)
+        for name, value in reference.items():
+            self.assertAlmostEqual(summary[name], 2.5 * value)
+
+    def test_result_set(self):
+        result_set = self.results.get_result_set(0.5e-4)
+        model = PressFitModel.from_result_set(result_set)
+
+        self.assertIs(result_set.connectivity, self.results.result_set.connectivity)
+        self.assertAlmostEqual(
+            model.max_contact_pressure(), 0.5 * self.model.max_contact_pressure(), 5
+        )
+        self.assertAlmostEqual(
+            model.max_element_vm_stress(1),
+            0.5 * self.model.max_element_vm_stress(1),
+            3,
+        )
+        # Every node has a contact row, but only those of the interface are in contact
+        interface = np.isin(result_set.node_ids, result_set.node_sets["L2"])
+        self.assertTrue(interface.sum() < len(interface))
+        np.testing.assert_array_equal(self.results.contact_nodes, interface)
+        np.testing.assert_array_equal(self.results.closed_nodes, interface)
+
+    def test_invalid_interference(self):
+        for interference in (0, -1e-5):
+            with self.assertRaises(ValueError):
+                self.results.get_summary(interference)
+        with self.assertRaises(ValueError):
+            ScaledResults(self.results.result_set, 0, self.results.summary)
+
+
+class TestLinearScalingCache(unittest.TestCase):
+    def test_reuse(self):
+        cache = LinearScalingCache()
+        key = get_geometry_key(0.02, 0.05, 0.015, _STEEL, _ALUMINIUM, 5)
+        with stand_in_solver(solve_seconds=0):
+            reference = cache.get_results(
+                0.02, 0.03, 0.0301, 0.05, 0.015, _STEEL, _ALUMINIUM, 5
+            )
+        summary = reference.get_summary(1e-4)
+
+        # A different interference of the same geometry is answered without solving
+        scaled = cache.get_summary(
+            0.02, 0.03, 0.03015, 0.05, 0.015, _STEEL, _ALUMINIUM, 5
+        )
+        self.assertAlmostEqual(
+            scaled["contact_pressure"], 1.5 * summary["contact_pressure"]
+        )
+        self.assertIs(cache.find(key, 0.03005), reference)
+
+        # Another geometry, or a contact diameter too far from the reference, is not
+        other = get_geometry_key(0.01, 0.05, 0.015, _STEEL, _ALUMINIUM, 5)
+        self.assertIsNone(cache.find(other, 0.03005))
+        self.assertIsNone(cache.find(key, 0.031))
+        with self.assertRaises(ValueError):
+            cache.get_results(0.02, 0.03, 0.0299, 0.05, 0.015, _STEEL, _STEEL, 5)
+
+    def test_size(self):
+        cache = LinearScalingCache(size=2, rtol=1e-6)
+        key = get_geometry_key(0.02, 0.05, 0.015, _STEEL, _ALUMINIUM, 5)
+        references = [object() for _ in range(3)]
+        cache.add(key, 0.03, references[0])
+        cache.add(key, 0.031, references[1])
+
+        # References of one geometry count towards the size, least recently used removed first
+        self.assertIs(cache.find(key, 0.03), references[0])
+        cache.add(key, 0.032, references[2])
+        self.assertIs(cache.find(key, 0.03), references[0])
+        self.assertIsNone(cache.find(key, 0.031))
+        self.assertIs(cache.find(key, 0.032), references[2])
@@ -0,0 +1,129 @@
+import asyncio
+import threading
+import unittest
+
+from pressfits.scheduler import (BATCH, INTERACTIVE, SchedulerSaturated,
+                                 SolveScheduler)
+
+
+class TestSolveScheduler(unittest.TestCase):
+    def test_priority(self):
+        scheduler = SolveScheduler(2, reserved_interactive_workers=1)
+
+        batch = [scheduler.submit(BATCH, "sweep") for _ in range(3)]
+        # Batch solves can't use the reserved worker
+        self.assertIsNotNone(batch[0].granted)
+        self.assertIsNone(batch[1].granted)
+
+        interactive = scheduler.submit(INTERACTIVE, "frontend")
+        self.assertIsNotNone(interactive.granted)
+
+        queued = scheduler.submit(INTERACTIVE, "frontend")
+        self.assertIsNone(queued.granted)
+
+        # Interactive solves are granted before batch solves queued earlier
+        batch[0].release()
+        self.assertIsNotNone(queued.granted)
+        self.assertIsNone(batch[1].granted)
+
+        interactive.release()
+        queued.release()
+        self.assertIsNotNone(batch[1].granted)
+        self.assertIsNone(batch[2].granted)
+        self.assertEqual(scheduler.get_stats()["running"], {INTERACTIVE: 0, BATCH: 1})
+
+    def test_single_worker(self):
+        # Batch solves keep the only worker, so nothing can be reserved
+        with self.assertLogs("pressfits.scheduler", "WARNING"):
+            scheduler = SolveScheduler(1, reserved_interactive_workers=1)
+        self.assertEqual(scheduler.get_stats()["reserved_interactive_workers"], 0)
+
+        batch = [scheduler.submit(BATCH, "sweep") for _ in range(2)]
+        self.assertIsNotNone(batch[0].granted)
+
+        # An interactive solve waits for the running batch solve, then goes first
+        interactive = scheduler.submit(INTERACTIVE, "frontend")
+        self.assertIsNone(interactive.granted)
+        batch[0].release()
+        self.assertIsNotNone(interactive.granted)
+        self.assertIsNone(batch[1].granted)
+
+        scheduler = SolveScheduler(2, reserved_interactive_workers=3)
+        self.assertEqual(scheduler.reserved_interactive_workers, 1)
+        self.assertEqual(scheduler.batch_workers, 1)
+
+    def test_fair_share(self):
+        scheduler = SolveScheduler(1)
+        running = scheduler.submit(BATCH, "a")
+
+        tickets = [scheduler.submit(BATCH, "a") for _ in range(3)]
+        tickets.append(scheduler.submit(BATCH, "b"))
+
+        order = []
+        for _ in range(4):
+            running.release()
+            running = next(
+                ticket
+                for ticket in tickets
+                if ticket.granted is not None and ticket not in order
+            )
+            order.append(running)
+
+        self.assertEqual([ticket.client for ticket in order], ["a", "b", "a", "a"])
+
+    def test_saturation(self):
+        scheduler = SolveScheduler(
+            1,
+            max_queued={INTERACTIVE: 2, BATCH: 10},
+            max_queued_per_client={BATCH: 1},
+        )
+        scheduler.submit(INTERACTIVE, "a")
+        scheduler.submit(INTERACTIVE, "a")
+        scheduler.submit(INTERACTIVE, "b")
+
+        with self.assertRaises(SchedulerSaturated) as context:
+            scheduler.submit(INTERACTIVE, "c")
+        self.assertGreaterEqual(context.exception.retry_after, 2)
+
+        scheduler.submit(BATCH, "a")
+        with self.assertRaises(SchedulerSaturated):
+            scheduler.submit(BATCH, "a")
+        scheduler.submit(BATCH, "b")
+
+        with self.assertRaises(ValueError):
+            scheduler.submit("urgent", "a")
+
+    def test_blocking_wait(self):
+        scheduler = SolveScheduler(1)
+        first = scheduler.submit(INTERACTIVE, "a")
+        second = scheduler.submit(INTERACTIVE, "a")
+
+        waiter = threading.Thread(target=lambda: second.__enter__())
+        waiter.start()
+        first.release()
+        waiter.join(timeout=5)
+
+        self.assertFalse(waiter.is_alive())
+        self.assertGreaterEqual(second.get_wait_time(), 0)
+
+    def test_async_cancel(self):
+        scheduler = SolveScheduler(1)
+
+        async def run():
+            first = scheduler.submit(INTERACTIVE, "a")
+            async with first:
+                second = scheduler.submit(INTERACTIVE, "a")
+                waiter = asyncio.create_task(second.__aenter__())
+                await asyncio.sleep(0)
+                waiter.cancel()
+                with self.assertRaises(asyncio.CancelledError):
+                    await waiter
+
+            third = scheduler.submit(INTERACTIVE, "a")
+            async with third:
+                return scheduler.get_stats()
+
+        stats = asyncio.run(run())
+        self.assertEqual(stats["queued"][INTERACTIVE], 0)
+        self.assertEqual(stats["running"][INTERACTIVE], 1)
+        self.assertEqual(scheduler.get_stats()["running"][INTERACTIVE], 0)
@@ -0,0 +1,126 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from pressfits.benchmarks.fixtures import write_dat, write_frd
+from pressfits.benchmarks.load import stand_in_solver
+from pressfits.model import AxisymmetricPressFitModel, Material, PressFitModel
+from pressfits.result_set import ResultSet
+from pressfits.similarity import SimilarityCache, get_similarity_key
+
+_STEEL = Material("Steel", 2.1e11, 0.3)
+_ALUMINIUM = Material("Aluminium", 6.89e10, 0.33)
+
+
+def get_design(scale=1.0, stiffness=1.0, interference=1e-4):
+    return {
+        "id_0": 0.02 * scale,
+        "id_1": 0.03 * scale,
+        "od_0": 0.03 * scale + interference,
+        "od_1": 0.05 * scale,
+        "length": 0.015 * scale,
+        "inner_material": Material("Steel", _STEEL.youngs_modulus * stiffness, 0.3),
+        "outer_material": Material(
+            "Aluminium", _ALUMINIUM.youngs_modulus * stiffness, 0.33
+        ),
+        "lines_per_part": 5,
+    }
+
+
+def get_solved_model(design):
+    model = AxisymmetricPressFitModel(
+        design["id_0"],
+        design["id_1"],
+        design["od_0"],
+        design["od_1"],
+        design["length"],
+        design["length"],
+        "Similar_Model",
+        lines_per_part=design["lines_per_part"],
+    )
+    with tempfile.TemporaryDirectory() as directory:
+        model.name = os.path.join(directory, "Similar_Model")
+        write_frd(model.mesh, f"{model.name}.frd")
+        write_dat(model.mesh, f"{model.name}.dat")
+        model.read_nodal_results()
+        model.read_element_results()
+
+    return model
+
+
+class TestSimilarityCache(unittest.TestCase):
+    def setUp(self):
+        self.design = get_design()
+        self.model = get_solved_model(self.design)
+        self.summary = self.model.get_summary()
+
+    def test_similar_design(self):
+        cache = SimilarityCache()
+        cache.put(self.design, ResultSet.from_model(self.model), self.summary)
+
+        # Twice the size, three times as stiff and 1.5 times the interference strain
+        similar = get_design(2, 3, 3e-4)
+        self.assertEqual(get_similarity_key(similar), get_similarity_key(self.design))
+        result_set, summary = cache.get(similar)
+
+        self.assertAlmostEqual(
+            summary["contact_pressure"], 4.5 * self.summary["contact_pressure"]
+        )
+        self.assertAlmostEqual(
+            summary["max_outer_vm_stress"], 4.5 * self.summary["max_outer_vm_stress"]
+        )
+        self.assertAlmostEqual(
+            summary["inner_radial_deflection"],
+            3 * self.summary["inner_radial_deflection"],
+        )
+
+        model = PressFitModel.from_result_set(result_set)
+        self.assertAlmostEqual(
+            model.max_contact_pressure(), summary["contact_pressure"], 3
+        )
+        self.assertAlmostEqual(
+            model.mesh.get_outer_nodes()[0].x,
+            self.model.mesh.get_outer_nodes()[0].x * 2,
+        )
+
+    def test_dissimilar_design(self):
+        cache = SimilarityCache()
+        cache.put(self.design, ResultSet.from_model(self.model), self.summary)
+
+        self.assertIsNone(cache.get({**self.design, "od_1": 0.06}))
+        self.assertIsNone(cache.get({**self.design, "inner_material": _ALUMINIUM}))
+        with self.assertRaises(ValueError):
+            cache.get_or_solve(get_design(interference=-1e-5))
+
+    def test_directory(self):
+        with tempfile.TemporaryDirectory() as directory:
+            with stand_in_solver(solve_seconds=0):
+                _, summary = SimilarityCache(directory).get_or_solve(self.design)
+
+            # A new cache, such as one in another process, reads the stored results
+            _, similar = SimilarityCache(directory).get(get_design(0.5, 2, 0.5e-4))
+
+        self.assertAlmostEqual(
+            similar["contact_pressure"], 2 * summary["contact_pressure"]
+        )
+
+    def test_atomic_writes(self):
+        with tempfile.TemporaryDirectory() as directory:
+            cache = SimilarityCache(directory)
+            result_set = ResultSet.from_model(self.model)
+            cache.put(self.design, result_set, self.summary)
+            entry_id = cache.get_entry_id(get_similarity_key(self.design))
+            self.assertEqual(
+                sorted(os.listdir(directory)), [f"{entry_id}.json", f"{entry_id}.npz"]
+            )
+
+            # A write that fails leaves no file, partial or temporary, for other processes
+            design = get_design(interference=2e-4, stiffness=3)
+            design["lines_per_part"] = 7
+            with mock.patch.object(ResultSet, "save", side_effect=OSError):
+                with self.assertRaises(OSError):
+                    cache.put(design, result_set, self.summary)
+
+            self.assertEqual(len(os.listdir(directory)), 2)
+            self.assertIsNone(SimilarityCache(directory).get(design))
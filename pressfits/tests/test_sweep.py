@@ -0,0 +1,170 @@
+import csv
+import os
+import tempfile
+import unittest
+
+from pressfits import sweep
+from pressfits.benchmarks.load import stand_in_solver
+from pressfits.model import Material
+
+_STEEL = Material("Steel", 2.1e11, 0.3)
+_ALUMINIUM = Material("Aluminium", 6.89e10, 0.33)
+
+
+def get_parameters():
+    return {
+        "id_0": 0.02,
+        "id_1": 0.03,
+        "od_0": sweep.Range(0.0301, 0.0303),
+        "od_1": [0.05, 0.06],
+        "length": 0.015,
+        "inner_material": [_STEEL, _ALUMINIUM],
+        "outer_material": _ALUMINIUM,
+        "lines_per_part": 5,
+    }
+
+
+class TestSweep(unittest.TestCase):
+    def test_full_factorial(self):
+        designs = sweep.get_designs(get_parameters())
+
+        self.assertEqual(len(designs), 3 * 2 * 2)
+        levels = sorted({design["od_0"] for design in designs})
+        for level, expected in zip(levels, (0.0301, 0.0302, 0.0303)):
+            self.assertAlmostEqual(level, expected)
+        self.assertEqual(
+            {design["inner_material"] for design in designs}, {_STEEL, _ALUMINIUM}
+        )
+        self.assertTrue(
+            all(design["outer_material"] == _ALUMINIUM for design in designs)
+        )
+
+    def test_latin_hypercube(self):
+        designs = sweep.get_designs(
+            get_parameters(), sweep.LATIN_HYPERCUBE, samples=8, seed=1
+        )
+
+        self.assertEqual(len(designs), 8)
+        # One design in each eighth of the range
+        strata = sorted(
+            int((design["od_0"] - 0.0301) / 0.0002 * 8) for design in designs
+        )
+        self.assertEqual(strata, list(range(8)))
+        self.assertEqual(
+            sum(design["inner_material"] == _STEEL for design in designs), 4
+        )
+        self.assertEqual(
+            designs,
+            sweep.get_designs(get_parameters(), sweep.LATIN_HYPERCUBE, 8, seed=1),
+        )
+
+    def test_invalid_parameters(self):
+        for parameters in (
+            {**get_parameters(), "width": 1},
+            {**get_parameters(), "lines_per_part": sweep.Range(5, 9)},
+            {name: value for name, value in get_parameters().items() if name != "id_0"},
+        ):
+            with self.assertRaises(ValueError):
+                sweep.get_designs(parameters)
+        with self.assertRaises(ValueError):
+            sweep.get_designs(get_parameters(), "exhaustive")
+
+    def test_invalid_designs(self):
+        for parameters in (
+            {**get_parameters(), "lines_per_part": [5, 4]},
+            {**get_parameters(), "lines_per_part": 1},
+            {**get_parameters(), "od_0": sweep.Range(0.0299, 0.0303)},
+            {**get_parameters(), "length": 0.0},
+            {**get_parameters(), "id_0": -0.01},
+        ):
+            for method in sweep.METHODS:
+                with self.assertRaises(ValueError):
+                    sweep.get_designs(parameters, method, samples=20)
+
+    def test_solid_shaft(self):
+        designs = sweep.get_designs({**get_parameters(), "id_0": 0.0})
+        self.assertTrue(all(design["id_0"] == 0 for design in designs))
+
+    def test_invalid_design_solved(self):
+        design = sweep.get_designs(get_parameters())[0]
+        with stand_in_solver(solve_seconds=0):
+            rows = [
+                sweep.solve_design(i, {**design, "lines_per_part": lines_per_part})
+                for i, lines_per_part in enumerate((5, 4, 5))
+            ]
+
+        # An invalid design fails alone, without affecting the designs solved after it
+        self.assertIn("odd integer", rows[1]["error"])
+        self.assertEqual([row["error"] for row in rows[::2]], [None, None])
+        self.assertEqual(rows[0]["contact_pressure"], rows[2]["contact_pressure"])
+
+    def test_run_sweep(self):
+        designs = sweep.get_designs(get_parameters(), sweep.RANDOM, samples=3)
+        with tempfile.TemporaryDirectory() as directory:
+            output = os.path.join(directory, "results.csv")
+            with stand_in_solver(solve_seconds=0):
+                summary = sweep.run_sweep(designs, output, workers=0)
+
+            with open(output, newline="") as f:
+                rows = list(csv.DictReader(f))
+
+        self.assertEqual(summary["designs"], 3)
+        self.assertEqual(summary["failed"], 0)
+        self.assertEqual([int(row["design"]) for row in rows], [0, 1, 2])
+        self.assertEqual(list(rows[0]), [name for name, _ in sweep.COLUMNS])
+        self.assertGreater(float(rows[0]["contact_pressure"]), 0)
+        self.assertEqual(rows[0]["error"], "")
+
+    def test_process_pool(self):
+        designs = sweep.get_designs(get_parameters())[:3]
+        with tempfile.TemporaryDirectory() as directory:
+            output = os.path.join(directory, "results.csv")
+            summary = sweep.run_sweep(designs, output, workers=2)
+
+            with open(output, newline="") as f:
+                rows = list(csv.DictReader(f))
+
+        # Rows are written as designs finish, whether or not ccx is installed
+        self.assertEqual(summary["designs"], 3)
+        self.assertEqual(sorted(int(row["design"]) for row in rows), [0, 1, 2])
+        self.assertTrue(all(row["lines_per_part"] == "5" for row in rows))
+
+    @unittest.skipIf(sweep.pq is None, "pyarrow is not installed")
+    def test_export(self):
+        designs = sweep.get_designs(get_parameters())[:4]
+        with tempfile.TemporaryDirectory() as directory:
+            with stand_in_solver(solve_seconds=0):
+                sweep.run_sweep(
+                    designs,
+                    os.path.join(directory, "results.csv"),
+                    workers=0,
+                    export_directory=os.path.join(directory, "fields"),
+                )
+
+            files = os.listdir(
+                os.path.join(directory, "fields", "nodes", "lines_per_part=5")
+            )
+            nodes = sweep.pq.read_table(os.path.join(directory, "fields", "nodes"))
+
+        # Every design of the sweep shares a file
+        self.assertEqual(len(files), 1)
+        self.assertEqual(
+            sorted(set(nodes.column("run_id").to_pylist())),
+            [f"design_{i}" for i in range(4)],
+        )
+
+    @unittest.skipIf(sweep.pq is None, "pyarrow is not installed")
+    def test_parquet(self):
+        designs = sweep.get_designs(get_parameters())[:5]
+        with tempfile.TemporaryDirectory() as directory:
+            output = os.path.join(directory, "results.parquet")
+            with stand_in_solver(solve_seconds=0):
+                sweep.run_sweep(designs, output, workers=0, rows_per_group=2)
+
+            table = sweep.pq.read_table(output)
+            row_groups = sweep.pq.ParquetFile(output).num_row_groups
+
+        self.assertEqual(table.num_rows, 5)
+        self.assertEqual(row_groups, 3)
+        self.assertEqual(table.column("inner_material").to_pylist()[0], "Steel")
+        self.assertEqual(table.column("error").null_count, 5)
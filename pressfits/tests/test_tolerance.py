@@ -0,0 +1,122 @@
+import math
+import unittest
+
+import numpy as np
+
+from pressfits import analytical, tolerance
+
+
+def get_parameters():
+    return {
+        "id_0": 0.02,
+        "id_1": tolerance.Tolerance(0.03, 0.030021),
+        "od_0": tolerance.Tolerance(0.030035, 0.030048),
+        "od_1": 0.05,
+        "length": 0.015,
+        "inner_youngs_modulus": tolerance.Normal(2.1e11, 5e9),
+        "inner_poissons_ratio": 0.3,
+        "outer_youngs_modulus": tolerance.Uniform(6.7e10, 7.1e10),
+        "outer_poissons_ratio": 0.33,
+    }
+
+
+class TestAnalytical(unittest.TestCase):
+    def test_same_material(self):
+        # EQ 3-57 of Shigley's, for parts of the same material
+        a, R, c = 0.01, 0.015, 0.025
+        delta = 1e-5
+        E = 2.1e11
+        expected = (
+            E * delta / R * (c**2 - R**2) * (R**2 - a**2) / (2 * R**2 * (c**2 - a**2))
+        )
+
+        summary = analytical.get_summary(
+            2 * a, 2 * R - delta, 2 * R + delta, 2 * c, 0.02, E, 0.3, E, 0.3, 0.1
+        )
+
+        self.assertAlmostEqual(float(summary["contact_pressure"]), expected * 1e-6, 0)
+        self.assertAlmostEqual(
+            float(summary["holding_force"]),
+            0.1 * expected * 2 * math.pi * R * 0.02,
+            delta=1e-6 * float(summary["holding_force"]),
+        )
+        # The outer part carries hoop stress above the contact pressure on its bore
+        self.assertGreater(
+            float(summary["max_outer_vm_stress"]), float(summary["contact_pressure"])
+        )
+
+    def test_solid_shaft_and_clearance(self):
+        summary = analytical.get_summary(
+            np.array([0.0, 0.0]),
+            np.array([0.03, 0.03]),
+            np.array([0.03003, 0.02997]),
+            0.05,
+            0.015,
+            2.1e11,
+            0.3,
+            2.1e11,
+            0.3,
+        )
+
+        pressure = summary["contact_pressure"]
+        # A solid shaft is under uniform compression, so its Von Mises stress is the pressure
+        self.assertAlmostEqual(summary["max_inner_vm_stress"][0], pressure[0])
+        self.assertEqual(summary["inner_radial_deflection"][0], 0)
+        self.assertEqual(pressure[1], 0)
+        self.assertEqual(summary["holding_torque"][1], 0)
+
+
+class TestTolerance(unittest.TestCase):
+    def test_sample(self):
+        generator = np.random.default_rng(0)
+        values = tolerance.sample(tolerance.Tolerance(1.0, 2.0), 10000, generator)
+
+        self.assertTrue(np.all((values >= 1) & (values <= 2)))
+        self.assertAlmostEqual(values.mean(), 1.5, 2)
+        self.assertAlmostEqual(values.std(), 1 / 6, 2)
+        np.testing.assert_array_equal(tolerance.sample(0.3, 3, generator), 0.3)
+
+    def test_converges(self):
+        result = tolerance.run_tolerance_analysis(get_parameters(), seed=1)
+
+        self.assertTrue(result["converged"])
+        self.assertLess(result["samples"], 200000)
+        self.assertEqual(len(result["history"]), result["samples"] // 2000)
+
+        pressure = result["statistics"]["contact_pressure"]
+        self.assertGreater(pressure["p0.1"], 0)
+        self.assertLess(pressure["p1"], pressure["p50"])
+        self.assertLess(pressure["p50"], pressure["p99"])
+        self.assertLessEqual(pressure["p99.9"], pressure["max"])
+
+        nominal = analytical.get_summary(
+            0.02, 0.0300105, 0.0300415, 0.05, 0.015, 2.1e11, 0.3, 6.9e10, 0.33
+        )
+        self.assertAlmostEqual(
+            pressure["p50"],
+            float(nominal["contact_pressure"]),
+            delta=0.02 * pressure["p50"],
+        )
+        self.assertEqual(
+            result,
+            {
+                **tolerance.run_tolerance_analysis(get_parameters(), seed=1),
+                "seconds": result["seconds"],
+            },
+        )
+
+    def test_max_samples(self):
+        result = tolerance.run_tolerance_analysis(
+            get_parameters(), batch_size=100, max_samples=300, rtol=0
+        )
+
+        self.assertFalse(result["converged"])
+        self.assertEqual(result["samples"], 300)
+
+    def test_invalid_parameters(self):
+        with self.assertRaises(ValueError):
+            tolerance.run_tolerance_analysis({**get_parameters(), "width": 1})
+        with self.assertRaises(ValueError):
+            tolerance.run_tolerance_analysis(
+                {n: v for n, v in get_parameters().items() if n != "od_1"}
+            )
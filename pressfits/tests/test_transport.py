@@ -0,0 +1,118 @@
+import gzip
+import json
+import math
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from pressfits import transport
+from pressfits.model import AxisymmetricPressFitModel
+from pressfits.renderers import ArrayRenderer
+from pressfits.tests.test_result_set import populate_results
+from pressfits.transport import (brotli, compress, decode_arrays,
+                                 encode_arrays, encode_json, get_model_arrays,
+                                 select_encoding)
+
+
+class TestTransport(unittest.TestCase):
+    def setUp(self):
+        self.model = AxisymmetricPressFitModel(
+            0.02, 0.03, 0.0301, 0.05, 0.015, 0.015, "Transport_Model", lines_per_part=5
+        )
+        populate_results(self.model)
+
+    def test_model_arrays_match_summaries(self):
+        arrays = get_model_arrays(self.model)
+        stresses = self.model.get_elemental_stresses_summary()
+        displacements = self.model.get_nodal_displacements_summary()
+
+        np.testing.assert_allclose(
+            arrays["elemental_stresses"],
+            [stresses[element_id] for element_id in arrays["element_ids"]],
+            rtol=1e-6,
+        )
+        np.testing.assert_allclose(
+            arrays["nodal_displacements"],
+            [displacements[node_id] for node_id in arrays["node_ids"]],
+            rtol=1e-6,
+        )
+        self.assertEqual(
+            list(arrays["node_ids"][arrays["connectivity"][3]]),
+            self.model.elements[3].get_ids(),
+        )
+
+    def test_round_trip(self):
+        arrays = get_model_arrays(self.model)
+        data = encode_arrays(arrays, {"contact_pressure": 12.5})
+        decoded, metadata = decode_arrays(data)
+
+        self.assertEqual(metadata, {"contact_pressure": 12.5})
+        for name, array in arrays.items():
+            np.testing.assert_array_equal(decoded[name], array)
+            self.assertEqual(decoded[name].dtype, array.dtype)
+
+        # Binary is far smaller than the JSON representation of the same fields
+        json_size = len(
+            json.dumps(
+                {
+                    "elemental_stresses": self.model.get_elemental_stresses_summary(),
+                    "nodal_displacements": self.model.get_nodal_displacements_summary(),
+                }
+            )
+        )
+        self.assertLess(
+            arrays["elemental_stresses"].nbytes + arrays["nodal_displacements"].nbytes,
+            json_size / 3,
+        )
+
+    def test_quantize(self):
+        values = np.linspace(-3.0, 7.0, 1001).astype("<f4")
+        data = encode_arrays({"values": values}, quantize=("values",))
+        decoded, _ = decode_arrays(data)
+
+        np.testing.assert_allclose(decoded["values"], values, atol=10 / 65535)
+        self.assertLess(len(data), values.nbytes)
+
+    def test_renderer(self):
+        renderer = ArrayRenderer()
+        _, metadata = decode_arrays(renderer.render({"detail": "Invalid Inputs"}))
+        self.assertEqual(metadata, {"detail": "Invalid Inputs"})
+
+        decoded, _ = decode_arrays(
+            renderer.render({"arrays": {"a": np.arange(3)}, "metadata": {}})
+        )
+        np.testing.assert_array_equal(decoded["a"], np.arange(3))
+
+    def test_encode_json(self):
+        data = {
+            "values": np.array([0, 1, np.nan], dtype="<f4"),
+            1: np.float64(2.5),
+            "text": "a",
+            "missing": [float("nan"), np.float64(np.inf), (-math.inf,)],
+        }
+        expected = {
+            "values": [0.0, 1.0, None],
+            "1": 2.5,
+            "text": "a",
+            "missing": [None, None, [None]],
+        }
+
+        # Both serializers write NaN and infinities as null
+        self.assertEqual(json.loads(encode_json(data)), expected)
+        with mock.patch.object(transport, "orjson", None):
+            self.assertEqual(json.loads(encode_json(data)), expected)
+
+    def test_select_encoding(self):
+        self.assertEqual(select_encoding("gzip, deflate", ("br", "gzip")), "gzip")
+        self.assertEqual(select_encoding("gzip;q=0, br", ("gzip",)), None)
+        self.assertEqual(select_encoding("", ("br", "gzip")), None)
+        self.assertEqual(select_encoding("*", ("gzip",)), "gzip")
+        if brotli is not None:
+            self.assertEqual(select_encoding("gzip, br", ("br", "gzip")), "br")
+
+    def test_compress(self):
+        content = encode_json({"values": list(range(1000))})
+        self.assertEqual(gzip.decompress(compress(content, "gzip", 5)), content)
+        if brotli is not None:
+            self.assertEqual(brotli.decompress(compress(content, "br", 5)), content)
@@ -1,7 +1,27 @@
+import asyncio
+import gzip
+import json
 import math
+import tempfile
 import unittest
+from types import SimpleNamespace
+from unittest import mock
 
-from pressfits.views import PressView
+from django.contrib.auth.models import AnonymousUser
+from django.test import AsyncClient, RequestFactory, override_settings
+from rest_framework.response import Response
+from rest_framework.test import APIClient, APIRequestFactory
+from rest_framework.views import APIView
+
+from pressfits import analytical, views
+from pressfits.jobs import JOB_ID_PATTERN, get_request_hash
+from pressfits.model import Material, PressFitModel
+from pressfits.results import Displacement
+from pressfits.scaling import LinearScalingCache
+from pressfits.scheduler import BATCH, INTERACTIVE, SolveScheduler
+from pressfits.tests.test_result_set import populate_results
+from pressfits.transport import BINARY_CONTENT_TYPE, decode_arrays
+from pressfits.views import CompressedResponseMixin, PressView
 
 
 class TestPressView(unittest.TestCase):
@@ -16,3 +36,575 @@ class TestPressView(unittest.TestCase):
         self.assertFalse(PressView.is_positive_number(-1))
         self.assertTrue(PressView.is_positive_number(1))
         self.assertTrue(PressView.is_positive_number(0.1))
+
+
+class _LargeView(CompressedResponseMixin, APIView):
+    compression_encodings = ("gzip",)
+
+    def get(self, request):
+        return Response({"values": list(range(2000))})
+
+
+class TestCompressedResponseMixin(unittest.TestCase):
+    def test_compression(self):
+        factory = APIRequestFactory()
+
+        response = _LargeView.as_view()(
+            factory.get("/large", HTTP_ACCEPT_ENCODING="gzip, br")
+        ).render()
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(
+            json.loads(gzip.decompress(response.content))["values"][-1], 1999
+        )
+        self.assertIn("Accept-Encoding", response["Vary"])
+
+        response = _LargeView.as_view()(factory.get("/large")).render()
+        self.assertFalse(response.has_header("Content-Encoding"))
+        self.assertEqual(json.loads(response.content)["values"][0], 0)
+
+
+def press_request_data(inner_od=30.1):
+    return {
+        "frictionCoefficient": 0.2,
+        "contactLength": 15,
+        "innerPart": {
+            "innerDiameter": 20,
+            "outerDiameter": inner_od,
+            "youngsModulus": 210,
+            "poissonsRatio": 0.3,
+        },
+        "outerPart": {
+            "innerDiameter": 30,
+            "outerDiameter": 50,
+            "youngsModulus": 68.9,
+            "poissonsRatio": 0.33,
+        },
+    }
+
+
+def fake_run_model(model, inner_material, outer_material, increments=1):
+    """Stands in for ccx by writing the input file string and assigning synthetic results"""
+    model.inp_str = model.mesh.get_inp_str(inner_material, outer_material, increments)
+    for key in range(101, 101 + increments):
+        populate_results(model, key)
+
+
+@mock.patch.object(PressFitModel, "run_model", fake_run_model)
+@mock.patch.object(PressFitModel, "read_element_results", lambda model: None)
+@mock.patch.object(PressFitModel, "read_nodal_results", lambda model: None)
+class TestPressViewResponses(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.settings = override_settings(
+            PRESSFITS_JOB_DIRECTORY=self.directory.name,
+            PRESSFITS_EXPORT_DIRECTORY=None,
+            ALLOWED_HOSTS=["testserver"],
+        )
+        self.settings.enable()
+        views._job_store = None
+        views._scheduler = None
+        self.client = APIClient()
+
+    def tearDown(self):
+        self.settings.disable()
+        views._job_store = None
+        views._scheduler = None
+        self.directory.cleanup()
+
+    def post(self, query=""):
+        return self.client.post(f"/press{query}", press_request_data(), format="json")
+
+    def test_profiles(self):
+        full = self.post().json()
+        self.assertIn("mesh_string", full)
+        self.assertIn("elemental_stresses", full)
+
+        summary = self.post("?profile=summary").json()
+        self.assertNotIn("mesh_string", summary)
+        self.assertAlmostEqual(summary["contact_pressure"], full["contact_pressure"])
+        self.assertIn("max_outer_vm_stress", summary)
+
+        interface = self.post("?profile=interface").json()
+        self.assertEqual(
+            len(interface["inner_interface"]["node_ids"]),
+            len(interface["inner_interface"]["contact_pressure"]),
+        )
+        self.assertNotIn("elemental_stresses", interface)
+
+        self.assertEqual(self.post("?profile=everything").status_code, 400)
+
+    def test_invalid_inputs(self):
+        impossible = press_request_data(inner_od=-30.1)
+        malformed = press_request_data()
+        del malformed["outerPart"]["youngsModulus"]
+
+        for data in (impossible, malformed):
+            response = self.client.post("/press", data, format="json")
+            self.assertEqual(response.status_code, 400)
+            self.assertEqual(response.json()["detail"], "Invalid Inputs")
+
+    def test_interference_ramp(self):
+        single = self.post("?profile=summary").json()
+        self.assertNotIn("interference_curve", single)
+
+        data = {**press_request_data(), "increments": 4}
+        ramped = self.client.post(
+            "/press?profile=interface", data, format="json"
+        ).json()
+        self.assertNotEqual(ramped["job_id"], single["job_id"])
+
+        curve = ramped["interference_curve"]
+        self.assertEqual(len(curve), 4)
+        self.assertAlmostEqual(curve[-1]["time"], 1.0)
+        for point in curve:
+            self.assertAlmostEqual(point["interference"], point["time"] * 0.0001)
+        self.assertAlmostEqual(
+            curve[-1]["contact_pressure"], ramped["contact_pressure"]
+        )
+        self.assertIn("inner_interface", ramped)
+
+        for increments in (0, 2.5, "many", 1000):
+            response = self.client.post(
+                "/press", {**data, "increments": increments}, format="json"
+            )
+            self.assertEqual(response.status_code, 400)
+
+        # JSON numbers too large for a float are infinite
+        body = json.dumps(data).replace('"increments": 4', '"increments": 1e400')
+        response = self.client.post("/press", body, content_type="application/json")
+        self.assertEqual(response.status_code, 400)
+
+    def test_field_pages(self):
+        job_id = self.post("?profile=summary").json()["job_id"]
+
+        job = self.client.get(f"/press/{job_id}").json()
+        total = job["fields"]["elemental_stresses"]
+        self.assertIn("contact_pressure", job)
+
+        values = []
+        start = 0
+        while start is not None:
+            page = self.client.get(
+                f"/press/{job_id}/fields/elemental_stresses?start={start}&limit=7"
+            ).json()
+            self.assertEqual(page["total"], total)
+            values.extend(page["values"])
+            start = page["next"]
+
+        self.assertEqual(len(values), total)
+        self.assertAlmostEqual(max(values), job["max_outer_vm_stress"], delta=1e-3)
+
+        arrays, metadata = decode_arrays(
+            self.client.get(
+                f"/press/{job_id}/fields/coordinates?format=arrays&limit=5"
+            ).content
+        )
+        self.assertEqual(arrays["coordinates"].shape, (5, 2))
+        self.assertEqual(metadata["next"], 5)
+
+        self.assertEqual(
+            self.client.get(f"/press/{job_id}/fields/unknown").status_code, 404
+        )
+        self.assertEqual(self.client.get(f"/press/{'0' * 32}").status_code, 404)
+
+    def test_ramped_fields(self):
+        def fake_ramped_run_model(model, inner_material, outer_material, increments=1):
+            fake_run_model(model, inner_material, outer_material, increments)
+            # Displacements grow with the interference of each increment
+            for i, key in enumerate(range(101, 101 + increments)):
+                for node in model.nodes:
+                    displacement = node.results[key].displacement
+                    node.results[key].add_displacement(
+                        Displacement(
+                            displacement.x * (i + 1) / increments,
+                            displacement.y * (i + 1) / increments,
+                            0.0,
+                        )
+                    )
+
+        data = {**press_request_data(), "increments": 4}
+        with mock.patch.object(PressFitModel, "run_model", fake_ramped_run_model):
+            full = self.client.post("/press?layout=arrays", data, format="json").json()
+
+        total = len(full["nodal_displacements"])
+        page = self.client.get(
+            f"/press/{full['job_id']}/fields/nodal_displacements?limit={total}"
+        ).json()
+        for value, expected in zip(page["values"], full["nodal_displacements"]):
+            self.assertAlmostEqual(value, expected)
+        self.assertGreater(max(page["values"]), 0)
+
+        job = self.client.get(f"/press/{full['job_id']}").json()
+        self.assertEqual(job["fields"]["nodal_displacements"], total)
+
+    def test_conditional_requests(self):
+        with mock.patch.object(
+            PressFitModel, "run_model", autospec=True, side_effect=fake_run_model
+        ) as run_model:
+            first = self.post("?profile=summary")
+            etag = first["ETag"]
+            job_id = first.json()["job_id"]
+            self.assertTrue(etag.startswith(f'W/"{job_id}-'))
+            self.assertIn("Accept-Encoding", first["Vary"])
+
+            # Same inputs with different number formatting are answered from the job store
+            data = press_request_data()
+            data["innerPart"]["innerDiameter"] = 20.0
+            cached = self.client.post("/press", data, format="json")
+            self.assertEqual(cached.json()["job_id"], job_id)
+            self.assertIn("mesh_string", cached.json())
+            self.assertEqual(run_model.call_count, 1)
+
+            # The full profile is a representation the client has not cached
+            self.assertNotEqual(cached["ETag"], etag)
+            modified = self.client.post(
+                "/press", data, format="json", HTTP_IF_NONE_MATCH=etag
+            )
+            self.assertEqual(modified.status_code, 200)
+
+            not_modified = self.client.post(
+                "/press", data, format="json", HTTP_IF_NONE_MATCH=cached["ETag"]
+            )
+            self.assertEqual(not_modified.status_code, 304)
+            self.assertEqual(not_modified["ETag"], cached["ETag"])
+            self.assertEqual(run_model.call_count, 1)
+
+            # As are other encodings and formats
+            for headers in (
+                {"HTTP_ACCEPT_ENCODING": "gzip"},
+                {"HTTP_ACCEPT": BINARY_CONTENT_TYPE},
+            ):
+                response = self.client.post(
+                    "/press",
+                    data,
+                    format="json",
+                    HTTP_IF_NONE_MATCH=cached["ETag"],
+                    **headers,
+                )
+                self.assertEqual(response.status_code, 200)
+                self.assertNotEqual(response["ETag"], cached["ETag"])
+
+            other = self.client.post(
+                "/press?profile=summary",
+                press_request_data(30.2),
+                format="json",
+                HTTP_IF_NONE_MATCH=etag,
+            )
+            self.assertEqual(other.status_code, 200)
+            self.assertNotEqual(other["ETag"], etag)
+            self.assertEqual(run_model.call_count, 2)
+
+        job = self.client.get(f"/press/{job_id}")
+        self.assertNotEqual(job["ETag"], etag)
+        self.assertIn("max-age", job["Cache-Control"])
+        self.assertIn("Accept", job["Vary"])
+        self.assertEqual(
+            self.client.get(
+                f"/press/{job_id}", HTTP_IF_NONE_MATCH=job["ETag"]
+            ).status_code,
+            304,
+        )
+        self.assertEqual(
+            self.client.get(
+                f"/press/{job_id}?profile=full", HTTP_IF_NONE_MATCH=job["ETag"]
+            ).status_code,
+            200,
+        )
+
+        interface = self.client.get(f"/press/{job_id}?profile=interface").json()
+        self.assertIn("inner_interface", interface)
+
+    def test_saturated(self):
+        scheduler = SolveScheduler(1, max_queued={BATCH: 0})
+        views._scheduler = scheduler
+        running = scheduler.submit(INTERACTIVE, "other")
+
+        response = self.client.post(
+            "/press",
+            press_request_data(),
+            format="json",
+            HTTP_X_SOLVE_PRIORITY="batch",
+        )
+        self.assertEqual(response.status_code, 429)
+        self.assertIn("Retry-After", response)
+
+        response = self.client.post(
+            "/press?priority=urgent", press_request_data(), format="json"
+        )
+        self.assertEqual(response.status_code, 400)
+
+        running.release()
+        self.assertEqual(self.post().status_code, 200)
+        self.assertEqual(scheduler.get_stats()["running"][INTERACTIVE], 0)
+
+    def test_metrics(self):
+        self.post("?profile=summary")
+
+        response = self.client.get("/metrics")
+        self.assertTrue(response["Content-Type"].startswith("text/plain"))
+        text = response.content.decode()
+        for stage in ("mesh", "summary", "store", "serialize", "queue"):
+            self.assertIn(
+                f'pressfits_stage_duration_seconds_count{{stage="{stage}"}}', text
+            )
+        self.assertIn(
+            'pressfits_requests_total{route="press",method="POST",status="200"}', text
+        )
+        self.assertIn('pressfits_queued_solves{priority="batch"} 0', text)
+        self.assertIn("pressfits_worker_utilization 0.0", text)
+        self.assertIn('pressfits_cache_hit_ratio{cache="jobs"}', text)
+
+
+@mock.patch.object(PressFitModel, "run_model", fake_run_model)
+@mock.patch.object(PressFitModel, "read_element_results", lambda model: None)
+@mock.patch.object(PressFitModel, "read_nodal_results", lambda model: None)
+class TestInterferenceView(unittest.TestCase):
+    def setUp(self):
+        self.settings = override_settings(ALLOWED_HOSTS=["testserver"])
+        self.settings.enable()
+        views._scheduler = None
+        # Synthetic results do not depend on the interference, so every interference shares one solve
+        views._scaling_cache = LinearScalingCache(rtol=0.1)
+        self.client = APIClient()
+
+    def tearDown(self):
+        self.settings.disable()
+        views._scheduler = None
+        views._scaling_cache = None
+
+    def optimize_request_data(self, **values):
+        data = press_request_data()
+        del data["innerPart"]["outerDiameter"]
+        data["outerPart"]["yieldStrength"] = 250
+        return {**data, **values}
+
+    def test_optimize(self):
+        response = self.client.post(
+            "/press/optimize",
+            self.optimize_request_data(holdingForce=20000),
+            format="json",
+        )
+        self.assertEqual(response.status_code, 200)
+
+        result = response.json()
+        self.assertAlmostEqual(result["holding_force"] / 20000, 1, 3)
+        self.assertAlmostEqual(result["od_0"], 0.03 + result["interference"])
+        self.assertIn("feasible", result)
+        self.assertGreater(result["maximum_interference"], 0)
+        self.assertTrue(result["converged"])
+        self.assertEqual(result["solves"], 1)
+
+    def test_default_friction_coefficient(self):
+        def optimize(**values):
+            data = self.optimize_request_data(holdingForce=20000)
+            del data["frictionCoefficient"]
+            data.update(values)
+            return self.client.post("/press/optimize", data, format="json").json()
+
+        # The endpoint defaults to the library's coefficient, whatever its value
+        with mock.patch.object(analytical, "DEFAULT_FRICTION_COEFFICIENT", 0.4):
+            result = optimize()
+        self.assertEqual(result, optimize(frictionCoefficient=0.4))
+        self.assertNotEqual(
+            result["interference"], optimize(frictionCoefficient=0.2)["interference"]
+        )
+
+    def test_invalid_inputs(self):
+        for data in (
+            self.optimize_request_data(),
+            self.optimize_request_data(holdingTorque=-5),
+            self.optimize_request_data(holdingForce="strong"),
+            self.optimize_request_data(holdingForce=100, contactLength=0),
+        ):
+            response = self.client.post("/press/optimize", data, format="json")
+            self.assertEqual(response.status_code, 400)
+            self.assertEqual(response.json()["detail"], "Invalid Inputs")
+
+
+class TestRequestHash(unittest.TestCase):
+    def test_normalization(self):
+        inner = Material("innerPart_mat", 210e9, 0.3)
+        outer = Material("outerPart_mat", 68.9e9, 0.33)
+
+        job_id = get_request_hash(0.02, 0.03, 0.0301, 0.05, 0.015, inner, outer)
+        self.assertRegex(job_id, f"^{JOB_ID_PATTERN}$")
+        self.assertEqual(
+            job_id,
+            get_request_hash(
+                20 / 1000, 0.03, 30.1 / 1000, 0.05, 15 / 1000, inner, outer
+            ),
+        )
+        self.assertNotEqual(
+            job_id, get_request_hash(0.02, 0.03, 0.0301, 0.05, 0.015, outer, inner)
+        )
+        self.assertNotEqual(
+            job_id,
+            get_request_hash(0.02, 0.03, 0.0301, 0.05, 0.015, inner, outer, 20),
+        )
+        self.assertEqual(
+            job_id,
+            get_request_hash(
+                0.02, 0.03, 0.0301, 0.05, 0.015, inner, outer, increments=1
+            ),
+        )
+        self.assertNotEqual(
+            job_id,
+            get_request_hash(
+                0.02, 0.03, 0.0301, 0.05, 0.015, inner, outer, increments=5
+            ),
+        )
+
+
+class TestSubmitSolve(unittest.TestCase):
+    def setUp(self):
+        self.settings = override_settings(ALLOWED_HOSTS=["testserver"])
+        self.settings.enable()
+        views._scheduler = SolveScheduler(4)
+        self.factory = RequestFactory()
+
+    def tearDown(self):
+        self.settings.disable()
+        views._scheduler = None
+
+    def submit(self, path="/press", priority=INTERACTIVE, user=None, **headers):
+        request = self.factory.post(
+            path,
+            headers={name.replace("_", "-"): value for name, value in headers.items()},
+        )
+        ticket = views.submit_solve(request, user or AnonymousUser(), priority)
+        ticket.cancel()
+        return ticket
+
+    def test_priority(self):
+        self.assertEqual(self.submit().priority, INTERACTIVE)
+        # Clients may lower the priority of an endpoint, but not raise it
+        self.assertEqual(self.submit(X_Solve_Priority="batch").priority, BATCH)
+        self.assertEqual(self.submit("/press?priority=batch").priority, BATCH)
+        self.assertEqual(
+            self.submit(priority=BATCH, X_Solve_Priority="interactive").priority, BATCH
+        )
+        with self.assertRaises(ValueError):
+            self.submit("/press?priority=urgent")
+
+    def test_client(self):
+        # Clients can't pose as another with a header
+        self.assertEqual(self.submit(X_Client_Id="other").client, "address:127.0.0.1")
+        user = SimpleNamespace(is_authenticated=True, pk=7)
+        self.assertEqual(self.submit(user=user).client, "user:7")
+
+
+async def fake_run_model_async(model, inner_material, outer_material, increments=1):
+    """Stands in for an asyncio ccx subprocess, taking long enough for requests to overlap"""
+    await asyncio.sleep(0.05)
+    fake_run_model(model, inner_material, outer_material, increments)
+
+
+@mock.patch.object(PressFitModel, "read_element_results", lambda model: None)
+@mock.patch.object(PressFitModel, "read_nodal_results", lambda model: None)
+class TestAsyncPressView(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.settings = override_settings(
+            PRESSFITS_JOB_DIRECTORY=self.directory.name,
+            PRESSFITS_EXPORT_DIRECTORY=None,
+            ALLOWED_HOSTS=["testserver"],
+        )
+        self.settings.enable()
+        views._job_store = None
+        views._scheduler = None
+        self.client = AsyncClient()
+
+    def tearDown(self):
+        self.settings.disable()
+        views._job_store = None
+        views._scheduler = None
+        self.directory.cleanup()
+
+    def post(self, query="", data=None, **extra):
+        return self.client.post(
+            f"/press/async{query}",
+            data or press_request_data(),
+            content_type="application/json",
+            **extra,
+        )
+
+    def test_shared_solve(self):
+        async def requests():
+            return await asyncio.gather(
+                self.post("?profile=summary"), self.post(), self.post()
+            )
+
+        with mock.patch.object(
+            PressFitModel,
+            "run_model_async",
+            autospec=True,
+            side_effect=fake_run_model_async,
+        ) as run_model_async:
+            summary, full, _ = asyncio.run(requests())
+            self.assertEqual(run_model_async.call_count, 1)
+
+            self.assertEqual(summary.status_code, 200)
+            self.assertNotIn("mesh_string", summary.json())
+            self.assertIn("mesh_string", full.json())
+            self.assertNotEqual(summary["ETag"], full["ETag"])
+
+            # Answered from the job store
+            interface = asyncio.run(self.post("?profile=interface"))
+            self.assertIn("inner_interface", interface.json())
+            self.assertEqual(
+                asyncio.run(
+                    self.post(headers={"If-None-Match": full["ETag"]})
+                ).status_code,
+                304,
+            )
+            self.assertEqual(run_model_async.call_count, 1)
+
+    def test_background_solve(self):
+        async def requests():
+            started = await self.post("?wait=false")
+            status = await self.client.get(f"{started['Location']}?wait=5")
+            return started, status
+
+        with mock.patch.object(
+            PressFitModel,
+            "run_model_async",
+            autospec=True,
+            side_effect=fake_run_model_async,
+        ), mock.patch.object(
+            views, "submit_solve", wraps=views.submit_solve
+        ) as submit_solve:
+            started, status = asyncio.run(requests())
+
+        # Nobody waits for a background solve
+        self.assertEqual(submit_solve.call_args.args[2], BATCH)
+        self.assertEqual(started.status_code, 202)
+        self.assertEqual(status.json()["status"], "done")
+        self.assertEqual(status.json()["job_id"], started.json()["job_id"])
+
+    def test_invalid_inputs(self):
+        data = press_request_data()
+        data["innerPart"]["poissonsRatio"] = 0.7
+        self.assertEqual(asyncio.run(self.post(data=data)).status_code, 400)
+        self.assertEqual(asyncio.run(self.post("?profile=all")).status_code, 400)
+        self.assertEqual(
+            asyncio.run(self.client.get(f"/press/{'0' * 32}/status")).status_code, 404
+        )
+
+    def test_infinite_increments(self):
+        body = json.dumps({**press_request_data(), "increments": 4}).replace(
+            '"increments": 4', '"increments": 1e400'
+        )
+        response = asyncio.run(
+            self.client.post("/press/async", body, content_type="application/json")
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_csrf_exempt(self):
+        # Clients post JSON without a CSRF cookie, as they do to the REST framework views
+        self.client = AsyncClient(enforce_csrf_checks=True)
+        data = press_request_data()
+        data["innerPart"]["poissonsRatio"] = 0.7
+        response = asyncio.run(self.post(data=data))
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {"detail": "Invalid Inputs"})
@@ -0,0 +1,255 @@
+import argparse
+import json
+import time
+from collections import namedtuple
+
+import numpy as np
+
+from pressfits import analytical
+
+# Distributions a parameter may be sampled from. A Tolerance is a normal distribution centred on
+# a tolerance band, whose limits are sigmas standard deviations away and are never exceeded.
+Uniform = namedtuple("Uniform", "low high")
+Normal = namedtuple("Normal", "mean std")
+Tolerance = namedtuple("Tolerance", "low high sigmas", defaults=(3,))
+
+PARAMETERS = (
+    "id_0",
+    "id_1",
+    "od_0",
+    "od_1",
+    "length",
+    "inner_youngs_modulus",
+    "inner_poissons_ratio",
+    "outer_youngs_modulus",
+    "outer_poissons_ratio",
+    "friction_coefficient",
+)
+OUTPUTS = (
+    "contact_pressure",
+    "max_inner_vm_stress",
+    "max_outer_vm_stress",
+    "inner_radial_deflection",
+    "outer_radial_deflection",
+    "holding_force",
+    "holding_torque",
+)
+PERCENTILES = (0.1, 1, 5, 50, 95, 99, 99.9)
+
+
+def sample(distribution, count, generator):
+    """Draws samples of a parameter
+
+    Args:
+        distribution (object): A Uniform, Normal or Tolerance, or a fixed value
+        count (int): Number of samples
+        generator (numpy.random.Generator): Source of random numbers
+
+    Returns:
+        numpy.ndarray: The samples
+    """
+    if isinstance(distribution, Uniform):
+        return generator.uniform(distribution.low, distribution.high, count)
+    if isinstance(distribution, Normal):
+        return generator.normal(distribution.mean, distribution.std, count)
+    if isinstance(distribution, Tolerance):
+        mean = (distribution.low + distribution.high) / 2
+        std = (distribution.high - distribution.low) / 2 / distribution.sigmas
+        values = generator.normal(mean, std, count)
+        # Parts outside the band are rejected by inspection, so are drawn again
+        outside = (values < distribution.low) | (values > distribution.high)
+        while outside.any():
+            values[outside] = generator.normal(mean, std, outside.sum())
+            outside = (values < distribution.low) | (values > distribution.high)
+        return values
+
+    return np.full(count, float(distribution))
+
+
+def evaluate_analytical(samples):
+    """Evaluates sampled designs with Lamé's equations
+
+    Args:
+        samples (dict(String, numpy.ndarray)): Values of every parameter of each design
+
+    Returns:
+        dict(String, numpy.ndarray): Values of every output of each design
+    """
+    return analytical.get_summary(**samples)
+
+
+def get_statistics(values):
+    """Gets the statistics of the samples of an output
+
+    Args:
+        values (numpy.ndarray): The samples
+
+    Returns:
+        dict: Mean, standard deviation, minimum, maximum and each of PERCENTILES, keyed p{percentile}
+    """
+    percentiles = np.percentile(values, PERCENTILES)
+
+    return {
+        "mean": float(values.mean()),
+        "std": float(values.std()),
+        "min": float(values.min()),
+        "max": float(values.max()),
+        **{
+            f"p{percentile:g}": float(value)
+            for percentile, value in zip(PERCENTILES, percentiles)
+        },
+    }
+
+
+def run_tolerance_analysis(
+    parameters,
+    evaluate=evaluate_analytical,
+    batch_size=2000,
+    max_samples=200000,
+    rtol=0.002,
+    patience=2,
+    seed=0,
+):
+    """Samples designs from the distributions of their parameters in batches until the
+    percentiles of every output are stable. Percentiles are stable once no batch has moved any
+    of them by more than rtol of its value for patience batches in a row.
+
+    Args:
+        parameters (dict(String, object)): Distribution or fixed value of every parameter in
+            PARAMETERS. friction_coefficient may be left out for the default of the analytical solution.
+        evaluate (callable, optional): Evaluates a batch of designs, taking and returning
+            dictionaries of arrays as evaluate_analytical does. Defaults to evaluate_analytical.
+        batch_size (int, optional): Designs sampled between convergence checks. Defaults to 2000.
+        max_samples (int, optional): Designs sampled before stopping without converging. Defaults to 200000.
+        rtol (float, optional): Relative change of the percentiles considered stable. Defaults to 0.002.
+        patience (int, optional): Batches in a row the percentiles must be stable for. Defaults to 2.
+        seed (int, optional): Seed of the samples. Defaults to 0.
+
+    Raises:
+        ValueError: If a parameter is missing or not recognized
+
+    Returns:
+        dict: Number of samples, whether the percentiles converged, the statistics of every
+            output from get_statistics, the percentiles after each batch, and the duration (s)
+    """
+    parameters = {
+        "friction_coefficient": analytical.DEFAULT_FRICTION_COEFFICIENT,
+        **parameters,
+    }
+    unknown = set(parameters) - set(PARAMETERS)
+    if unknown:
+        raise ValueError(f"Unrecognized parameters: {', '.join(sorted(unknown))}")
+    missing = set(PARAMETERS) - set(parameters)
+    if missing:
+        raise ValueError(f"Missing parameters: {', '.join(sorted(missing))}")
+
+    start = time.perf_counter()
+    generator = np.random.default_rng(seed)
+    batches = {name: [] for name in OUTPUTS}
+    history = []
+    previous = None
+    stable = 0
+
+    while stable < patience and len(history) * batch_size < max_samples:
+        samples = {
+            name: sample(distribution, batch_size, generator)
+            for name, distribution in parameters.items()
+        }
+        outputs = evaluate(samples)
+        for name in OUTPUTS:
+            batches[name].append(np.asarray(outputs[name]))
+
+        percentiles = np.array(
+            [
+                np.percentile(np.concatenate(batches[name]), PERCENTILES)
+                for name in OUTPUTS
+            ]
+        )
+        history.append(percentiles)
+        if previous is not None and np.all(
+            np.abs(percentiles - previous) <= rtol * np.abs(previous)
+        ):
+            stable += 1
+        else:
+            stable = 0
+        previous = percentiles
+
+    return {
+        "samples": len(history) * batch_size,
+        "converged": stable >= patience,
+        "statistics": {
+            name: get_statistics(np.concatenate(batches[name])) for name in OUTPUTS
+        },
+        "history": [
+            {
+                "samples": (i + 1) * batch_size,
+                **{
+                    name: dict(zip((f"p{p:g}" for p in PERCENTILES), values.tolist()))
+                    for name, values in zip(OUTPUTS, percentiles)
+                },
+            }
+            for i, percentiles in enumerate(history)
+        ],
+        "seconds": time.perf_counter() - start,
+    }
+
+
+def parse_distribution(text):
+    """Parses the distribution of a parameter given on the command line, as a fixed value, a
+    low:high tolerance band, uniform:low:high, or normal:mean:std
+
+    Args:
+        text (String): The distribution
+
+    Returns:
+        object: A Uniform, Normal or Tolerance, or a fixed value
+    """
+    values = text.split(":")
+    if values[0] == "uniform":
+        return Uniform(float(values[1]), float(values[2]))
+    if values[0] == "normal":
+        return Normal(float(values[1]), float(values[2]))
+    if len(values) == 2:
+        return Tolerance(float(values[0]), float(values[1]))
+
+    return float(text)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Monte Carlo tolerance analysis of an axisymmetric press fit with Lamé's "
+        "equations, sampling until the percentiles of every output are stable. Dimensions are "
+        "in m and moduli in Pa. Each parameter is a value, a low:high tolerance band sampled as "
+        "a normal distribution with the limits at 3 standard deviations, uniform:low:high or "
+        "normal:mean:std."
+    )
+    for name in PARAMETERS:
+        parser.add_argument(
+            f"--{name.replace('_', '-')}",
+            type=parse_distribution,
+            required=name != "friction_coefficient",
+        )
+    parser.add_argument("--batch-size", type=int, default=2000)
+    parser.add_argument("--max-samples", type=int, default=200000)
+    parser.add_argument("--rtol", type=float, default=0.002)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    parameters = {
+        name: getattr(args, name)
+        for name in PARAMETERS
+        if getattr(args, name) is not None
+    }
+    result = run_tolerance_analysis(
+        parameters,
+        batch_size=args.batch_size,
+        max_samples=args.max_samples,
+        rtol=args.rtol,
+        seed=args.seed,
+    )
+    del result["history"]
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,293 @@
+import gzip
+import json
+import math
+import struct
+
+import numpy as np
+
+from pressfits.result_set import von_mises
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+BINARY_CONTENT_TYPE = "application/vnd.pressfits.arrays"
+
+_MAGIC = b"PFA1"
+_ALIGNMENT = 8
+_QUANTIZED_DTYPE = np.dtype("<u2")
+_QUANTIZED_LEVELS = np.iinfo(_QUANTIZED_DTYPE).max
+
+
+def get_model_arrays(model, key=101):
+    """Gets the mesh and summary fields of a solved model as contiguous typed arrays
+
+    Args:
+        model (PressFitModel): A model that has had its results read
+        key (int, optional): Step of simulation. Defaults to 101.
+
+    Returns:
+        dict(String, np.ndarray): node_ids, coordinates (m), node_parts, element_ids, connectivity
+            (node indices), elemental_stresses (mean Von Mises, MPa) and nodal_displacements (m)
+    """
+    nodes = model.nodes
+    elements = model.elements
+    node_ids = np.array([node.id for node in nodes], dtype="<i4")
+
+    offsets = np.zeros(len(elements) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(element.results) for element in elements])
+    stresses = np.array(
+        [
+            [stress.xx, stress.yy, stress.zz, stress.xy, stress.yz, stress.zx]
+            for element in elements
+            for stress in element.results
+        ]
+    ).reshape(-1, 6)
+    counts = np.diff(offsets)
+    if (counts == 0).any():
+        raise IndexError("No stress results within an element")
+    elemental_stresses = (
+        np.add.reduceat(von_mises(stresses), offsets[:-1]) / counts / 1000**2
+    )
+
+    return {
+        "node_ids": node_ids,
+        "coordinates": np.array([[node.x, node.y] for node in nodes], dtype="<f4"),
+        "node_parts": np.array([node.part for node in nodes], dtype="<i4"),
+        "element_ids": np.array([element.id for element in elements], dtype="<i4"),
+        "connectivity": np.searchsorted(
+            node_ids, [element.get_ids() for element in elements]
+        ).astype("<i4"),
+        "elemental_stresses": elemental_stresses.astype("<f4"),
+        "nodal_displacements": np.fromiter(
+            (node.results[key].displacement.get_total_displacement() for node in nodes),
+            dtype="<f4",
+            count=len(nodes),
+        ),
+    }
+
+
+def get_model_array_lists(model, key=101):
+    """Gets the mesh and summary fields of a solved model as ordered arrays, for JSON responses.
+    Unlike the id keyed dictionaries of the default response, values are positional and share
+    the order of node_ids and element_ids.
+
+    Args:
+        model (PressFitModel): A model that has had its results read
+        key (int, optional): Step of simulation. Defaults to 101.
+
+    Returns:
+        dict(String, np.ndarray): Arrays as returned by get_model_arrays, with contact_pressure
+    """
+    arrays = get_model_arrays(model, key)
+    arrays["contact_pressure"] = model.max_contact_pressure(key)
+    return arrays
+
+
+def encode_json(data):
+    """Serializes data to compact JSON, using orjson when it is installed. numpy arrays and
+    scalars are serialized as lists and numbers, and NaN and infinities as null, whichever
+    serializer is used.
+
+    Args:
+        data (object): Data to serialize
+
+    Returns:
+        bytes: UTF-8 encoded JSON
+    """
+    if orjson is not None:
+        return orjson.dumps(
+            data,
+            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS,
+            default=_json_default,
+        )
+
+    return json.dumps(
+        _to_json_values(data),
+        separators=(",", ":"),
+        default=_json_default,
+        allow_nan=False,
+    ).encode()
+
+
+def _to_json_values(value):
+    """Converts data to values the json module serializes as orjson does. The json module
+    never passes floats to its default function, so NaN and infinities are replaced first.
+
+    Args:
+        value (object): Data to convert
+
+    Returns:
+        object: The data with numpy arrays and scalars converted to lists and numbers, and NaN
+            and infinities to None
+    """
+    if isinstance(value, dict):
+        return {key: _to_json_values(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_to_json_values(item) for item in value]
+    if isinstance(value, (np.ndarray, np.generic)):
+        return _to_json_values(value.tolist())
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+
+    return value
+
+
+def _json_default(value):
+    """Converts values that are not natively JSON serializable
+
+    Args:
+        value (object): Value to convert
+
+    Raises:
+        TypeError: If the value cannot be converted
+
+    Returns:
+        object: A JSON serializable value
+    """
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def select_encoding(accept_encoding, encodings):
+    """Selects the content encoding to use for a response
+
+    Args:
+        accept_encoding (String): Accept-Encoding header of the request
+        encodings (iterable(String)): Supported encodings in order of preference, from br and gzip
+
+    Returns:
+        String: The selected encoding, or None if the response should not be compressed
+    """
+    accepted = {}
+    for item in accept_encoding.split(","):
+        name, _, parameters = item.strip().partition(";")
+        quality = 1.0
+        if parameters.strip().startswith("q="):
+            try:
+                quality = float(parameters.strip()[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[name.strip().lower()] = quality
+
+    for encoding in encodings:
+        if encoding == "br" and brotli is None:
+            continue
+        if accepted.get(encoding, accepted.get("*", 0.0)) > 0:
+            return encoding
+
+    return None
+
+
+def compress(content, encoding, level):
+    """Compresses response content
+
+    Args:
+        content (bytes): Content to compress
+        encoding (String): br or gzip
+        level (int): Compression level, from 1 (fastest) to 9
+
+    Returns:
+        bytes: Compressed content
+    """
+    if encoding == "br":
+        return brotli.compress(content, quality=level)
+
+    return gzip.compress(content, compresslevel=level, mtime=0)
+
+
+def encode_arrays(arrays, metadata=None, quantize=()):
+    """Encodes arrays into a single binary buffer. The buffer is laid out as a 4 byte magic
+    number, a little-endian uint32 header length, a JSON header describing each array and the
+    raw little-endian array data, with every array aligned to 8 bytes.
+
+    Args:
+        arrays (dict(String, np.ndarray)): Arrays to encode
+        metadata (dict, optional): JSON serializable values to include in the header. Defaults to None.
+        quantize (iterable(String), optional): Names of float arrays to quantize to uint16 over their range. Defaults to ().
+
+    Returns:
+        bytes: Encoded arrays
+    """
+    descriptions = []
+    buffers = []
+    offset = 0
+
+    for name, array in arrays.items():
+        array = np.asarray(array)
+        description = {"name": name, "shape": list(array.shape)}
+
+        if name in quantize and array.size > 0:
+            minimum = float(np.nanmin(array))
+            scale = (float(np.nanmax(array)) - minimum) / _QUANTIZED_LEVELS or 1.0
+            description["minimum"] = minimum
+            description["scale"] = scale
+            array = np.round((array - minimum) / scale).astype(_QUANTIZED_DTYPE)
+        else:
+            array = array.astype(array.dtype.newbyteorder("<"), copy=False)
+
+        data = np.ascontiguousarray(array).tobytes()
+        padding = -len(data) % _ALIGNMENT
+
+        description["dtype"] = array.dtype.str
+        description["offset"] = offset
+        description["length"] = len(data)
+        descriptions.append(description)
+        buffers.append(data + b"\0" * padding)
+        offset += len(data) + padding
+
+    header = json.dumps(
+        {"metadata": metadata or {}, "arrays": descriptions}, separators=(",", ":")
+    ).encode()
+    header += b" " * (-(len(header) + len(_MAGIC) + 4) % _ALIGNMENT)
+
+    return b"".join(
+        [_MAGIC, struct.pack("<I", len(header)), header, *buffers],
+    )
+
+
+def decode_arrays(data):
+    """Decodes a buffer created by encode_arrays, dequantizing any quantized arrays
+
+    Args:
+        data (bytes): Encoded arrays
+
+    Raises:
+        ValueError: If the data is not an encoded array buffer
+
+    Returns:
+        (dict(String, np.ndarray), dict): Arrays by name and metadata
+    """
+    if data[: len(_MAGIC)] != _MAGIC:
+        raise ValueError("Data is not an encoded array buffer")
+
+    (header_length,) = struct.unpack_from("<I", data, len(_MAGIC))
+    start = len(_MAGIC) + 4
+    header = json.loads(data[start : start + header_length])
+    start += header_length
+
+    arrays = {}
+    for description in header["arrays"]:
+        array = np.frombuffer(
+            data,
+            dtype=np.dtype(description["dtype"]),
+            count=description["length"] // np.dtype(description["dtype"]).itemsize,
+            offset=start + description["offset"],
+        ).reshape(description["shape"])
+
+        if "scale" in description:
+            array = array * description["scale"] + description["minimum"]
+
+        arrays[description["name"]] = array
+
+    return arrays, header["metadata"]
@@ -1,13 +1,26 @@
 from django.contrib.auth.models import User
-from django.urls import include, path
+from django.urls import include, path, re_path
 from rest_framework import routers
 
 from . import views
+from .jobs import JOB_ID_PATTERN
 
 router = routers.DefaultRouter()
 router.register(r"PressFitData", views.PressView, basename="PressFitData")
 
 urlpatterns = [
     path("", views.PressFit.as_view()),
+    path("metrics", views.MetricsView.as_view()),
     path("press", views.PressView.as_view()),
+    path("press/async", views.AsyncPressView.as_view()),
+    path("press/optimize", views.InterferenceView.as_view()),
+    re_path(rf"^press/(?P<job_id>{JOB_ID_PATTERN})$", views.PressJobView.as_view()),
+    re_path(
+        rf"^press/(?P<job_id>{JOB_ID_PATTERN})/fields/(?P<field>\w+)$",
+        views.PressFieldView.as_view(),
+    ),
+    re_path(
+        rf"^press/(?P<job_id>{JOB_ID_PATTERN})/status$",
+        views.AsyncPressStatusView.as_view(),
+    ),
 ]
@@ -1,13 +1,46 @@
-from django.http import JsonResponse
+import asyncio
+import hashlib
+import json
+import logging
+import math
+import os
+import shutil
+import subprocess
+import tempfile
+import weakref
+from functools import partial
+from types import SimpleNamespace
+
+import numpy as np
+from django.conf import settings
+from django.http import HttpResponse, JsonResponse
 from django.shortcuts import render
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.utils.decorators import method_decorator
+from django.utils.http import parse_etags
 from django.views import View
-from rest_framework import exceptions
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework import exceptions, renderers
 from rest_framework import views as REST_Views
 from rest_framework.response import Response
 from rest_framework.views import exception_handler
 
-from pressfits.model import AxisymmetricPressFitModel, Material
-from pressfits.serializers import PressSerializer
+from pressfits import analytical
+from pressfits.export import export_run, get_run_parameters
+from pressfits.jobs import FIELDS, JobStore, get_field, get_request_hash
+from pressfits.metrics import (CONTENT_TYPE, REGISTRY, Gauge,
+                               record_cache_lookup, time_stage)
+from pressfits.model import AxisymmetricPressFitModel, Material, PressFitModel
+from pressfits.optimization import find_minimum_interference
+from pressfits.renderers import ArrayRenderer, FastJSONRenderer
+from pressfits.result_set import ResultSet
+from pressfits.scaling import LinearScalingCache
+from pressfits.scheduler import (BATCH, INTERACTIVE, PRIORITIES,
+                                 SchedulerSaturated, SolveScheduler)
+from pressfits.transport import (compress, encode_json, get_model_array_lists,
+                                 get_model_arrays, select_encoding)
+
+logger = logging.getLogger(__name__)
 
 
 class PressFit(View):
@@ -15,52 +48,615 @@ class PressFit(View):
         return render(request, "pressfits/page.html")
 
 
-class PressView(REST_Views.APIView):
-    def post(self, request):
-        print("Recieved Request:")
-        print(request.data)
+# Response detail levels of PressView, from least to most detailed
+PROFILES = ("summary", "interface", "full")
 
-        # TODO: Validate inputs
+_DEFAULT_PAGE_LENGTH = 10000
+_MAX_PAGE_LENGTH = 100000
+_JOB_MAX_AGE = 24 * 60 * 60  # Seconds stored jobs may be cached by clients
+_MAX_INCREMENTS = 100  # The default increment limit of a ccx step
+# Query parameters that select the representation of a job's results, rather than its inputs
+_REPRESENTATION_PARAMETERS = (
+    "profile",
+    "format",
+    "layout",
+    "quantize",
+    "start",
+    "limit",
+)
 
-        # Process post data
-        p_0_material = self.get_material(request, "innerPart")
-        p_1_material = self.get_material(request, "outerPart")
-        length = request.data["contactLength"] / 1000
-        [p_0_id, p_0_od] = self.get_part_parameters(request, "innerPart")
-        [p_1_id, p_1_od] = self.get_part_parameters(request, "outerPart")
+_job_store = None
+_scheduler = None
+_scaling_cache = None
 
-        if not self.inputs_are_valid(
-            p_0_material,
-            p_1_material,
-            [p_0_id, p_0_od],
-            [p_1_id, p_1_od],
+
+def get_job_store():
+    """Gets the store of finished jobs, creating it on first use
+
+    Returns:
+        JobStore: The job store, or None if jobs are not stored
+    """
+    global _job_store
+
+    if _job_store is None and settings.PRESSFITS_JOB_DIRECTORY is not None:
+        _job_store = JobStore(
+            settings.PRESSFITS_JOB_DIRECTORY, settings.PRESSFITS_JOB_STORE_SIZE
+        )
+
+    return _job_store
+
+
+def get_scaling_cache():
+    """Gets the cache of reference solves shared by interference optimizations, creating it on
+    first use
+
+    Returns:
+        LinearScalingCache: The cache
+    """
+    global _scaling_cache
+
+    if _scaling_cache is None:
+        _scaling_cache = LinearScalingCache()
+
+    return _scaling_cache
+
+
+def get_scheduler():
+    """Gets the scheduler that solves are run through, creating it on first use
+
+    Returns:
+        SolveScheduler: The scheduler
+    """
+    global _scheduler
+
+    if _scheduler is None:
+        _scheduler = SolveScheduler(
+            settings.PRESSFITS_MAX_CONCURRENT_SOLVES,
+            settings.PRESSFITS_RESERVED_INTERACTIVE_SOLVES,
+            settings.PRESSFITS_MAX_QUEUED_SOLVES,
+            settings.PRESSFITS_MAX_QUEUED_SOLVES_PER_CLIENT,
+        )
+
+    return _scheduler
+
+
+def _get_scheduler_values(name):
+    """Gets the number of queued or running solves of each priority, for gauges
+
+    Args:
+        name (String): queued or running
+
+    Returns:
+        dict(tuple(String), int): Number of solves keyed by priority
+    """
+    return {
+        (priority,): count
+        for priority, count in get_scheduler().get_stats()[name].items()
+    }
+
+
+def _get_worker_utilization():
+    stats = get_scheduler().get_stats()
+    return {(): sum(stats["running"].values()) / stats["workers"]}
+
+
+REGISTRY.register(
+    Gauge(
+        "pressfits_queued_solves",
+        "Number of solves waiting for a worker",
+        ("priority",),
+        partial(_get_scheduler_values, "queued"),
+    )
+)
+REGISTRY.register(
+    Gauge(
+        "pressfits_running_solves",
+        "Number of solves running",
+        ("priority",),
+        partial(_get_scheduler_values, "running"),
+    )
+)
+REGISTRY.register(
+    Gauge(
+        "pressfits_worker_utilization",
+        "Fraction of solve workers in use",
+        (),
+        _get_worker_utilization,
+    )
+)
+
+
+def get_client_id(request, user):
+    """Identifies the client of a request for fair sharing of the scheduler, by its
+    authenticated user, or its address if anonymous. Headers set by clients are not trusted, as
+    any client could pose as another.
+
+    Args:
+        request (HttpRequest): The request
+        user (User): The user of the request
+
+    Returns:
+        String: Identifier of the client
+    """
+    if user is not None and user.is_authenticated:
+        return f"user:{user.pk}"
+
+    return f"address:{request.META.get('REMOTE_ADDR', '')}"
+
+
+def submit_solve(request, user, priority=INTERACTIVE):
+    """Queues the solve of a request with the scheduler, at the priority of its endpoint. Clients
+    may lower it to batch with the X-Solve-Priority header or priority query parameter, as that
+    only yields to others, but can't raise it.
+
+    Args:
+        request (HttpRequest): The request
+        user (User): The user of the request, see get_client_id
+        priority (String, optional): Priority of the endpoint, from PRIORITIES. Defaults to INTERACTIVE.
+
+    Raises:
+        ValueError: If the priority requested is not recognized
+        SchedulerSaturated: If the queue of the priority or client is full
+
+    Returns:
+        SolveTicket: Ticket to wait for a worker with
+    """
+    requested = (
+        request.headers.get("X-Solve-Priority") or request.GET.get("priority", priority)
+    ).lower()
+    if requested not in PRIORITIES:
+        raise ValueError(f"Unrecognized priority: {requested}")
+    if requested == BATCH:
+        priority = BATCH
+
+    return get_scheduler().submit(priority, get_client_id(request, user))
+
+
+class MetricsView(View):
+    def get(self, request):
+        """Gets the metrics of this server process in the Prometheus text format"""
+        return HttpResponse(REGISTRY.render(), content_type=CONTENT_TYPE)
+
+
+class CompressedResponseMixin:
+    """Compresses rendered responses with an encoding accepted by the client.
+    Endpoints configure compression by overriding the compression class attributes."""
+
+    # Encodings in order of preference. br is skipped if brotli is not installed.
+    compression_encodings = ("br", "gzip")
+    compression_minimum_size = 1024  # Bytes
+    compression_level = 5
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+
+        if isinstance(response, Response) and self.compression_encodings:
+            response.add_post_render_callback(partial(self._compress, request))
+
+        return response
+
+    def _compress(self, request, response):
+        """Compresses the content of a rendered response in place
+
+        Args:
+            request (Request): The request being responded to
+            response (Response): The rendered response
+        """
+        patch_vary_headers(response, ("Accept-Encoding",))
+
+        if (
+            len(response.content) < self.compression_minimum_size
+            or response.has_header("Content-Encoding")
+            or response.status_code == 304
         ):
+            return
+
+        encoding = select_encoding(
+            request.META.get("HTTP_ACCEPT_ENCODING", ""), self.compression_encodings
+        )
+        if encoding is None:
+            return
+
+        with time_stage("compress"):
+            response.content = compress(
+                response.content, encoding, self.compression_level
+            )
+        response["Content-Encoding"] = encoding
+
+
+def get_etag(request, job_id):
+    """Gets the ETag of a representation of the results of a job. It combines the job id with
+    the path, the _REPRESENTATION_PARAMETERS and the Accept and Accept-Encoding headers of the
+    request, so that a client only matches a representation it has cached. ETags are weak, as
+    responses may be compressed.
+
+    Args:
+        request (HttpRequest): The request
+        job_id (String): Id of the job
+
+    Returns:
+        String: ETag header value
+    """
+    representation = {
+        "path": request.path,
+        **{
+            name: request.GET.get(name)
+            for name in _REPRESENTATION_PARAMETERS
+            if name in request.GET
+        },
+        "accept": request.META.get("HTTP_ACCEPT", ""),
+        "accept_encoding": request.META.get("HTTP_ACCEPT_ENCODING", ""),
+    }
+    digest = hashlib.sha256(
+        json.dumps(representation, sort_keys=True).encode()
+    ).hexdigest()[:16]
+    return f'W/"{job_id}-{digest}"'
+
+
+def set_etag(response, etag):
+    """Sets the ETag of a response, varying it with the headers the ETag depends on
+
+    Args:
+        response (HttpResponse): The response
+        etag (String): ETag of the response, from get_etag
+
+    Returns:
+        HttpResponse: The response
+    """
+    response["ETag"] = etag
+    patch_vary_headers(response, ("Accept", "Accept-Encoding"))
+    return response
+
+
+def etag_matches(request, etag):
+    """Checks if the If-None-Match header of a request matches an ETag, using weak comparison
+
+    Args:
+        request (Request): The request
+        etag (String): ETag of the current results
+
+    Returns:
+        bool: True if the client already has the current results
+    """
+    if_none_match = request.META.get("HTTP_IF_NONE_MATCH")
+    if not if_none_match:
+        return False
+
+    etags = parse_etags(if_none_match)
+    return "*" in etags or etag.removeprefix("W/") in {
+        tag.removeprefix("W/") for tag in etags
+    }
+
+
+def not_modified(etag):
+    """Creates an empty response telling the client its copy of the results is current
+
+    Args:
+        etag (String): ETag of the current results
+
+    Returns:
+        Response: 304 response
+    """
+    return set_etag(Response(status=304), etag)
+
+
+def cache_job_response(response):
+    """Allows clients to cache a response of a stored job. Results of a job never change, as
+    its id is the hash of its inputs.
+
+    Args:
+        response (Response): Response to a request for a stored job
+
+    Returns:
+        Response: The response
+    """
+    patch_cache_control(response, private=True, max_age=_JOB_MAX_AGE)
+    patch_vary_headers(response, ("Accept",))
+    return response
+
+
+class ProfileResponseMixin:
+    """Builds responses from solved or stored models at the detail levels of PROFILES"""
+
+    def get_profile(self, request, default="full"):
+        """Gets the detail level requested with the profile query parameter
+
+        Args:
+            request (Request): The request
+            default (String, optional): Profile used if none is requested. Defaults to "full".
+
+        Raises:
+            ValidationError: If the profile is not recognized
+
+        Returns:
+            String: Profile, from PROFILES
+        """
+        profile = request.GET.get("profile", default)
+        if profile not in PROFILES:
+            raise exceptions.ValidationError(
+                {"profile": f"Must be one of {', '.join(PROFILES)}"}
+            )
+
+        return profile
+
+    @staticmethod
+    def load_model(job_store, job_id, profile):
+        """Loads the model of a stored job, with the input needed by the profile
+
+        Args:
+            job_store (JobStore): Store the job is in
+            job_id (String): Id of the job
+            profile (String): Detail level the model will be used for, from PROFILES
+
+        Returns:
+            PressFitModel: Model with the stored mesh and results, or None if not needed by the profile
+        """
+        if profile == "summary":
+            return None
+
+        model = PressFitModel.from_result_set(job_store.load(job_id))
+        if profile == "full":
+            model.inp_str = job_store.load_mesh_string(job_id)
+
+        return model
+
+    def save_job(self, model, job_id, parameters):
+        """Exports and stores the results of a solved model, if enabled in the settings
+
+        Args:
+            model (PressFitModel): The solved model
+            job_id (String): Id to store the results under
+            parameters (dict): Inputs of the run, from get_run_parameters
+
+        Returns:
+            dict: Summary values of the model, from get_summary
+        """
+        if settings.PRESSFITS_EXPORT_DIRECTORY is not None:
+            export_run(model, settings.PRESSFITS_EXPORT_DIRECTORY, job_id, parameters)
+
+        summary = self.get_summary(model)
+        job_store = get_job_store()
+        if job_store is not None:
+            with time_stage("store"):
+                job_store.save(
+                    job_id, ResultSet.from_model(model), summary, model.inp_str
+                )
+
+        model.emit_run_record(job_id=job_id)
+        return summary
+
+    def build_response(self, request, model, job_id, summary, profile):
+        """Builds the response to a solved request at the requested detail level
+
+        Args:
+            request (Request): The request
+            model (PressFitModel): The solved model
+            job_id (String): Id the results were stored under
+            summary (dict): Summary values of the model, from get_summary
+            profile (String): Detail level of the response, from PROFILES
+
+        Returns:
+            Response: The response
+        """
+        data = {"job_id": job_id, **summary}
+        if profile == "interface":
+            data.update(self.get_interface_fields(model, model.get_final_key()))
+
+        if request.accepted_renderer.format == ArrayRenderer.format:
+            # Typed arrays of the mesh and fields, requested with ?format=arrays or the Accept header
+            quantize = request.query_params.get("quantize", "").lower() == "true"
+            arrays = {}
+            if profile == "full":
+                arrays = get_model_arrays(model, model.get_final_key())
+            elif profile == "interface":
+                arrays = {
+                    f"{surface}_{name}": values
+                    for surface in ("inner_interface", "outer_interface")
+                    for name, values in data.pop(surface).items()
+                }
+
+            return Response(
+                {
+                    "arrays": arrays,
+                    "metadata": data,
+                    "quantize": (
+                        ("elemental_stresses", "nodal_displacements")
+                        if quantize
+                        else ()
+                    ),
+                }
+            )
+
+        return Response(
+            self.get_profile_data(
+                model, data, profile, request.query_params.get("layout")
+            )
+        )
+
+    @staticmethod
+    def get_profile_data(model, data, profile, layout=None):
+        """Adds the mesh and fields of a full profile to the data of a JSON response
+
+        Args:
+            model (PressFitModel): The solved model
+            data (dict): Job id, summary and interface fields of the response
+            profile (String): Detail level of the response, from PROFILES
+            layout (String, optional): "arrays" for positional arrays rather than id keyed dictionaries. Defaults to None.
+
+        Returns:
+            dict: Data of the response
+        """
+        if profile != "full":
+            return data
+
+        # Fields are those of the full interference, the last increment of the solve
+        key = model.get_final_key()
+        if layout == "arrays":
+            # Positional arrays ordered by node_ids and element_ids, rather than id keyed dictionaries
+            return {**data, **get_model_array_lists(model, key)}
+
+        return {
+            **data,
+            "mesh_string": model.inp_str,
+            "elemental_stresses": model.get_elemental_stresses_summary(),
+            "nodal_displacements": model.get_nodal_displacements_summary(key),
+        }
+
+    @staticmethod
+    def get_summary(model):
+        """Gets the summary values of a solved model
+
+        Args:
+            model (PressFitModel): The solved model
+
+        Returns:
+            dict: Summary values, from PressFitModel.get_summary
+        """
+        with time_stage("summary"):
+            return model.get_summary()
+
+    @staticmethod
+    def get_interface_fields(model, key=101):
+        """Gets fields along the contacting surfaces of both parts
+
+        Args:
+            model (PressFitModel): The solved model
+            key (int, optional): Step of simulation. Defaults to 101.
+
+        Returns:
+            dict: Node ids, axial positions (m), contact pressures (MPa) and radial displacements (m)
+                of the inner_interface (outer surface of the inner part) and outer_interface
+        """
+        fields = {}
+
+        for surface, node_ids in (
+            ("inner_interface", model.mesh.l_2),
+            ("outer_interface", model.mesh.l_4),
+        ):
+            nodes = [model.nodes[node_id - 1] for node_id in node_ids]
+            fields[surface] = {
+                "node_ids": np.array(node_ids),
+                "y": np.array([node.y for node in nodes]),
+                "contact_pressure": np.array(
+                    [
+                        (
+                            node.results[key].contact.contact_pressure * 1e-6
+                            if node.results[key].contact is not None
+                            else 0.0
+                        )
+                        for node in nodes
+                    ]
+                ),
+                "radial_displacement": np.array(
+                    [node.results[key].displacement.x for node in nodes]
+                ),
+            }
+
+        return fields
+
+
+class PressView(CompressedResponseMixin, ProfileResponseMixin, REST_Views.APIView):
+    renderer_classes = [
+        FastJSONRenderer,
+        renderers.BrowsableAPIRenderer,
+        ArrayRenderer,
+    ]
+
+    def post(self, request):
+        logger.debug("Received request: %s", request.data)
+
+        # Process post data
+        try:
+            p_0_material = self.get_material(request, "innerPart")
+            p_1_material = self.get_material(request, "outerPart")
+            length = request.data["contactLength"] / 1000
+            [p_0_id, p_0_od] = self.get_part_parameters(request, "innerPart")
+            [p_1_id, p_1_od] = self.get_part_parameters(request, "outerPart")
+            increments = self.get_increments(request)
+            is_valid = self.inputs_are_valid(
+                p_0_material,
+                p_1_material,
+                [p_0_id, p_0_od],
+                [p_1_id, p_1_od],
+            )
+        except (ValueError, KeyError, TypeError):
+            is_valid = False  # Missing or malformed parameters
+
+        if not is_valid:
             response = exception_handler(exceptions.APIException(), None)
+            response.status_code = 400
             response.data["status_code"] = 400
             response.data["detail"] = "Invalid Inputs"
             return response
-        model = AxisymmetricPressFitModel(
+
+        profile = self.get_profile(request)
+
+        job_id = get_request_hash(
             p_0_id,
             p_1_id,
             p_0_od,
             p_1_od,
             length,
-            length,
-            "Press_Fit",
+            p_0_material,
+            p_1_material,
+            increments=increments,
         )
-        model.run_model(p_0_material, p_1_material)
+        etag = get_etag(request, job_id)
+        if etag_matches(request, etag):
+            return not_modified(etag)
 
-        model.read_element_results()
-        model.read_nodal_results()
-        model_data = {
-            "mesh_string": model.inp_str,
-            "elemental_stresses": model.get_elemental_stresses_summary(),
-            "nodal_displacements": model.get_nodal_displacements_summary(),
-            "contact_pressure": model.max_contact_pressure(),
-        }
+        job_store = get_job_store()
+        is_stored = job_store is not None and job_store.exists(job_id)
+        record_cache_lookup("jobs", is_stored)
+        if is_stored:
+            # Identical inputs were solved before
+            summary = job_store.load_summary(job_id)
+            model = self.load_model(job_store, job_id, profile)
+        else:
+            try:
+                ticket = submit_solve(request, request.user)
+            except ValueError as e:
+                raise exceptions.ValidationError({"priority": str(e)})
+            except SchedulerSaturated as e:
+                raise exceptions.Throttled(e.retry_after, str(e))
+
+            with ticket:
+                # Each solve has its own directory, so concurrent solves don't share files
+                directory = tempfile.mkdtemp(dir=settings.PRESSFITS_WORK_DIRECTORY)
+                try:
+                    model = AxisymmetricPressFitModel(
+                        p_0_id,
+                        p_1_id,
+                        p_0_od,
+                        p_1_od,
+                        length,
+                        length,
+                        os.path.join(directory, "Press_Fit"),
+                    )
+                    model.run_model(p_0_material, p_1_material, increments)
 
-        results = PressSerializer(model_data).data
-        return Response(results)
+                    model.read_element_results()
+                    model.read_nodal_results()
+                finally:
+                    shutil.rmtree(directory, True)
+
+            summary = self.save_job(
+                model,
+                job_id,
+                get_run_parameters(
+                    p_0_id,
+                    p_1_id,
+                    p_0_od,
+                    p_1_od,
+                    length,
+                    p_0_material,
+                    p_1_material,
+                    model.mesh.curve_num,
+                ),
+            )
+
+        response = self.build_response(request, model, job_id, summary, profile)
+        return set_etag(response, etag)
 
     @staticmethod
     def inputs_are_valid(p_0_material, p_1_material, p_0_dims, p_1_dims):
@@ -147,6 +743,31 @@ class PressView(REST_Views.APIView):
             poissons_ratio=float(request.data[part_prefix]["poissonsRatio"]),
         )
 
+    @staticmethod
+    def get_increments(request):
+        """Gets the number of increments to ramp the interference over, each adding a point of
+        the interference_curve of the summary
+
+        Args:
+            request (Request): Request containing post parameters
+
+        Raises:
+            ValueError: If the number of increments is not a whole number from 1 to _MAX_INCREMENTS
+
+        Returns:
+            int: Number of increments, 1 if not given
+        """
+        increments = request.data.get("increments", 1)
+        if (
+            isinstance(increments, bool)
+            or not math.isfinite(float(increments))
+            or int(increments) != float(increments)
+            or not 1 <= int(increments) <= _MAX_INCREMENTS
+        ):
+            raise ValueError(f"Invalid number of increments: {increments}")
+
+        return int(increments)
+
     @staticmethod
     def get_part_parameters(request, part_prefix):
         """Gets a material from a request post description
@@ -164,3 +785,467 @@ class PressView(REST_Views.APIView):
             float(request.data[part_prefix]["innerDiameter"]) / 1000,
             float(request.data[part_prefix]["outerDiameter"]) / 1000,
         )
+
+
+class InterferenceView(REST_Views.APIView):
+    """Finds the smallest interference of a press fit that holds a required axial force or
+    torque, sizing the outer diameter of the inner part for the given bore of the outer part
+    """
+
+    renderer_classes = [FastJSONRenderer, renderers.BrowsableAPIRenderer]
+
+    def post(self, request):
+        try:
+            p_0_material = PressView.get_material(request, "innerPart")
+            p_1_material = PressView.get_material(request, "outerPart")
+            length = request.data["contactLength"] / 1000
+            p_0_id = float(request.data["innerPart"]["innerDiameter"]) / 1000
+            [p_1_id, p_1_od] = PressView.get_part_parameters(request, "outerPart")
+            friction_coefficient = float(
+                request.data.get(
+                    "frictionCoefficient", analytical.DEFAULT_FRICTION_COEFFICIENT
+                )
+            )
+            holding_force = self.get_optional_number(request.data, "holdingForce")
+            holding_torque = self.get_optional_number(request.data, "holdingTorque")
+            yield_strengths = [
+                self.get_optional_number(request.data[part], "yieldStrength")
+                for part in ("innerPart", "outerPart")
+            ]
+            # The inner part is checked at no interference, its smallest outer diameter
+            is_valid = (
+                PressView.inputs_are_valid(
+                    p_0_material,
+                    p_1_material,
+                    [p_0_id, p_1_id],
+                    [p_1_id, p_1_od],
+                )
+                and PressView.is_positive_number(length)
+                and PressView.is_positive_number(friction_coefficient)
+                and (holding_force is not None or holding_torque is not None)
+                and all(
+                    value is None or PressView.is_positive_number(value)
+                    for value in [holding_force, holding_torque, *yield_strengths]
+                )
+            )
+        except (ValueError, KeyError, TypeError):
+            is_valid = False  # Missing or malformed parameters
+
+        if not is_valid:
+            response = exception_handler(exceptions.APIException(), None)
+            response.status_code = 400
+            response.data["status_code"] = 400
+            response.data["detail"] = "Invalid Inputs"
+            return response
+
+        try:
+            ticket = submit_solve(request, request.user)
+        except ValueError as e:
+            raise exceptions.ValidationError({"priority": str(e)})
+        except SchedulerSaturated as e:
+            raise exceptions.Throttled(e.retry_after, str(e))
+
+        with ticket, time_stage("optimize"):
+            try:
+                result = find_minimum_interference(
+                    p_0_id,
+                    p_1_id,
+                    p_1_od,
+                    length,
+                    p_0_material,
+                    p_1_material,
+                    holding_force,
+                    holding_torque,
+                    friction_coefficient,
+                    *yield_strengths,
+                    cache=get_scaling_cache(),
+                    work_directory=settings.PRESSFITS_WORK_DIRECTORY,
+                )
+            except ValueError as e:
+                # No interference holds the requirement, such as with a vanishing capacity
+                raise exceptions.ValidationError(str(e))
+
+        return Response(result)
+
+    @staticmethod
+    def get_optional_number(data, name):
+        """Gets a number from post parameters, if it was given
+
+        Args:
+            data (dict): Post parameters
+            name (String): Name of the parameter
+
+        Returns:
+            float: The number, or None if it was not given
+        """
+        value = data.get(name)
+        return None if value is None else float(value)
+
+
+class PressJobView(CompressedResponseMixin, ProfileResponseMixin, REST_Views.APIView):
+    renderer_classes = [
+        FastJSONRenderer,
+        renderers.BrowsableAPIRenderer,
+        ArrayRenderer,
+    ]
+
+    def get(self, request, job_id):
+        """Gets a finished job at the detail level of the profile query parameter. The default
+        summary profile also includes the length of each field of the job."""
+        job_store = get_job_store()
+        if job_store is None or not job_store.exists(job_id):
+            raise exceptions.NotFound(f"Job not found: {job_id}")
+
+        profile = self.get_profile(request, "summary")
+        etag = get_etag(request, job_id)
+        if etag_matches(request, etag):
+            return cache_job_response(not_modified(etag))
+
+        summary = job_store.load_summary(job_id)
+        if profile != "summary":
+            try:
+                model = self.load_model(job_store, job_id, profile)
+            except KeyError:
+                raise exceptions.NotFound(f"Job input not found: {job_id}")
+            response = self.build_response(request, model, job_id, summary, profile)
+            return cache_job_response(set_etag(response, etag))
+
+        result_set = job_store.load(job_id)
+        key = max(result_set.get_step_keys())
+        fields = {}
+        for name in FIELDS:
+            try:
+                fields[name] = len(get_field(result_set, name, key))
+            except KeyError:
+                continue  # The quantity was not output by the solve
+
+        return cache_job_response(
+            set_etag(Response({"job_id": job_id, **summary, "fields": fields}), etag)
+        )
+
+
+class PressFieldView(CompressedResponseMixin, REST_Views.APIView):
+    renderer_classes = [
+        FastJSONRenderer,
+        renderers.BrowsableAPIRenderer,
+        ArrayRenderer,
+    ]
+
+    def get(self, request, job_id, field):
+        """Gets a range of rows of a field of a finished job, set by the start and limit query parameters"""
+        job_store = get_job_store()
+        if job_store is None or not job_store.exists(job_id):
+            raise exceptions.NotFound(f"Job not found: {job_id}")
+        if field not in FIELDS:
+            raise exceptions.NotFound(f"Unrecognized field: {field}")
+
+        etag = get_etag(request, job_id)
+        if etag_matches(request, etag):
+            return cache_job_response(not_modified(etag))
+
+        try:
+            start = int(request.query_params.get("start", 0))
+            limit = int(request.query_params.get("limit", _DEFAULT_PAGE_LENGTH))
+        except ValueError:
+            raise exceptions.ValidationError("start and limit must be integers")
+        if start < 0 or not 0 < limit <= _MAX_PAGE_LENGTH:
+            raise exceptions.ValidationError(
+                f"start must be positive and limit between 1 and {_MAX_PAGE_LENGTH}"
+            )
+
+        result_set = job_store.load(job_id)
+        try:
+            # Fields of a ramped solve are those at the full interference
+            values = get_field(result_set, field, max(result_set.get_step_keys()))
+        except KeyError:
+            raise exceptions.NotFound(f"Field not available: {field}")
+        stop = min(start + limit, len(values))
+        page = {
+            "job_id": job_id,
+            "field": field,
+            "total": len(values),
+            "start": start,
+            "stop": stop,
+            "next": stop if stop < len(values) else None,
+        }
+
+        if request.accepted_renderer.format == ArrayRenderer.format:
+            response = Response(
+                {"arrays": {field: values[start:stop]}, "metadata": page}
+            )
+        else:
+            response = Response({**page, "values": values[start:stop]})
+
+        return cache_job_response(set_etag(response, etag))
+
+
+# Solves in flight on each event loop
+_solves = weakref.WeakKeyDictionary()
+
+_MAX_STATUS_WAIT = 30  # Seconds
+
+
+async def run_in_executor(function, *args):
+    """Runs a blocking function in the default executor of the running event loop
+
+    Args:
+        function (callable): Function to run
+        *args: Arguments of the function
+
+    Returns:
+        object: Return value of the function
+    """
+    return await asyncio.get_running_loop().run_in_executor(
+        None, partial(function, *args)
+    )
+
+
+def get_solves():
+    """Gets the solves in flight on the running event loop
+
+    Returns:
+        dict(String, asyncio.Task): Solve tasks by job id
+    """
+    return _solves.setdefault(asyncio.get_running_loop(), {})
+
+
+def encode_response(request, data, status=200, compression_level=5):
+    """Creates a compressed JSON response outside of the rest framework
+
+    Args:
+        request (HttpRequest): The request being responded to
+        data (dict): Data of the response
+        status (int, optional): Status code. Defaults to 200.
+        compression_level (int, optional): Compression level, from 1 (fastest) to 9. Defaults to 5.
+
+    Returns:
+        HttpResponse: The response
+    """
+    with time_stage("serialize"):
+        content = encode_json(data)
+    encoding = None
+    if len(content) >= CompressedResponseMixin.compression_minimum_size:
+        encoding = select_encoding(
+            request.META.get("HTTP_ACCEPT_ENCODING", ""),
+            CompressedResponseMixin.compression_encodings,
+        )
+    if encoding is not None:
+        with time_stage("compress"):
+            content = compress(content, encoding, compression_level)
+
+    response = HttpResponse(content, content_type="application/json", status=status)
+    if encoding is not None:
+        response["Content-Encoding"] = encoding
+    patch_vary_headers(response, ("Accept-Encoding",))
+    return response
+
+
+@method_decorator(csrf_exempt, name="dispatch")
+class AsyncPressView(ProfileResponseMixin, View):
+    """Solves press fits like PressView without holding a thread while ccx runs. Meshing and
+    parsing run in executor threads and ccx in an asyncio subprocess, so that an ASGI worker can
+    keep many solves in flight. Identical requests share one solve, scheduled with the priority
+    of the first. Responses are JSON only.
+
+    With ?wait=false the job id is returned immediately with a 202 status, and the solve
+    continues in the background at batch priority, as nobody waits for it. This requires an
+    ASGI server, as the event loop of a WSGI request is closed once it is answered.
+
+    Like the REST framework views, it is exempt from CSRF checks, as clients post JSON without
+    a session.
+    """
+
+    async def post(self, request):
+        try:
+            # The parameter helpers of PressView only read request.data
+            inputs = SimpleNamespace(data=json.loads(request.body))
+            p_0_material = PressView.get_material(inputs, "innerPart")
+            p_1_material = PressView.get_material(inputs, "outerPart")
+            length = inputs.data["contactLength"] / 1000
+            [p_0_id, p_0_od] = PressView.get_part_parameters(inputs, "innerPart")
+            [p_1_id, p_1_od] = PressView.get_part_parameters(inputs, "outerPart")
+            increments = PressView.get_increments(inputs)
+            profile = self.get_profile(request)
+        except exceptions.ValidationError as e:
+            return JsonResponse({"detail": e.detail}, status=400)
+        except (ValueError, KeyError, TypeError):
+            return JsonResponse({"detail": "Invalid Inputs"}, status=400)
+
+        if not PressView.inputs_are_valid(
+            p_0_material,
+            p_1_material,
+            [p_0_id, p_0_od],
+            [p_1_id, p_1_od],
+        ):
+            return JsonResponse({"detail": "Invalid Inputs"}, status=400)
+
+        job_id = get_request_hash(
+            p_0_id,
+            p_1_id,
+            p_0_od,
+            p_1_od,
+            length,
+            p_0_material,
+            p_1_material,
+            increments=increments,
+        )
+        etag = get_etag(request, job_id)
+        if etag_matches(request, etag):
+            return set_etag(HttpResponse(status=304), etag)
+
+        # Background solves are not awaited by anyone, so are batch solves
+        is_background = request.GET.get("wait", "true").lower() == "false"
+        user = await request.auser()
+
+        solves = get_solves()
+        if job_id not in solves:
+            job_store = get_job_store()
+            is_stored = job_store is not None and await run_in_executor(
+                job_store.exists, job_id
+            )
+            record_cache_lookup("jobs", is_stored)
+
+        # Another request may have started the same solve while checking the job store
+        if job_id not in solves:
+            ticket = None
+            if not is_stored:
+                try:
+                    ticket = submit_solve(
+                        request, user, BATCH if is_background else INTERACTIVE
+                    )
+                except ValueError as e:
+                    return JsonResponse({"detail": str(e)}, status=400)
+                except SchedulerSaturated as e:
+                    response = JsonResponse({"detail": str(e)}, status=429)
+                    response["Retry-After"] = str(e.retry_after)
+                    return response
+
+            solves[job_id] = asyncio.create_task(
+                self.solve(
+                    job_id,
+                    (p_0_id, p_1_id, p_0_od, p_1_od, length),
+                    (p_0_material, p_1_material),
+                    ticket,
+                    increments,
+                )
+            )
+            solves[job_id].add_done_callback(lambda task: solves.pop(job_id, None))
+        solve = solves[job_id]
+
+        if is_background:
+            response = JsonResponse({"job_id": job_id, "status": "running"}, status=202)
+            response["Location"] = f"/press/{job_id}/status"
+            return response
+
+        try:
+            # Shielded so that a client disconnecting does not cancel a solve other requests share
+            summary, model = await asyncio.shield(solve)
+        except subprocess.CalledProcessError:
+            return JsonResponse({"detail": "Solve failed"}, status=500)
+
+        if model is None and profile != "summary":
+            model = await run_in_executor(
+                self.load_model, get_job_store(), job_id, profile
+            )
+
+        response = await run_in_executor(
+            self.build_async_response, request, model, job_id, summary, profile
+        )
+        return set_etag(response, etag)
+
+    async def solve(self, job_id, dimensions, materials, ticket, increments=1):
+        """Solves a model once the scheduler grants it a worker
+
+        Args:
+            job_id (String): Id to store the results under
+            dimensions (tuple(float)): id_0, id_1, od_0, od_1 and contact length (m)
+            materials (tuple(Material)): Materials of the inner and outer part
+            ticket (SolveTicket): Ticket of the solve, or None to load the summary of identical inputs solved before
+            increments (int, optional): Number of increments to ramp the interference over. Defaults to 1.
+
+        Raises:
+            subprocess.CalledProcessError: If ccx fails
+
+        Returns:
+            (dict, PressFitModel): Summary values, and the solved model or None if it was loaded from the job store
+        """
+        if ticket is None:
+            return await run_in_executor(get_job_store().load_summary, job_id), None
+
+        p_0_id, p_1_id, p_0_od, p_1_od, length = dimensions
+        async with ticket:
+            directory = await run_in_executor(
+                partial(tempfile.mkdtemp, dir=settings.PRESSFITS_WORK_DIRECTORY)
+            )
+            try:
+                model = await run_in_executor(
+                    AxisymmetricPressFitModel,
+                    p_0_id,
+                    p_1_id,
+                    p_0_od,
+                    p_1_od,
+                    length,
+                    length,
+                    os.path.join(directory, "Press_Fit"),
+                )
+                await model.run_model_async(*materials, increments)
+
+                await run_in_executor(model.read_element_results)
+                await run_in_executor(model.read_nodal_results)
+            finally:
+                await run_in_executor(shutil.rmtree, directory, True)
+
+        summary = await run_in_executor(
+            self.save_job,
+            model,
+            job_id,
+            get_run_parameters(*dimensions, *materials, model.mesh.curve_num),
+        )
+        return summary, model
+
+    def build_async_response(self, request, model, job_id, summary, profile):
+        """Builds and encodes the JSON response to a solved request at the requested detail level
+
+        Args:
+            request (HttpRequest): The request
+            model (PressFitModel): The solved model, or None for the summary profile
+            job_id (String): Id the results were stored under
+            summary (dict): Summary values of the model, from get_summary
+            profile (String): Detail level of the response, from PROFILES
+
+        Returns:
+            HttpResponse: The response
+        """
+        data = {"job_id": job_id, **summary}
+        if profile == "interface":
+            data.update(self.get_interface_fields(model, model.get_final_key()))
+
+        return encode_response(
+            request,
+            self.get_profile_data(model, data, profile, request.GET.get("layout")),
+        )
+
+
+class AsyncPressStatusView(View):
+    async def get(self, request, job_id):
+        """Gets the status of a job, waiting up to the number of seconds of the wait query
+        parameter for a running solve to finish"""
+        try:
+            wait = min(float(request.GET.get("wait", 0)), _MAX_STATUS_WAIT)
+        except ValueError:
+            return JsonResponse({"detail": "wait must be a number"}, status=400)
+
+        solve = get_solves().get(job_id)
+        if solve is not None:
+            try:
+                await asyncio.wait_for(asyncio.shield(solve), max(wait, 0))
+            except asyncio.TimeoutError:
+                return JsonResponse({"job_id": job_id, "status": "running"})
+            except subprocess.CalledProcessError:
+                return JsonResponse({"job_id": job_id, "status": "failed"})
+
+        job_store = get_job_store()
+        if job_store is not None and await run_in_executor(job_store.exists, job_id):
+            return JsonResponse({"job_id": job_id, "status": "done"})
+
+        return JsonResponse({"detail": f"Job not found: {job_id}"}, status=404)
@@ -45,6 +45,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "pressfits.middleware.RequestMetricsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -132,7 +133,56 @@ STATIC_ROOT = os.path.join(BASE_DIR, "static")
 MEDIA_ROOT = os.path.join(BASE_DIR, "media")
 
 
+# Directory that solved runs are exported to as Parquet datasets for analysis. None disables exporting.
+PRESSFITS_EXPORT_DIRECTORY = None
+
+# Directory that the results of finished solves are stored in, for retrieving their fields by job id.
+# None disables storing jobs.
+PRESSFITS_JOB_DIRECTORY = os.path.join(BASE_DIR, "jobs")
+
+# Number of jobs kept in PRESSFITS_JOB_DIRECTORY. Once exceeded, the least recently used jobs are removed.
+# None keeps every job.
+PRESSFITS_JOB_STORE_SIZE = 1000
+
+# Directory that the async endpoint creates a working directory in for each solve. None uses the system
+# temporary directory.
+PRESSFITS_WORK_DIRECTORY = None
+
+# Record the peak memory of each stage of a run with tracemalloc. Slows solves noticeably.
+PRESSFITS_TRACE_MEMORY = False
+
+# Directory that a cProfile capture of each run is written to. None disables profiling.
+PRESSFITS_PROFILE_DIRECTORY = None
+
+# Maximum number of solves run at once, per server process
+PRESSFITS_MAX_CONCURRENT_SOLVES = os.cpu_count() or 1
+
+# Number of the concurrent solves that batch solves can't use, keeping them free for interactive
+# solves. Batch solves always keep one, so nothing is reserved with a single concurrent solve.
+PRESSFITS_RESERVED_INTERACTIVE_SOLVES = 1
+
+# Maximum number of queued solves of each priority, in total and per client, before requests are
+# rejected with 429 Too Many Requests. Clients are authenticated users, or the addresses of anonymous ones.
+PRESSFITS_MAX_QUEUED_SOLVES = {"interactive": 256, "batch": 20000}
+PRESSFITS_MAX_QUEUED_SOLVES_PER_CLIENT = {"interactive": 16, "batch": 10000}
+
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/4.1/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
+
+
+# Run records and diagnostics are logged by the pressfits loggers. Set PRESSFITS_LOG_LEVEL to INFO
+# to log a structured record of every run.
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {"console": {"class": "logging.StreamHandler"}},
+    "loggers": {
+        "pressfits": {
+            "handlers": ["console"],
+            "level": os.environ.get("PRESSFITS_LOG_LEVEL", "WARNING"),
+        },
+    },
+}